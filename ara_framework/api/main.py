@@ -17,6 +17,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from api.routes import budget, pipeline
 from core.budget_manager import BudgetManager
+from core.model_factory import warmup_models, close_models
+from core.redis_checkpointer import close_checkpointer
+from tools.scraping_tool import close_scraping_tool, get_scraping_metrics, prewarm_scraping_tool
+from config.settings import settings
 
 
 @asynccontextmanager
@@ -34,11 +38,29 @@ async def lifespan(app: FastAPI):
         print(f"⚠️ Budget Manager warning: {e}")
         app.state.budget_manager = None
     
+    # Pre-open pooled LLM connections
+    if settings.LLM_WARMUP_ON_STARTUP:
+        results = await warmup_models()
+        print(f"✅ LLM clients warmed up: {results}")
+    
+    # Pre-start the scraping browser (otherwise started on first use)
+    if settings.SCRAPE_BROWSER_PREWARM:
+        try:
+            await prewarm_scraping_tool()
+            print("✅ Scraping browser started")
+        except Exception as e:
+            print(f"⚠️ Scraping browser warning: {e}")
+    
     print("🎯 ARA Framework API ready!")
     yield
     
     # Shutdown: Cleanup
     print("🛑 ARA Framework API shutting down...")
+    await close_models()
+    await close_scraping_tool()
+    await close_checkpointer()
+    if app.state.budget_manager:
+        await app.state.budget_manager.close()
 
 
 # Create FastAPI app
@@ -86,6 +108,7 @@ async def health_check():
     return {
         "status": "healthy",
         "budget_manager": app.state.budget_manager is not None,
+        "scraping": get_scraping_metrics(),
         "api_version": "0.1.0"
     }
 
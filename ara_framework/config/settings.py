@@ -83,6 +83,8 @@ class Settings(BaseSettings):
     # - llama-3.1-sonar-large-128k-online: Better quality (recommended)
     # - llama-3.1-sonar-huge-128k-online: Best quality, slower
     PERPLEXITY_BASE_URL: str = "https://api.perplexity.ai"
+    PERPLEXITY_MAX_CONCURRENT: int = 3  # Búsquedas simultáneas por proceso
+    PERPLEXITY_CACHE_TTL: int = 21600  # 6 horas (por query + recency filter)
     
     # ============================================================
     # GITHUB MODELS (Beta - GRATIS durante beta)
@@ -111,6 +113,15 @@ class Settings(BaseSettings):
     # - ministral-3b: Modelo pequeño (3B parámetros)
     GITHUB_MODELS_BASE_URL: str = "https://models.inference.ai.azure.com"
     
+    # Pool HTTP compartido para clientes LLM (core/model_factory.py)
+    LLM_HTTP_MAX_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # segundos
+    LLM_HTTP_TIMEOUT: float = 120.0  # segundos por request
+    LLM_WARMUP_ON_STARTUP: bool = False  # Abrir conexiones al arrancar la API
+    # Scheduler de RPM por modelo según MODEL_COSTS.rpm_limit (core/model_scheduler.py)
+    LLM_RPM_SCHEDULING: bool = True
+    LLM_RPM_MAX_WAIT: float = 10.0  # Espera máxima (segundos) antes de usar el fallback
+    
     # ============================================================
     # MCP SERVERS - Tokens y URLs
     # ============================================================
@@ -150,6 +161,10 @@ class Settings(BaseSettings):
     SEMANTIC_SCHOLAR_DELAY: float = 1.0  # 1 segundo entre requests (CRÍTICO)
     SEMANTIC_SCHOLAR_BASE_URL: str = "https://api.semanticscholar.org/graph/v1"
     
+    # Rate limiting de MCP adapters (mcp_servers/rate_limit.py)
+    # "memory": token bucket por proceso | "redis": compartido entre workers
+    MCP_RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    
     # ============================================================
     # VALKEY/REDIS - Cache Configuration
     # ============================================================
@@ -159,6 +174,10 @@ class Settings(BaseSettings):
     REDIS_TTL_ANALYSIS: int = 2592000  # 30 días (resultados de análisis)
     REDIS_MAX_CONNECTIONS: int = 10
     
+    # Cache L1 en proceso delante de Redis (mcp_servers/cache.py)
+    MCP_L1_CACHE_MAX_ENTRIES: int = 512  # Por adapter (0 = deshabilitado)
+    MCP_L1_CACHE_MAX_TTL: int = 3600  # El L1 nunca supera el TTL de Redis
+    
     # ============================================================
     # UPTRACE - Observability (1TB/mes gratis)
     # ============================================================
@@ -176,12 +195,74 @@ class Settings(BaseSettings):
     AGENT_TIMEOUT_SYNTHESIS: int = 600  # 10 min (ContentSynthesizer)
     AGENT_TIMEOUT_ORCHESTRATOR: int = 420  # 7 min (Orchestrator)
     
+    # ============================================================
+    # TOOL CALLING - safe_agent_invoke (core/agent_utils.py)
+    # ============================================================
+    AGENT_TOOL_TIMEOUT: float = 120.0  # Timeout por tool call (segundos)
+    AGENT_TOOL_MAX_CONCURRENCY: int = 3  # Llamadas simultáneas por tool
+    
+    # ============================================================
+    # LLM RESPONSE CACHE - safe_agent_invoke (core/llm_cache.py)
+    # ============================================================
+    # "none": deshabilitado | "redis": usa REDIS_URL | "sqlite": archivo local
+    LLM_CACHE_BACKEND: Literal["none", "redis", "sqlite"] = "none"
+    # "read_write": normal | "replay": solo lectura, miss = error (benchmarks)
+    LLM_CACHE_MODE: Literal["read_write", "replay"] = "read_write"
+    LLM_CACHE_TTL: int = 604800  # 7 días
+    LLM_CACHE_MAX_ENTRIES: int = 5000  # Evicción de las más antiguas
+    LLM_CACHE_SQLITE_PATH: str = ".cache/llm_responses.sqlite"
+    
+    # ============================================================
+    # PDF PROCESSING - MarkItDownAdapter (mcp_servers/markitdown_mcp.py)
+    # ============================================================
+    # Conversiones cacheadas por hash del contenido (mcp_servers/pdf_cache.py)
+    PDF_CACHE_ENABLED: bool = True
+    PDF_CACHE_DIR: str = ".cache/pdf"  # Store comprimido + índice path → hash
+    PDF_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Store: se podan las conversiones menos usadas
+    PDF_CACHE_MAX_INDEX_ENTRIES: int = 10000  # Índice: filas huérfanas y más antiguas
+    # Pool de procesos para conversiones (mcp_servers/pdf_workers.py)
+    PDF_WORKERS: int = 2  # 0 = thread pool en proceso (con rate limit 5/min)
+    PDF_CONVERSION_TIMEOUT: float = 120.0  # Por documento; el worker se reemplaza
+    
+    # ============================================================
+    # WEB SCRAPING - PlaywrightAdapter (mcp_servers/playwright_mcp.py)
+    # ============================================================
+    # Pools de contexto + página (mcp_servers/browser_pool.py)
+    PLAYWRIGHT_POOL_SIZE: int = 3  # Páginas de texto (imágenes/fuentes/CSS bloqueados)
+    PLAYWRIGHT_RENDER_POOL_SIZE: int = 1  # Páginas con render completo (screenshots)
+    PLAYWRIGHT_PAGE_MAX_USES: int = 50  # Navegaciones antes de reciclar el contexto (0 = nunca)
+    # scrape_multiple_urls: cola de trabajo acotada (mcp_servers/work_queue.py)
+    SCRAPE_PER_HOST_LIMIT: int = 2  # Scrapes simultáneos por host
+    SCRAPE_URL_TIMEOUT: float = 30.0  # Deadline por URL (segundos)
+    SCRAPE_BATCH_DEADLINE: float = 120.0  # Deadline del lote; retorna resultados parciales
+    # scrape_website: GET HTTP primero, Playwright solo si hace falta (mcp_servers/http_fetcher.py)
+    SCRAPE_TIERED: bool = True
+    SCRAPE_HTTP_TIMEOUT: float = 10.0
+    SCRAPE_HTTP_MAX_CONNECTIONS: int = 20
+    SCRAPE_MIN_TEXT_LENGTH: int = 200  # Menos texto visible = página renderizada con JS
+    # Páginas vencidas (REDIS_TTL_CONTENT): GET condicional con ETag / Last-Modified / hash
+    # "off": fetch completo | "revalidate": revalidar antes de responder
+    # "stale_while_revalidate": responder con la copia vencida y revalidar en background
+    SCRAPE_REVALIDATION_MODE: Literal["off", "revalidate", "stale_while_revalidate"] = "revalidate"
+    SCRAPE_PAGE_RETENTION: int = 2592000  # 30 días guardando validadores + contenido
+    # Ciclo de vida del browser del ScrapingTool (mcp_servers/browser_manager.py)
+    SCRAPE_BROWSER_PREWARM: bool = False  # Iniciar Chromium al arrancar la API
+    SCRAPE_BROWSER_IDLE_TIMEOUT: float = 300.0  # Cerrar tras N segundos sin uso (0 = nunca)
+    SCRAPE_BROWSER_MAX_PAGES: int = 500  # Reiniciar tras N páginas (0 = nunca)
+    
     # ============================================================
     # BUDGET MANAGER - Copilot Pro Credits (300/mes)
     # ============================================================
     BUDGET_MAX_CREDITS_PER_MONTH: int = 300  # Copilot Pro limit
     BUDGET_ALERT_THRESHOLD: float = 0.80  # Alert at 80% usage (240 credits)
     BUDGET_PROJECTED_USAGE_PER_ANALYSIS: float = 0.45  # créditos por análisis
+    # usage_log en Supabase: write-behind por lotes (core/usage_log.py)
+    BUDGET_USAGE_LOG_BATCH_SIZE: int = 50  # Flush al juntar N eventos...
+    BUDGET_USAGE_LOG_FLUSH_INTERVAL: float = 5.0  # ...o cada N segundos
+    BUDGET_USAGE_LOG_MAX_BUFFER: int = 10000  # Eventos retenidos si Supabase no responde
+    BUDGET_USAGE_LOG_SPOOL_PATH: str = ".cache/usage_log_spool.jsonl"  # Pendientes al apagar ("" = no)
+    # Snapshot en memoria del BudgetStatus; al vencer se valida con el campo "version" en Redis
+    BUDGET_STATUS_CACHE_TTL: float = 1.0  # Segundos sin round-trips
     
     # Credit costs por modelo (según docs/03_PROJECT_SPEC.md)
     CREDIT_COST_GPT5: float = 1.0  # GPT-5
@@ -215,6 +296,14 @@ class Settings(BaseSettings):
     # PIPELINE CONFIGURATION
     # ============================================================
     PIPELINE_MAX_CONCURRENT_AGENTS: int = 3  # Paralelización limitada
+    # "sequential": cadena de 5 nodos (fallback)
+    # "parallel": fan-out/fan-in (papers || comunidad, arquitectura || plan/riesgos)
+    PIPELINE_GRAPH_MODE: Literal["sequential", "parallel"] = "sequential"
+    # "memory": checkpoints en proceso | "redis": persistentes, permite resume
+    # (TTL = REDIS_TTL_ANALYSIS, ver core/redis_checkpointer.py)
+    PIPELINE_CHECKPOINT_BACKEND: Literal["memory", "redis"] = "memory"
+    # Historial de mensajes en ResearchState (ver core/state_compaction.py)
+    STATE_MAX_MESSAGES: int = 20  # Mensajes más antiguos se colapsan en un resumen
     PIPELINE_ENABLE_CACHE: bool = True
     PIPELINE_ENABLE_TELEMETRY: bool = True
     
@@ -1,53 +1,246 @@
 """
 Utilidades para crear y ejecutar agentes con mejor manejo de errores.
 """
+import asyncio
 import structlog
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from langchain_core.messages import BaseMessage, AIMessage, ToolMessage
 from langchain_core.tools import BaseTool
 from langchain_groq import ChatGroq
 from langchain_openai import ChatOpenAI
 
+from config.settings import settings
+from core.llm_cache import LLMCacheMiss, LLMResponseCache, cached_ainvoke, get_llm_cache
+from core.model_scheduler import ModelRateScheduler, get_model_scheduler
+from core.token_usage import TokenUsage, record_llm_usage
+
 logger = structlog.get_logger(__name__)
 
 
+def _model_name(llm: Any) -> Optional[str]:
+    """Nombre del modelo (ChatOpenAI.model_name / ChatOllama.model)."""
+    name = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    return name if isinstance(name, str) else None
+
+
+def _with_model(llm: Any, model: str) -> Any:
+    """Copia del LLM con otro modelo (mismo cliente HTTP y parámetros)."""
+    field = "model_name" if hasattr(llm, "model_name") else "model"
+    return llm.model_copy(update={field: model})
+
+
+async def _invoke_llm(
+    llm: Any,
+    runnable: Any,
+    tools: List[BaseTool],
+    messages: List[BaseMessage],
+    cache: Optional[LLMResponseCache],
+    scheduler: Optional[ModelRateScheduler],
+) -> Tuple[BaseMessage, Optional[str], TokenUsage]:
+    """
+    Una llamada al LLM respetando el rpm_limit del modelo.
+    
+    Si la espera del modelo supera LLM_RPM_MAX_WAIT se usa el fallback que
+    elija el scheduler. El modelo y su turno se reservan juntos antes de
+    consultar el cache; si la respuesta sale del cache el turno se devuelve.
+    
+    Returns:
+        (respuesta, modelo usado, tokens de la llamada; vacío en un hit del cache)
+    
+    Raises:
+        ModelRateLimited: Ni el modelo ni un fallback tienen turno en LLM_RPM_MAX_WAIT
+    """
+    name = _model_name(llm)
+    reservation = None
+    if scheduler is not None and name is not None and scheduler.is_limited(name):
+        reservation = await scheduler.reserve(name)
+        if reservation.model != name:
+            llm = _with_model(llm, reservation.model)
+            runnable = llm.bind_tools(tools) if tools else llm
+            name = reservation.model
+    
+    provider_called = False
+    
+    async def before_invoke() -> None:
+        nonlocal provider_called
+        provider_called = True
+        if reservation is not None:
+            await scheduler.wait(reservation)
+    
+    try:
+        response = await cached_ainvoke(runnable, messages, tools, llm, cache, before_invoke)
+    finally:
+        if reservation is not None and not provider_called:
+            scheduler.release(reservation)
+    usage = TokenUsage.from_response(response, name) if provider_called else TokenUsage()
+    return response, name, usage
+
+
+async def _execute_tool_call(
+    tool_call: Dict[str, Any],
+    tools_by_name: Dict[str, BaseTool],
+    semaphores: Dict[str, asyncio.Semaphore],
+    timeout: Optional[float],
+) -> ToolMessage:
+    """
+    Ejecuta un tool call y siempre retorna un ToolMessage (nunca lanza).
+    
+    Errores, tools inexistentes y timeouts se devuelven como mensaje para
+    que el LLM pueda continuar con el resto de resultados.
+    """
+    tool_call_id = tool_call.get("id", "unknown")
+    tool = tools_by_name.get(tool_call["name"])
+    
+    if not tool:
+        logger.error(
+            "tool_not_found",
+            tool_name=tool_call["name"],
+            available_tools=list(tools_by_name),
+        )
+        return ToolMessage(
+            content=f"Error: Tool '{tool_call['name']}' not found",
+            tool_call_id=tool_call_id,
+        )
+    
+    try:
+        async with semaphores[tool.name]:
+            logger.info(
+                "executing_tool",
+                tool_name=tool.name,
+                args=tool_call["args"],
+            )
+            
+            result = await asyncio.wait_for(
+                tool.ainvoke(tool_call["args"]),
+                timeout=timeout,
+            )
+        
+        result_str = str(result)
+        
+        logger.info(
+            "tool_executed_successfully",
+            tool_name=tool.name,
+            result_length=len(result_str),
+        )
+        
+        return ToolMessage(content=result_str, tool_call_id=tool_call_id)
+    
+    except asyncio.TimeoutError:
+        logger.error(
+            "tool_execution_timeout",
+            tool_name=tool.name,
+            timeout_seconds=timeout,
+        )
+        return ToolMessage(
+            content=f"Error executing {tool.name}: timed out after {timeout}s",
+            tool_call_id=tool_call_id,
+        )
+    
+    except Exception as tool_error:
+        logger.error(
+            "tool_execution_failed",
+            tool_name=tool.name,
+            error=str(tool_error),
+        )
+        # Agregar mensaje de error pero continuar
+        return ToolMessage(
+            content=f"Error executing {tool.name}: {str(tool_error)}",
+            tool_call_id=tool_call_id,
+        )
+
+
 async def safe_agent_invoke(
     llm: Union[ChatGroq, ChatOpenAI],
     tools: List[BaseTool],
     messages: List[BaseMessage],
     max_iterations: int = 5,
+    tool_timeout: Optional[float] = None,
+    tool_concurrency: Optional[Dict[str, int]] = None,
+    cache: Optional[LLMResponseCache] = None,
+    scheduler: Optional[ModelRateScheduler] = None,
 ) -> Dict[str, Any]:
     """
     Ejecuta un agente con manejo robusto de errores de tool calling.
     
+    Los tool calls de una misma respuesta se ejecutan concurrentemente
+    (limitados por tool) y sus ToolMessages se agregan en el orden original.
+    
+    Si LLM_CACHE_BACKEND está configurado, las llamadas al LLM pasan por el
+    cache de respuestas (ver core/llm_cache.py). Las que van al proveedor se
+    admiten según el rpm_limit del modelo (ver core/model_scheduler.py) y
+    sus tokens (usage_metadata) se suman al nodo / run activos
+    (ver core/token_usage.py).
+    
     Args:
         llm: LLM configurado
         tools: Lista de herramientas disponibles
         messages: Mensajes del contexto
         max_iterations: Máximo de iteraciones tool-calling
+        tool_timeout: Timeout por tool call en segundos
+            (default: settings.AGENT_TOOL_TIMEOUT)
+        tool_concurrency: Límite de llamadas simultáneas por nombre de tool
+            (default: settings.AGENT_TOOL_MAX_CONCURRENCY para todas)
+        cache: Cache de respuestas LLM (default: get_llm_cache())
+        scheduler: Scheduler de RPM por modelo (default: get_model_scheduler())
     
     Returns:
-        Dict con 'output' y 'tool_calls'
+        Dict con 'output', 'tool_calls' y 'usage' (totales de tokens, costo
+        y créditos, con el detalle por iteración en usage['iterations'])
+    
+    Raises:
+        LLMCacheMiss: En modo replay, si una llamada no está grabada
     """
     # Bind tools al LLM
     llm_with_tools = llm.bind_tools(tools) if tools else llm
     
+    # Lookup O(1) y un semáforo por tool (compartido entre iteraciones)
+    tools_by_name = {t.name: t for t in tools}
+    tool_concurrency = tool_concurrency or {}
+    tool_semaphores = {
+        name: asyncio.Semaphore(
+            tool_concurrency.get(name, settings.AGENT_TOOL_MAX_CONCURRENCY)
+        )
+        for name in tools_by_name
+    }
+    if tool_timeout is None:
+        tool_timeout = settings.AGENT_TOOL_TIMEOUT
+    if cache is None:
+        cache = await get_llm_cache()
+    if scheduler is None:
+        scheduler = await get_model_scheduler()
+    
     current_messages = messages.copy()
     tool_calls_made = []
+    total_usage = TokenUsage()
+    usage_by_iteration: List[Dict[str, Any]] = []
+    
+    async def invoke(runnable: Any, bound_tools: List[BaseTool], iteration: int) -> BaseMessage:
+        response, model, usage = await _invoke_llm(
+            llm, runnable, bound_tools, current_messages, cache, scheduler
+        )
+        if usage.llm_calls:
+            total_usage.add(usage)
+            usage_by_iteration.append({"iteration": iteration, "model": model, **usage.to_dict()})
+            await record_llm_usage(model, usage)
+        return response
+    
+    def usage_report() -> Dict[str, Any]:
+        return {**total_usage.to_dict(), "iterations": usage_by_iteration}
     
     for iteration in range(max_iterations):
         try:
             # Invocar LLM
-            response = await llm_with_tools.ainvoke(current_messages)
+            response = await invoke(llm_with_tools, tools, iteration)
             
             # Si no hay tool calls, terminamos
             if not hasattr(response, 'tool_calls') or not response.tool_calls:
                 return {
                     "output": response.content,
                     "tool_calls": tool_calls_made,
+                    "usage": usage_report(),
                 }
             
-            # Procesar tool calls
+            # Procesar tool calls (concurrentes, resultados en el orden original)
             current_messages.append(response)
             
             for tool_call in response.tool_calls:
@@ -55,70 +248,20 @@ async def safe_agent_invoke(
                     "name": tool_call["name"],
                     "args": tool_call["args"],
                 })
-                
-                # Buscar la tool
-                tool = next((t for t in tools if t.name == tool_call["name"]), None)
-                
-                if not tool:
-                    logger.error(
-                        "tool_not_found",
-                        tool_name=tool_call["name"],
-                        available_tools=[t.name for t in tools],
-                    )
-                    # Agregar mensaje de error
-                    current_messages.append(
-                        ToolMessage(
-                            content=f"Error: Tool '{tool_call['name']}' not found",
-                            tool_call_id=tool_call.get("id", "unknown"),
-                        )
-                    )
-                    continue
-                
-                try:
-                    # Ejecutar tool
-                    logger.info(
-                        "executing_tool",
-                        tool_name=tool.name,
-                        args=tool_call["args"],
-                    )
-                    
-                    result = await tool.ainvoke(tool_call["args"])
-                    
-                    # Convertir resultado a string si es necesario
-                    if isinstance(result, dict):
-                        result_str = str(result)
-                    elif isinstance(result, list):
-                        result_str = str(result)
-                    else:
-                        result_str = str(result)
-                    
-                    # Agregar resultado
-                    current_messages.append(
-                        ToolMessage(
-                            content=result_str,
-                            tool_call_id=tool_call.get("id", "unknown"),
-                        )
-                    )
-                    
-                    logger.info(
-                        "tool_executed_successfully",
-                        tool_name=tool.name,
-                        result_length=len(result_str),
-                    )
-                    
-                except Exception as tool_error:
-                    logger.error(
-                        "tool_execution_failed",
-                        tool_name=tool.name,
-                        error=str(tool_error),
-                    )
-                    # Agregar mensaje de error pero continuar
-                    current_messages.append(
-                        ToolMessage(
-                            content=f"Error executing {tool.name}: {str(tool_error)}",
-                            tool_call_id=tool_call.get("id", "unknown"),
-                        )
-                    )
+            
+            tool_messages = await asyncio.gather(*[
+                _execute_tool_call(
+                    tool_call,
+                    tools_by_name,
+                    tool_semaphores,
+                    tool_timeout,
+                )
+                for tool_call in response.tool_calls
+            ])
+            current_messages.extend(tool_messages)
+        
+        except LLMCacheMiss:
+            raise
         
         except Exception as e:
             error_msg = str(e)
@@ -132,16 +275,20 @@ async def safe_agent_invoke(
             if "tool" in error_msg.lower() or "function" in error_msg.lower():
                 # Reintentar sin tools
                 try:
-                    response = await llm.ainvoke(current_messages)
+                    response = await invoke(llm, [], iteration)
                     return {
                         "output": response.content,
                         "tool_calls": tool_calls_made,
+                        "usage": usage_report(),
                         "error": f"Tool calling failed, completed without tools: {error_msg}",
                     }
+                except LLMCacheMiss:
+                    raise
                 except Exception as retry_error:
                     return {
                         "output": f"[Agent failed after {iteration} iterations]",
                         "tool_calls": tool_calls_made,
+                        "usage": usage_report(),
                         "error": str(retry_error),
                     }
             
@@ -149,6 +296,7 @@ async def safe_agent_invoke(
             return {
                 "output": f"[Agent failed: {error_msg}]",
                 "tool_calls": tool_calls_made,
+                "usage": usage_report(),
                 "error": error_msg,
             }
     
@@ -161,15 +309,19 @@ async def safe_agent_invoke(
     
     # Hacer una última llamada sin tools para obtener respuesta
     try:
-        final_response = await llm.ainvoke(current_messages)
+        final_response = await invoke(llm, [], max_iterations)
         return {
             "output": final_response.content,
             "tool_calls": tool_calls_made,
+            "usage": usage_report(),
             "warning": f"Max iterations ({max_iterations}) reached",
         }
+    except LLMCacheMiss:
+        raise
     except Exception as e:
         return {
             "output": "[Max iterations reached, no final response]",
             "tool_calls": tool_calls_made,
+            "usage": usage_report(),
             "error": str(e),
         }
@@ -10,8 +10,31 @@ Funcionalidades:
 - Fallback automático a modelos más baratos
 - Alerting cuando se acerca al límite (80% = 240 créditos)
 - Integración con Supabase para persistencia
+
+Contabilidad atómica:
+- record_usage hace un solo round-trip a Redis (script Lua): incrementa
+  créditos y el contador del modelo, inicializa el período, renueva el TTL
+  y retorna los totales nuevos. Es atómico entre procesos/workers, sin
+  locks en proceso.
+- El usage_log en Supabase se escribe por lotes en background
+  (core/usage_log.py): no agrega latencia a la invocación del modelo.
+  close() drena los eventos pendientes.
+- record_usage acepta los tokens de entrada/salida de la llamada: se
+  acumulan en el hash (input_tokens / output_tokens) y van en el metadata
+  del usage_log (ver core/token_usage.py).
+
+Snapshot del estado:
+- can_use_model / get_fallback_model / get_remaining_credits leen un
+  BudgetStatus en memoria. Durante BUDGET_STATUS_CACHE_TTL segundos no
+  hay round-trips; después, un HGET del campo "version" del hash (que el
+  script de record_usage incrementa) decide si el snapshot sigue válido
+  o hay que recargarlo (otro worker registró uso).
+- El record_usage de este proceso reemplaza el snapshot con los totales
+  que retorna el script.
 """
 import asyncio
+import time
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, Literal, Optional, Any
 from dataclasses import dataclass, field
@@ -27,9 +50,28 @@ print("WARNING: Supabase deshabilitado temporalmente")
 print("INFO: Usando solo Redis para almacenamiento")
 
 from config.settings import settings
+from core.usage_log import UsageLogWriter
 
 logger = structlog.get_logger()
 
+# Hash de Redis con el estado del período actual
+BUDGET_KEY = "budget:current"
+BUDGET_KEY_TTL = 30 * 24 * 60 * 60  # 30 días
+
+# Incremento atómico del uso en un round-trip; retorna el hash actualizado
+# (HGETALL). credits_limit y period_start solo se fijan al crear el hash.
+_RECORD_USAGE_LUA = """
+redis.call('HINCRBYFLOAT', KEYS[1], 'credits_used', ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'model:' .. ARGV[2], 1)
+redis.call('HINCRBY', KEYS[1], 'input_tokens', ARGV[6])
+redis.call('HINCRBY', KEYS[1], 'output_tokens', ARGV[7])
+redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('HSETNX', KEYS[1], 'credits_limit', ARGV[3])
+redis.call('HSETNX', KEYS[1], 'period_start', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return redis.call('HGETALL', KEYS[1])
+"""
+
 
 ModelType = Literal[
     "gpt-5",
@@ -51,12 +93,27 @@ class ModelCost:
     is_free: bool = False
     fallback_model: Optional[ModelType] = None
     
+    # Endpoint que sirve el modelo: un fallback del scheduler reusa el
+    # cliente del modelo pedido, así que solo puede ser del mismo provider
+    provider: str = "github"
+    
     # Rate limits (requests per minute)
     rpm_limit: int = 60
     
+    # Precio por token (USD por millón) para modelos de pago directo
+    input_usd_per_million: float = 0.0
+    output_usd_per_million: float = 0.0
+    
     # Características
     context_window: int = 128_000
     best_for: str = ""
+    
+    def cost_usd(self, input_tokens: int, output_tokens: int) -> float:
+        """Costo en USD de una llamada según sus tokens."""
+        return (
+            input_tokens * self.input_usd_per_million
+            + output_tokens * self.output_usd_per_million
+        ) / 1_000_000
 
 
 # Configuración de modelos (fuente: docs/03_PROJECT_SPEC.md)
@@ -81,6 +138,7 @@ MODEL_COSTS: Dict[ModelType, ModelCost] = {
         name="claude-sonnet-4.5",
         credits_per_request=1.0,
         fallback_model="claude-haiku-4.5",
+        provider="anthropic",
         rpm_limit=50,
         context_window=200_000,
         best_for="architecture, complex reasoning",
@@ -89,6 +147,7 @@ MODEL_COSTS: Dict[ModelType, ModelCost] = {
         name="claude-haiku-4.5",
         credits_per_request=0.33,
         fallback_model="gpt-4o",
+        provider="anthropic",
         rpm_limit=100,
         context_window=200_000,
         best_for="fast tasks, cost-sensitive",
@@ -97,6 +156,7 @@ MODEL_COSTS: Dict[ModelType, ModelCost] = {
         name="gemini-2.5-pro",
         credits_per_request=0.0,
         is_free=True,
+        provider="google",
         rpm_limit=15,  # 1500 req/día = ~15 req/min
         context_window=1_000_000,
         best_for="large context, niche analysis",
@@ -105,7 +165,10 @@ MODEL_COSTS: Dict[ModelType, ModelCost] = {
         name="deepseek-v3",
         credits_per_request=0.0,  # Pago directo ($0.27/M), no créditos
         is_free=False,  # Pago pero no usa créditos Copilot
+        provider="deepseek",
         rpm_limit=60,
+        input_usd_per_million=0.27,
+        output_usd_per_million=1.10,
         context_window=64_000,
         best_for="code generation, technical architecture",
     ),
@@ -113,6 +176,7 @@ MODEL_COSTS: Dict[ModelType, ModelCost] = {
         name="minimax-m2",
         credits_per_request=0.0,
         is_free=True,  # Beta gratuita
+        provider="minimax",
         rpm_limit=30,
         context_window=128_000,
         best_for="academic analysis, literature review",
@@ -132,6 +196,10 @@ class BudgetStatus:
     # Contadores por modelo
     requests_by_model: Dict[ModelType, int] = field(default_factory=dict)
     
+    # Tokens del período (llamadas registradas con record_usage)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    
     # Alertas
     alert_triggered: bool = False
     alert_threshold: float = 0.80  # 80% = 240 credits
@@ -140,6 +208,9 @@ class BudgetStatus:
     period_start: datetime = field(default_factory=datetime.now)
     period_end: datetime = field(init=False)
     
+    # Versión del hash en Redis (la incrementa cada record_usage)
+    version: int = 0
+    
     def __post_init__(self):
         self.credits_remaining = self.credits_limit - self.credits_used
         self.usage_percentage = (self.credits_used / self.credits_limit) * 100
@@ -161,6 +232,8 @@ class BudgetStatus:
             "credits_remaining": self.credits_remaining,
             "usage_percentage": self.usage_percentage,
             "requests_by_model": self.requests_by_model,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
             "alert_triggered": self.alert_triggered,
             "period_start": self.period_start.isoformat(),
             "period_end": self.period_end.isoformat(),
@@ -223,10 +296,20 @@ class BudgetManager:
         self.monthly_limit = monthly_limit
         self.models = MODEL_COSTS  # Diccionario de configuraciones de modelos
         
-        # Locks para evitar race conditions
-        self._locks: Dict[ModelType, asyncio.Lock] = {
-            model: asyncio.Lock() for model in MODEL_COSTS.keys()
-        }
+        # Script Lua de record_usage (atómico entre procesos)
+        self._record_script = (
+            redis_client.register_script(_RECORD_USAGE_LUA) if redis_client else None
+        )
+        
+        # Write-behind del usage_log (se crea con el primer evento)
+        self.usage_log: Optional[UsageLogWriter] = None
+        
+        # Snapshot del estado (ver _load_status)
+        self.status_cache_ttl = settings.BUDGET_STATUS_CACHE_TTL
+        self._snapshot: Optional[BudgetStatus] = None
+        self._snapshot_expires = 0.0
+        self._snapshot_lock = asyncio.Lock()
+        self.snapshot_stats: Counter = Counter()
     
     async def initialize(self) -> None:
         """Inicializa el budget manager."""
@@ -280,6 +363,8 @@ class BudgetManager:
         model: ModelType,
         credits_used: Optional[float] = None,
         metadata: Optional[dict] = None,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
     ) -> BudgetStatus:
         """
         Registra el uso de un modelo.
@@ -288,36 +373,54 @@ class BudgetManager:
             model: Modelo utilizado
             credits_used: Créditos consumidos (default: cost del modelo)
             metadata: Datos adicionales (agent_name, task_id, etc.)
+            input_tokens: Tokens del prompt (usage_metadata de la respuesta)
+            output_tokens: Tokens generados
         
         Returns:
             Estado actualizado del presupuesto
         """
-        async with self._locks[model]:
-            cost = credits_used or MODEL_COSTS[model].credits_per_request
-            
-            # Actualizar Redis (cache rápido)
-            await self._increment_usage(model, cost)
-            
-            # Actualizar Supabase (persistencia)
-            await self._persist_usage(model, cost, metadata)
-            
-            # Cargar estado actualizado
+        cost = credits_used or MODEL_COSTS[model].credits_per_request
+        
+        # Actualizar Redis y leer los totales nuevos (1 round-trip atómico)
+        status = await self._increment_usage(model, cost, input_tokens, output_tokens)
+        if status is not None:
+            self._set_snapshot(status)
+        else:
+            self._invalidate_snapshot()
             status = await self._load_status()
-            
-            # Log y alertas
-            self.logger.info(
-                "model_usage_recorded",
-                model=model,
-                credits=cost,
-                remaining=status.credits_remaining,
-                usage_pct=f"{status.usage_percentage:.1f}%",
+        
+        # Actualizar Supabase (persistencia, por lotes en background)
+        metadata = dict(metadata or {})
+        if input_tokens or output_tokens:
+            metadata.update(
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost_usd=MODEL_COSTS[model].cost_usd(input_tokens, output_tokens),
             )
-            
-            if status.alert_triggered and not status.alert_triggered:
-                # Primera vez que se cruza el threshold
-                await self._send_alert(status)
-            
-            return status
+        self._log_usage({
+            "model": model,
+            "credits_used": cost,
+            "timestamp": datetime.now().isoformat(),
+            "metadata": metadata,
+        })
+        
+        # Log y alertas
+        self.logger.info(
+            "model_usage_recorded",
+            model=model,
+            credits=cost,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            remaining=status.credits_remaining,
+            usage_pct=f"{status.usage_percentage:.1f}%",
+        )
+        
+        threshold = status.alert_threshold * status.credits_limit
+        if status.credits_used >= threshold > status.credits_used - cost:
+            # Este request cruzó el threshold
+            await self._send_alert(status)
+        
+        return status
     
     async def get_fallback_model(self, model: ModelType) -> ModelType:
         """
@@ -413,11 +516,62 @@ class BudgetManager:
             "projected_end_of_month_usage": self._project_usage(status),
         }
     
+    async def close(self) -> None:
+        """Drena el usage_log pendiente a Supabase (llamar al apagar)."""
+        if self.usage_log is not None:
+            await self.usage_log.close()
+    
     # ============================================================
     # MÉTODOS PRIVADOS
     # ============================================================
     
     async def _load_status(self) -> BudgetStatus:
+        """
+        Estado desde el snapshot en memoria, o recargado si cambió.
+        
+        El snapshot se sirve sin round-trips durante status_cache_ttl; al
+        vencer, se compara su versión con la del hash en Redis.
+        """
+        if self._snapshot is not None and time.monotonic() < self._snapshot_expires:
+            self.snapshot_stats["hits"] += 1
+            return self._snapshot
+        
+        async with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() < self._snapshot_expires:
+                self.snapshot_stats["hits"] += 1
+                return snapshot
+            
+            if snapshot is not None and self.redis:
+                version = await self._read_version()
+                if version is not None and version == snapshot.version:
+                    self.snapshot_stats["revalidated"] += 1
+                    self._set_snapshot(snapshot)
+                    return snapshot
+            
+            self.snapshot_stats["reloads"] += 1
+            status = await self._fetch_status()
+            self._set_snapshot(status)
+            return status
+    
+    def _set_snapshot(self, status: BudgetStatus) -> None:
+        self._snapshot = status
+        self._snapshot_expires = time.monotonic() + self.status_cache_ttl
+    
+    def _invalidate_snapshot(self) -> None:
+        self._snapshot = None
+        self._snapshot_expires = 0.0
+    
+    async def _read_version(self) -> Optional[int]:
+        """Versión actual del hash (0 si no existe), o None si Redis falló."""
+        try:
+            version = await self.redis.hget(BUDGET_KEY, "version")
+            return int(version or 0)
+        except Exception as e:
+            self.logger.error("redis_version_error", error=str(e))
+            return None
+    
+    async def _fetch_status(self) -> BudgetStatus:
         """Carga estado desde Redis (cache) o Supabase (source of truth)."""
         # Intentar Redis primero
         if self.redis:
@@ -434,23 +588,39 @@ class BudgetManager:
             return None
         
         try:
-            data = await self.redis.hgetall("budget:current")
+            data = await self.redis.hgetall(BUDGET_KEY)
             
             if not data:
                 return None
             
-            return BudgetStatus(
-                credits_used=float(data.get("credits_used", 0)),
-                credits_limit=int(data.get("credits_limit", 300)),
-                requests_by_model=eval(data.get("requests_by_model", "{}")),
-                period_start=datetime.fromisoformat(
-                    data.get("period_start", datetime.now().isoformat())
-                ),
-            )
+            return self._status_from_hash(data)
         except Exception as e:
             self.logger.error("redis_load_error", error=str(e))
             return None
     
+    def _status_from_hash(self, data: Dict[Any, Any]) -> BudgetStatus:
+        """BudgetStatus desde el hash de Redis (campos model:<nombre> = requests)."""
+        data = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in data.items()
+        }
+        requests_by_model = {
+            field[len("model:"):]: int(value)
+            for field, value in data.items()
+            if field.startswith("model:")
+        }
+        return BudgetStatus(
+            credits_used=float(data.get("credits_used", 0)),
+            credits_limit=int(float(data.get("credits_limit", self.monthly_limit))),
+            requests_by_model=requests_by_model,
+            input_tokens=int(data.get("input_tokens", 0)),
+            output_tokens=int(data.get("output_tokens", 0)),
+            period_start=datetime.fromisoformat(
+                data.get("period_start", datetime.now().isoformat())
+            ),
+            version=int(data.get("version", 0)),
+        )
+    
     async def _load_from_supabase(self) -> BudgetStatus:
         """Carga estado desde Supabase."""
         if not self.supabase:
@@ -485,56 +655,53 @@ class BudgetManager:
             # Fallback to default
             return BudgetStatus()
     
-    async def _increment_usage(self, model: ModelType, credits: float) -> None:
-        """Incrementa el uso en Redis."""
-        if not self.redis:
-            return
+    async def _increment_usage(
+        self,
+        model: ModelType,
+        credits: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> Optional[BudgetStatus]:
+        """
+        Incrementa el uso en Redis (script Lua, 1 round-trip).
+        
+        Returns:
+            Estado con los totales nuevos, o None sin Redis / si falló
+        """
+        if not self._record_script:
+            return None
+        
+        period_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
         try:
-            # Incrementar créditos totales
-            await self.redis.hincrbyfloat("budget:current", "credits_used", credits)
-            
-            # Incrementar contador del modelo
-            await self.redis.hincrby(
-                "budget:current",
-                f"model:{model}",
-                1
+            flat = await self._record_script(
+                keys=[BUDGET_KEY],
+                args=[
+                    credits, model, int(self.monthly_limit), period_start.isoformat(),
+                    BUDGET_KEY_TTL, int(input_tokens), int(output_tokens),
+                ],
             )
-            
-            # Set expiry (30 días)
-            await self.redis.expire("budget:current", 30 * 24 * 60 * 60)
+            return self._status_from_hash(dict(zip(flat[::2], flat[1::2])))
         
         except Exception as e:
             self.logger.error("redis_increment_error", error=str(e))
+            return None
     
-    async def _persist_usage(
-        self,
-        model: ModelType,
-        credits: float,
-        metadata: Optional[dict],
-    ) -> None:
-        """Persiste el uso en Supabase."""
+    def _log_usage(self, data: dict) -> None:
+        """Encola el evento para el usage_log en Supabase."""
         if not self.supabase:
             # Si Supabase no está disponible, simplemente retornar
             return
         
-        try:
-            data = {
-                "model": model,
-                "credits_used": credits,
-                "timestamp": datetime.now().isoformat(),
-                "metadata": metadata or {},
-            }
-            
-            self.supabase.table("usage_log").insert(data).execute()
-        
-        except Exception as e:
-            self.logger.error("supabase_persist_error", error=str(e))
+        if self.usage_log is None:
+            self.usage_log = UsageLogWriter(self.supabase)
+        self.usage_log.add(data)
     
     async def _reset_period(self) -> None:
         """Resetea el presupuesto para un nuevo período."""
+        self._invalidate_snapshot()
         if self.redis:
-            await self.redis.delete("budget:current")
+            await self.redis.delete(BUDGET_KEY)
         
         # Crear nuevo registro en Supabase solo si está disponible
         if not self.supabase:
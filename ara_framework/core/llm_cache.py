@@ -0,0 +1,375 @@
+"""
+LLM Response Cache - Cache persistente de respuestas para safe_agent_invoke.
+
+GitHub Models limita a 50 requests/día: re-ejecutar el mismo nicho o
+reintentar un nodo tras un fallo posterior gasta cuota en llamadas idénticas.
+
+Este módulo cachea la respuesta (AIMessage, incluidos tool_calls) de cada
+llamada al LLM:
+- Key: hash canónico de mensajes + schema de tools + modelo + temperatura
+- Backends: Redis (REDIS_URL) o archivo SQLite local
+- TTL y evicción por tamaño (se eliminan las entradas más antiguas)
+- Modo "replay": solo lectura, un miss lanza LLMCacheMiss (benchmarks
+  deterministas sin llamar a la API)
+
+Es opt-in: LLM_CACHE_BACKEND="none" (default) deshabilita el cache.
+
+Usage:
+    ```python
+    from core.llm_cache import get_llm_cache, make_cache_key
+
+    cache = await get_llm_cache()
+    key = make_cache_key(messages, tools, llm)
+    response = await cache.get(key)
+    if response is None:
+        response = await llm.ainvoke(messages)
+        await cache.set(key, response)
+    ```
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+import structlog
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from redis.asyncio import Redis
+
+from config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# Versión del formato de key: cambiarla invalida todo el cache
+CACHE_KEY_VERSION = "v1"
+
+
+class LLMCacheMiss(Exception):
+    """Miss en modo replay: la llamada no está grabada en el cache."""
+
+
+# =============================================================================
+# Key canónica
+# =============================================================================
+
+def _canonical_message(message: BaseMessage) -> dict:
+    """Campos que determinan la respuesta del LLM (sin IDs ni metadata)."""
+    data = {"type": message.type, "content": message.content}
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        data["tool_calls"] = [
+            {"name": tc["name"], "args": tc["args"], "id": tc.get("id")}
+            for tc in tool_calls
+        ]
+    tool_call_id = getattr(message, "tool_call_id", None)
+    if tool_call_id:
+        data["tool_call_id"] = tool_call_id
+    return data
+
+
+def _llm_identity(llm: Any) -> dict:
+    """Modelo y temperatura del LLM (ChatOpenAI usa model_name, ChatOllama model)."""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    temperature = getattr(llm, "temperature", None)
+    return {
+        "class": type(llm).__name__,
+        "model": str(model),
+        "temperature": temperature if isinstance(temperature, (int, float)) else None,
+    }
+
+
+def make_cache_key(
+    messages: Sequence[BaseMessage],
+    tools: Sequence[BaseTool],
+    llm: Any,
+) -> str:
+    """
+    Genera la key canónica de una llamada al LLM.
+
+    Args:
+        messages: Mensajes enviados al LLM
+        tools: Tools enlazadas (su schema forma parte de la key)
+        llm: LLM base (se usan modelo y temperatura)
+
+    Returns:
+        Hash SHA-256 hex
+    """
+    payload = {
+        "version": CACHE_KEY_VERSION,
+        "llm": _llm_identity(llm),
+        "tools": [convert_to_openai_tool(t) for t in tools],
+        "messages": [_canonical_message(m) for m in messages],
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _dump(message: BaseMessage) -> str:
+    return json.dumps(messages_to_dict([message])[0], default=str)
+
+
+def _load(raw: str) -> BaseMessage:
+    return messages_from_dict([json.loads(raw)])[0]
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+class LLMResponseCache(ABC):
+    """Interfaz común de los backends (get/set de AIMessage por key)."""
+
+    backend = "base"
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        mode: Optional[str] = None,
+    ):
+        self.ttl = ttl if ttl is not None else settings.LLM_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else settings.LLM_CACHE_MAX_ENTRIES
+        self.mode = mode or settings.LLM_CACHE_MODE
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    async def get(self, key: str) -> Optional[BaseMessage]:
+        """Retorna la respuesta cacheada o None (nunca lanza)."""
+        try:
+            raw = await self._get(key)
+        except Exception as e:
+            logger.error("llm_cache_get_error", backend=self.backend, error=str(e))
+            raw = None
+
+        if raw is None:
+            self.misses += 1
+            logger.debug("llm_cache_miss", backend=self.backend, key=key[:16])
+            return None
+
+        self.hits += 1
+        logger.info("llm_cache_hit", backend=self.backend, key=key[:16])
+        return _load(raw)
+
+    async def set(self, key: str, response: BaseMessage) -> None:
+        """Guarda la respuesta (no-op en modo replay, nunca lanza)."""
+        if self.replay:
+            return
+        try:
+            await self._set(key, _dump(response))
+        except Exception as e:
+            logger.error("llm_cache_set_error", backend=self.backend, error=str(e))
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[str]:
+        """Retorna la respuesta serializada o None."""
+
+    @abstractmethod
+    async def _set(self, key: str, value: str) -> None:
+        """Guarda la respuesta serializada."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Borra todas las entradas del backend."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Cierra la conexión del backend."""
+
+
+class RedisLLMCache(LLMResponseCache):
+    """
+    Backend Redis.
+
+    Cada respuesta se guarda con SETEX (TTL) y su timestamp en un sorted set
+    índice; al superar max_entries se eliminan las más antiguas.
+    """
+
+    backend = "redis"
+
+    def __init__(self, redis_client: Redis, prefix: str = "llm_cache", **kwargs):
+        super().__init__(**kwargs)
+        self.redis = redis_client
+        self.prefix = prefix
+        self.index_key = f"{prefix}:index"
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def _get(self, key: str) -> Optional[str]:
+        return await self.redis.get(self._key(key))
+
+    async def _set(self, key: str, value: str) -> None:
+        pipe = self.redis.pipeline()
+        pipe.setex(self._key(key), self.ttl, value)
+        pipe.zadd(self.index_key, {key: time.time()})
+        pipe.zcard(self.index_key)
+        results = await pipe.execute()
+
+        # Entradas expiradas por TTL también se purgan del índice aquí
+        overflow = results[-1] - self.max_entries
+        if overflow > 0:
+            evicted = await self.redis.zpopmin(self.index_key, overflow)
+            if evicted:
+                await self.redis.delete(*[self._key(k) for k, _ in evicted])
+                logger.info("llm_cache_evicted", backend=self.backend, count=len(evicted))
+
+    async def clear(self) -> None:
+        keys = await self.redis.zrange(self.index_key, 0, -1)
+        if keys:
+            await self.redis.delete(*[self._key(k) for k in keys])
+        await self.redis.delete(self.index_key)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+class SQLiteLLMCache(LLMResponseCache):
+    """
+    Backend SQLite (archivo local, sin servicios externos).
+
+    Las operaciones se ejecutan en un thread para no bloquear el event loop.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path or settings.LLM_CACHE_SQLITE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = asyncio.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache (created_at)"
+        )
+        self._conn.commit()
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT value FROM llm_cache WHERE key = ? AND created_at >= ?",
+            (key, time.time() - self.ttl),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_sync(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, now),
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    async def _get(self, key: str) -> Optional[str]:
+        async with self._lock:
+            return await asyncio.to_thread(self._get_sync, key)
+
+    async def _set(self, key: str, value: str) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._set_sync, key, value)
+
+    async def clear(self) -> None:
+        async with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM llm_cache")
+
+    async def close(self) -> None:
+        self._conn.close()
+
+
+# Singleton instance
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+async def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Factory function para obtener el cache singleton.
+
+    Returns:
+        Cache configurado, o None si LLM_CACHE_BACKEND="none"
+    """
+    global _llm_cache
+
+    if settings.LLM_CACHE_BACKEND == "none":
+        return None
+
+    if _llm_cache is None:
+        if settings.LLM_CACHE_BACKEND == "redis":
+            from redis.asyncio import from_url
+
+            redis_client = await from_url(
+                settings.REDIS_URL,
+                **settings.redis_client_kwargs
+            )
+            _llm_cache = RedisLLMCache(redis_client)
+        else:
+            _llm_cache = SQLiteLLMCache()
+
+        logger.info(
+            "llm_cache_initialized",
+            backend=_llm_cache.backend,
+            mode=_llm_cache.mode,
+            ttl=_llm_cache.ttl,
+        )
+
+    return _llm_cache
+
+
+async def cached_ainvoke(
+    runnable: Any,
+    messages: List[BaseMessage],
+    tools: Sequence[BaseTool],
+    llm: Any,
+    cache: Optional[LLMResponseCache],
+    before_invoke: Optional[Callable[[], Awaitable[Any]]] = None,
+) -> BaseMessage:
+    """
+    Invoca el LLM pasando por el cache.
+
+    Args:
+        runnable: LLM a invocar (con o sin tools enlazadas)
+        messages: Mensajes de la llamada
+        tools: Tools enlazadas en `runnable` (parte de la key)
+        llm: LLM base (modelo/temperatura para la key)
+        cache: Cache a usar (None = llamada directa)
+        before_invoke: Se espera antes de llamar al proveedor (no en un
+            hit del cache), ej: el turno del scheduler de RPM
+
+    Raises:
+        LLMCacheMiss: En modo replay si la llamada no está grabada
+    """
+    if cache is None:
+        if before_invoke is not None:
+            await before_invoke()
+        return await runnable.ainvoke(messages)
+
+    key = make_cache_key(messages, tools, llm)
+    response = await cache.get(key)
+    if response is not None:
+        return response
+
+    if cache.replay:
+        raise LLMCacheMiss(f"No recorded LLM response for key {key[:16]}")
+
+    if before_invoke is not None:
+        await before_invoke()
+    response = await runnable.ainvoke(messages)
+    await cache.set(key, response)
+    return response
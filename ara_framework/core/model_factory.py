@@ -3,10 +3,21 @@ Model Factory - Create LLM instances for different providers.
 
 This module centralizes LLM creation logic to make it easy to switch
 between providers (GitHub Models, Ollama, Groq, etc.) for testing and production.
+
+Client pooling:
+    `create_model` returns instances from a process-wide registry keyed by
+    (provider, model, parameters). GitHub Models clients share one keep-alive
+    httpx pool per base URL, so graph nodes and tool iterations reuse open
+    TLS connections instead of building a new client each time.
+    Call `warmup_models()` at startup and `close_models()` on shutdown.
 """
 
+import asyncio
+import os
+import threading
+import httpx
 import structlog
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Dict, Tuple, Any
 from langchain_core.language_models import BaseChatModel
 from langchain_core.tools import BaseTool
 from langchain_openai import ChatOpenAI
@@ -17,9 +28,69 @@ from config.settings import settings
 logger = structlog.get_logger(__name__)
 
 
+# =============================================================================
+# Client Registry (process-wide)
+# =============================================================================
+
+_registry_lock = threading.Lock()
+_model_registry: Dict[Tuple[Any, ...], BaseChatModel] = {}
+_http_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+
+# Temperature of the research graph agents (part of the registry key)
+AGENT_TEMPERATURE = 0.7
+
+
+def agent_model_spec() -> Dict[str, Any]:
+    """
+    create_model kwargs used by every research graph agent.
+    
+    USE_OLLAMA=true switches the agents to local Ollama (mistral:7b).
+    warmup_models() warms this spec by default, so the graph reuses the
+    warmed registry entry.
+    """
+    use_ollama = os.getenv("USE_OLLAMA", "false").lower() == "true"
+    return {
+        "provider": "ollama" if use_ollama else "github",
+        "model": "mistral:7b" if use_ollama else settings.GITHUB_MODEL,
+        "temperature": AGENT_TEMPERATURE,
+    }
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_http_clients(base_url: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Get the shared (sync, async) keep-alive httpx clients for a base URL.
+    
+    Note:
+        The async client is bound to the event loop that first uses it.
+        Long-lived processes (API server, pipeline) run a single loop; code
+        that calls asyncio.run() repeatedly should call close_models() in
+        between.
+    """
+    with _registry_lock:
+        clients = _http_clients.get(base_url)
+        if clients is None:
+            timeout = httpx.Timeout(settings.LLM_HTTP_TIMEOUT, connect=10.0)
+            clients = (
+                httpx.Client(limits=_http_limits(), timeout=timeout),
+                httpx.AsyncClient(limits=_http_limits(), timeout=timeout),
+            )
+            _http_clients[base_url] = clients
+            logger.info("llm_http_pool_created", base_url=base_url)
+        return clients
+
+
 def create_github_model(
     model: Optional[str] = None,
     temperature: float = 0.7,
+    shared_http: bool = True,
 ) -> ChatOpenAI:
     """
     Create a ChatOpenAI instance configured for GitHub Models.
@@ -27,6 +98,7 @@ def create_github_model(
     Args:
         model: Model name (default: settings.GITHUB_MODEL)
         temperature: Temperature for sampling (default: 0.7)
+        shared_http: Use the shared keep-alive httpx pool for the base URL
     
     Returns:
         Configured ChatOpenAI instance
@@ -34,11 +106,20 @@ def create_github_model(
     Example:
         >>> llm = create_github_model(model="gpt-4o", temperature=0.7)
     """
+    http_kwargs = {}
+    if shared_http:
+        http_client, http_async_client = get_http_clients(settings.GITHUB_MODELS_BASE_URL)
+        http_kwargs = {
+            "http_client": http_client,
+            "http_async_client": http_async_client,
+        }
+    
     return ChatOpenAI(
         model=model or settings.GITHUB_MODEL,
         temperature=temperature,
         api_key=settings.GITHUB_TOKEN,
         base_url=settings.GITHUB_MODELS_BASE_URL,
+        **http_kwargs,
     )
 
 
@@ -84,19 +165,46 @@ def create_ollama_model(
     )
 
 
+def _build_model(
+    provider: str,
+    model: Optional[str],
+    temperature: float,
+    **kwargs,
+) -> BaseChatModel:
+    """Build a new (unregistered) LLM instance."""
+    if provider == "github":
+        return create_github_model(model=model, temperature=temperature)
+    elif provider == "ollama":
+        return create_ollama_model(
+            model=model,
+            temperature=temperature,
+            num_ctx=kwargs.get("num_ctx"),
+        )
+    else:
+        raise ValueError(f"Unsupported provider: {provider}")
+
+
 def create_model(
     provider: Literal["github", "ollama"] = "github",
     model: Optional[str] = None,
     temperature: float = 0.7,
+    reuse: bool = True,
     **kwargs,
 ) -> BaseChatModel:
     """
     Universal model factory - create LLM for any provider.
     
+    Instances are cached in a process-wide registry keyed by provider, model
+    and parameters, so repeated calls (one per graph node) return the same
+    client and its open connections. Chat models are stateless between
+    calls; `bind_tools` returns a new runnable and leaves the shared
+    instance untouched.
+    
     Args:
         provider: Provider name ("github" or "ollama")
         model: Model name (provider-specific)
         temperature: Temperature for sampling
+        reuse: Return the registry instance (False = always build a new one)
         **kwargs: Additional provider-specific arguments
     
     Returns:
@@ -112,16 +220,89 @@ def create_model(
     Raises:
         ValueError: If provider is not supported
     """
-    if provider == "github":
-        return create_github_model(model=model, temperature=temperature)
-    elif provider == "ollama":
-        return create_ollama_model(
-            model=model,
-            temperature=temperature,
-            num_ctx=kwargs.get("num_ctx"),
-        )
-    else:
-        raise ValueError(f"Unsupported provider: {provider}")
+    if not reuse:
+        return _build_model(provider, model, temperature, **kwargs)
+    
+    key = (provider, model, temperature, tuple(sorted(kwargs.items())))
+    
+    with _registry_lock:
+        llm = _model_registry.get(key)
+    if llm is not None:
+        return llm
+    
+    llm = _build_model(provider, model, temperature, **kwargs)
+    
+    with _registry_lock:
+        # Another thread may have registered it meanwhile - keep the first one
+        llm = _model_registry.setdefault(key, llm)
+    
+    logger.info(
+        "llm_client_registered",
+        provider=provider,
+        model=model,
+        registry_size=len(_model_registry),
+    )
+    return llm
+
+
+async def warmup_models(
+    specs: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, bool]:
+    """
+    Pre-create registry clients and open their connections.
+    
+    Only opens the HTTP connection (TLS handshake + keep-alive); it does not
+    send a completion request, so it does not spend model quota.
+    
+    Args:
+        specs: create_model kwargs for each client to warm up
+            (default: agent_model_spec(), the spec of the research graph agents)
+    
+    Returns:
+        Dict of {"provider:model": reachable}
+    
+    Example:
+        >>> await warmup_models([{"provider": "github", "model": "gpt-4o"}])
+    """
+    if specs is None:
+        specs = [agent_model_spec()]
+    
+    async def _warm(spec: Dict[str, Any]) -> Tuple[str, bool]:
+        provider = spec.get("provider", "github")
+        name = f"{provider}:{spec.get('model')}"
+        try:
+            create_model(**spec)
+            if provider == "github":
+                _, client = get_http_clients(settings.GITHUB_MODELS_BASE_URL)
+                await client.head(settings.GITHUB_MODELS_BASE_URL)
+            elif provider == "ollama":
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    await client.get(settings.OLLAMA_BASE_URL)
+            return name, True
+        except Exception as e:
+            logger.warning("llm_warmup_failed", client=name, error=str(e))
+            return name, False
+    
+    results = dict(await asyncio.gather(*[_warm(spec) for spec in specs]))
+    logger.info("llm_warmup_completed", results=results)
+    return results
+
+
+async def close_models() -> None:
+    """Close the shared HTTP pools and clear the client registry."""
+    with _registry_lock:
+        clients = list(_http_clients.values())
+        _http_clients.clear()
+        _model_registry.clear()
+    
+    for sync_client, async_client in clients:
+        try:
+            await async_client.aclose()
+        except Exception as e:
+            logger.warning("llm_http_pool_close_failed", error=str(e))
+        sync_client.close()
+    
+    logger.info("llm_clients_closed", pools=len(clients))
 
 
 def bind_tools_safe(
@@ -166,6 +347,9 @@ def verify_model_availability(
     """
     Verify that a model is available and working.
     
+    Uses the pooled registry client, so a successful check also leaves a
+    warm connection for the first real request.
+    
     Args:
         provider: Provider name
         model: Model name
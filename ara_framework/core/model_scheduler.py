@@ -0,0 +1,279 @@
+"""
+Scheduler de requests por modelo (ventana deslizante de 60 segundos).
+
+MODEL_COSTS declara rpm_limit por modelo (gpt-5: 50, gemini-2.5-pro: 15,
+minimax-m2: 30, ...) pero nada lo hacía cumplir: los agentes llamaban
+hasta recibir un 429 del proveedor, y cada 429 costaba un ciclo de
+safe_agent_invoke más los tokens del prompt.
+
+ModelRateScheduler guarda por modelo los instantes de admisión de los
+últimos 60 segundos (incluidos los turnos ya reservados a futuro):
+- reserve(model): elige el modelo y reserva su turno en un solo paso (sin
+  awaits entre medio, así un burst concurrente no elige todo el mismo
+  modelo). Si la espera supera LLM_RPM_MAX_WAIT recorre los fallbacks
+  (BudgetManager.get_fallback_model si el scheduler tiene un budget
+  manager, si no MODEL_COSTS[model].fallback_model) y reserva el primero
+  con espera aceptable. Solo se usan fallbacks del mismo provider que el
+  modelo pedido (se llaman con el mismo cliente). Si ninguno entra en
+  LLM_RPM_MAX_WAIT lanza ModelRateLimited en vez de esperar
+- wait(reservation): duerme hasta el turno reservado
+- release(reservation): devuelve un turno que no se usó (ej: hit del cache)
+- acquire(model): reserva el próximo turno del modelo (sin fallback) y
+  espera; los turnos se asignan en orden de llegada
+
+Los modelos fuera de MODEL_COSTS (ej: Ollama local) no se limitan.
+La ventana es por proceso, como TokenBucketLimiter en mcp_servers.
+get_model_scheduler() usa el BudgetManager compartido (get_budget_manager).
+
+Usage:
+    ```python
+    scheduler = await get_model_scheduler()
+    reservation = await scheduler.reserve("gpt-5")
+    await scheduler.wait(reservation)
+    response = await llm_for(reservation.model).ainvoke(messages)
+    ```
+"""
+import asyncio
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+import structlog
+
+from config.settings import settings
+from core.budget_manager import MODEL_COSTS, get_budget_manager
+
+logger = structlog.get_logger()
+
+WINDOW_SECONDS = 60.0
+
+
+class ModelRateLimited(Exception):
+    """Ni el modelo ni sus fallbacks tienen un turno dentro de max_wait."""
+
+    def __init__(self, model: str, wait: float, max_wait: float):
+        self.model = model
+        self.wait = wait
+        super().__init__(
+            f"Rate limited: {model} has no free turn for {wait:.1f}s "
+            f"(LLM_RPM_MAX_WAIT={max_wait:.1f}s, no fallback available)"
+        )
+
+
+@dataclass(frozen=True)
+class Reservation:
+    """Turno reservado: modelo elegido e instante (monotonic) de admisión."""
+    model: str
+    at: float
+    wait: float
+
+
+class ModelRateScheduler:
+    """Admisión de llamadas LLM según rpm_limit, con fallback por espera."""
+
+    def __init__(
+        self,
+        budget_manager: Optional[Any] = None,
+        max_wait: Optional[float] = None,
+        limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            budget_manager: BudgetManager para elegir fallbacks (opcional)
+            max_wait: Espera máxima antes de pasar al fallback
+                (default: LLM_RPM_MAX_WAIT)
+            limits: Requests por minuto por modelo
+                (default: rpm_limit de MODEL_COSTS)
+        """
+        self.budget_manager = budget_manager
+        self.max_wait = settings.LLM_RPM_MAX_WAIT if max_wait is None else max_wait
+        self.limits = limits if limits is not None else {
+            name: cost.rpm_limit for name, cost in MODEL_COSTS.items()
+        }
+        self._windows: Dict[str, Deque[float]] = {}
+        self.stats: Counter = Counter()
+
+    def is_limited(self, model: str) -> bool:
+        return model in self.limits
+
+    def _window(self, model: str, now: float) -> Deque[float]:
+        window = self._windows.setdefault(model, deque())
+        while window and window[0] <= now - WINDOW_SECONDS:
+            window.popleft()
+        return window
+
+    def expected_wait(self, model: str, now: Optional[float] = None) -> float:
+        """Segundos hasta el próximo turno libre del modelo (sin reservarlo)."""
+        if model not in self.limits:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        window = self._window(model, now)
+        limit = self.limits[model]
+        if len(window) < limit:
+            return 0.0
+        # El turno se libera cuando la admisión `limit` posiciones atrás sale de la ventana
+        return max(0.0, window[-limit] + WINDOW_SECONDS - now)
+
+    def _reserve_now(self, model: str) -> Reservation:
+        """Reserva el próximo turno libre del modelo (síncrono)."""
+        now = time.monotonic()
+        wait = self.expected_wait(model, now)
+        self._windows[model].append(now + wait)
+        self.stats["admitted"] += 1
+        return Reservation(model=model, at=now + wait, wait=wait)
+
+    async def wait(self, reservation: Reservation) -> float:
+        """
+        Espera hasta el turno reservado.
+
+        Returns:
+            Segundos esperados
+        """
+        wait = reservation.at - time.monotonic()
+        if wait <= 0:
+            return 0.0
+
+        self.stats["waited"] += 1
+        logger.info("llm_rpm_wait", model=reservation.model, wait_seconds=round(wait, 2))
+        await asyncio.sleep(wait)
+        return wait
+
+    def release(self, reservation: Reservation) -> None:
+        """Devuelve un turno reservado que no se usó."""
+        try:
+            self._windows[reservation.model].remove(reservation.at)
+        except (KeyError, ValueError):
+            return
+        self.stats["released"] += 1
+
+    async def acquire(self, model: str) -> float:
+        """
+        Reserva un turno para el modelo (sin fallback) y espera hasta él.
+
+        Returns:
+            Segundos esperados
+        """
+        if model not in self.limits:
+            return 0.0
+        return await self.wait(self._reserve_now(model))
+
+    async def reserve(self, model: str) -> Reservation:
+        """
+        Elige el modelo (el pedido o un fallback) y reserva su turno.
+
+        Entre la última elección de _choose y la reserva no hay awaits: cada
+        llamada concurrente ve los turnos que reservaron las anteriores.
+
+        Raises:
+            ModelRateLimited: Ningún candidato tiene turno dentro de max_wait
+        """
+        best = await self._choose(model)
+
+        wait = self.expected_wait(best)
+        if wait > self.max_wait:
+            self.stats["rate_limited"] += 1
+            logger.warning("llm_rpm_rate_limited", model=model, wait_seconds=round(wait, 2))
+            raise ModelRateLimited(model, wait, self.max_wait)
+
+        if best != model:
+            self.stats["fallbacks"] += 1
+            logger.info(
+                "llm_rpm_fallback",
+                model=model,
+                fallback=best,
+                expected_wait=round(self.expected_wait(model), 2),
+            )
+        if best not in self.limits:
+            return Reservation(model=best, at=time.monotonic(), wait=0.0)
+        return self._reserve_now(best)
+
+    async def select(self, model: str) -> str:
+        """Modelo que elegiría reserve() ahora (sin reservar el turno)."""
+        return await self._choose(model)
+
+    async def _choose(self, model: str) -> str:
+        """
+        Recorre la cadena de fallbacks hasta un modelo con espera aceptable.
+
+        La elección final se hace después del último await (resolver un
+        fallback puede ceder el event loop).
+        """
+        candidates = [model]
+        while True:
+            best = self._pick(candidates, time.monotonic())
+            if self.expected_wait(best) <= self.max_wait:
+                return best
+            fallback = await self._fallback_for(candidates[-1])
+            if fallback is None or fallback in candidates or not _same_provider(model, fallback):
+                return self._pick(candidates, time.monotonic())
+            candidates.append(fallback)
+
+    def _pick(self, candidates: List[str], now: float) -> str:
+        """Primer candidato con espera <= max_wait, o el de menor espera."""
+        best, best_wait = candidates[0], self.expected_wait(candidates[0], now)
+        for candidate in candidates:
+            wait = self.expected_wait(candidate, now)
+            if wait <= self.max_wait:
+                return candidate
+            if wait < best_wait:
+                best, best_wait = candidate, wait
+        return best
+
+    async def _fallback_for(self, model: str) -> Optional[str]:
+        if self.budget_manager is not None and model in MODEL_COSTS:
+            try:
+                return await self.budget_manager.get_fallback_model(model)
+            except Exception as e:
+                logger.warning("llm_rpm_budget_fallback_failed", model=model, error=str(e))
+        config = MODEL_COSTS.get(model)
+        return config.fallback_model if config else None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Requests en la ventana actual por modelo y contadores."""
+        now = time.monotonic()
+        return {
+            "window": {
+                model: {"in_window": len(self._window(model, now)), "rpm_limit": self.limits[model]}
+                for model in self._windows
+            },
+            **{
+                key: self.stats[key]
+                for key in ("admitted", "waited", "fallbacks", "released", "rate_limited")
+            },
+        }
+
+
+def _same_provider(model: str, fallback: str) -> bool:
+    """El fallback lo sirve el mismo endpoint que el modelo pedido."""
+    config, fallback_config = MODEL_COSTS.get(model), MODEL_COSTS.get(fallback)
+    if config is None or fallback_config is None:
+        return config is fallback_config
+    return config.provider == fallback_config.provider
+
+
+# Singleton instance
+_model_scheduler: Optional[ModelRateScheduler] = None
+
+
+async def get_model_scheduler() -> Optional[ModelRateScheduler]:
+    """
+    Scheduler compartido del proceso (None si LLM_RPM_SCHEDULING está deshabilitado).
+
+    Elige los fallbacks con el BudgetManager compartido; si no se puede
+    crear, usa MODEL_COSTS[model].fallback_model.
+    """
+    global _model_scheduler
+
+    if not settings.LLM_RPM_SCHEDULING:
+        return None
+
+    if _model_scheduler is None:
+        try:
+            budget_manager = await get_budget_manager()
+        except Exception as e:
+            logger.warning("llm_rpm_budget_manager_unavailable", error=str(e))
+            budget_manager = None
+        _model_scheduler = ModelRateScheduler(budget_manager=budget_manager)
+
+    return _model_scheduler
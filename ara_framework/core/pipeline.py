@@ -70,6 +70,7 @@ except ImportError:
 
 from config.settings import settings
 from core.budget_manager import BudgetManager
+from core.token_usage import RunUsage, track_run
 from tools import get_database_tool
 from graphs.research_graph import create_research_graph
 
@@ -110,6 +111,11 @@ class PipelineResult:
     end_time: Optional[datetime] = None
     duration_seconds: float = 0.0
     total_credits_used: float = 0.0
+    total_tokens: int = 0
+    total_cost_usd: float = 0.0
+    
+    # Tokens / costo por nodo y por modelo (ver core/token_usage.py)
+    token_usage: Dict[str, Any] = field(default_factory=dict)
     
     # Agent results
     agent_results: List[AgentResult] = field(default_factory=list)
@@ -133,6 +139,9 @@ class PipelineResult:
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "duration_seconds": self.duration_seconds,
             "total_credits_used": self.total_credits_used,
+            "total_tokens": self.total_tokens,
+            "total_cost_usd": self.total_cost_usd,
+            "token_usage": self.token_usage,
             "agent_results": [
                 {
                     "agent_name": r.agent_name,
@@ -348,21 +357,26 @@ class AnalysisPipeline:
             
             # STEP 4: Execute research graph with timeout and monitoring
             graph_output = None
+            run_usage = RunUsage(budget_manager=self.budget_manager)
             try:
                 # Use asyncio.wait_for for timeout with enhanced monitoring
                 with GraphExecutionTracer(monitor, execution_id, thread_id) as tracer:
                     tracer.log_start({"niche": niche})
                     
-                    graph_output = await asyncio.wait_for(
-                        self._run_graph_with_circuit_breaker(research_graph, niche),
-                        timeout=self.timeout_minutes * 60,
-                    )
+                    # Tokens de cada nodo → monitor; de cada llamada → budget
+                    run_usage.tracer = tracer
+                    with track_run(run_usage):
+                        graph_output = await asyncio.wait_for(
+                            self._run_graph_with_circuit_breaker(research_graph, niche),
+                            timeout=self.timeout_minutes * 60,
+                        )
                     
                     tracer.log_completion(graph_output or {})
                 
                 logger.info("graph_execution_completed", execution_id=execution_id)
                 
             except asyncio.TimeoutError:
+                self._apply_token_usage(result, run_usage)
                 result.status = PipelineStatus.TIMEOUT
                 error_msg = f"Pipeline timeout after {self.timeout_minutes} minutes"
                 result.errors.append(error_msg)
@@ -373,6 +387,7 @@ class AnalysisPipeline:
                 return result
             
             except Exception as e:
+                self._apply_token_usage(result, run_usage)
                 result.status = PipelineStatus.FAILED
                 error_msg = f"Graph execution failed: {str(e)}"
                 result.errors.append(error_msg)
@@ -404,16 +419,16 @@ class AnalysisPipeline:
                 result.end_time - result.start_time
             ).total_seconds()
             
-            # Get credits used from budget manager
-            result.total_credits_used = self.budget_manager.get_usage_since(
-                result.start_time
-            )
+            # Credits y tokens de las llamadas LLM de este run
+            self._apply_token_usage(result, run_usage)
             
             logger.info(
                 "pipeline_metrics",
                 duration_seconds=result.duration_seconds,
                 duration_minutes=result.duration_seconds / 60,
                 credits_used=result.total_credits_used,
+                total_tokens=result.total_tokens,
+                cost_usd=result.total_cost_usd,
             )
             
             # STEP 7: Save to Supabase
@@ -457,6 +472,13 @@ class AnalysisPipeline:
                 span.set_attribute("credits_used", result.total_credits_used)
                 span.end()
     
+    def _apply_token_usage(self, result: PipelineResult, run_usage: RunUsage) -> None:
+        """Copia los totales del run (también parciales, ej: timeout) al resultado."""
+        result.total_credits_used = run_usage.total.credits
+        result.total_tokens = run_usage.total.total_tokens
+        result.total_cost_usd = run_usage.total.cost_usd
+        result.token_usage = run_usage.to_dict()
+    
     async def _run_graph_with_circuit_breaker(
         self, research_graph, niche: str
     ) -> Any:
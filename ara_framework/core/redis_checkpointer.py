@@ -0,0 +1,368 @@
+"""
+Redis Checkpointer - Persistencia de checkpoints LangGraph en Redis.
+
+Permite reanudar un research pipeline desde el último nodo completado
+(ver run_research_pipeline(resume=True)): un fallo en content_synthesizer ya
+no obliga a pagar de nuevo los cuatro nodos anteriores.
+
+Formato compacto:
+- Cada checkpoint guarda solo metadata + versiones de canales
+- Los valores de canal se guardan como blobs por (canal, versión): un
+  checkpoint solo escribe los canales que cambiaron en ese paso (deltas)
+- Todo se serializa con el serde de LangGraph y se comprime con zlib
+- Todas las keys expiran a los REDIS_TTL_ANALYSIS segundos
+
+Layout de keys ({p} = prefix, {t} = thread_id, {ns} = checkpoint_ns):
+    {p}:{t}:{ns}:index              ZSET de checkpoint_ids (orden lexicográfico)
+    {p}:{t}:{ns}:cp:{id}            HASH checkpoint / metadata / parent
+    {p}:{t}:{ns}:blob:{ch}:{ver}    valor comprimido de un canal
+    {p}:{t}:{ns}:writes:{id}        HASH de pending writes por task
+    {p}:{t}:keys                    SET con todas las keys del thread
+
+Solo implementa la API async (graph.ainvoke / aget_state / aget_state_history).
+
+from_settings() comparte un único cliente Redis por proceso (cada
+create_research_graph() crea un saver); close_checkpointer() lo cierra en
+el shutdown.
+
+Usage:
+    ```python
+    from core.redis_checkpointer import RedisCheckpointSaver
+
+    checkpointer = RedisCheckpointSaver.from_settings()
+    graph = workflow.compile(checkpointer=checkpointer)
+    ```
+"""
+import random
+import zlib
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
+
+import structlog
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from redis.asyncio import Redis
+
+from config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# Nivel de compresión zlib (6 = balance velocidad/tamaño)
+COMPRESSION_LEVEL = 6
+
+# Cliente compartido por los savers de from_settings()
+_redis_client: Optional[Redis] = None
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver[str]):
+    """Checkpoint saver async sobre redis.asyncio con blobs delta comprimidos."""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        ttl: Optional[int] = None,
+        prefix: str = "checkpoint",
+    ):
+        """
+        Args:
+            redis_client: Cliente Redis con decode_responses=False (valores binarios)
+            ttl: Expiración de las keys en segundos (default: REDIS_TTL_ANALYSIS)
+            prefix: Prefijo de todas las keys
+        """
+        super().__init__()
+        self.redis = redis_client
+        self.ttl = ttl if ttl is not None else settings.REDIS_TTL_ANALYSIS
+        self.prefix = prefix
+
+    @classmethod
+    def from_settings(cls) -> "RedisCheckpointSaver":
+        """
+        Crea el saver con REDIS_URL (la conexión se abre en el primer uso).
+
+        Note:
+            El cliente se comparte entre savers y queda ligado al event loop
+            que lo usa primero: código que llama asyncio.run() varias veces
+            debe llamar close_checkpointer() entre runs.
+        """
+        global _redis_client
+
+        if _redis_client is None:
+            _redis_client = Redis.from_url(
+                settings.REDIS_URL,
+                **{**settings.redis_client_kwargs, "decode_responses": False},
+            )
+        return cls(_redis_client)
+
+    # =========================================================================
+    # Serialización
+    # =========================================================================
+
+    def _dumps(self, value: Any) -> bytes:
+        type_, data = self.serde.dumps_typed(value)
+        return zlib.compress(type_.encode() + b"|" + data, COMPRESSION_LEVEL)
+
+    def _loads(self, raw: bytes) -> Any:
+        type_, _, data = zlib.decompress(raw).partition(b"|")
+        return self.serde.loads_typed((type_.decode(), data))
+
+    # =========================================================================
+    # Keys
+    # =========================================================================
+
+    def _base(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"{self.prefix}:{thread_id}:{checkpoint_ns}"
+
+    def _thread_keys(self, thread_id: str) -> str:
+        return f"{self.prefix}:{thread_id}:keys"
+
+    def _blob_key(self, base: str, channel: str, version: Any) -> str:
+        return f"{base}:blob:{channel}:{version}"
+
+    def _track(self, pipe: Any, thread_id: str, keys: Sequence[str]) -> None:
+        """Registra keys del thread y aplica TTL (en el mismo pipeline)."""
+        thread_keys = self._thread_keys(thread_id)
+        pipe.sadd(thread_keys, *keys)
+        for key in (*keys, thread_keys):
+            pipe.expire(key, self.ttl)
+
+    # =========================================================================
+    # Lectura
+    # =========================================================================
+
+    async def _load_tuple(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: str,
+    ) -> Optional[CheckpointTuple]:
+        base = self._base(thread_id, checkpoint_ns)
+        saved = await self.redis.hgetall(f"{base}:cp:{checkpoint_id}")
+        if not saved:
+            return None
+
+        checkpoint: Checkpoint = self._loads(saved[b"checkpoint"])
+        versions = checkpoint["channel_versions"]
+
+        # Blobs de canales + pending writes en un solo round-trip
+        pipe = self.redis.pipeline(transaction=False)
+        for channel, version in versions.items():
+            pipe.get(self._blob_key(base, channel, version))
+        pipe.hgetall(f"{base}:writes:{checkpoint_id}")
+        results = await pipe.execute()
+        raw_writes = results.pop()
+
+        channel_values = {}
+        for channel, raw in zip(versions, results):
+            if raw:
+                channel_values[channel] = self._loads(raw)
+
+        writes = [self._loads(raw) for raw in raw_writes.values()]
+        writes.sort(key=lambda w: writes_sort_key(w[3], w[0], w[4]))
+
+        parent_id = saved.get(b"parent", b"").decode() or None
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self._loads(saved[b"metadata"]),
+            pending_writes=[(task_id, channel, value) for task_id, channel, value, _, _ in writes],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+        )
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Checkpoint indicado en config, o el último del thread."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        if not checkpoint_id:
+            latest = await self.redis.zrange(
+                f"{self._base(thread_id, checkpoint_ns)}:index", 0, 0, desc=True
+            )
+            if not latest:
+                return None
+            checkpoint_id = latest[0].decode()
+
+        return await self._load_tuple(thread_id, checkpoint_ns, checkpoint_id)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Checkpoints del thread, del más reciente al más antiguo."""
+        if config is None:
+            raise ValueError("RedisCheckpointSaver.alist requires a thread_id config")
+
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        config_checkpoint_id = get_checkpoint_id(config)
+        before_id = get_checkpoint_id(before) if before else None
+
+        ids = await self.redis.zrange(
+            f"{self._base(thread_id, checkpoint_ns)}:index", 0, -1, desc=True
+        )
+        for raw_id in ids:
+            checkpoint_id = raw_id.decode()
+            if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                continue
+            if before_id and checkpoint_id >= before_id:
+                continue
+            if limit is not None and limit <= 0:
+                break
+
+            item = await self._load_tuple(thread_id, checkpoint_ns, checkpoint_id)
+            if item is None:
+                continue
+            if filter and not all(
+                item.metadata.get(key) == value for key, value in filter.items()
+            ):
+                continue
+
+            if limit is not None:
+                limit -= 1
+            yield item
+
+    # =========================================================================
+    # Escritura
+    # =========================================================================
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Guarda el checkpoint y solo los canales que cambiaron (new_versions)."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        base = self._base(thread_id, checkpoint_ns)
+
+        checkpoint = checkpoint.copy()
+        values = checkpoint.pop("channel_values")
+
+        pipe = self.redis.pipeline(transaction=True)
+        keys = []
+        size = 0
+        for channel, version in new_versions.items():
+            key = self._blob_key(base, channel, version)
+            # Canal vaciado: blob vacío (no se restaura al leer)
+            blob = self._dumps(values[channel]) if channel in values else b""
+            pipe.set(key, blob)
+            keys.append(key)
+            size += len(blob)
+
+        cp_key = f"{base}:cp:{checkpoint['id']}"
+        pipe.hset(cp_key, mapping={
+            "checkpoint": self._dumps(checkpoint),
+            "metadata": self._dumps(get_checkpoint_metadata(config, metadata)),
+            "parent": config["configurable"].get("checkpoint_id") or "",
+        })
+        pipe.zadd(f"{base}:index", {checkpoint["id"]: 0})
+        keys.extend([cp_key, f"{base}:index"])
+        self._track(pipe, thread_id, keys)
+        await pipe.execute()
+
+        logger.debug(
+            "checkpoint_saved",
+            thread_id=thread_id,
+            checkpoint_id=checkpoint["id"],
+            channels_written=len(new_versions),
+            blob_bytes=size,
+        )
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Guarda los writes pendientes de una task (resume tras un crash a mitad de paso)."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        writes_key = f"{self._base(thread_id, checkpoint_ns)}:writes:{checkpoint_id}"
+
+        mapping = {}
+        for idx, (channel, value) in enumerate(writes):
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            mapping[f"{task_id}:{write_idx}"] = (
+                write_idx,
+                self._dumps((task_id, channel, value, task_path, write_idx)),
+            )
+
+        pipe = self.redis.pipeline(transaction=True)
+        for field, (write_idx, blob) in mapping.items():
+            # Writes especiales (errores, interrupts) se sobreescriben; el resto no
+            if write_idx >= 0:
+                pipe.hsetnx(writes_key, field, blob)
+            else:
+                pipe.hset(writes_key, field, blob)
+        self._track(pipe, thread_id, [writes_key])
+        await pipe.execute()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Elimina todos los checkpoints y writes del thread."""
+        thread_keys = self._thread_keys(thread_id)
+        keys = await self.redis.smembers(thread_keys)
+        if keys:
+            await self.redis.delete(*keys)
+        await self.redis.delete(thread_keys)
+        logger.info("checkpoint_thread_deleted", thread_id=thread_id, keys=len(keys))
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        """Versiones string monotónicas (mismo formato que MemorySaver)."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+async def close_checkpointer() -> None:
+    """Cierra el cliente Redis compartido de from_settings() (si se creó)."""
+    global _redis_client
+
+    if _redis_client is not None:
+        client, _redis_client = _redis_client, None
+        await client.aclose()
@@ -0,0 +1,149 @@
+"""
+State Compaction - Historial de mensajes acotado para ResearchState.
+
+Cada nodo del research graph registraba sus prompts completos en
+`ResearchState.messages`. Los system prompts ocupan varios KB (incluyen el
+contexto de los agentes anteriores, que ya vive en su propio campo del estado)
+y con checkpointing se serializan en cada paso.
+
+Este módulo implementa la capa de compactación:
+- IDs estables por contenido: el mismo mensaje se guarda una sola vez
+  (add_messages reemplaza por ID en vez de concatenar)
+- Política de historial por nodo: recorte de prompts largos
+- Historial total acotado: los mensajes más antiguos se colapsan en un resumen
+
+Usage:
+    ```python
+    from core.state_compaction import compact_node_messages, bounded_add_messages
+
+    class ResearchState(TypedDict):
+        messages: Annotated[Sequence[BaseMessage], bounded_add_messages]
+
+    # En el nodo
+    return {"messages": compact_node_messages("niche_analyst", [system_msg, human_msg])}
+    ```
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, SystemMessage
+from langgraph.graph.message import add_messages
+
+from config.settings import settings
+
+SUMMARY_MESSAGE_ID = "history-summary"
+
+
+@dataclass(frozen=True)
+class HistoryPolicy:
+    """Cuánto de cada mensaje conserva un nodo en el estado."""
+
+    # Caracteres máximos a guardar (0 = no guardar ese tipo de mensaje)
+    system_chars: int = 300
+    other_chars: int = 2000
+
+
+DEFAULT_HISTORY_POLICY = HistoryPolicy()
+
+# Los system prompts embeben el output de los agentes previos, que ya está en
+# niche_analysis / literature_review / etc. Basta con el encabezado (rol + misión).
+NODE_HISTORY_POLICIES: Dict[str, HistoryPolicy] = {
+    "niche_analyst": HistoryPolicy(system_chars=300),
+    "literature_researcher": HistoryPolicy(system_chars=300),
+    "technical_architect": HistoryPolicy(system_chars=300),
+    "implementation_specialist": HistoryPolicy(system_chars=300),
+    # El prompt del synthesizer es casi todo contexto copiado (~10K chars)
+    "content_synthesizer": HistoryPolicy(system_chars=0),
+}
+
+
+def message_id(message: BaseMessage) -> str:
+    """ID estable derivado del tipo y contenido completo del mensaje."""
+    digest = hashlib.sha256(
+        f"{message.type}:{message.content}".encode("utf-8")
+    ).hexdigest()
+    return f"msg-{digest[:16]}"
+
+
+def _truncate(content: str, limit: int) -> str:
+    if len(content) <= limit:
+        return content
+    omitted = len(content) - limit
+    return f"{content[:limit]}\n[... {omitted} chars compacted]"
+
+
+def compact_node_messages(
+    node_name: str,
+    messages: Sequence[BaseMessage],
+    policy: Optional[HistoryPolicy] = None,
+) -> List[BaseMessage]:
+    """
+    Aplica la política de historial del nodo antes de escribir en el estado.
+
+    Args:
+        node_name: Nombre del nodo (clave en NODE_HISTORY_POLICIES)
+        messages: Mensajes nuevos generados por el nodo
+        policy: Política explícita (default: la del nodo)
+
+    Returns:
+        Copias compactadas con ID estable (el original no se modifica)
+    """
+    policy = policy or NODE_HISTORY_POLICIES.get(node_name, DEFAULT_HISTORY_POLICY)
+
+    compacted = []
+    for message in messages:
+        limit = policy.system_chars if isinstance(message, SystemMessage) else policy.other_chars
+        if limit <= 0:
+            continue
+
+        content = message.content
+        if isinstance(content, str):
+            content = _truncate(content, limit)
+
+        compacted.append(
+            message.model_copy(update={
+                "content": content,
+                # El ID se calcula sobre el contenido original: dos prompts
+                # distintos con el mismo prefijo no colisionan.
+                "id": message.id or message_id(message),
+            })
+        )
+
+    return compacted
+
+
+def bounded_add_messages(
+    left: Sequence[BaseMessage],
+    right: Sequence[BaseMessage],
+) -> List[BaseMessage]:
+    """
+    Reducer para ResearchState.messages.
+
+    - Fusiona por ID (mensajes repetidos se guardan una vez)
+    - Mantiene como máximo settings.STATE_MAX_MESSAGES mensajes; los más
+      antiguos se colapsan en un único mensaje resumen
+    """
+    merged = add_messages(list(left or []), list(right or []))
+    limit = settings.STATE_MAX_MESSAGES
+
+    if limit <= 0 or len(merged) <= limit:
+        return merged
+
+    compacted_count = 0
+    if merged[0].id == SUMMARY_MESSAGE_ID:
+        compacted_count = merged[0].additional_kwargs.get("compacted", 0)
+        merged = merged[1:]
+
+    # Dejar lugar para el resumen
+    overflow = len(merged) - (limit - 1)
+    dropped, kept = merged[:overflow], merged[overflow:]
+    compacted_count += len(dropped)
+
+    summary = SystemMessage(
+        content=f"[{compacted_count} earlier messages compacted]",
+        id=SUMMARY_MESSAGE_ID,
+        additional_kwargs={"compacted": compacted_count},
+    )
+
+    return [summary] + kept
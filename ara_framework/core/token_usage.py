@@ -0,0 +1,267 @@
+"""
+Uso de tokens por llamada LLM, por nodo del graph y por run del pipeline.
+
+BudgetManager cobraba un credits_per_request plano por request y
+LangGraphMonitor.complete_node_execution aceptaba tokens_used / cost_usd
+que nadie llenaba: no había forma de saber dónde se iban los tokens.
+
+- TokenUsage: tokens de entrada/salida (AIMessage.usage_metadata), costo
+  en USD (precios por millón de MODEL_COSTS) y créditos de una o varias
+  llamadas
+- safe_agent_invoke registra cada llamada al proveedor (no los hits del
+  cache) con record_llm_usage y devuelve el detalle por iteración en
+  result["usage"]
+- tracked_node(name, node): envuelve un nodo del graph; acumula el uso de
+  sus llamadas y lo agrega al state (token_usage[name], total_credits_used)
+- RunUsage: acumulado de un run (track_run); reenvía cada llamada a
+  BudgetManager.record_usage y cada nodo al LangGraphMonitor
+  (log_node_start / log_node_completion con tokens_used y cost_usd)
+
+El nodo y el run activos viajan en contextvars: las tasks que LangGraph
+crea para cada nodo heredan el run de quien llamó a graph.ainvoke.
+
+Usage:
+    ```python
+    run = RunUsage(budget_manager=budget, tracer=tracer)
+    with track_run(run):
+        state = await graph.ainvoke(initial_state, config=config)
+
+    print(run.total.total_tokens, run.by_node["niche_analyst"].cost_usd)
+    ```
+"""
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+import structlog
+
+from core.budget_manager import MODEL_COSTS
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class TokenUsage:
+    """Tokens, costo y créditos acumulados de una o más llamadas LLM."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    llm_calls: int = 0
+    cost_usd: float = 0.0
+    credits: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @classmethod
+    def from_response(cls, response: Any, model: Optional[str]) -> "TokenUsage":
+        """
+        Uso de una respuesta del proveedor.
+
+        Lee usage_metadata (langchain-core) y, si el proveedor no lo llena,
+        response_metadata["token_usage"] (formato OpenAI).
+        """
+        usage = getattr(response, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens")
+        output_tokens = usage.get("output_tokens")
+
+        if input_tokens is None and output_tokens is None:
+            metadata = getattr(response, "response_metadata", None) or {}
+            token_usage = metadata.get("token_usage") or {}
+            input_tokens = token_usage.get("prompt_tokens")
+            output_tokens = token_usage.get("completion_tokens")
+
+        input_tokens = int(input_tokens or 0)
+        output_tokens = int(output_tokens or 0)
+        config = MODEL_COSTS.get(model)
+
+        return cls(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            llm_calls=1,
+            cost_usd=config.cost_usd(input_tokens, output_tokens) if config else 0.0,
+            credits=config.credits_per_request if config else 0.0,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TokenUsage":
+        data = data or {}
+        return cls(
+            input_tokens=int(data.get("input_tokens", 0)),
+            output_tokens=int(data.get("output_tokens", 0)),
+            llm_calls=int(data.get("llm_calls", 0)),
+            cost_usd=float(data.get("cost_usd", 0.0)),
+            credits=float(data.get("credits", 0.0)),
+        )
+
+    def add(self, other: "TokenUsage") -> "TokenUsage":
+        """Suma `other` a este acumulado (in place)."""
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.llm_calls += other.llm_calls
+        self.cost_usd += other.cost_usd
+        self.credits += other.credits
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "llm_calls": self.llm_calls,
+            "cost_usd": round(self.cost_usd, 6),
+            "credits": round(self.credits, 4),
+        }
+
+
+def merge_usage_dicts(
+    left: Optional[Dict[str, Dict[str, Any]]],
+    right: Optional[Dict[str, Dict[str, Any]]],
+) -> Dict[str, Dict[str, Any]]:
+    """Suma dos mapas {nombre: TokenUsage.to_dict()} (ej: por nodo)."""
+    merged = dict(left or {})
+    for name, usage in (right or {}).items():
+        merged[name] = TokenUsage.from_dict(merged.get(name)).add(TokenUsage.from_dict(usage)).to_dict()
+    return merged
+
+
+class RunUsage:
+    """
+    Uso de tokens de un run del pipeline: total, por nodo y por modelo.
+
+    Cada llamada se reenvía a BudgetManager.record_usage (si el modelo está
+    en MODEL_COSTS) y cada nodo terminado al tracer del LangGraphMonitor.
+    """
+
+    def __init__(self, budget_manager: Optional[Any] = None, tracer: Optional[Any] = None):
+        """
+        Args:
+            budget_manager: BudgetManager donde registrar cada llamada (opcional)
+            tracer: GraphExecutionTracer del run (opcional)
+        """
+        self.budget_manager = budget_manager
+        self.tracer = tracer
+        self.total = TokenUsage()
+        self.by_node: Dict[str, TokenUsage] = {}
+        self.by_model: Dict[str, TokenUsage] = {}
+
+    async def record_call(self, model: Optional[str], usage: TokenUsage, node: Optional[str] = None) -> None:
+        """Acumula una llamada y la registra en el BudgetManager."""
+        self.total.add(usage)
+        self.by_model.setdefault(model or "unknown", TokenUsage()).add(usage)
+
+        if self.budget_manager is None or model not in MODEL_COSTS:
+            return
+
+        try:
+            await self.budget_manager.record_usage(
+                model,
+                metadata={"node": node},
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens,
+            )
+        except Exception as e:
+            logger.error("token_usage_budget_record_failed", model=model, node=node, error=str(e))
+
+    def node_started(self, node: str, state: Dict[str, Any]) -> None:
+        if self.tracer is not None:
+            self.tracer.log_node_start(node, dict(state))
+
+    def node_completed(self, node: str, update: Dict[str, Any], usage: TokenUsage) -> None:
+        self.by_node.setdefault(node, TokenUsage()).add(usage)
+        if self.tracer is not None:
+            self.tracer.log_node_completion(node, update, usage.total_tokens, usage.cost_usd)
+
+    def node_failed(self, node: str, error: str, usage: TokenUsage) -> None:
+        self.by_node.setdefault(node, TokenUsage()).add(usage)
+        if self.tracer is not None:
+            self.tracer.log_node_failure(node, error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total.to_dict(),
+            "by_node": {name: usage.to_dict() for name, usage in self.by_node.items()},
+            "by_model": {name: usage.to_dict() for name, usage in self.by_model.items()},
+        }
+
+
+# Run y nodo activos (heredados por las tasks hijas)
+_current_run: ContextVar[Optional[RunUsage]] = ContextVar("token_usage_run", default=None)
+_current_node: ContextVar[Optional[Tuple[str, TokenUsage]]] = ContextVar("token_usage_node", default=None)
+
+
+@contextmanager
+def track_run(run: RunUsage) -> Iterator[RunUsage]:
+    """Activa `run` para las llamadas LLM hechas dentro del bloque."""
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+
+
+async def record_llm_usage(model: Optional[str], usage: TokenUsage) -> None:
+    """Suma una llamada al nodo y al run activos (si los hay)."""
+    if not usage.llm_calls:
+        return
+
+    node = _current_node.get()
+    if node is not None:
+        node[1].add(usage)
+
+    run = _current_run.get()
+    if run is not None:
+        await run.record_call(model, usage, node=node[0] if node else None)
+
+
+def tracked_node(
+    name: str,
+    node: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+) -> Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]:
+    """
+    Envuelve un nodo del graph para contar los tokens de sus llamadas LLM.
+
+    El update del nodo se extiende con token_usage[name] y
+    total_credits_used (ambos con reducer en ResearchState). Los nodos que
+    atrapan su error y devuelven "errors" se reportan como fallidos.
+    """
+    @functools.wraps(node)
+    async def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+        usage = TokenUsage()
+        run = _current_run.get()
+        token = _current_node.set((name, usage))
+        if run is not None:
+            run.node_started(name, state)
+
+        try:
+            update = dict(await node(state) or {})
+        except Exception as e:
+            if run is not None:
+                run.node_failed(name, str(e), usage)
+            raise
+        finally:
+            _current_node.reset(token)
+
+        if run is not None:
+            if update.get("errors"):
+                run.node_failed(name, update["errors"][-1], usage)
+            else:
+                run.node_completed(name, update, usage)
+
+        logger.info(
+            "node_token_usage",
+            node=name,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            llm_calls=usage.llm_calls,
+            cost_usd=round(usage.cost_usd, 6),
+        )
+
+        update["token_usage"] = {name: usage.to_dict()}
+        update["total_credits_used"] = usage.credits
+        return update
+
+    return wrapper
@@ -0,0 +1,220 @@
+"""
+Write-behind del usage_log de BudgetManager en Supabase.
+
+Antes cada record_usage hacía un insert síncrono en Supabase: una llamada
+de red por invocación del modelo. UsageLogWriter acumula los eventos en
+memoria y los inserta por lotes:
+- Flush al juntar BUDGET_USAGE_LOG_BATCH_SIZE eventos o cada
+  BUDGET_USAGE_LOG_FLUSH_INTERVAL segundos (lo que ocurra primero)
+- Un insert por lote (lista de filas), en un thread: el cliente de
+  Supabase es síncrono
+- Si Supabase no responde, el lote vuelve al buffer y se reintenta con
+  backoff exponencial; el buffer está acotado (BUDGET_USAGE_LOG_MAX_BUFFER,
+  se descartan los más antiguos)
+- close() drena el buffer; lo que no se pudo insertar se guarda en
+  BUDGET_USAGE_LOG_SPOOL_PATH (JSONL) y se reenvía en el próximo arranque
+
+Usage:
+    ```python
+    writer = UsageLogWriter(supabase)
+    writer.add({"model": "gpt-5", "credits_used": 1.0, ...})
+    ...
+    await writer.close()  # Al apagar
+    ```
+"""
+import asyncio
+import json
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+import structlog
+
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+# Backoff entre reintentos cuando Supabase falla (segundos)
+INITIAL_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+
+class UsageLogWriter:
+    """Buffer + flush por lotes del usage_log (una instancia por BudgetManager)."""
+
+    def __init__(
+        self,
+        supabase: Any,
+        table: str = "usage_log",
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_buffer: Optional[int] = None,
+        spool_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            supabase: Cliente de Supabase (sync)
+            table: Tabla destino
+            batch_size: Eventos por insert (default: BUDGET_USAGE_LOG_BATCH_SIZE)
+            flush_interval: Segundos máximos entre flushes
+                (default: BUDGET_USAGE_LOG_FLUSH_INTERVAL)
+            max_buffer: Eventos retenidos mientras Supabase no responde
+                (default: BUDGET_USAGE_LOG_MAX_BUFFER)
+            spool_path: JSONL para los eventos pendientes al apagar
+                (default: BUDGET_USAGE_LOG_SPOOL_PATH, "" = deshabilitado)
+        """
+        self.supabase = supabase
+        self.table = table
+        self.batch_size = batch_size or settings.BUDGET_USAGE_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.BUDGET_USAGE_LOG_FLUSH_INTERVAL
+        self.max_buffer = max_buffer or settings.BUDGET_USAGE_LOG_MAX_BUFFER
+        spool_path = settings.BUDGET_USAGE_LOG_SPOOL_PATH if spool_path is None else spool_path
+        self.spool_path = Path(spool_path) if spool_path else None
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._spool_loaded = False
+        self._backoff = 0.0
+        self.stats: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Encola un evento (no bloquea); inicia el flusher si hace falta."""
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self.stats["dropped"] += 1
+            logger.warning("usage_log_buffer_full", dropped=self.stats["dropped"])
+
+        self._buffer.append(row)
+        self._ensure_started()
+
+        if len(self._buffer) >= self.batch_size and not self._backoff:
+            self._wakeup.set()
+
+    def _ensure_started(self) -> None:
+        if not self._spool_loaded:
+            self._spool_loaded = True
+            self._load_spool()
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=self._backoff or self.flush_interval,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._buffer and await self._flush_batch():
+                pass
+
+            if self._closing:
+                return
+
+    async def _flush_batch(self) -> bool:
+        """Inserta hasta batch_size eventos. False si falló (el lote vuelve al buffer)."""
+        batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+        try:
+            await asyncio.to_thread(self._insert, batch)
+        except Exception as e:
+            self._buffer.extendleft(reversed(batch))
+            self._backoff = min(max(self._backoff * 2, INITIAL_BACKOFF), MAX_BACKOFF)
+            self.stats["failed_flushes"] += 1
+            logger.warning(
+                "usage_log_flush_failed",
+                rows=len(batch),
+                buffered=len(self._buffer),
+                retry_in=self._backoff,
+                error=str(e),
+            )
+            return False
+
+        self._backoff = 0.0
+        self.stats["flushed"] += len(batch)
+        self.stats["batches"] += 1
+        return True
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        self.supabase.table(self.table).insert(rows).execute()
+
+    # ============================================================
+    # Spool en disco (eventos pendientes entre reinicios)
+    # ============================================================
+
+    def _load_spool(self) -> None:
+        if self.spool_path is None or not self.spool_path.exists():
+            return
+        try:
+            with self.spool_path.open(encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+            self.spool_path.unlink()
+        except (OSError, ValueError) as e:
+            logger.error("usage_log_spool_load_error", path=str(self.spool_path), error=str(e))
+            return
+
+        self._buffer.extendleft(reversed(rows))
+        logger.info("usage_log_spool_loaded", rows=len(rows))
+
+    def _write_spool(self) -> None:
+        rows = list(self._buffer)
+        try:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.spool_path.open("a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, default=str) + "\n")
+        except OSError as e:
+            logger.error("usage_log_spool_write_error", path=str(self.spool_path), error=str(e))
+            return
+
+        self._buffer.clear()
+        self.stats["spooled"] += len(rows)
+        logger.warning("usage_log_spooled", rows=len(rows), path=str(self.spool_path))
+
+    # ============================================================
+    # Apagado
+    # ============================================================
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """
+        Drena el buffer a Supabase (con reintentos hasta timeout).
+
+        Lo que no se pudo insertar queda en el spool (si está habilitado).
+        """
+        if self._task is not None and not self._task.done():
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+        self._task = None
+
+        deadline = time.monotonic() + timeout
+        while self._buffer:
+            if await self._flush_batch():
+                continue
+            if time.monotonic() + self._backoff > deadline:
+                break
+            await asyncio.sleep(self._backoff)
+
+        if self._buffer and self.spool_path is not None:
+            self._write_spool()
+        elif self._buffer:
+            self.stats["dropped"] += len(self._buffer)
+            logger.error("usage_log_rows_lost", rows=len(self._buffer))
+            self._buffer.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Eventos en buffer, insertados, descartados y estado del backoff."""
+        return {
+            "buffered": len(self._buffer),
+            "backoff_seconds": self._backoff,
+            **{key: self.stats[key] for key in ("flushed", "batches", "failed_flushes", "dropped", "spooled")},
+        }
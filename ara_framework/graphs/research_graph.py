@@ -4,10 +4,16 @@ Research Graph - LangGraph implementation of the ARA research pipeline.
 This module implements the main research workflow as a LangGraph StateGraph,
 replacing the previous CrewAI Crew-based implementation.
 
-Architecture:
+Architecture (mode="sequential", default/fallback):
     START → NicheAnalyst → LiteratureResearcher → TechnicalArchitect 
           → ImplementationSpecialist → ContentSynthesizer → END
 
+Architecture (mode="parallel", fan-out/fan-in):
+    START ─┬→ NicheAnalyst (community scan) ──────┬─┬→ TechnicalArchitect ───────┬→ ContentSynthesizer → END
+           └→ LiteratureResearcher (paper search) ┘ └→ ImplementationSpecialist ─┘
+    Branches only need the niche plus a short summary of upstream output;
+    their partial updates are merged by the reducers declared in ResearchState.
+
 Key Features:
 - Explicit graph-based control flow
 - Built-in checkpointing for pause/resume
@@ -47,11 +53,14 @@ from langgraph.checkpoint.memory import MemorySaver
 from config.settings import settings
 from core.budget_manager import BudgetManager
 from core.agent_utils import safe_agent_invoke
-from core.model_factory import create_model
+from core.model_factory import agent_model_spec, create_model
+from core.redis_checkpointer import RedisCheckpointSaver
+from core.state_compaction import bounded_add_messages, compact_node_messages
+from core.token_usage import merge_usage_dicts, tracked_node
 
 # Import module-level tool functions directly
 from tools.scraping_tool import scrape_website, scrape_multiple_urls
-from tools.search_tool import search_recent_papers
+from tools.search_tool import get_papers_details, search_recent_papers
 from tools.pdf_tool import extract_pdf_text_only
 from tools.database_tool import save_analysis
 
@@ -65,18 +74,49 @@ logger = structlog.get_logger(__name__)
 # Control which LLM provider to use for agents
 # Options: "github" (gpt-4o, 50 req/day limit) or "ollama" (mistral:7b, unlimited)
 # Can be overridden via environment variable: USE_OLLAMA=true
-import os
-USE_OLLAMA = os.getenv("USE_OLLAMA", "false").lower() == "true"
-LLM_PROVIDER = "ollama" if USE_OLLAMA else "github"
+# Same spec as warmup_models(): the nodes reuse the warmed client
+AGENT_MODEL_SPEC = agent_model_spec()
+LLM_PROVIDER = AGENT_MODEL_SPEC["provider"]
+USE_OLLAMA = LLM_PROVIDER == "ollama"
 
 logger.info("llm_provider_selected", provider=LLM_PROVIDER, 
-            model="mistral:7b" if USE_OLLAMA else "gpt-4o")
+            model=AGENT_MODEL_SPEC["model"])
 
 
 # =============================================================================
 # State Schema
 # =============================================================================
 
+GraphMode = Literal["sequential", "parallel"]
+CheckpointBackend = Literal["memory", "redis"]
+
+# State field each agent node fills on success (used to resume failed runs)
+NODE_OUTPUTS = {
+    "niche_analyst": "niche_analysis",
+    "literature_researcher": "literature_review",
+    "technical_architect": "technical_architecture",
+    "implementation_specialist": "implementation_plan",
+    "content_synthesizer": "final_report",
+}
+
+
+def _merge_retry_counts(left: dict[str, int], right: dict[str, int]) -> dict[str, int]:
+    """Reducer: merge per-agent retry counters coming from parallel branches."""
+    merged = dict(left or {})
+    merged.update(right or {})
+    return merged
+
+
+def _merge_token_usage(left: dict[str, dict], right: dict[str, dict]) -> dict[str, dict]:
+    """Reducer: add per-node token usage (node retries and parallel branches)."""
+    return merge_usage_dicts(left, right)
+
+
+def _keep_latest(left: str, right: str) -> str:
+    """Reducer: last writer wins (allows concurrent branches to set the value)."""
+    return right
+
+
 class ResearchState(TypedDict):
     """
     Central state schema for the research pipeline.
@@ -86,34 +126,42 @@ class ResearchState(TypedDict):
     - Agent outputs: Results from each agent
     - Metadata: Execution tracking, errors, budget
     - Messages: Conversation history for LLM context
+    
+    Nodes return partial updates only. List/dict fields declare reducers so
+    that concurrent branches (parallel mode) can be merged at fan-in.
+    Messages are compacted per node and the history is bounded, so
+    checkpoint size stays flat instead of growing with every step.
+    Token usage and credits are added by the tracked_node wrapper around
+    every agent node (see core.token_usage).
     """
     
     # Input
     niche: str
     
-    # Agent outputs (populated sequentially)
+    # Agent outputs (populated sequentially or by parallel branches)
     niche_analysis: Optional[str]
     literature_review: Optional[str]
     technical_architecture: Optional[str]
     implementation_plan: Optional[str]
     final_report: Optional[str]
     
-    # Message history (accumulator)
-    messages: Annotated[Sequence[BaseMessage], add]
+    # Message history (bounded accumulator, see core.state_compaction)
+    messages: Annotated[Sequence[BaseMessage], bounded_add_messages]
     
     # Execution metadata
-    current_agent: str
-    agent_history: list[str]
+    current_agent: Annotated[str, _keep_latest]
+    agent_history: Annotated[list[str], add]
     start_time: str
     end_time: Optional[str]
     
     # Error handling
-    errors: list[str]
-    warnings: list[str]
-    retry_count: dict[str, int]
+    errors: Annotated[list[str], add]
+    warnings: Annotated[list[str], add]
+    retry_count: Annotated[dict[str, int], _merge_retry_counts]
     
-    # Budget tracking
-    total_credits_used: float
+    # Budget tracking (LLM calls made by each node, see core.token_usage)
+    total_credits_used: Annotated[float, add]
+    token_usage: Annotated[dict[str, dict], _merge_token_usage]
     budget_limit: float
     budget_exceeded: bool
     
@@ -121,6 +169,24 @@ class ResearchState(TypedDict):
     # checkpoint_id is reserved by LangGraph - removed
 
 
+# =============================================================================
+# Context Helpers
+# =============================================================================
+
+def _brief(text: Optional[str], limit: int, fallback: str = "Not available") -> str:
+    """
+    Short summary of an upstream output for prompt context.
+    
+    Keys may be missing or None (e.g. a parallel branch that has not run yet),
+    so this never assumes the value is a string.
+    """
+    if not text:
+        return fallback
+    if len(text) <= limit:
+        return text
+    return text[:limit] + "..."
+
+
 # =============================================================================
 # Agent Node Functions
 # =============================================================================
@@ -154,11 +220,7 @@ async def niche_analyst_node(state: ResearchState) -> ResearchState:
         # GitHub Models: gpt-4o (128K context, 50 req/day limit)
         # Ollama: mistral:7b (32K context, unlimited local inference)
         # Toggle via environment variable: USE_OLLAMA=true
-        llm = create_model(
-            provider=LLM_PROVIDER,
-            model="mistral:7b" if USE_OLLAMA else settings.GITHUB_MODEL,
-            temperature=0.7,
-        )
+        llm = create_model(**AGENT_MODEL_SPEC)
         
         # Use module-level tool functions directly (no need for instances)
         tools = [
@@ -266,11 +328,10 @@ Your mission: Analyze the viability and opportunities of the niche "{state['nich
         )
         
         return {
-            **state,
             "niche_analysis": analysis,
             "current_agent": "literature_researcher",
-            "agent_history": state.get("agent_history", []) + ["niche_analyst"],
-            "messages": state.get("messages", []) + [system_msg, human_msg],
+            "agent_history": ["niche_analyst"],
+            "messages": compact_node_messages("niche_analyst", [system_msg, human_msg]),
         }
         
     except Exception as e:
@@ -280,17 +341,11 @@ Your mission: Analyze the viability and opportunities of the niche "{state['nich
             error_type=type(e).__name__,
         )
         
-        # Update error state
-        errors = state.get("errors", [])
-        errors.append(f"NicheAnalyst: {str(e)}")
-        
-        retry_count = state.get("retry_count", {})
-        retry_count["niche_analyst"] = retry_count.get("niche_analyst", 0) + 1
+        previous_retries = (state.get("retry_count") or {}).get("niche_analyst", 0)
         
         return {
-            **state,
-            "errors": errors,
-            "retry_count": retry_count,
+            "errors": [f"NicheAnalyst: {str(e)}"],
+            "retry_count": {"niche_analyst": previous_retries + 1},
         }
 
 
@@ -307,7 +362,7 @@ async def literature_researcher_node(state: ResearchState) -> ResearchState:
     - Extract methodologies and key findings
     - Synthesize literature into coherent review
     
-    Tools: search_tool, pdf_tool, database_tool
+    Tools: search_tool (search_recent_papers, get_papers_details), pdf_tool, database_tool
     LLM: Groq LLaMA 3.3-70B
     Duration: ~20-25 minutes
     Credits: ~0.15-1.5 (mostly API rate limits, not LLM)
@@ -324,28 +379,27 @@ async def literature_researcher_node(state: ResearchState) -> ResearchState:
         # GitHub Models: gpt-4o (128K context, 50 req/day limit)
         # Ollama: mistral:7b (32K context, unlimited local inference)
         # Note: Agent 2 processes 40 papers (~63K tokens) - may exceed Mistral's 32K
-        llm = create_model(
-            provider=LLM_PROVIDER,
-            model="mistral:7b" if USE_OLLAMA else settings.GITHUB_MODEL,
-            temperature=0.7,
-        )
+        llm = create_model(**AGENT_MODEL_SPEC)
         
         # Use module-level tool functions directly (no need for instances)
         tools = [
             search_recent_papers,
+            get_papers_details,
             extract_pdf_text_only,
             save_analysis,
         ]
         
         # System prompt with context from previous agent
-        niche_analysis = state.get("niche_analysis", "No analysis available")
+        # In parallel mode this node runs alongside NicheAnalyst, so the
+        # analysis is usually not available yet - the niche alone is enough.
+        niche_analysis = _brief(state.get("niche_analysis"), 2000, "No analysis available")
         
         system_msg = SystemMessage(content=f"""You are a PhD-level Literature Researcher specializing in comprehensive academic literature reviews.
 
 Your mission: Conduct an exhaustive literature review for "{state['niche']}"
 
 **Context from Niche Analysis:**
-{niche_analysis[:2000]}...
+{niche_analysis}
 
 **Research Process:**
 
@@ -358,6 +412,7 @@ Your mission: Conduct an exhaustive literature review for "{state['niche']}"
    - Quality over quantity: select best papers only
 
 2. **Deep Analysis** (Top 10-12 papers):
+   - Fetch full details of the selected papers with ONE get_papers_details call (pass all paper_ids)
    - Read abstracts and key sections
    - Extract methodologies, datasets, results
    - Note limitations and future work
@@ -446,11 +501,10 @@ Your mission: Conduct an exhaustive literature review for "{state['niche']}"
         )
         
         return {
-            **state,
             "literature_review": review,
             "current_agent": "technical_architect",
-            "agent_history": state.get("agent_history", []) + ["literature_researcher"],
-            "messages": state.get("messages", []) + [system_msg, human_msg],
+            "agent_history": ["literature_researcher"],
+            "messages": compact_node_messages("literature_researcher", [system_msg, human_msg]),
         }
         
     except Exception as e:
@@ -460,16 +514,11 @@ Your mission: Conduct an exhaustive literature review for "{state['niche']}"
             error_type=type(e).__name__,
         )
         
-        errors = state.get("errors", [])
-        errors.append(f"LiteratureResearcher: {str(e)}")
-        
-        retry_count = state.get("retry_count", {})
-        retry_count["literature_researcher"] = retry_count.get("literature_researcher", 0) + 1
+        previous_retries = (state.get("retry_count") or {}).get("literature_researcher", 0)
         
         return {
-            **state,
-            "errors": errors,
-            "retry_count": retry_count,
+            "errors": [f"LiteratureResearcher: {str(e)}"],
+            "retry_count": {"literature_researcher": previous_retries + 1},
         }
 
 
@@ -502,11 +551,7 @@ async def technical_architect_node(state: ResearchState) -> ResearchState:
         # Initialize LLM - Supports both GitHub Models and Ollama
         # GitHub Models: gpt-4o (reliable, supports tools)
         # Ollama: mistral:7b (32K context, unlimited local inference)
-        llm = create_model(
-            provider=LLM_PROVIDER,
-            model="mistral:7b" if USE_OLLAMA else settings.GITHUB_MODEL,
-            temperature=0.7,
-        )
+        llm = create_model(**AGENT_MODEL_SPEC)
         
         # Use module-level tool functions directly (no need for instances)
         tools = [
@@ -516,8 +561,8 @@ async def technical_architect_node(state: ResearchState) -> ResearchState:
         ]
         
         # Get context
-        niche_analysis = state.get("niche_analysis", "")[:1500]
-        literature_review = state.get("literature_review", "")[:3000]
+        niche_analysis = _brief(state.get("niche_analysis"), 1500)
+        literature_review = _brief(state.get("literature_review"), 3000)
         
         system_msg = SystemMessage(content=f"""You are a Senior Software Architect with expertise in designing scalable, production-ready systems for cutting-edge research projects.
 
@@ -682,11 +727,10 @@ Your mission: Design a comprehensive technical architecture for "{state['niche']
         )
         
         return {
-            **state,
             "technical_architecture": architecture,
             "current_agent": "implementation_specialist",
-            "agent_history": state.get("agent_history", []) + ["technical_architect"],
-            "messages": state.get("messages", []) + [system_msg, human_msg],
+            "agent_history": ["technical_architect"],
+            "messages": compact_node_messages("technical_architect", [system_msg, human_msg]),
         }
         
     except Exception as e:
@@ -696,16 +740,11 @@ Your mission: Design a comprehensive technical architecture for "{state['niche']
             error_type=type(e).__name__,
         )
         
-        errors = state.get("errors", [])
-        errors.append(f"TechnicalArchitect: {str(e)}")
-        
-        retry_count = state.get("retry_count", {})
-        retry_count["technical_architect"] = retry_count.get("technical_architect", 0) + 1
+        previous_retries = (state.get("retry_count") or {}).get("technical_architect", 0)
         
         return {
-            **state,
-            "errors": errors,
-            "retry_count": retry_count,
+            "errors": [f"TechnicalArchitect: {str(e)}"],
+            "retry_count": {"technical_architect": previous_retries + 1},
         }
 
 
@@ -738,11 +777,7 @@ async def implementation_specialist_node(state: ResearchState) -> ResearchState:
         # Initialize LLM - Supports both GitHub Models and Ollama
         # GitHub Models: gpt-4o (reliable, supports all tools)
         # Ollama: mistral:7b (32K context, unlimited local inference)
-        llm = create_model(
-            provider=LLM_PROVIDER,
-            model="mistral:7b" if USE_OLLAMA else settings.GITHUB_MODEL,
-            temperature=0.7,
-        )
+        llm = create_model(**AGENT_MODEL_SPEC)
         
         # Use module-level tool functions directly (no need for instances)
         tools = [
@@ -750,15 +785,26 @@ async def implementation_specialist_node(state: ResearchState) -> ResearchState:
             save_analysis,
         ]
         
-        # Get context
-        architecture = state.get("technical_architecture", "")[:3000]
+        # Get context. In parallel mode the architecture is produced by a
+        # sibling branch, so plan from the niche + research summaries instead.
+        if state.get("technical_architecture"):
+            planning_context = (
+                "**Technical Architecture Context:**\n"
+                + _brief(state.get("technical_architecture"), 3000)
+            )
+        else:
+            planning_context = (
+                "**Niche Analysis Summary:**\n"
+                + _brief(state.get("niche_analysis"), 1500)
+                + "\n\n**Literature Review Summary:**\n"
+                + _brief(state.get("literature_review"), 1500)
+            )
         
         system_msg = SystemMessage(content=f"""You are a Technical Lead / Scrum Master with expertise in breaking down complex projects into actionable implementation plans.
 
 Your mission: Create a comprehensive implementation roadmap for "{state['niche']}"
 
-**Technical Architecture Context:**
-{architecture}
+{planning_context}
 
 **Planning Requirements:**
 
@@ -896,11 +942,10 @@ Week  | Phase              | Deliverables
         )
         
         return {
-            **state,
             "implementation_plan": plan,
             "current_agent": "content_synthesizer",
-            "agent_history": state.get("agent_history", []) + ["implementation_specialist"],
-            "messages": state.get("messages", []) + [system_msg, human_msg],
+            "agent_history": ["implementation_specialist"],
+            "messages": compact_node_messages("implementation_specialist", [system_msg, human_msg]),
         }
         
     except Exception as e:
@@ -910,16 +955,11 @@ Week  | Phase              | Deliverables
             error_type=type(e).__name__,
         )
         
-        errors = state.get("errors", [])
-        errors.append(f"ImplementationSpecialist: {str(e)}")
-        
-        retry_count = state.get("retry_count", {})
-        retry_count["implementation_specialist"] = retry_count.get("implementation_specialist", 0) + 1
+        previous_retries = (state.get("retry_count") or {}).get("implementation_specialist", 0)
         
         return {
-            **state,
-            "errors": errors,
-            "retry_count": retry_count,
+            "errors": [f"ImplementationSpecialist: {str(e)}"],
+            "retry_count": {"implementation_specialist": previous_retries + 1},
         }
 
 
@@ -957,20 +997,16 @@ async def content_synthesizer_node(state: ResearchState) -> ResearchState:
         # Initialize LLM - Supports both GitHub Models and Ollama
         # GitHub Models: gpt-4o (best for synthesis and writing)
         # Ollama: mistral:7b (32K context, unlimited local inference)
-        llm = create_model(
-            provider=LLM_PROVIDER,
-            model="mistral:7b" if USE_OLLAMA else settings.GITHUB_MODEL,
-            temperature=0.7,
-        )
+        llm = create_model(**AGENT_MODEL_SPEC)
         
         # Use module-level tool functions directly (no need for instances)
         tools = [save_analysis]
         
         # Get all context
-        niche_analysis = state.get("niche_analysis", "Not available")
-        literature_review = state.get("literature_review", "Not available")
-        architecture = state.get("technical_architecture", "Not available")
-        impl_plan = state.get("implementation_plan", "Not available")
+        niche_analysis = _brief(state.get("niche_analysis"), 2000)
+        literature_review = _brief(state.get("literature_review"), 3000)
+        architecture = _brief(state.get("technical_architecture"), 3000)
+        impl_plan = _brief(state.get("implementation_plan"), 2000)
         
         system_msg = SystemMessage(content=f"""You are a Technical Editor and Documentation Specialist with expertise in synthesizing complex technical content into coherent, professional reports.
 
@@ -979,16 +1015,16 @@ Your mission: Create a comprehensive final report for "{state['niche']}" that in
 **Source Materials:**
 
 **1. Niche Analysis:**
-{niche_analysis[:2000]}
+{niche_analysis}
 
 **2. Literature Review:**
-{literature_review[:3000]}
+{literature_review}
 
 **3. Technical Architecture:**
-{architecture[:3000]}
+{architecture}
 
 **4. Implementation Plan:**
-{impl_plan[:2000]}
+{impl_plan}
 
 **Synthesis Requirements:**
 
@@ -1187,11 +1223,10 @@ Your mission: Create a comprehensive final report for "{state['niche']}" that in
         )
         
         return {
-            **state,
             "final_report": final_report,
             "current_agent": "completed",
-            "agent_history": state.get("agent_history", []) + ["content_synthesizer"],
-            "messages": state.get("messages", []) + [system_msg, human_msg],
+            "agent_history": ["content_synthesizer"],
+            "messages": compact_node_messages("content_synthesizer", [system_msg, human_msg]),
             "end_time": end_time,
         }
         
@@ -1202,16 +1237,11 @@ Your mission: Create a comprehensive final report for "{state['niche']}" that in
             error_type=type(e).__name__,
         )
         
-        errors = state.get("errors", [])
-        errors.append(f"ContentSynthesizer: {str(e)}")
-        
-        retry_count = state.get("retry_count", {})
-        retry_count["content_synthesizer"] = retry_count.get("content_synthesizer", 0) + 1
+        previous_retries = (state.get("retry_count") or {}).get("content_synthesizer", 0)
         
         return {
-            **state,
-            "errors": errors,
-            "retry_count": retry_count,
+            "errors": [f"ContentSynthesizer: {str(e)}"],
+            "retry_count": {"content_synthesizer": previous_retries + 1},
         }
 
 
@@ -1287,9 +1317,45 @@ def check_budget(state: ResearchState) -> Literal["continue", "stop"]:
 # Graph Builder
 # =============================================================================
 
+def _add_sequential_edges(workflow: StateGraph) -> None:
+    """Original five-node chain (fallback mode)."""
+    workflow.set_entry_point("niche_analyst")
+    
+    workflow.add_edge("niche_analyst", "literature_researcher")
+    workflow.add_edge("literature_researcher", "technical_architect")
+    workflow.add_edge("technical_architect", "implementation_specialist")
+    workflow.add_edge("implementation_specialist", "content_synthesizer")
+    workflow.add_edge("content_synthesizer", END)
+
+
+def _add_parallel_edges(workflow: StateGraph) -> None:
+    """
+    Fan-out/fan-in topology.
+    
+    Stage 1: community scan (NicheAnalyst) || paper search (LiteratureResearcher)
+    Stage 2: architecture (TechnicalArchitect) || plan & risks (ImplementationSpecialist)
+    Stage 3: ContentSynthesizer merges everything
+    
+    A list of sources in add_edge makes the target wait for all of them,
+    so each stage only starts once both branches have written their outputs.
+    """
+    research_branches = ["niche_analyst", "literature_researcher"]
+    design_branches = ["technical_architect", "implementation_specialist"]
+    
+    for node in research_branches:
+        workflow.add_edge(START, node)
+    
+    for node in design_branches:
+        workflow.add_edge(research_branches, node)
+    
+    workflow.add_edge(design_branches, "content_synthesizer")
+    workflow.add_edge("content_synthesizer", END)
+
+
 def create_research_graph(
     enable_checkpointing: bool = True,
-    checkpoint_backend: Literal["memory", "redis"] = "memory",
+    checkpoint_backend: Optional[CheckpointBackend] = None,
+    mode: Optional[GraphMode] = None,
 ) -> StateGraph:
     """
     Creates the LangGraph research pipeline.
@@ -1297,13 +1363,16 @@ def create_research_graph(
     Args:
         enable_checkpointing: Enable state persistence
         checkpoint_backend: "memory" for dev, "redis" for production
+            (persistent, resumable). Default: settings.PIPELINE_CHECKPOINT_BACKEND
+        mode: "sequential" (five-node chain) or "parallel" (fan-out/fan-in).
+            Default: settings.PIPELINE_GRAPH_MODE
     
     Returns:
         Compiled StateGraph ready for execution
     
     Usage:
         ```python
-        graph = create_research_graph()
+        graph = create_research_graph(mode="parallel")
         
         result = await graph.ainvoke({
             "niche": "Rust WebAssembly for audio processing",
@@ -1313,6 +1382,7 @@ def create_research_graph(
             "warnings": [],
             "retry_count": {},
             "total_credits_used": 0.0,
+            "token_usage": {},
             "budget_limit": 10.0,
             "budget_exceeded": False,
             "start_time": datetime.now(timezone.utc).isoformat(),
@@ -1321,8 +1391,12 @@ def create_research_graph(
         print(result["final_report"])
         ```
     """
+    mode = mode or settings.PIPELINE_GRAPH_MODE
+    checkpoint_backend = checkpoint_backend or settings.PIPELINE_CHECKPOINT_BACKEND
+    
     logger.info(
         "creating_research_graph",
+        mode=mode,
         checkpointing=enable_checkpointing,
         backend=checkpoint_backend if enable_checkpointing else None,
     )
@@ -1330,26 +1404,25 @@ def create_research_graph(
     # Initialize graph
     workflow = StateGraph(ResearchState)
     
-    # Add agent nodes
-    workflow.add_node("niche_analyst", niche_analyst_node)
-    workflow.add_node("literature_researcher", literature_researcher_node)
-    workflow.add_node("technical_architect", technical_architect_node)
-    workflow.add_node("implementation_specialist", implementation_specialist_node)
-    workflow.add_node("content_synthesizer", content_synthesizer_node)
+    # Add agent nodes (wrapped to account the tokens of their LLM calls)
+    workflow.add_node("niche_analyst", tracked_node("niche_analyst", niche_analyst_node))
+    workflow.add_node("literature_researcher", tracked_node("literature_researcher", literature_researcher_node))
+    workflow.add_node("technical_architect", tracked_node("technical_architect", technical_architect_node))
+    workflow.add_node("implementation_specialist", tracked_node("implementation_specialist", implementation_specialist_node))
+    workflow.add_node("content_synthesizer", tracked_node("content_synthesizer", content_synthesizer_node))
     
-    # Set entry point
-    workflow.set_entry_point("niche_analyst")
-    
-    # Add sequential edges (happy path)
-    workflow.add_edge("niche_analyst", "literature_researcher")
-    workflow.add_edge("literature_researcher", "technical_architect")
-    workflow.add_edge("technical_architect", "implementation_specialist")
-    workflow.add_edge("implementation_specialist", "content_synthesizer")
-    workflow.add_edge("content_synthesizer", END)
+    if mode == "parallel":
+        _add_parallel_edges(workflow)
+    elif mode == "sequential":
+        _add_sequential_edges(workflow)
+    else:
+        logger.warning("unknown_graph_mode", mode=mode, fallback="sequential")
+        mode = "sequential"
+        _add_sequential_edges(workflow)
     
     # TODO: Add conditional edges for retry/error handling
     # This would require modifying the node functions to return control flags
-    # For v1, we'll use simple sequential flow with exception handling in nodes
+    # For v1, we'll use simple flow with exception handling in nodes
     
     # Set up checkpointing
     checkpointer = None
@@ -1358,14 +1431,12 @@ def create_research_graph(
             checkpointer = MemorySaver()
             logger.info("checkpointing_enabled", backend="memory")
         elif checkpoint_backend == "redis":
-            # TODO: Implement Redis checkpointing
-            # from langgraph.checkpoint.redis import RedisSaver
-            # checkpointer = RedisSaver(...)
-            logger.warning(
-                "redis_checkpointing_not_implemented",
-                fallback="memory",
+            checkpointer = RedisCheckpointSaver.from_settings()
+            logger.info(
+                "checkpointing_enabled",
+                backend="redis",
+                ttl=checkpointer.ttl,
             )
-            checkpointer = MemorySaver()
         else:
             logger.warning(
                 "unknown_checkpoint_backend",
@@ -1377,7 +1448,12 @@ def create_research_graph(
     # Compile graph
     graph = workflow.compile(checkpointer=checkpointer)
     
-    logger.info("research_graph_created", nodes=5, checkpointing=checkpointer is not None)
+    logger.info(
+        "research_graph_created",
+        nodes=5,
+        mode=mode,
+        checkpointing=checkpointer is not None,
+    )
     
     return graph
 
@@ -1386,10 +1462,51 @@ def create_research_graph(
 # Convenience Functions
 # =============================================================================
 
+async def _find_resume_config(graph, config: dict) -> Optional[dict]:
+    """
+    Find the checkpoint to resume a thread from.
+    
+    - Interrupted run (crash, cancellation): the latest checkpoint still has
+      pending nodes, so resuming continues from it.
+    - Completed run with failed nodes (nodes catch their own errors and
+      leave their output empty): resume from the first checkpoint scheduled
+      to run a failed node. Everything before it is reused from the checkpoint.
+    
+    Returns:
+        Config to pass to graph.ainvoke(None, ...), or None if the thread
+        has no checkpoints
+    """
+    snapshot = await graph.aget_state(config)
+    if not snapshot.values:
+        return None
+    
+    if snapshot.next:
+        return snapshot.config
+    
+    failed = {
+        node for node, field in NODE_OUTPUTS.items()
+        if not snapshot.values.get(field)
+    }
+    if not failed:
+        # Already complete: re-invoking the final checkpoint is a no-op
+        return snapshot.config
+    
+    history = [s async for s in graph.aget_state_history(config)]
+    for past in reversed(history):  # oldest first
+        if failed & set(past.next):
+            return past.config
+    
+    return None
+
+
 async def run_research_pipeline(
     niche: str,
     budget_limit: float = 10.0,
     enable_checkpointing: bool = True,
+    mode: Optional[GraphMode] = None,
+    checkpoint_backend: Optional[CheckpointBackend] = None,
+    thread_id: Optional[str] = None,
+    resume: bool = False,
 ) -> ResearchState:
     """
     Convenience function to run the complete research pipeline.
@@ -1398,6 +1515,13 @@ async def run_research_pipeline(
         niche: Research topic/niche to analyze
         budget_limit: Maximum credits to spend (mostly for LLM calls)
         enable_checkpointing: Enable state persistence
+        mode: "sequential" or "parallel" (default: settings.PIPELINE_GRAPH_MODE)
+        checkpoint_backend: "memory" or "redis"
+            (default: settings.PIPELINE_CHECKPOINT_BACKEND)
+        thread_id: Checkpoint thread (default: a new "pipeline-<timestamp>" id,
+            logged as checkpointing_config_set)
+        resume: Resume thread_id from the last completed node instead of
+            starting over. Requires a persistent backend ("redis")
     
     Returns:
         Final state with completed research report
@@ -1410,18 +1534,32 @@ async def run_research_pipeline(
         )
         
         print(result["final_report"])
+        
+        # After a failure in content_synthesizer, only that node runs again
+        result = await run_research_pipeline(
+            niche="Rust WebAssembly for real-time audio processing",
+            checkpoint_backend="redis",
+            thread_id="pipeline-20250101-120000",
+            resume=True,
+        )
         ```
     """
+    if resume and not (enable_checkpointing and thread_id):
+        raise ValueError("resume=True requires enable_checkpointing and a thread_id")
+    
     logger.info(
         "starting_research_pipeline",
         niche=niche,
         budget_limit=budget_limit,
+        mode=mode or settings.PIPELINE_GRAPH_MODE,
+        resume=resume,
     )
     
     # Create graph
     graph = create_research_graph(
         enable_checkpointing=enable_checkpointing,
-        checkpoint_backend="memory",
+        checkpoint_backend=checkpoint_backend,
+        mode=mode,
     )
     
     # Initialize state
@@ -1441,6 +1579,7 @@ async def run_research_pipeline(
         "warnings": [],
         "retry_count": {},
         "total_credits_used": 0.0,
+        "token_usage": {},
         "budget_limit": budget_limit,
         "budget_exceeded": False,
     }
@@ -1451,11 +1590,23 @@ async def run_research_pipeline(
         config = {}
         if enable_checkpointing:
             # Generate unique thread_id for this pipeline run
-            thread_id = f"pipeline-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            thread_id = thread_id or f"pipeline-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
             config = {"configurable": {"thread_id": thread_id}}
             logger.info("checkpointing_config_set", thread_id=thread_id)
         
-        result = await graph.ainvoke(initial_state, config)
+        resume_config = await _find_resume_config(graph, config) if resume else None
+        
+        if resume_config is not None:
+            logger.info(
+                "resuming_research_pipeline",
+                thread_id=thread_id,
+                checkpoint_id=resume_config["configurable"].get("checkpoint_id"),
+            )
+            result = await graph.ainvoke(None, resume_config)
+        else:
+            if resume:
+                logger.warning("nothing_to_resume", thread_id=thread_id)
+            result = await graph.ainvoke(initial_state, config)
         
         logger.info(
             "research_pipeline_completed",
@@ -1463,6 +1614,11 @@ async def run_research_pipeline(
             agents_executed=len(result.get("agent_history", [])),
             has_final_report=result.get("final_report") is not None,
             errors_count=len(result.get("errors", [])),
+            total_tokens=sum(
+                usage.get("total_tokens", 0)
+                for usage in (result.get("token_usage") or {}).values()
+            ),
+            total_credits_used=result.get("total_credits_used", 0.0),
         )
         
         return result
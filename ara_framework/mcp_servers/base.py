@@ -7,13 +7,15 @@ Todos los MCP servers deben heredar de MCPAdapter y implementar
 los métodos abstractos.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Generic, TypeVar
-import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Generic, TypeVar
+import json
 from datetime import datetime
 import structlog
 from redis.asyncio import Redis
 
 from config.settings import settings
+from mcp_servers.cache import LocalTTLCache, SingleFlight
+from mcp_servers.rate_limit import RateLimit, RateLimiter, create_rate_limiter
 
 logger = structlog.get_logger()
 
@@ -26,7 +28,7 @@ class MCPAdapter(ABC, Generic[T]):
     
     Funcionalidades comunes:
     - Rate limiting
-    - Caching (Redis)
+    - Caching de dos niveles (L1 en proceso + Redis), single-flight y tags
     - Error handling
     - Telemetry
     - Retry logic
@@ -38,7 +40,16 @@ class MCPAdapter(ABC, Generic[T]):
         redis_client: Optional[Redis] = None,
         rate_limit_rpm: int = 60,
         cache_ttl: int = 3600,
+        rate_limit: Optional[RateLimit] = None,
     ):
+        """
+        Args:
+            name: Nombre del adapter (logs, cache keys, rate limit key)
+            redis_client: Cliente Redis para cache y rate limit compartido
+            rate_limit_rpm: Límite en requests/minuto (si no se pasa rate_limit)
+            cache_ttl: TTL del cache en segundos
+            rate_limit: Límite explícito (RPS/RPM con burst), tiene prioridad
+        """
         self.name = name
         self.redis = redis_client
         self.rate_limit_rpm = rate_limit_rpm
@@ -46,9 +57,20 @@ class MCPAdapter(ABC, Generic[T]):
         
         self.logger = logger.bind(mcp_adapter=name)
         
-        # Rate limiter (sliding window)
-        self._request_timestamps: list[float] = []
-        self._rate_limit_lock = asyncio.Lock()
+        # Rate limiter (token bucket, en proceso o compartido vía Redis)
+        self.rate_limit = rate_limit or RateLimit.per_minute(rate_limit_rpm)
+        self.rate_limiter: RateLimiter = create_rate_limiter(
+            name,
+            self.rate_limit,
+            redis_client,
+        )
+        
+        # Cache L1 en proceso (delante de Redis) + de-duplicación de misses
+        self._local_cache = LocalTTLCache(
+            max_entries=settings.MCP_L1_CACHE_MAX_ENTRIES,
+            default_ttl=min(cache_ttl, settings.MCP_L1_CACHE_MAX_TTL),
+        )
+        self._single_flight = SingleFlight()
     
     @abstractmethod
     async def connect(self) -> None:
@@ -67,46 +89,42 @@ class MCPAdapter(ABC, Generic[T]):
     
     async def _wait_for_rate_limit(self) -> None:
         """
-        Rate limiting con sliding window.
+        Rate limiting con token bucket (ver mcp_servers/rate_limit.py).
         
-        Ejemplo: Si rate_limit_rpm=60, solo permite 60 requests en 60 segundos.
+        Ejemplo: RateLimit.per_second(1) permite 1 request/seg; con
+        MCP_RATE_LIMIT_BACKEND="redis" el límite se comparte entre workers.
         """
-        async with self._rate_limit_lock:
-            now = asyncio.get_event_loop().time()
-            window_start = now - 60.0
-            
-            # Limpiar timestamps antiguos
-            self._request_timestamps = [
-                ts for ts in self._request_timestamps if ts > window_start
-            ]
-            
-            # Si alcanzamos el límite, esperar
-            if len(self._request_timestamps) >= self.rate_limit_rpm:
-                oldest = self._request_timestamps[0]
-                wait_time = 60.0 - (now - oldest)
-                
-                if wait_time > 0:
-                    self.logger.debug(
-                        "rate_limit_waiting",
-                        wait_seconds=wait_time,
-                        current_requests=len(self._request_timestamps),
-                    )
-                    await asyncio.sleep(wait_time)
-            
-            # Registrar este request
-            self._request_timestamps.append(now)
+        await self.rate_limiter.acquire()
+    
+    def _l1_ttl(self, ttl: Optional[float]) -> float:
+        """TTL del L1: nunca más que el de Redis ni que MCP_L1_CACHE_MAX_TTL."""
+        if ttl is None or ttl < 0:
+            ttl = self.cache_ttl
+        return min(ttl, settings.MCP_L1_CACHE_MAX_TTL)
     
     async def _get_cached(self, cache_key: str) -> Optional[T]:
-        """Obtiene valor del cache (Redis)."""
+        """Obtiene valor del cache (L1 en proceso, luego Redis)."""
+        value = self._local_cache.get(cache_key)
+        if value is not None:
+            self.logger.debug("cache_hit", key=cache_key, tier="l1")
+            return value
+        
         if not self.redis:
             return None
         
         try:
-            cached = await self.redis.get(cache_key)
+            # Valor + TTL restante en un solo round-trip
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.get(cache_key)
+            pipe.ttl(cache_key)
+            cached, remaining_ttl = await pipe.execute()
+            
             if cached:
-                self.logger.debug("cache_hit", key=cache_key)
-                import json
-                return json.loads(cached)
+                self.logger.debug("cache_hit", key=cache_key, tier="redis")
+                value = json.loads(cached)
+                # El L1 expira junto con (o antes que) la entrada de Redis
+                self._local_cache.set(cache_key, value, ttl=self._l1_ttl(remaining_ttl))
+                return value
             else:
                 self.logger.debug("cache_miss", key=cache_key)
                 return None
@@ -114,47 +132,158 @@ class MCPAdapter(ABC, Generic[T]):
             self.logger.error("cache_get_error", error=str(e), key=cache_key)
             return None
     
+    async def _get_cached_many(self, cache_keys: List[str]) -> Dict[str, T]:
+        """
+        Lectura en lote: L1 primero, el resto con un solo MGET a Redis.
+        
+        Returns:
+            Dict {cache_key: valor} solo con los hits
+        """
+        found: Dict[str, T] = {}
+        missing = []
+        for cache_key in cache_keys:
+            value = self._local_cache.get(cache_key)
+            if value is not None:
+                found[cache_key] = value
+            else:
+                missing.append(cache_key)
+        
+        if not missing or not self.redis:
+            return found
+        
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.mget(missing)
+            for cache_key in missing:
+                pipe.ttl(cache_key)
+            raw_values, *ttls = await pipe.execute()
+            
+            for cache_key, raw, remaining_ttl in zip(missing, raw_values, ttls):
+                if raw:
+                    value = json.loads(raw)
+                    self._local_cache.set(cache_key, value, ttl=self._l1_ttl(remaining_ttl))
+                    found[cache_key] = value
+        except Exception as e:
+            self.logger.error("cache_get_many_error", error=str(e), keys=len(missing))
+        
+        self.logger.debug("cache_get_many", requested=len(cache_keys), hits=len(found))
+        return found
+    
     async def _set_cached(
         self,
         cache_key: str,
         value: T,
         ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
     ) -> None:
-        """Guarda valor en cache (Redis)."""
+        """
+        Guarda valor en cache (L1 + Redis).
+        
+        Args:
+            cache_key: Key (ver _make_cache_key)
+            value: Valor serializable a JSON
+            ttl: TTL en segundos (default: self.cache_ttl)
+            tags: Tags para invalidar en grupo (ver _invalidate_tags)
+        """
+        ttl = ttl or self.cache_ttl
+        tags = list(tags)
+        self._local_cache.set(cache_key, value, ttl=self._l1_ttl(ttl), tags=tags)
+        
         if not self.redis:
             return
         
         try:
-            import json
-            ttl = ttl or self.cache_ttl
-            await self.redis.setex(
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(
                 cache_key,
                 ttl,
                 json.dumps(value, default=str)
             )
+            for tag in tags:
+                tag_key = self._make_tag_key(tag)
+                pipe.sadd(tag_key, cache_key)
+                # El set vive al menos tanto como sus entradas
+                pipe.expire(tag_key, ttl, gt=True)
+                pipe.expire(tag_key, ttl, nx=True)
+            await pipe.execute()
             self.logger.debug("cache_set", key=cache_key, ttl=ttl)
         except Exception as e:
             self.logger.error("cache_set_error", error=str(e), key=cache_key)
     
-    async def _invalidate_cache(self, pattern: str) -> int:
-        """Invalida cache que coincida con el patrón."""
+    async def _get_or_fetch(
+        self,
+        cache_key: str,
+        fetch: Callable[[], Awaitable[Optional[T]]],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> Optional[T]:
+        """
+        Lectura de cache con fetch upstream en caso de miss.
+        
+        Misses concurrentes de la misma key esperan un único fetch
+        (single-flight), así no gastan rate limit en requests duplicados.
+        Resultados None no se cachean.
+        
+        Args:
+            cache_key: Key (ver _make_cache_key)
+            fetch: Coroutine function que obtiene el valor serializable
+            ttl: TTL en segundos (default: self.cache_ttl)
+            tags: Tags de la entrada
+        """
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        async def fetch_and_store() -> Optional[T]:
+            value = await fetch()
+            if value is not None:
+                await self._set_cached(cache_key, value, ttl=ttl, tags=tags)
+            return value
+        
+        value, shared = await self._single_flight.do(cache_key, fetch_and_store)
+        if shared:
+            self.logger.debug("cache_miss_coalesced", key=cache_key)
+        return value
+    
+    async def _invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalida todas las entradas asociadas a los tags (L1 + Redis).
+        
+        Returns:
+            Número de entradas eliminadas en Redis (o en L1 si no hay Redis)
+        """
+        local_count = self._local_cache.invalidate_tags(*tags)
+        
         if not self.redis:
-            return 0
+            return local_count
         
         try:
-            keys = []
-            async for key in self.redis.scan_iter(match=pattern):
-                keys.append(key)
+            tag_keys = [self._make_tag_key(tag) for tag in tags]
+            pipe = self.redis.pipeline(transaction=False)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+            
+            keys = set().union(*members) if members else set()
+            # Entradas de otros procesos que este L1 no conocía
+            self._local_cache.delete(*keys)
             
+            pipe = self.redis.pipeline(transaction=False)
             if keys:
-                deleted = await self.redis.delete(*keys)
-                self.logger.info("cache_invalidated", pattern=pattern, count=deleted)
-                return deleted
-            return 0
+                pipe.delete(*keys)
+            pipe.delete(*tag_keys)
+            results = await pipe.execute()
+            deleted = results[0] if keys else 0
+            self.logger.info("cache_invalidated", tags=list(tags), count=deleted)
+            return deleted
         except Exception as e:
-            self.logger.error("cache_invalidate_error", error=str(e), pattern=pattern)
+            self.logger.error("cache_invalidate_error", error=str(e), tags=list(tags))
             return 0
     
+    def _make_tag_key(self, tag: str) -> str:
+        """Key del set Redis que indexa las entradas de un tag."""
+        return f"mcp:{self.name}:tag:{tag}"
+    
     def _make_cache_key(self, *parts: str) -> str:
         """Genera cache key consistente."""
         return f"mcp:{self.name}:{':'.join(parts)}"
@@ -0,0 +1,292 @@
+"""
+Ciclo de vida del browser de PlaywrightAdapter.
+
+El ScrapingTool singleton iniciaba Chromium en el primer uso y no lo
+liberaba nunca: en los workers de la API la memoria del browser crecía
+job tras job. BrowserManager envuelve al adapter:
+- Pre-warm opcional (arranque de la API) y arranque lazy en el primer uso
+- Apagado tras SCRAPE_BROWSER_IDLE_TIMEOUT segundos sin uso
+- Reinicio automático si el browser crashea (evento "disconnected") o tras
+  SCRAPE_BROWSER_MAX_PAGES páginas servidas; el reinicio espera a que
+  terminen las sesiones en curso y las nuevas esperan al browser nuevo
+- metrics(): estado, reinicios por motivo, páginas, RSS de los procesos
+  del browser y stats de los pools de páginas
+- Los refreshes de background del adapter (stale_while_revalidate) corren
+  dentro de una session(): el apagado y los reinicios los esperan
+
+Usage:
+    ```python
+    from mcp_servers.browser_manager import BrowserManager
+
+    manager = BrowserManager(PlaywrightAdapter())
+    async with manager.session() as adapter:
+        content = await adapter.scrape_page(url)
+    await manager.close()
+    ```
+"""
+import asyncio
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import structlog
+
+from mcp_servers.playwright_mcp import PlaywrightAdapter
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Nombres de proceso de los browsers de Playwright
+BROWSER_PROCESS_NAMES = ("chrom", "headless_shell", "firefox", "webkit")
+
+
+def _linux_process_tree() -> Dict[int, Dict[str, Any]]:
+    """{pid: {ppid, name, rss}} leído de /proc (sin psutil)."""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    processes = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+            with open(f"/proc/{entry}/statm") as f:
+                resident = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        # "pid (name) state ppid ..." - el nombre puede contener espacios
+        name = stat[stat.index("(") + 1:stat.rindex(")")]
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        processes[int(entry)] = {"ppid": ppid, "name": name, "rss": resident * page_size}
+    return processes
+
+
+def browser_rss_bytes() -> Optional[int]:
+    """
+    RSS total de los procesos de browser descendientes de este proceso.
+
+    Returns:
+        Bytes, o None si no se puede medir en esta plataforma
+    """
+    if psutil is not None:
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                if child.name().lower().startswith(BROWSER_PROCESS_NAMES):
+                    total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    if not os.path.isdir("/proc"):
+        return None
+
+    processes = _linux_process_tree()
+    children: Dict[int, list] = {}
+    for pid, info in processes.items():
+        children.setdefault(info["ppid"], []).append(pid)
+
+    total = 0
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        if processes[pid]["name"].lower().startswith(BROWSER_PROCESS_NAMES):
+            total += processes[pid]["rss"]
+    return total
+
+
+class BrowserManager:
+    """Arranque, apagado por inactividad y reinicio del browser de un adapter."""
+
+    def __init__(
+        self,
+        adapter: PlaywrightAdapter,
+        idle_timeout: Optional[float] = None,
+        max_pages: Optional[int] = None,
+    ):
+        """
+        Args:
+            adapter: PlaywrightAdapter (no conectado)
+            idle_timeout: Segundos sin uso antes de cerrar el browser
+                (default: SCRAPE_BROWSER_IDLE_TIMEOUT, 0 = nunca)
+            max_pages: Páginas servidas antes de reiniciar el browser
+                (default: SCRAPE_BROWSER_MAX_PAGES, 0 = nunca)
+        """
+        self.adapter = adapter
+        self.idle_timeout = (
+            settings.SCRAPE_BROWSER_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        )
+        self.max_pages = settings.SCRAPE_BROWSER_MAX_PAGES if max_pages is None else max_pages
+
+        self.running = False
+        self._crashed = False
+        self._draining = False
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+        self._idle_task: Optional[asyncio.Task] = None
+
+        self._started_at: Optional[float] = None
+        self._last_used = time.monotonic()
+        self.starts = 0
+        self.restarts: Counter = Counter()
+        self.idle_shutdowns = 0
+        self.pages_since_start = 0
+        self.total_pages = 0
+
+        self._revalidator = getattr(adapter, "revalidator", None)
+        if self._revalidator is not None:
+            self._revalidator.background_session = self.session
+
+    # ============================================================
+    # Arranque / apagado (con self._cond tomado)
+    # ============================================================
+
+    def _on_disconnected(self, *args: Any) -> None:
+        if self.running:
+            self._crashed = True
+            logger.warning("browser_disconnected", pages_since_start=self.pages_since_start)
+
+    async def _start_locked(self) -> None:
+        await self.adapter.connect()
+        if self.adapter.browser is not None:
+            self.adapter.browser.on("disconnected", self._on_disconnected)
+
+        self.running = True
+        self._crashed = False
+        self._started_at = time.monotonic()
+        self._last_used = self._started_at
+        self.pages_since_start = 0
+        self.starts += 1
+
+        if self.idle_timeout and (self._idle_task is None or self._idle_task.done()):
+            self._idle_task = asyncio.create_task(self._idle_watch())
+
+        logger.info("browser_started", starts=self.starts)
+
+    async def _stop_locked(self) -> None:
+        self.running = False
+        try:
+            await self.adapter.disconnect()
+        except Exception as e:
+            # Tras un crash el browser ya no responde: solo se limpia
+            logger.warning("browser_stop_failed", error=str(e))
+        self._started_at = None
+
+    def _restart_reason(self) -> Optional[str]:
+        if not self.running:
+            return None
+        browser = self.adapter.browser
+        if self._crashed or (browser is not None and not browser.is_connected()):
+            return "crashed"
+        if self.max_pages and self.pages_since_start >= self.max_pages:
+            return "max_pages"
+        return None
+
+    async def _idle_watch(self) -> None:
+        interval = min(max(self.idle_timeout / 4, 0.05), 30.0)
+        while True:
+            await asyncio.sleep(interval)
+            async with self._cond:
+                if not self.running:
+                    return
+                idle = time.monotonic() - self._last_used
+                if self._in_flight == 0 and not self._draining and idle >= self.idle_timeout:
+                    await self._stop_locked()
+                    self.idle_shutdowns += 1
+                    logger.info("browser_idle_shutdown", idle_seconds=round(idle, 1))
+                    return
+
+    # ============================================================
+    # API pública
+    # ============================================================
+
+    async def start(self) -> None:
+        """Inicia el browser si no está corriendo (pre-warm)."""
+        async with self._cond:
+            if not self.running:
+                await self._start_locked()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[PlaywrightAdapter]:
+        """
+        Adapter conectado para una operación (una página).
+
+        Inicia el browser si hace falta y lo reinicia antes de entregarlo si
+        crasheó o alcanzó max_pages.
+        """
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._draining)
+
+            reason = self._restart_reason()
+            if reason is not None:
+                self._draining = True
+                try:
+                    await self._cond.wait_for(lambda: self._in_flight == 0)
+                    await self._stop_locked()
+                    self.restarts[reason] += 1
+                    logger.info("browser_restarting", reason=reason, pages=self.pages_since_start)
+                    await self._start_locked()
+                finally:
+                    self._draining = False
+                    self._cond.notify_all()
+            elif not self.running:
+                await self._start_locked()
+
+            self._in_flight += 1
+            self.pages_since_start += 1
+            self.total_pages += 1
+
+        try:
+            yield self.adapter
+        finally:
+            async with self._cond:
+                self._in_flight -= 1
+                self._last_used = time.monotonic()
+                self._cond.notify_all()
+
+    async def health_check(self) -> bool:
+        """True si el browser no está corriendo (arranca bajo demanda) o responde."""
+        if not self.running:
+            return True
+        if self._restart_reason() == "crashed":
+            return False
+        return await self.adapter.health_check()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Estado del browser, reinicios, páginas servidas y memoria."""
+        now = time.monotonic()
+        rss = browser_rss_bytes() if self.running else 0
+        return {
+            "running": self.running,
+            "crashed": self._restart_reason() == "crashed",
+            "in_flight": self._in_flight,
+            "uptime_seconds": round(now - self._started_at, 1) if self._started_at else 0.0,
+            "idle_seconds": round(now - self._last_used, 1),
+            "starts": self.starts,
+            "restarts": dict(self.restarts),
+            "idle_shutdowns": self.idle_shutdowns,
+            "pages_since_start": self.pages_since_start,
+            "total_pages": self.total_pages,
+            "browser_rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+            "pools": self.adapter.pool_stats() if self.running else {},
+        }
+
+    async def close(self) -> None:
+        """Cierra el browser y detiene el watcher de inactividad."""
+        if self._idle_task is not None:
+            self._idle_task.cancel()
+            self._idle_task = None
+        # Antes de tomar el lock: una sesión de background lo necesita para salir
+        if self._revalidator is not None:
+            await self._revalidator.cancel()
+        async with self._cond:
+            if self.running:
+                await self._stop_locked()
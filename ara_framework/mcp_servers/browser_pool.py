@@ -0,0 +1,207 @@
+"""
+Pool de contextos y páginas de Playwright.
+
+Antes cada scrape abría una página nueva sobre un único BrowserContext
+compartido y descargaba todas las imágenes, fuentes, hojas de estilo y
+media de la página, aunque solo se extraía texto. Este pool:
+- Mantiene N slots (contexto + página) reutilizables; acquire espera un slot
+  libre, así el tamaño del pool también acota las páginas abiertas
+- Recicla un slot (cierra su contexto) tras N usos o si la página se cerró /
+  crasheó: evita que la memoria del renderer crezca sin límite
+- Intercepta requests por perfil: el perfil "text" aborta recursos pesados
+  (image, font, stylesheet, media); el perfil "full" carga todo (screenshots)
+
+Cada slot tiene su propio contexto: cookies y storage no se comparten entre
+páginas concurrentes, y cerrar el contexto libera toda su memoria.
+
+Usage:
+    ```python
+    from mcp_servers.browser_pool import BrowserPagePool, TEXT_PROFILE
+
+    pool = BrowserPagePool(browser, TEXT_PROFILE, size=3, max_uses=50)
+    async with pool.page() as page:
+        await page.goto(url)
+        text = await page.inner_text("body")
+    await pool.close()
+    ```
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Tipos de recurso (request.resource_type) que no aportan texto
+HEAVY_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media"})
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Qué recursos se bloquean en las páginas de un pool."""
+
+    name: str
+    blocked_resource_types: FrozenSet[str] = field(default_factory=frozenset)
+
+
+# Extracción de texto: HTML + scripts, sin assets pesados
+TEXT_PROFILE = RenderProfile("text", HEAVY_RESOURCE_TYPES)
+
+# Render completo (screenshots, JS que depende del layout)
+FULL_RENDER_PROFILE = RenderProfile("full")
+
+
+class _Slot:
+    """Un contexto con su página, creados bajo demanda."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.context: Any = None
+        self.page: Any = None
+        self.uses = 0
+
+    @property
+    def open(self) -> bool:
+        return self.page is not None and not self.page.is_closed()
+
+
+class BrowserPagePool:
+    """
+    Pool acotado de páginas sobre un Browser de Playwright.
+
+    Los slots vacíos o reciclados se (re)crean al adquirirlos, no al liberar:
+    un pool ocioso no mantiene contextos que nadie va a usar.
+    """
+
+    def __init__(
+        self,
+        browser: Any,
+        profile: RenderProfile = TEXT_PROFILE,
+        size: int = 3,
+        max_uses: int = 50,
+        context_options: Optional[Dict[str, Any]] = None,
+        init_script: Optional[str] = None,
+    ):
+        """
+        Args:
+            browser: Browser de Playwright ya lanzado
+            profile: Perfil de intercepción de requests
+            size: Número máximo de páginas abiertas
+            max_uses: Navegaciones por slot antes de reciclar su contexto
+                (0 = sin límite)
+            context_options: kwargs para browser.new_context()
+            init_script: Script inyectado en cada contexto (stealth)
+        """
+        self.browser = browser
+        self.profile = profile
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.context_options = dict(context_options or {})
+        self.init_script = init_script
+
+        self._slots: List[_Slot] = [_Slot(i) for i in range(self.size)]
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+
+        self.contexts_created = 0
+        self.recycled = 0
+        self.blocked_requests = 0
+        self.total_uses = 0
+
+    # ============================================================
+    # Contextos
+    # ============================================================
+
+    async def _route(self, route: Any) -> None:
+        if route.request.resource_type in self.profile.blocked_resource_types:
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _open(self, slot: _Slot) -> None:
+        options = dict(self.context_options)
+        if self.profile.blocked_resource_types:
+            # Los service workers pueden servir requests sin pasar por route()
+            options.setdefault("service_workers", "block")
+
+        context = await self.browser.new_context(**options)
+        try:
+            if self.init_script:
+                await context.add_init_script(self.init_script)
+            if self.profile.blocked_resource_types:
+                await context.route("**/*", self._route)
+            page = await context.new_page()
+        except BaseException:
+            await context.close()
+            raise
+
+        slot.context = context
+        slot.page = page
+        slot.uses = 0
+        self.contexts_created += 1
+
+    async def _discard(self, slot: _Slot) -> None:
+        context = slot.context
+        slot.context = None
+        slot.page = None
+        slot.uses = 0
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.warning(
+                    "browser_context_close_failed",
+                    profile=self.profile.name,
+                    slot=slot.index,
+                    error=str(e),
+                )
+
+    # ============================================================
+    # Acquire / release
+    # ============================================================
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """
+        Adquiere una página del pool (espera si todas están en uso).
+
+        Si el bloque lanza una excepción que deja la página cerrada, o el slot
+        alcanza max_uses, su contexto se cierra y se recrea en el próximo uso.
+        """
+        slot = await self._idle.get()
+        try:
+            if not slot.open:
+                await self._discard(slot)
+                await self._open(slot)
+
+            slot.uses += 1
+            self.total_uses += 1
+            yield slot.page
+        finally:
+            if slot.context is not None and (
+                not slot.open or (self.max_uses and slot.uses >= self.max_uses)
+            ):
+                self.recycled += 1
+                await asyncio.shield(self._discard(slot))
+            self._idle.put_nowait(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile.name,
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "open_pages": sum(1 for slot in self._slots if slot.open),
+            "contexts_created": self.contexts_created,
+            "recycled": self.recycled,
+            "total_uses": self.total_uses,
+            "blocked_requests": self.blocked_requests,
+        }
+
+    async def close(self) -> None:
+        """Cierra todos los contextos (los slots quedan reutilizables)."""
+        await asyncio.gather(*[self._discard(slot) for slot in self._slots])
+        logger.info("browser_pool_closed", **self.stats())
@@ -0,0 +1,153 @@
+"""
+Cache en proceso (L1) para MCP adapters.
+
+MCPAdapter usa dos niveles:
+- L1: LRU en memoria con TTL (este módulo), sin round-trip ni json.loads
+- L2: Redis (compartido entre procesos, persistente)
+
+Además:
+- SingleFlight: misses concurrentes de la misma key comparten un único
+  fetch upstream (ej: dos agentes buscando la misma query a la vez)
+- Tags: cada entrada puede asociarse a tags para invalidar por grupo sin
+  recorrer el keyspace
+
+Los valores se guardan por referencia: los callers no deben mutarlos (los
+adapters solo los usan para construir dataclasses nuevas).
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+
+class LocalTTLCache:
+    """LRU acotado por número de entradas, con expiración por entrada."""
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 3600):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Set[str]] = {}  # índice inverso para limpiar _tags
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna el valor o None si no existe / expiró."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._discard(key)
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """Guarda el valor; evicta las entradas menos usadas si se excede el tamaño."""
+        if self.max_entries <= 0:
+            return
+
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._unlink_tags(key)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        tags = set(tags)
+        if tags:
+            self._key_tags[key] = tags
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._data) > self.max_entries:
+            evicted, _ = self._data.popitem(last=False)
+            self._unlink_tags(evicted)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._discard(key)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Elimina las entradas asociadas a los tags. Retorna cuántas había."""
+        count = 0
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                if key in self._data:
+                    count += 1
+                self._discard(key)
+        return count
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._tags.clear()
+        self._key_tags.clear()
+
+    def _discard(self, key: str) -> None:
+        self._data.pop(key, None)
+        self._unlink_tags(key)
+
+    def _unlink_tags(self, key: str) -> None:
+        """Quita la key de sus tags (y los tags que quedan vacíos)."""
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class SingleFlight:
+    """De-duplica llamadas concurrentes por key (patrón singleflight de Go)."""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Ejecuta fn una sola vez por key mientras esté en curso.
+
+        Returns:
+            (resultado, shared) - shared=True si se reutilizó una llamada en curso
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita "exception was never retrieved" si nadie más esperaba
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._inflight[key]
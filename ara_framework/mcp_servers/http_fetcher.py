@@ -0,0 +1,285 @@
+"""
+Fetcher HTTP plano para páginas estáticas (primer nivel de scraping).
+
+La mayoría de las páginas que usan los agentes (abstracts de arXiv, READMEs
+de GitHub, posts de blogs) traen el contenido en el HTML del servidor: un
+GET con un cliente httpx con keep-alive + extracción de texto con
+BeautifulSoup tarda milisegundos, contra segundos y cientos de MB de una
+navegación con Chromium.
+
+El fetcher también decide si la página necesita un browser real:
+- Body vacío o casi vacío tras quitar scripts/estilos
+- <noscript> pidiendo habilitar JavaScript en una página con poco texto
+- Dominio conocido como SPA (SPA_DOMAINS)
+- wait_for_selector que no existe en el HTML del servidor
+
+En esos casos ScrapingTool escala a PlaywrightAdapter.scrape_page.
+
+Las páginas vencidas se revalidan con un GET condicional (ETag /
+Last-Modified / hash del body, ver mcp_servers/revalidation.py).
+
+Usage:
+    ```python
+    from mcp_servers.http_fetcher import HTTPFetcher
+
+    async with HTTPFetcher(redis_client) as fetcher:
+        content = await fetcher.fetch("https://arxiv.org/abs/2401.00001")
+        if content is None or content.metadata["render_required"]:
+            ...  # Escalar a Playwright
+    ```
+"""
+import asyncio
+import re
+from typing import Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import structlog
+from bs4 import BeautifulSoup
+
+from mcp_servers.base import MCPAdapter
+from mcp_servers.playwright_mcp import CONTEXT_OPTIONS, ScrapedContent
+from mcp_servers.rate_limit import RateLimit
+from mcp_servers.revalidation import NOT_MODIFIED, PageRecord, Revalidator
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Dominios cuyo HTML de servidor no trae el contenido (incluye subdominios)
+SPA_DOMAINS = frozenset({
+    "x.com",
+    "twitter.com",
+    "linkedin.com",
+    "instagram.com",
+    "facebook.com",
+    "discord.com",
+    "producthunt.com",
+    "notion.site",
+})
+
+# Content-types que el fetcher sabe convertir a texto
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+# Elementos sin texto visible
+NON_CONTENT_TAGS = ["script", "style", "noscript", "template", "svg", "iframe"]
+
+NOSCRIPT_JS_RE = re.compile(
+    r"(enable|requires?|turn on|activate|needs?)\W+(\w+\W+){0,4}javascript"
+    r"|javascript\W+(\w+\W+){0,3}(required|disabled|enabled)",
+    re.IGNORECASE,
+)
+
+# Con más texto que esto, un <noscript> no implica que falte el contenido
+NOSCRIPT_MAX_TEXT_LENGTH = 1000
+
+
+def is_spa_domain(url: str) -> bool:
+    """True si el host (o un dominio padre) está en SPA_DOMAINS."""
+    host = (urlsplit(url).hostname or "").lower()
+    parts = host.split(".")
+    return any(".".join(parts[i:]) in SPA_DOMAINS for i in range(len(parts) - 1))
+
+
+def html_to_text(html: str) -> Tuple[str, str, bool]:
+    """
+    Título y texto visible del HTML.
+
+    Returns:
+        (title, text, noscript_requires_js)
+    """
+    title, text, noscript_requires_js, _ = parse_page(html)
+    return title, text, noscript_requires_js
+
+
+def parse_page(html: str, selector: Optional[str] = None) -> Tuple[str, str, bool, Optional[bool]]:
+    """
+    Un solo parse del HTML: título, texto visible y si existe `selector`.
+
+    Es CPU-bound (BeautifulSoup/lxml): HTTPFetcher lo corre en un thread.
+
+    Returns:
+        (title, text, noscript_requires_js, selector_found) - selector_found
+        es None sin selector y False si el selector es inválido
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    selector_found = None
+    if selector:
+        try:
+            selector_found = soup.select_one(selector) is not None
+        except Exception:
+            selector_found = False
+
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    noscript_requires_js = any(
+        NOSCRIPT_JS_RE.search(tag.get_text(" ")) for tag in soup.find_all("noscript")
+    )
+
+    for tag in soup(NON_CONTENT_TAGS):
+        tag.decompose()
+
+    body = soup.body or soup
+    text = body.get_text("\n", strip=True)
+    return title, text, noscript_requires_js, selector_found
+
+
+def render_required_reason(
+    url: str,
+    text: str,
+    noscript_requires_js: bool,
+    min_text_length: Optional[int] = None,
+) -> Optional[str]:
+    """Motivo para escalar a un browser, o None si el HTML alcanza."""
+    min_text_length = settings.SCRAPE_MIN_TEXT_LENGTH if min_text_length is None else min_text_length
+    if is_spa_domain(url):
+        return "spa_domain"
+    if len(text) < min_text_length:
+        return "empty_body"
+    if noscript_requires_js and len(text) < NOSCRIPT_MAX_TEXT_LENGTH:
+        return "noscript"
+    return None
+
+
+class HTTPFetcher(MCPAdapter[ScrapedContent]):
+    """
+    GET con pool de conexiones + HTML → texto.
+
+    Rate Limiting: 10 requests/seg (ráfagas de 20); no hay browser que proteger
+    Cache TTL: 3 días (mismo TTL que el contenido scrapeado con Playwright);
+    después se revalida según SCRAPE_REVALIDATION_MODE
+    """
+
+    def __init__(self, redis_client=None):
+        super().__init__(
+            name="http_fetcher",
+            redis_client=redis_client,
+            rate_limit=RateLimit.per_second(10, burst=20),
+            cache_ttl=settings.REDIS_TTL_CONTENT,
+        )
+        self.client: Optional[httpx.AsyncClient] = None
+        self.revalidator = Revalidator(self, fresh_ttl=settings.REDIS_TTL_CONTENT)
+
+    async def connect(self) -> None:
+        """Crea el cliente HTTP con keep-alive (idempotente)."""
+        if self.client is not None:
+            return
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.SCRAPE_HTTP_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=settings.SCRAPE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SCRAPE_HTTP_MAX_CONNECTIONS,
+            ),
+            follow_redirects=True,
+            headers={
+                "User-Agent": CONTEXT_OPTIONS["user_agent"],
+                "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+        )
+        self.logger.info("http_fetcher_connected")
+
+    async def disconnect(self) -> None:
+        """Cierra el cliente HTTP."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            self.logger.info("http_fetcher_disconnected")
+
+    async def health_check(self) -> bool:
+        return self.client is not None and not self.client.is_closed
+
+    async def fetch(
+        self,
+        url: str,
+        include_html: bool = False,
+        wait_for_selector: Optional[str] = None,
+    ) -> Optional[ScrapedContent]:
+        """
+        Descarga la página y extrae el texto sin browser.
+
+        Args:
+            url: URL a descargar
+            include_html: Si incluir el HTML en el resultado
+            wait_for_selector: Selector que debe existir en el HTML del
+                servidor (si no existe, la página necesita render)
+
+        Returns:
+            ScrapedContent con metadata["render_required"] = motivo para
+            escalar a un browser (None si el texto es utilizable), o None si
+            la respuesta no es utilizable (error HTTP, content-type binario)
+
+        Raises:
+            httpx.HTTPError: Errores de red / timeout
+        """
+        cache_key = self._make_cache_key("page", url, str(include_html), wait_for_selector or "")
+
+        async def refresh(stale: Optional[PageRecord]) -> Any:
+            await self._wait_for_rate_limit()
+            await self.connect()
+
+            # Entrada vencida: GET condicional (304 / mismo hash = sin parsear)
+            headers = stale.conditional_headers() if stale is not None else {}
+            response = await self.client.get(url, headers=headers)
+            if stale is not None and stale.matches(response):
+                self.logger.info("page_not_modified", url=url, status_code=response.status_code)
+                return NOT_MODIFIED
+            if stale is not None and response.status_code >= 500:
+                # Error transitorio: el Revalidator responde con la copia vencida
+                response.raise_for_status()
+
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+
+            if response.status_code >= 400 or not content_type.startswith(TEXT_CONTENT_TYPES):
+                self.logger.info(
+                    "http_fetch_unusable",
+                    url=url,
+                    status_code=response.status_code,
+                    content_type=content_type,
+                )
+                return None
+
+            html = response.text
+            if content_type == "text/plain":
+                title, text, noscript_requires_js = "", html.strip(), False
+                selector_found = False if wait_for_selector else None
+            else:
+                # Parse fuera del event loop (páginas grandes bloquearían al resto)
+                title, text, noscript_requires_js, selector_found = await asyncio.to_thread(
+                    parse_page, html, wait_for_selector
+                )
+
+            reason = render_required_reason(url, text, noscript_requires_js)
+            if reason is None and selector_found is False:
+                reason = "selector_missing"
+
+            content = ScrapedContent(
+                url=url,
+                title=title,
+                text=text,
+                html=html if include_html else None,
+                metadata={
+                    "status": response.status_code,
+                    "final_url": str(response.url),
+                    "content_type": content_type,
+                    "fetcher": "http",
+                    "render_required": reason,
+                },
+            )
+
+            self.logger.info(
+                "page_fetched",
+                url=url,
+                text_length=len(text),
+                render_required=reason,
+            )
+
+            return PageRecord.from_response(content.to_dict(), response.headers, response.content)
+
+        cached = await self.revalidator.get(cache_key, refresh, tags=[f"url:{url}"])
+        return ScrapedContent(**cached) if cached is not None else None
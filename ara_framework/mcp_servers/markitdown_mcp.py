@@ -9,9 +9,15 @@ Estrategia híbrida:
 2. Fallback a PyMuPDF si MarkItDown falla
 3. Extracción de metadatos (autor, título, año)
 4. Limpieza de texto (elimina headers/footers repetitivos)
+
+Las conversiones se cachean por hash del contenido (ver pdf_cache.py), no
+por path: el mismo PDF descargado a otro lugar no se reconvierte.
+
+Con PDF_WORKERS > 0 las conversiones corren en un pool de procesos
+(ver pdf_workers.py): escalan con los cores y tienen timeout por documento.
 """
 import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple, Union
 from dataclasses import dataclass
 from pathlib import Path
 import tempfile
@@ -43,10 +49,31 @@ except ImportError:
     structlog.get_logger().warning("pymupdf_not_installed")
 
 from mcp_servers.base import MCPAdapter
+from mcp_servers.pdf_cache import PDFConversionCache, hash_file
+from mcp_servers.pdf_sections import SECTION_NAMES, match_section_header, scan_markdown, section_name
+from mcp_servers.pdf_workers import (
+    PDFWorkerPool,
+    convert_with_markitdown_sync,
+    convert_with_pymupdf_sync,
+)
+from mcp_servers.rate_limit import RateLimit
 from config.settings import settings
 
 logger = structlog.get_logger()
 
+# Caracteres de formato markdown que elimina extract_text_only ("**" incluido)
+_MARKDOWN_CHARS = str.maketrans("", "", "#*_")
+
+
+def strip_markdown(text: str) -> str:
+    """Elimina el formato markdown (#, *, _) en una sola pasada."""
+    return text.translate(_MARKDOWN_CHARS)
+
+
+def _page_text(doc: Any, index: int) -> str:
+    """Texto de una página (PyMuPDF carga solo esa página)."""
+    return doc.load_page(index).get_text()
+
 
 @dataclass
 class ProcessedPDF:
@@ -81,10 +108,11 @@ class MarkItDownAdapter(MCPAdapter[ProcessedPDF]):
     - Extracción de metadatos (autor, título, año)
     - Limpieza automática de headers/footers
     - Detección de secciones (Abstract, Introduction, etc.)
-    - Cache agresivo (PDFs no cambian)
+    - Cache por hash de contenido: disco comprimido + Redis (opcional)
     
-    Rate Limiting: 5 conversiones/min (CPU-intensive)
-    Cache TTL: 7 días (mismo que papers)
+    Concurrencia: pool de PDF_WORKERS procesos; sin pool (PDF_WORKERS=0),
+    rate limit de 5 conversiones/min (CPU-intensive, solo misses)
+    Cache TTL: 7 días en Redis (mismo que papers); el store en disco no expira
     
     Uso:
         async with MarkItDownAdapter(redis_client) as md:
@@ -103,19 +131,44 @@ class MarkItDownAdapter(MCPAdapter[ProcessedPDF]):
                 "paper1.pdf",
                 "paper2.pdf",
             ])
+            
+            # Batch con resultados a medida que terminan
+            async for path, result in md.iter_conversions(paths):
+                ...
     """
     
-    def __init__(self, redis_client=None):
+    def __init__(
+        self,
+        redis_client=None,
+        pdf_cache: Optional[PDFConversionCache] = None,
+        workers: Optional[int] = None,
+    ):
         super().__init__(
             name="markitdown",
             redis_client=redis_client,
-            rate_limit_rpm=5,  # Conservative (CPU-intensive)
+            rate_limit=RateLimit.per_minute(5, burst=2),  # Conservative (CPU-intensive)
             cache_ttl=settings.REDIS_TTL_PAPERS,  # 7 días
         )
         
         # MarkItDown converter - lazy loading
         self.markitdown = None
         self._markitdown_loaded = False
+        
+        # Store local por hash de contenido (se crea en el primer uso)
+        self._pdf_cache = pdf_cache
+        
+        # Pool de procesos (los workers arrancan en la primera conversión)
+        self.workers = settings.PDF_WORKERS if workers is None else workers
+        self.worker_pool: Optional[PDFWorkerPool] = (
+            PDFWorkerPool(workers=self.workers) if self.workers > 0 else None
+        )
+    
+    @property
+    def pdf_cache(self) -> Optional[PDFConversionCache]:
+        """Store en disco configurado (None si PDF_CACHE_ENABLED=False)."""
+        if self._pdf_cache is None and settings.PDF_CACHE_ENABLED:
+            self._pdf_cache = PDFConversionCache(settings.PDF_CACHE_DIR)
+        return self._pdf_cache
     
     def _ensure_markitdown(self):
         """Inicializa MarkItDown si está disponible y no ha sido cargado."""
@@ -142,7 +195,9 @@ class MarkItDownAdapter(MCPAdapter[ProcessedPDF]):
         )
     
     async def disconnect(self) -> None:
-        """Nada que cerrar."""
+        """Detiene el pool de workers (si arrancó)."""
+        if self.worker_pool is not None:
+            await self.worker_pool.close()
         self.logger.info("markitdown_disconnected")
     
     async def health_check(self) -> bool:
@@ -166,74 +221,72 @@ class MarkItDownAdapter(MCPAdapter[ProcessedPDF]):
         Returns:
             ProcessedPDF con markdown y metadatos
         """
-        # Check cache
+        # Validate file exists
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"PDF not found: {file_path}")
+        
+        # Key por contenido: renombrar/re-descargar no invalida, sobreescribir sí
+        digest = await self._content_hash(path)
         cache_key = self._make_cache_key(
             "convert",
-            file_path,
+            digest,
             str(clean_headers),
             str(extract_sections),
         )
-        cached = await self._get_cached(cache_key)
-        if cached:
-            return ProcessedPDF(**cached)
         
-        # Enforce rate limit
-        await self._wait_for_rate_limit()
+        async def fetch() -> dict:
+            raw = await self._get_raw_conversion(file_path, digest)
+            return self._postprocess(raw, clean_headers, extract_sections)
         
-        # Validate file exists
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"PDF not found: {file_path}")
+        # Cache (L1 + Redis compartido); conversiones concurrentes del mismo PDF se unifican
+        cached = await self._get_or_fetch(
+            cache_key,
+            fetch,
+            ttl=settings.REDIS_TTL_PAPERS,
+            tags=[f"pdf:{digest}"],
+        )
+        return ProcessedPDF(**{**cached, "file_path": file_path})
+    
+    async def iter_conversions(
+        self,
+        file_paths: List[str],
+        max_concurrent: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[str, Union[ProcessedPDF, Exception]]]:
+        """
+        Convierte múltiples PDFs y entrega cada resultado en cuanto termina.
         
-        # Try MarkItDown first (lazy load)
-        if self._ensure_markitdown():
-            try:
-                result = await self._convert_with_markitdown(
-                    file_path,
-                    clean_headers,
-                    extract_sections,
-                )
-                
-                # Cache
-                await self._set_cached(
-                    cache_key,
-                    result.to_dict(),
-                    ttl=settings.REDIS_TTL_PAPERS,
-                )
-                
-                return result
-            
-            except Exception as e:
-                self.logger.warning(
-                    "markitdown_failed",
-                    file_path=file_path,
-                    error=str(e),
-                    fallback="pymupdf",
-                )
+        Args:
+            file_paths: Lista de paths a PDFs
+            max_concurrent: Máximo conversiones simultáneas (default: workers del pool)
+            **kwargs: Argumentos para convert_pdf
         
-        # Fallback to PyMuPDF
-        if PYMUPDF_AVAILABLE:
-            result = await self._convert_with_pymupdf(
-                file_path,
-                clean_headers,
-                extract_sections,
-            )
-            
-            # Cache
-            await self._set_cached(
-                cache_key,
-                result.to_dict(),
-                ttl=settings.REDIS_TTL_PAPERS,
-            )
-            
-            return result
+        Yields:
+            (file_path, ProcessedPDF o excepción)
+        """
+        semaphore = asyncio.Semaphore(max_concurrent or max(self.workers, 2))
         
-        raise RuntimeError("No PDF converter succeeded")
+        async def convert_with_semaphore(path: str) -> Tuple[str, Union[ProcessedPDF, Exception]]:
+            async with semaphore:
+                try:
+                    return path, await self.convert_pdf(path, **kwargs)
+                except Exception as e:
+                    self.logger.error("conversion_failed", file_path=path, error=str(e))
+                    return path, e
+        
+        tasks = [asyncio.create_task(convert_with_semaphore(path)) for path in file_paths]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
     
     async def convert_multiple(
         self,
         file_paths: List[str],
-        max_concurrent: int = 2,
+        max_concurrent: Optional[int] = None,
         **kwargs,
     ) -> List[ProcessedPDF]:
         """
@@ -241,28 +294,18 @@ class MarkItDownAdapter(MCPAdapter[ProcessedPDF]):
         
         Args:
             file_paths: Lista de paths a PDFs
-            max_concurrent: Máximo conversiones simultáneas
+            max_concurrent: Máximo conversiones simultáneas (default: workers del pool)
             **kwargs: Argumentos para convert_pdf
         
         Returns:
-            Lista de ProcessedPDF
+            Lista de ProcessedPDF (en el orden de file_paths, sin los fallidos)
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def convert_with_semaphore(path: str) -> ProcessedPDF:
-            async with semaphore:
-                return await self.convert_pdf(path, **kwargs)
+        results = {}
+        async for path, result in self.iter_conversions(file_paths, max_concurrent, **kwargs):
+            if not isinstance(result, Exception):
+                results[path] = result
         
-        tasks = [convert_with_semaphore(path) for path in file_paths]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter exceptions
-        successful = []
-        for result in results:
-            if isinstance(result, Exception):
-                self.logger.error("conversion_failed", error=str(result))
-            else:
-                successful.append(result)
+        successful = [results[path] for path in dict.fromkeys(file_paths) if path in results]
         
         self.logger.info(
             "batch_conversion_completed",
@@ -272,37 +315,236 @@ class MarkItDownAdapter(MCPAdapter[ProcessedPDF]):
         
         return successful
     
-    async def extract_text_only(self, file_path: str) -> str:
+    async def extract_text_only(
+        self,
+        file_path: str,
+        max_pages: Optional[int] = None,
+        stop_after: Optional[str] = None,
+    ) -> str:
         """
         Extrae solo texto sin markdown (útil para búsquedas).
         
+        Sin límites usa la conversión completa (cacheada). Con max_pages o
+        stop_after lee el PDF página a página y deja de leer en cuanto
+        tiene lo pedido (ver iter_pages / iter_sections).
+        
         Args:
             file_path: Path al PDF
+            max_pages: Leer solo las primeras N páginas
+            stop_after: Sección tras la cual parar (ej: "abstract", "introduction")
         
         Returns:
             Texto plano extraído
         """
-        result = await self.convert_pdf(file_path, clean_headers=False, extract_sections=False)
+        if stop_after:
+            parts = [
+                text
+                async for _, text in self.iter_sections(
+                    file_path, last_page=max_pages, stop_after=stop_after
+                )
+            ]
+        elif max_pages:
+            parts = [text async for _, text in self.iter_pages(file_path, last_page=max_pages)]
+        else:
+            result = await self.convert_pdf(file_path, clean_headers=False, extract_sections=False)
+            parts = [strip_markdown(result.markdown)]
+        
+        return "\n\n".join(parts).strip()
+    
+    async def iter_pages(
+        self,
+        file_path: str,
+        first_page: int = 1,
+        last_page: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Texto plano del PDF página a página (numeración desde 1).
+        
+        Con PyMuPDF solo se cargan las páginas que se consumen: cerrar el
+        iterador antes (break) evita parsear el resto del documento. Sin
+        PyMuPDF se usa la conversión completa, separada por form feeds.
+        
+        Args:
+            file_path: Path al PDF
+            first_page: Primera página (inclusive)
+            last_page: Última página (inclusive, default: la última)
+        
+        Yields:
+            (número de página, texto)
+        """
+        if not Path(file_path).exists():
+            raise FileNotFoundError(f"PDF not found: {file_path}")
+        
+        if not PYMUPDF_AVAILABLE:
+            result = await self.convert_pdf(file_path, clean_headers=False, extract_sections=False)
+            for number, text in enumerate(result.markdown.split("\f"), start=1):
+                if number < first_page:
+                    continue
+                if last_page and number > last_page:
+                    break
+                yield number, strip_markdown(text)
+            return
+        
+        doc = await asyncio.to_thread(fitz.open, file_path)
+        try:
+            last = min(last_page or len(doc), len(doc))
+            for number in range(max(first_page, 1), last + 1):
+                yield number, await asyncio.to_thread(_page_text, doc, number - 1)
+        finally:
+            doc.close()
+    
+    async def iter_sections(
+        self,
+        file_path: str,
+        first_page: int = 1,
+        last_page: Optional[int] = None,
+        stop_after: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Texto del PDF sección a sección, leyendo página a página.
+        
+        Usa la misma detección de headers que convert_pdf (pdf_sections.py). El texto
+        de cada sección incluye su línea de header.
+        
+        Args:
+            file_path: Path al PDF
+            first_page: Primera página (inclusive)
+            last_page: Última página (inclusive)
+            stop_after: Nombre de sección (ej: "introduction", "conclusions");
+                al empezar la siguiente sección se deja de leer el PDF
         
-        # Remove markdown formatting
-        text = result.markdown
-        text = text.replace("#", "")
-        text = text.replace("**", "")
-        text = text.replace("*", "")
-        text = text.replace("_", "")
+        Yields:
+            (nombre de sección, texto) - "header" para lo previo al primer header
+        
+        Raises:
+            ValueError: stop_after no es una sección conocida (SECTION_NAMES)
+        """
+        if stop_after:
+            section = section_name(stop_after)
+            if section is None:
+                raise ValueError(
+                    f"Unknown section for stop_after: {stop_after!r} "
+                    f"(known: {', '.join(sorted(set(SECTION_NAMES.values())))})"
+                )
+            stop_after = section
+        current_section = "header"
+        current_text: List[str] = []
+        
+        async for _, page in self.iter_pages(file_path, first_page, last_page):
+            for line in page.split("\n"):
+                section = match_section_header(line)
+                if section is None:
+                    current_text.append(line)
+                    continue
+                
+                text = "\n".join(current_text).strip()
+                if text:
+                    yield current_section, text
+                if current_section == stop_after:
+                    return
+                
+                current_section = section
+                current_text = [line]
         
-        return text.strip()
+        text = "\n".join(current_text).strip()
+        if text:
+            yield current_section, text
     
     # ============================================================
     # MÉTODOS PRIVADOS
     # ============================================================
     
-    async def _convert_with_markitdown(
+    async def _content_hash(self, path: Path) -> str:
+        """Hash del PDF (vía índice path → hash si el store está habilitado)."""
+        if self.pdf_cache is not None:
+            return await self.pdf_cache.content_hash(path)
+        return await asyncio.to_thread(hash_file, path)
+    
+    async def _get_raw_conversion(self, file_path: str, digest: str) -> dict:
+        """
+        Conversión sin post-procesar (store en disco o conversión nueva).
+        
+        Una sola conversión por hash aunque se pidan varias combinaciones
+        de flags a la vez.
+        """
+        async def load_or_convert() -> dict:
+            if self.pdf_cache is not None:
+                raw = await self.pdf_cache.get(digest)
+                if raw is not None:
+                    self.logger.info("pdf_cache_hit", file_path=file_path, digest=digest[:16])
+                    return raw
+            
+            # Sin pool, el rate limit acota el uso de CPU (el pool ya lo
+            # acota con su número de workers)
+            if self.worker_pool is None:
+                await self._wait_for_rate_limit()
+            
+            raw = (await self._convert(file_path)).to_dict()
+            if self.pdf_cache is not None:
+                await self.pdf_cache.put(digest, raw)
+            return raw
+        
+        raw, _ = await self._single_flight.do(f"raw:{digest}", load_or_convert)
+        return raw
+    
+    async def _convert(self, file_path: str) -> ProcessedPDF:
+        """Convierte con MarkItDown y hace fallback a PyMuPDF."""
+        if self.worker_pool is not None:
+            result = ProcessedPDF(**await self.worker_pool.convert(file_path))
+            
+            self.logger.info(
+                "pdf_converted",
+                file_path=file_path,
+                method=result.method_used,
+                pages=result.page_count,
+                markdown_length=len(result.markdown),
+                worker_pool=True,
+            )
+            
+            return result
+        
+        # Try MarkItDown first (lazy load)
+        if self._ensure_markitdown():
+            try:
+                return await self._convert_with_markitdown(file_path)
+            
+            except Exception as e:
+                self.logger.warning(
+                    "markitdown_failed",
+                    file_path=file_path,
+                    error=str(e),
+                    fallback="pymupdf",
+                )
+        
+        # Fallback to PyMuPDF
+        if PYMUPDF_AVAILABLE:
+            return await self._convert_with_pymupdf(file_path)
+        
+        raise RuntimeError("No PDF converter succeeded")
+    
+    def _postprocess(
         self,
-        file_path: str,
+        raw: dict,
         clean_headers: bool,
         extract_sections: bool,
-    ) -> ProcessedPDF:
+    ) -> dict:
+        """Aplica limpieza de headers y detección de secciones a una conversión cruda."""
+        if not clean_headers and not extract_sections:
+            return raw
+        
+        # Una sola pasada: headers repetidos, números de página y secciones
+        scan = scan_markdown(raw["markdown"], clean_headers, extract_sections)
+        metadata = dict(raw["metadata"])
+        
+        if extract_sections:
+            metadata["sections"] = scan.sections
+            metadata["section_offsets"] = {
+                name: list(span) for name, span in scan.section_offsets.items()
+            }
+        
+        return {**raw, "markdown": scan.text, "metadata": metadata}
+    
+    async def _convert_with_markitdown(self, file_path: str) -> ProcessedPDF:
         """Conversión usando MarkItDown."""
         # Asegurar que MarkItDown está cargado
         if not self._ensure_markitdown():
@@ -310,212 +552,33 @@ class MarkItDownAdapter(MCPAdapter[ProcessedPDF]):
         
         # MarkItDown es síncrono, ejecutar en thread pool
         loop = asyncio.get_event_loop()
-        
-        def sync_convert():
-            result = self.markitdown.convert(file_path)
-            return result.text_content
-        
-        markdown = await loop.run_in_executor(None, sync_convert)
-        
-        # Extract metadata (si disponible)
-        metadata = await self._extract_metadata_pymupdf(file_path)
-        
-        # Clean headers if requested
-        if clean_headers:
-            markdown = self._clean_repetitive_headers(markdown)
-        
-        # Extract sections if requested
-        if extract_sections:
-            sections = self._extract_sections(markdown)
-            metadata["sections"] = sections
-        
-        # Page count (usar PyMuPDF si disponible)
-        page_count = metadata.get("page_count", 0)
+        result = ProcessedPDF(**await loop.run_in_executor(
+            None, convert_with_markitdown_sync, self.markitdown, file_path
+        ))
         
         self.logger.info(
             "pdf_converted",
             file_path=file_path,
             method="markitdown",
-            pages=page_count,
-            markdown_length=len(markdown),
+            pages=result.page_count,
+            markdown_length=len(result.markdown),
         )
         
-        return ProcessedPDF(
-            file_path=file_path,
-            markdown=markdown,
-            metadata=metadata,
-            page_count=page_count,
-            method_used="markitdown",
-        )
+        return result
     
-    async def _convert_with_pymupdf(
-        self,
-        file_path: str,
-        clean_headers: bool,
-        extract_sections: bool,
-    ) -> ProcessedPDF:
+    async def _convert_with_pymupdf(self, file_path: str) -> ProcessedPDF:
         """Conversión usando PyMuPDF."""
         loop = asyncio.get_event_loop()
-        
-        def sync_convert():
-            doc = fitz.open(file_path)
-            
-            # Extract text from all pages
-            text_parts = []
-            for page in doc:
-                text_parts.append(page.get_text())
-            
-            markdown = "\n\n".join(text_parts)
-            
-            # Extract metadata
-            metadata = {
-                "title": doc.metadata.get("title", ""),
-                "author": doc.metadata.get("author", ""),
-                "subject": doc.metadata.get("subject", ""),
-                "creator": doc.metadata.get("creator", ""),
-                "page_count": len(doc),
-            }
-            
-            doc.close()
-            
-            return markdown, metadata
-        
-        markdown, metadata = await loop.run_in_executor(None, sync_convert)
-        
-        # Clean headers
-        if clean_headers:
-            markdown = self._clean_repetitive_headers(markdown)
-        
-        # Extract sections
-        if extract_sections:
-            sections = self._extract_sections(markdown)
-            metadata["sections"] = sections
+        result = ProcessedPDF(**await loop.run_in_executor(
+            None, convert_with_pymupdf_sync, file_path
+        ))
         
         self.logger.info(
             "pdf_converted",
             file_path=file_path,
             method="pymupdf",
-            pages=metadata["page_count"],
-            markdown_length=len(markdown),
-        )
-        
-        return ProcessedPDF(
-            file_path=file_path,
-            markdown=markdown,
-            metadata=metadata,
-            page_count=metadata["page_count"],
-            method_used="pymupdf",
+            pages=result.page_count,
+            markdown_length=len(result.markdown),
         )
-    
-    async def _extract_metadata_pymupdf(self, file_path: str) -> Dict[str, Any]:
-        """Extrae metadatos usando PyMuPDF."""
-        if not PYMUPDF_AVAILABLE:
-            return {}
-        
-        loop = asyncio.get_event_loop()
-        
-        def sync_extract():
-            doc = fitz.open(file_path)
-            metadata = {
-                "title": doc.metadata.get("title", ""),
-                "author": doc.metadata.get("author", ""),
-                "subject": doc.metadata.get("subject", ""),
-                "creator": doc.metadata.get("creator", ""),
-                "page_count": len(doc),
-            }
-            doc.close()
-            return metadata
-        
-        return await loop.run_in_executor(None, sync_extract)
-    
-    def _clean_repetitive_headers(self, text: str) -> str:
-        """
-        Limpia headers/footers repetitivos (números de página, etc.).
-        
-        Estrategia simple:
-        - Elimina líneas que aparecen >3 veces exactamente iguales
-        - Elimina líneas que son solo números (páginas)
-        """
-        lines = text.split("\n")
-        
-        # Count line frequencies
-        line_counts = {}
-        for line in lines:
-            stripped = line.strip()
-            if stripped:
-                line_counts[stripped] = line_counts.get(stripped, 0) + 1
-        
-        # Filter out repetitive lines (>3 occurrences)
-        cleaned_lines = []
-        for line in lines:
-            stripped = line.strip()
-            
-            # Keep empty lines
-            if not stripped:
-                cleaned_lines.append(line)
-                continue
-            
-            # Remove if repetitive
-            if line_counts[stripped] > 3:
-                continue
-            
-            # Remove if just numbers (page numbers)
-            if stripped.isdigit():
-                continue
-            
-            cleaned_lines.append(line)
-        
-        return "\n".join(cleaned_lines)
-    
-    def _extract_sections(self, markdown: str) -> Dict[str, str]:
-        """
-        Detecta secciones académicas comunes.
-        
-        Returns:
-            Dict de {section_name: section_text}
-        """
-        sections = {}
-        
-        # Common academic section headers
-        section_keywords = [
-            "abstract",
-            "introduction",
-            "related work",
-            "methodology",
-            "methods",
-            "results",
-            "discussion",
-            "conclusion",
-            "references",
-            "acknowledgments",
-        ]
-        
-        lines = markdown.split("\n")
-        current_section = "header"
-        current_text = []
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Check if line is a section header
-            is_section = False
-            for keyword in section_keywords:
-                if keyword in line_lower and len(line_lower) < 50:
-                    # Save previous section
-                    if current_text:
-                        sections[current_section] = "\n".join(current_text).strip()
-                    
-                    # Start new section
-                    current_section = keyword.replace(" ", "_")
-                    current_text = []
-                    is_section = True
-                    break
-            
-            if not is_section:
-                current_text.append(line)
-        
-        # Save last section
-        if current_text:
-            sections[current_section] = "\n".join(current_text).strip()
         
-        return sections
+        return result
@@ -0,0 +1,283 @@
+"""
+Cache de conversiones PDF → Markdown por hash de contenido.
+
+La conversión es el paso más pesado en CPU del pipeline y los mismos PDFs de
+arXiv aparecen en muchos nichos, descargados a paths distintos. Por eso la
+key es el SHA-256 de los bytes, no el path:
+- Un archivo renombrado / re-descargado / en otro temp dir no se reconvierte
+- Un archivo sobreescrito en el mismo path no retorna resultados viejos
+
+Capas:
+- Índice path → hash (SQLite) con mtime y tamaño: un archivo sin cambios no
+  se vuelve a hashear
+- Store en disco: una conversión por hash, JSON comprimido con zlib
+- Redis (opcional, compartido entre procesos): lo aporta MarkItDownAdapter
+  vía el cache del MCPAdapter, con la misma key de contenido
+
+Se guarda la conversión "cruda" (antes de limpiar headers / detectar
+secciones): una sola conversión sirve para cualquier combinación de flags.
+
+Tamaño acotado:
+- Store: al pasar PDF_CACHE_MAX_BYTES se borran las conversiones menos
+  usadas (LRU por mtime; un hit actualiza el mtime) hasta el 90% del límite
+- Índice: al pasar PDF_CACHE_MAX_INDEX_ENTRIES se borran las filas de
+  archivos que ya no existen y, si hace falta, las más antiguas
+- prune() aplica ambos límites a mano (ej: desde un cron)
+
+Usage:
+    ```python
+    from mcp_servers.pdf_cache import PDFConversionCache
+
+    cache = PDFConversionCache(".cache/pdf")
+    digest = await cache.content_hash("paper.pdf")
+    raw = await cache.get(digest)
+    if raw is None:
+        raw = convert("paper.pdf")
+        await cache.put(digest, raw)
+    ```
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import structlog
+
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+# Tamaño de bloque para hashear sin cargar el PDF completo en memoria
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Nivel de compresión zlib (6 = balance velocidad/tamaño)
+COMPRESSION_LEVEL = 6
+
+# Al podar el store se baja hasta esta fracción del límite (no podar en cada put)
+PRUNE_TARGET_RATIO = 0.9
+
+
+def hash_file(path: Union[str, Path], chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """SHA-256 hex del contenido, leyendo el archivo por bloques."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PDFConversionCache:
+    """
+    Store en disco de conversiones + índice path → hash.
+
+    Las operaciones de disco se ejecutan en un thread para no bloquear el
+    event loop.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_bytes: Optional[int] = None,
+        max_index_entries: Optional[int] = None,
+    ):
+        """
+        Args:
+            root: Directorio del store y del índice
+            max_bytes: Tamaño máximo del store (default: PDF_CACHE_MAX_BYTES)
+            max_index_entries: Filas máximas del índice
+                (default: PDF_CACHE_MAX_INDEX_ENTRIES)
+        """
+        self.max_bytes = settings.PDF_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_index_entries = (
+            settings.PDF_CACHE_MAX_INDEX_ENTRIES if max_index_entries is None else max_index_entries
+        )
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._lock = asyncio.Lock()
+        self._store_lock = asyncio.Lock()
+        # Bytes del store (se calcula con el primer put)
+        self._store_bytes: Optional[int] = None
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS path_index ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, digest TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self.hashes_computed = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ============================================================
+    # Índice path → hash
+    # ============================================================
+
+    def _content_hash_sync(self, path: Path) -> str:
+        resolved = str(path.resolve())
+        stat = path.stat()
+
+        row = self._conn.execute(
+            "SELECT digest FROM path_index WHERE path = ? AND mtime_ns = ? AND size = ?",
+            (resolved, stat.st_mtime_ns, stat.st_size),
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hash_file(path)
+        self.hashes_computed += 1
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO path_index (path, mtime_ns, size, digest) "
+                "VALUES (?, ?, ?, ?)",
+                (resolved, stat.st_mtime_ns, stat.st_size, digest),
+            )
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM path_index").fetchone()
+        if count > self.max_index_entries:
+            self._prune_index_sync()
+        return digest
+
+    def _prune_index_sync(self) -> int:
+        """Borra las filas de archivos que ya no existen y, sobre el límite, las más antiguas."""
+        rows = self._conn.execute("SELECT path FROM path_index").fetchall()
+        orphaned = [(path,) for (path,) in rows if not os.path.exists(path)]
+        with self._conn:
+            self._conn.executemany("DELETE FROM path_index WHERE path = ?", orphaned)
+            # INSERT OR REPLACE asigna un rowid nuevo: rowid bajo = hasheado hace más tiempo
+            oldest = self._conn.execute(
+                "DELETE FROM path_index WHERE rowid NOT IN "
+                "(SELECT rowid FROM path_index ORDER BY rowid DESC LIMIT ?)",
+                (self.max_index_entries,),
+            )
+        removed = len(orphaned) + oldest.rowcount
+        if removed:
+            logger.info("pdf_cache_index_pruned", removed=removed, orphaned=len(orphaned))
+        return removed
+
+    async def content_hash(self, file_path: Union[str, Path]) -> str:
+        """
+        Hash del contenido del archivo.
+
+        Solo se recalcula si cambió el mtime o el tamaño desde el último hash.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe
+        """
+        async with self._lock:
+            return await asyncio.to_thread(self._content_hash_sync, Path(file_path))
+
+    # ============================================================
+    # Store de conversiones
+    # ============================================================
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.json.z"
+
+    def _get_sync(self, digest: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(digest)
+        try:
+            raw = path.read_bytes()
+            # El mtime marca el último uso (orden LRU de la poda)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return json.loads(zlib.decompress(raw))
+
+    def _put_sync(self, digest: str, value: Dict[str, Any]) -> None:
+        path = self._entry_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = zlib.compress(json.dumps(value).encode("utf-8"), COMPRESSION_LEVEL)
+        if self._store_bytes is None:
+            self._store_bytes = sum(size for _, size, _ in self._store_entries())
+        try:
+            self._store_bytes -= path.stat().st_size
+        except FileNotFoundError:
+            pass
+        # Escritura atómica: otro proceso nunca lee un archivo a medias
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._store_bytes += len(data)
+
+        if self._store_bytes > self.max_bytes:
+            self._prune_store_sync(int(self.max_bytes * PRUNE_TARGET_RATIO))
+
+    def _store_entries(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, tamaño, path) de cada conversión guardada."""
+        entries = []
+        for path in self.root.glob("*/*.json.z"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _prune_store_sync(self, target_bytes: int) -> Tuple[int, int]:
+        """Borra las conversiones menos usadas hasta quedar en target_bytes."""
+        entries = sorted(self._store_entries(), key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        removed = removed_bytes = 0
+        for _, size, path in entries:
+            if total <= target_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+            removed_bytes += size
+
+        self._store_bytes = total
+        self.evictions += removed
+        if removed:
+            logger.info("pdf_cache_store_pruned", removed=removed, bytes_removed=removed_bytes, store_bytes=total)
+        return removed, removed_bytes
+
+    async def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Conversión guardada para el hash, o None (nunca lanza)."""
+        try:
+            value = await asyncio.to_thread(self._get_sync, digest)
+        except Exception as e:
+            logger.warning("pdf_cache_read_error", digest=digest[:16], error=str(e))
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def put(self, digest: str, value: Dict[str, Any]) -> None:
+        """Guarda la conversión (nunca lanza)."""
+        try:
+            async with self._store_lock:
+                await asyncio.to_thread(self._put_sync, digest, value)
+        except Exception as e:
+            logger.warning("pdf_cache_write_error", digest=digest[:16], error=str(e))
+
+    async def prune(self) -> Dict[str, int]:
+        """
+        Aplica max_bytes al store y limpia el índice (filas huérfanas y
+        sobre max_index_entries).
+
+        Returns:
+            Dict con entries_removed, bytes_removed e index_rows_removed
+        """
+        async with self._store_lock:
+            removed, removed_bytes = await asyncio.to_thread(self._prune_store_sync, self.max_bytes)
+        async with self._lock:
+            index_rows = await asyncio.to_thread(self._prune_index_sync)
+        return {
+            "entries_removed": removed,
+            "bytes_removed": removed_bytes,
+            "index_rows_removed": index_rows,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
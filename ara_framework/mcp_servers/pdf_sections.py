@@ -0,0 +1,223 @@
+"""
+Scanner de una pasada para el markdown de PDFs académicos.
+
+Reemplaza la limpieza de headers y la detección de secciones que antes
+hacían dos recorridos separados del documento (split + dict de frecuencias,
+y luego lower() + búsqueda de 10 keywords por línea):
+- Headers/footers repetitivos (líneas que aparecen >3 veces) y números de
+  página se eliminan
+- Las secciones se detectan con un regex compilado y anclado a la línea
+  completa: "3. Results" o "## Conclusions" son headers; "our results show
+  that..." no lo es
+- Se retornan offsets (start, end) de cada sección sobre el texto limpio:
+  `scan.text[start:end]` equivale al texto de la sección sin copiarlo antes
+
+El conteo de frecuencias usa collections.Counter (implementado en C); el
+recorrido en Python es uno solo, y los regex solo se evalúan sobre líneas
+candidatas (cortas y, para headers, terminadas como un nombre de sección).
+
+Usage:
+    ```python
+    from mcp_servers.pdf_sections import scan_markdown
+
+    scan = scan_markdown(markdown)
+    intro = scan.section("introduction")
+    ```
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+# Headers académicos -> nombre normalizado de la sección
+SECTION_NAMES = {
+    "abstract": "abstract",
+    "introduction": "introduction",
+    "related work": "related_work",
+    "background": "background",
+    "methodology": "methodology",
+    "method": "methods",
+    "methods": "methods",
+    "materials and methods": "methods",
+    "results": "results",
+    "results and discussion": "results",
+    "discussion": "discussion",
+    "conclusion": "conclusion",
+    "conclusions": "conclusion",
+    "references": "references",
+    "bibliography": "references",
+    "acknowledgment": "acknowledgments",
+    "acknowledgments": "acknowledgments",
+    "acknowledgement": "acknowledgments",
+    "acknowledgements": "acknowledgments",
+}
+
+# Línea completa: "## 2.1 Related Work", "**Abstract**", "IV. RESULTS:", ...
+SECTION_HEADER_RE = re.compile(
+    r"^[ \t]*(?:#{1,6}[ \t]*)?(?:\*\*|__)?[ \t]*"
+    r"(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?[ \t]+)?"
+    r"(?P<name>"
+    + "|".join(
+        name.replace(" ", r"[ \t]+")
+        for name in sorted(SECTION_NAMES, key=len, reverse=True)
+    )
+    + r")"
+    r"[ \t]*[:.]?[ \t]*(?:\*\*|__)?[ \t]*$",
+    re.IGNORECASE,
+)
+
+# Últimas 4 letras de cada nombre, para descartar líneas sin correr el regex
+HEADER_TAILS = frozenset(name[-4:] for name in SECTION_NAMES)
+HEADER_TRAILING = " \t:.*_"
+
+# Números de página sueltos: "12", "Page 3", "3 of 10", "- 7 -"
+PAGE_NUMBER_RE = re.compile(
+    r"^[ \t]*(?:-[ \t]*)?(?:page[ \t]+)?\d+(?:[ \t]*(?:/|of)[ \t]*\d+)?(?:[ \t]*-)?[ \t]*$",
+    re.IGNORECASE,
+)
+
+# Longitud máxima de las líneas candidatas (evita correr los regex en el resto)
+MAX_HEADER_LENGTH = 60
+MAX_PAGE_NUMBER_LENGTH = 16
+
+# Una línea que aparece más veces que esto se considera header/footer
+REPEATED_LINE_THRESHOLD = 3
+
+
+def section_name(name: str) -> Optional[str]:
+    """
+    Nombre normalizado de una sección pedida por el usuario, o None.
+
+    Acepta los headers de SECTION_NAMES ("conclusions", "results and
+    discussion") y los nombres normalizados ("related_work").
+    """
+    key = " ".join(name.lower().replace("_", " ").split())
+    if key in SECTION_NAMES:
+        return SECTION_NAMES[key]
+    normalized = key.replace(" ", "_")
+    return normalized if normalized in SECTION_NAMES.values() else None
+
+
+def match_section_header(line: str) -> Optional[str]:
+    """Nombre normalizado de la sección si la línea es un header, o None."""
+    match = SECTION_HEADER_RE.match(line)
+    if match is None:
+        return None
+    return SECTION_NAMES[" ".join(match.group("name").lower().split())]
+
+
+@dataclass
+class MarkdownScan:
+    """Resultado de scan_markdown."""
+
+    text: str
+    section_offsets: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    removed_repeated: int = 0
+    removed_page_numbers: int = 0
+
+    def section(self, name: str) -> Optional[str]:
+        """Texto de una sección (slice de text), o None si no existe."""
+        offsets = self.section_offsets.get(name)
+        if offsets is None:
+            return None
+        return self.text[offsets[0]:offsets[1]]
+
+    @property
+    def sections(self) -> Dict[str, str]:
+        """Dict {nombre: texto} (mismo formato que metadata["sections"])."""
+        return {name: self.text[start:end] for name, (start, end) in self.section_offsets.items()}
+
+
+def _stripped_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Offsets de text[start:end].strip() sin construir el substring."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def scan_markdown(
+    markdown: str,
+    clean_headers: bool = True,
+    extract_sections: bool = True,
+) -> MarkdownScan:
+    """
+    Limpia headers/números de página y separa secciones en un recorrido.
+
+    Args:
+        markdown: Texto convertido del PDF
+        clean_headers: Eliminar líneas repetidas (>3 veces) y números de página
+        extract_sections: Calcular offsets de secciones
+
+    Returns:
+        MarkdownScan con el texto limpio y los offsets de cada sección. El
+        texto antes del primer header queda en la sección "header"; los
+        offsets excluyen la línea de header y los espacios de los bordes.
+        Como antes, una sección sin líneas no aparece y si un nombre se
+        repite gana la última aparición.
+    """
+    lines = markdown.split("\n")
+    if clean_headers:
+        stripped_lines = [line.strip() for line in lines]
+        counts = Counter(stripped_lines)
+    else:
+        stripped_lines = lines
+        counts = None
+
+    header_match = SECTION_HEADER_RE.match
+    page_number_match = PAGE_NUMBER_RE.match
+
+    kept = []
+    position = 0  # Offset en el texto limpio del inicio de la próxima línea
+    removed_repeated = 0
+    removed_page_numbers = 0
+
+    spans: Dict[str, Tuple[int, int]] = {}
+    current_section = "header"
+    section_start = 0
+    section_has_lines = False
+
+    for line, stripped in zip(lines, stripped_lines):
+        if counts is not None and stripped:
+            if counts[stripped] > REPEATED_LINE_THRESHOLD:
+                removed_repeated += 1
+                continue
+            if len(stripped) <= MAX_PAGE_NUMBER_LENGTH and page_number_match(stripped):
+                removed_page_numbers += 1
+                continue
+
+        line_start = position
+        position += len(line) + 1
+        kept.append(line)
+
+        if not extract_sections:
+            continue
+
+        # Filtro barato antes del regex: línea corta que termina como un header
+        match = None
+        if len(line) <= MAX_HEADER_LENGTH and line.rstrip(HEADER_TRAILING)[-4:].lower() in HEADER_TAILS:
+            match = header_match(line)
+        if match is None:
+            section_has_lines = True
+            continue
+
+        if section_has_lines:
+            spans[current_section] = (section_start, max(section_start, line_start - 1))
+        current_section = SECTION_NAMES[" ".join(match.group("name").lower().split())]
+        section_start = position
+        section_has_lines = False
+
+    text = "\n".join(kept) if counts is not None else markdown
+
+    if section_has_lines:
+        spans[current_section] = (section_start, len(text))
+
+    return MarkdownScan(
+        text=text,
+        section_offsets={
+            name: _stripped_span(text, start, end) for name, (start, end) in spans.items()
+        },
+        removed_repeated=removed_repeated,
+        removed_page_numbers=removed_page_numbers,
+    )
@@ -0,0 +1,329 @@
+"""
+Pool de procesos para conversión de PDFs.
+
+MarkItDown y PyMuPDF son CPU-bound y retienen el GIL durante la mayor parte
+del parseo: con el thread pool por defecto, convertir varios PDFs a la vez
+casi no escala. Este pool usa procesos dedicados:
+- N workers (PDF_WORKERS), cada uno carga markitdown / fitz una sola vez
+- Un documento por worker a la vez; el resultado vuelve por un Pipe
+- Timeout por documento (PDF_CONVERSION_TIMEOUT): el worker que lo excede
+  se mata y se reemplaza por uno nuevo (un PDF patológico no bloquea el pool)
+
+Las funciones de conversión síncronas (convert_pdf_sync) son las mismas que
+usa MarkItDownAdapter cuando el pool está deshabilitado (PDF_WORKERS=0).
+
+Usage:
+    ```python
+    from mcp_servers.pdf_workers import PDFWorkerPool
+
+    pool = PDFWorkerPool(workers=4, timeout=120)
+    await pool.start()
+    raw = await pool.convert(file_path)
+    await pool.close()
+    ```
+"""
+import asyncio
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+# Tiempo máximo para que un worker nuevo cargue los conversores
+WORKER_STARTUP_TIMEOUT = 120.0
+
+
+# ============================================================
+# Conversión síncrona (ejecutada dentro de los workers)
+# ============================================================
+
+def load_markitdown() -> Any:
+    """Instancia MarkItDown, o None si no está disponible."""
+    try:
+        from markitdown import MarkItDown
+        return MarkItDown()
+    except Exception:
+        return None
+
+
+def read_metadata_sync(file_path: str) -> Dict[str, Any]:
+    """Metadatos del PDF con PyMuPDF ({} si no está instalado)."""
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        return {}
+
+    doc = fitz.open(file_path)
+    try:
+        return {
+            "title": doc.metadata.get("title", ""),
+            "author": doc.metadata.get("author", ""),
+            "subject": doc.metadata.get("subject", ""),
+            "creator": doc.metadata.get("creator", ""),
+            "page_count": len(doc),
+        }
+    finally:
+        doc.close()
+
+
+def convert_with_markitdown_sync(markitdown: Any, file_path: str) -> Dict[str, Any]:
+    """Conversión con MarkItDown (metadatos vía PyMuPDF si está disponible)."""
+    markdown = markitdown.convert(file_path).text_content
+    metadata = read_metadata_sync(file_path)
+    return {
+        "file_path": file_path,
+        "markdown": markdown,
+        "metadata": metadata,
+        "page_count": metadata.get("page_count", 0),
+        "method_used": "markitdown",
+    }
+
+
+def convert_with_pymupdf_sync(file_path: str) -> Dict[str, Any]:
+    """Conversión con PyMuPDF (texto plano por página)."""
+    import pymupdf as fitz
+
+    doc = fitz.open(file_path)
+    try:
+        markdown = "\n\n".join(page.get_text() for page in doc)
+        metadata = {
+            "title": doc.metadata.get("title", ""),
+            "author": doc.metadata.get("author", ""),
+            "subject": doc.metadata.get("subject", ""),
+            "creator": doc.metadata.get("creator", ""),
+            "page_count": len(doc),
+        }
+    finally:
+        doc.close()
+
+    return {
+        "file_path": file_path,
+        "markdown": markdown,
+        "metadata": metadata,
+        "page_count": metadata["page_count"],
+        "method_used": "pymupdf",
+    }
+
+
+def convert_pdf_sync(file_path: str, markitdown: Any = None) -> Dict[str, Any]:
+    """Estrategia híbrida: MarkItDown primero, fallback a PyMuPDF."""
+    markitdown_error = None
+    if markitdown is not None:
+        try:
+            return convert_with_markitdown_sync(markitdown, file_path)
+        except Exception as e:
+            markitdown_error = e
+
+    try:
+        return convert_with_pymupdf_sync(file_path)
+    except ImportError as e:
+        if markitdown_error is not None:
+            # El error útil es el de MarkItDown, no la falta de PyMuPDF
+            raise markitdown_error from None
+        raise RuntimeError("No PDF converter succeeded") from e
+
+
+def _worker_main(conn: Connection) -> None:
+    """Loop del proceso worker: carga conversores una vez y atiende paths."""
+    markitdown = load_markitdown()
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            file_path = conn.recv()
+        except EOFError:
+            break
+        if file_path is None:
+            break
+
+        try:
+            conn.send(("ok", convert_pdf_sync(file_path, markitdown)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+# ============================================================
+# Pool
+# ============================================================
+
+class PDFConversionError(RuntimeError):
+    """La conversión falló dentro del worker."""
+
+
+class _Worker:
+    """Proceso worker + su Pipe. Sus métodos son bloqueantes (se usan en threads)."""
+
+    def __init__(self, ctx: Any, index: int):
+        self.ctx = ctx
+        self.index = index
+        self.process = None
+        self.conn: Optional[Connection] = None
+        self.restarts = 0
+
+    def start(self) -> None:
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(
+            target=_worker_main,
+            args=(child_conn,),
+            name=f"pdf-worker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+        if not parent_conn.poll(WORKER_STARTUP_TIMEOUT):
+            self.kill()
+            raise RuntimeError(f"PDF worker {self.index} did not start")
+        parent_conn.recv()
+
+    def kill(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+        if self.process is not None:
+            self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def restart(self) -> None:
+        self.kill()
+        self.restarts += 1
+        self.start()
+
+    def run(self, file_path: str, timeout: float) -> Dict[str, Any]:
+        """Convierte un documento; mata y reemplaza el worker si excede el timeout."""
+        if self.process is None:
+            self.start()
+
+        try:
+            self.conn.send(file_path)
+            finished = self.conn.poll(timeout)
+            if finished:
+                status, payload = self.conn.recv()
+        except (EOFError, OSError) as e:
+            self.restart()
+            raise PDFConversionError(f"PDF worker crashed converting {file_path}") from e
+
+        if not finished:
+            self.restart()
+            raise TimeoutError(f"PDF conversion exceeded {timeout}s: {file_path}")
+
+        if status == "error":
+            raise PDFConversionError(payload)
+        return payload
+
+    def stop(self) -> None:
+        if self.conn is not None and self.process is not None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=5)
+            except OSError:
+                pass
+        self.kill()
+
+
+class PDFWorkerPool:
+    """
+    Pool de procesos con timeout por documento.
+
+    Los workers se asignan de una cola de libres; las esperas sobre los
+    Pipes corren en threads (liberan el GIL), el parseo en los procesos.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        start_method: str = "spawn",
+    ):
+        """
+        Args:
+            workers: Número de procesos (default: PDF_WORKERS)
+            timeout: Segundos máximos por documento (default: PDF_CONVERSION_TIMEOUT)
+            start_method: Método de multiprocessing ("spawn" evita heredar
+                threads / event loop del proceso padre)
+        """
+        self.size = max(1, workers or settings.PDF_WORKERS)
+        self.timeout = timeout or settings.PDF_CONVERSION_TIMEOUT
+        self._ctx = multiprocessing.get_context(start_method)
+        self._workers: List[_Worker] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    async def start(self) -> None:
+        """Arranca los workers en paralelo (idempotente)."""
+        async with self._start_lock:
+            if self.started:
+                return
+
+            self._workers = [_Worker(self._ctx, i) for i in range(self.size)]
+            await asyncio.gather(*[asyncio.to_thread(w.start) for w in self._workers])
+
+            self._idle = asyncio.Queue()
+            for worker in self._workers:
+                self._idle.put_nowait(worker)
+
+            logger.info("pdf_worker_pool_started", workers=self.size, timeout=self.timeout)
+
+    async def convert(self, file_path: str) -> Dict[str, Any]:
+        """
+        Convierte un PDF en un worker libre.
+
+        Returns:
+            Conversión cruda (file_path, markdown, metadata, page_count, method_used)
+
+        Raises:
+            TimeoutError: Si excede el timeout (el worker se reemplaza)
+            PDFConversionError: Si la conversión falla o el worker muere
+        """
+        await self.start()
+        worker = await self._idle.get()
+        future = asyncio.ensure_future(asyncio.to_thread(worker.run, file_path, self.timeout))
+
+        try:
+            result = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # El worker sigue ocupado: se mata (run() lo reemplaza al ver el
+            # Pipe cerrado) y vuelve a la cola cuando el thread termina
+            if worker.process is not None:
+                worker.process.kill()
+            future.add_done_callback(lambda f: self._release(worker, f))
+            raise
+        except BaseException:
+            self._release(worker)
+            raise
+
+        self._release(worker)
+        return result
+
+    def _release(self, worker: _Worker, future: Optional[asyncio.Future] = None) -> None:
+        if future is not None and not future.cancelled():
+            future.exception()  # Evita "exception was never retrieved"
+        if self._idle is not None:
+            self._idle.put_nowait(worker)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.size,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "restarts": sum(w.restarts for w in self._workers),
+        }
+
+    async def close(self) -> None:
+        """Detiene los workers."""
+        if not self.started:
+            return
+        await asyncio.gather(*[asyncio.to_thread(w.stop) for w in self._workers])
+        self._workers = []
+        self._idle = None
+        logger.info("pdf_worker_pool_closed")
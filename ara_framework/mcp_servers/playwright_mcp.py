@@ -10,25 +10,54 @@ Capacidades:
 3. Screenshots para debugging
 4. Extracción estructurada con selectores
 5. JavaScript execution en contexto de página
+
+Las páginas salen de pools de contextos (mcp_servers/browser_pool.py):
+- Perfil "text" (scrape_page, extract_structured_data): bloquea imágenes,
+  fuentes, hojas de estilo y media
+- Perfil "full" (take_screenshot, evaluate_js): render completo
+
+scrape_page guarda ETag / Last-Modified y el hash del documento: al vencer
+la entrada se revalida con un GET condicional y solo se vuelve a renderizar
+si la página cambió (mcp_servers/revalidation.py).
 """
-import asyncio
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple, Union
 from dataclasses import dataclass
 from pathlib import Path
+import httpx
 import structlog
 from playwright.async_api import (
     async_playwright,
     Browser,
-    BrowserContext,
-    Page,
     Playwright,
 )
 
 from mcp_servers.base import MCPAdapter
+from mcp_servers.browser_pool import BrowserPagePool, FULL_RENDER_PROFILE, TEXT_PROFILE
+from mcp_servers.rate_limit import RateLimit
+from mcp_servers.revalidation import NOT_MODIFIED, PageRecord, Revalidator, is_unchanged
+from mcp_servers.work_queue import iter_completed
 from config.settings import settings
 
 logger = structlog.get_logger()
 
+# Opciones de cada BrowserContext (stealth settings)
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "locale": "en-US",
+    "timezone_id": "America/New_York",
+}
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
 
 @dataclass
 class ScrapedContent:
@@ -63,9 +92,12 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
     - Screenshots para debugging
     - Extracción estructurada con CSS/XPath
     - JavaScript evaluation
+    - Pool de páginas (PLAYWRIGHT_POOL_SIZE) recicladas cada
+      PLAYWRIGHT_PAGE_MAX_USES navegaciones
     
     Rate Limiting: 10 requests/min por defecto (configurable)
-    Cache TTL: 3 días (contenido web cambia frecuentemente)
+    Cache TTL: 3 días (contenido web cambia frecuentemente); después la
+    página se revalida (SCRAPE_REVALIDATION_MODE) en lugar de re-renderizarse
     
     Uso:
         async with PlaywrightAdapter(redis_client) as pw:
@@ -88,20 +120,35 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
             )
     """
     
-    def __init__(self, redis_client=None, browser_type: str = "chromium"):
+    def __init__(
+        self,
+        redis_client=None,
+        browser_type: str = "chromium",
+        pool_size: Optional[int] = None,
+        page_max_uses: Optional[int] = None,
+    ):
         super().__init__(
             name="playwright",
             redis_client=redis_client,
-            rate_limit_rpm=10,  # Conservative por defecto
+            rate_limit=RateLimit.per_minute(10, burst=3),  # Conservative por defecto
             cache_ttl=settings.REDIS_TTL_CONTENT,  # 3 días
         )
         
         self.browser_type = browser_type
+        self.pool_size = pool_size or settings.PLAYWRIGHT_POOL_SIZE
+        self.page_max_uses = (
+            settings.PLAYWRIGHT_PAGE_MAX_USES if page_max_uses is None else page_max_uses
+        )
         
         # Playwright objects
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
+        self.text_pool: Optional[BrowserPagePool] = None
+        self.render_pool: Optional[BrowserPagePool] = None
+        
+        # Revalidación de páginas vencidas (GET condicional, sin browser)
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.revalidator = Revalidator(self, fresh_ttl=settings.REDIS_TTL_CONTENT)
     
     async def connect(self) -> None:
         """Inicializa Playwright y browser."""
@@ -116,34 +163,47 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
             ],
         )
         
-        # Create context con stealth settings
-        self.context = await self.browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            locale="en-US",
-            timezone_id="America/New_York",
+        # Pools de contextos con stealth settings (se crean bajo demanda)
+        self.text_pool = BrowserPagePool(
+            self.browser,
+            TEXT_PROFILE,
+            size=self.pool_size,
+            max_uses=self.page_max_uses,
+            context_options=CONTEXT_OPTIONS,
+            init_script=STEALTH_SCRIPT,
+        )
+        self.render_pool = BrowserPagePool(
+            self.browser,
+            FULL_RENDER_PROFILE,
+            size=settings.PLAYWRIGHT_RENDER_POOL_SIZE,
+            max_uses=self.page_max_uses,
+            context_options=CONTEXT_OPTIONS,
+            init_script=STEALTH_SCRIPT,
         )
         
-        # Inject stealth scripts
-        await self.context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
+        self.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.SCRAPE_HTTP_TIMEOUT, connect=5.0),
+            follow_redirects=True,
+            headers={"User-Agent": CONTEXT_OPTIONS["user_agent"]},
+        )
         
         self.logger.info(
             "playwright_connected",
             browser_type=self.browser_type,
+            pool_size=self.pool_size,
+            page_max_uses=self.page_max_uses,
         )
     
     async def disconnect(self) -> None:
         """Cierra browser y Playwright."""
-        if self.context:
-            await self.context.close()
+        # Un render de background no puede sobrevivir a los pools
+        await self.revalidator.cancel()
+        for pool in (self.text_pool, self.render_pool):
+            if pool is not None:
+                await pool.close()
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
         if self.browser:
             await self.browser.close()
         if self.playwright:
@@ -151,12 +211,19 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
         
         self.logger.info("playwright_disconnected")
     
+    def pool_stats(self) -> Dict[str, Any]:
+        """Métricas de los pools de páginas (vacío si no está conectado)."""
+        return {
+            pool.profile.name: pool.stats()
+            for pool in (self.text_pool, self.render_pool)
+            if pool is not None
+        }
+    
     async def health_check(self) -> bool:
         """Verifica que browser esté operativo."""
         try:
-            page = await self.context.new_page()
-            await page.goto("about:blank")
-            await page.close()
+            async with self.text_pool.page() as page:
+                await page.goto("about:blank")
             return True
         except Exception as e:
             self.logger.error("health_check_failed", error=str(e))
@@ -181,71 +248,74 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
         Returns:
             ScrapedContent con texto extraído
         """
-        # Check cache
-        cache_key = self._make_cache_key("scrape", url)
-        cached = await self._get_cached(cache_key)
-        if cached:
-            return ScrapedContent(**cached)
-        
-        # Enforce rate limit
-        await self._wait_for_rate_limit()
-        
-        page = await self.context.new_page()
-        
-        try:
-            # Navigate
-            await page.goto(url, wait_until="domcontentloaded", timeout=wait_timeout)
+        cache_key = self._make_cache_key("page", url)
+        
+        async def refresh(stale: Optional[PageRecord]) -> Any:
+            # Entrada vencida: GET condicional antes de gastar un render
+            if stale is not None and self.http_client is not None:
+                if await is_unchanged(self.http_client, url, stale):
+                    self.logger.info("page_not_modified", url=url)
+                    return NOT_MODIFIED
             
-            # Wait for specific selector if provided (con fallback)
-            if wait_for_selector:
-                try:
-                    await page.wait_for_selector(wait_for_selector, timeout=wait_timeout)
-                except Exception as e:
-                    # Si falla selector específico, continuar con scraping genérico
-                    self.logger.warning(
-                        "selector_wait_failed_using_fallback",
-                        url=url,
-                        selector=wait_for_selector,
-                        error=str(e),
-                    )
-                    # Continuar sin error - scraping genérico
+            # Enforce rate limit
+            await self._wait_for_rate_limit()
             
-            # Extract content
-            title = await page.title()
-            text = await page.inner_text("body")
-            html = await page.content() if include_html else None
+            async with self.text_pool.page() as page:
+                # Navigate
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=wait_timeout)
             
-            # Metadata
-            metadata = {
-                "status": page.url,
-                "final_url": page.url,  # Puede ser diferente por redirects
-            }
+                # Wait for specific selector if provided (con fallback)
+                if wait_for_selector:
+                    try:
+                        await page.wait_for_selector(wait_for_selector, timeout=wait_timeout)
+                    except Exception as e:
+                        # Si falla selector específico, continuar con scraping genérico
+                        self.logger.warning(
+                            "selector_wait_failed_using_fallback",
+                            url=url,
+                            selector=wait_for_selector,
+                            error=str(e),
+                        )
+                        # Continuar sin error - scraping genérico
             
-            content = ScrapedContent(
-                url=url,
-                title=title,
-                text=text,
-                html=html,
-                metadata=metadata,
-            )
+                # Extract content
+                title = await page.title()
+                text = await page.inner_text("body")
+                html = await page.content() if include_html else None
             
-            # Cache
-            await self._set_cached(
-                cache_key,
-                content.to_dict(),
-                ttl=settings.REDIS_TTL_CONTENT,
-            )
+                # Metadata
+                metadata = {
+                    "status": page.url,
+                    "final_url": page.url,  # Puede ser diferente por redirects
+                }
             
-            self.logger.info(
-                "page_scraped",
-                url=url,
-                text_length=len(text),
-            )
+                content = ScrapedContent(
+                    url=url,
+                    title=title,
+                    text=text,
+                    html=html,
+                    metadata=metadata,
+                )
+            
+                self.logger.info(
+                    "page_scraped",
+                    url=url,
+                    text_length=len(text),
+                )
             
-            return content
+                # Validadores del documento principal (sin body en redirects / errores)
+                headers, body = {}, None
+                if response is not None:
+                    headers = response.headers
+                    try:
+                        body = await response.body()
+                    except Exception:
+                        body = None
+            
+                return PageRecord.from_response(content.to_dict(), headers, body)
         
-        finally:
-            await page.close()
+        cached = await self.revalidator.get(cache_key, refresh, tags=[f"url:{url}"])
+        return ScrapedContent(**cached)
     
     async def extract_structured_data(
         self,
@@ -273,55 +343,47 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
             }
             data = await adapter.extract_structured_data(url, selectors)
         """
-        # Check cache
         cache_key = self._make_cache_key("extract", url, str(sorted(selectors.items())))
-        cached = await self._get_cached(cache_key)
-        if cached:
-            return cached
-        
-        # Enforce rate limit
-        await self._wait_for_rate_limit()
         
-        page = await self.context.new_page()
-        
-        try:
-            await page.goto(url, wait_until="domcontentloaded", timeout=wait_timeout)
+        async def fetch() -> dict:
+            # Enforce rate limit
+            await self._wait_for_rate_limit()
             
-            # Extract each field
-            data = {}
-            for field, selector in selectors.items():
-                try:
-                    element = await page.query_selector(selector)
-                    if element:
-                        data[field] = await element.inner_text()
-                    else:
-                        data[field] = None
-                except Exception as e:
-                    self.logger.warning(
-                        "selector_failed",
-                        field=field,
-                        selector=selector,
-                        error=str(e),
-                    )
-                    data[field] = None
+            async with self.text_pool.page() as page:
+                await page.goto(url, wait_until="domcontentloaded", timeout=wait_timeout)
             
-            # Cache
-            await self._set_cached(
-                cache_key,
-                data,
-                ttl=settings.REDIS_TTL_CONTENT,
-            )
+                # Extract each field
+                data = {}
+                for field, selector in selectors.items():
+                    try:
+                        element = await page.query_selector(selector)
+                        if element:
+                            data[field] = await element.inner_text()
+                        else:
+                            data[field] = None
+                    except Exception as e:
+                        self.logger.warning(
+                            "selector_failed",
+                            field=field,
+                            selector=selector,
+                            error=str(e),
+                        )
+                        data[field] = None
             
-            self.logger.info(
-                "structured_data_extracted",
-                url=url,
-                fields=len(data),
-            )
+                self.logger.info(
+                    "structured_data_extracted",
+                    url=url,
+                    fields=len(data),
+                )
             
-            return data
+                return data
         
-        finally:
-            await page.close()
+        return await self._get_or_fetch(
+            cache_key,
+            fetch,
+            ttl=settings.REDIS_TTL_CONTENT,
+            tags=[f"url:{url}"],
+        )
     
     async def take_screenshot(
         self,
@@ -343,9 +405,7 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
         # Enforce rate limit
         await self._wait_for_rate_limit()
         
-        page = await self.context.new_page()
-        
-        try:
+        async with self.render_pool.page() as page:
             await page.goto(url, wait_until="domcontentloaded")
             
             # Generate path if not provided
@@ -363,9 +423,6 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
             )
             
             return path
-        
-        finally:
-            await page.close()
     
     async def evaluate_js(
         self,
@@ -393,9 +450,7 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
         # Enforce rate limit
         await self._wait_for_rate_limit()
         
-        page = await self.context.new_page()
-        
-        try:
+        async with self.render_pool.page() as page:
             await page.goto(url, wait_until="domcontentloaded", timeout=wait_timeout)
             
             result = await page.evaluate(script)
@@ -407,14 +462,61 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
             )
             
             return result
+    
+    async def iter_scrape(
+        self,
+        urls: List[str],
+        max_concurrent: int = 3,
+        per_host: Optional[int] = None,
+        url_timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[str, Union[ScrapedContent, Exception]]]:
+        """
+        Scrapea múltiples URLs y entrega cada resultado en cuanto termina.
+        
+        Cola de trabajo acotada (mcp_servers/work_queue.py): un slot libre
+        toma la siguiente URL sin esperar al resto de un grupo.
+        
+        Args:
+            urls: Lista de URLs
+            max_concurrent: Máximo número de scrapes simultáneos
+            per_host: Máximo de scrapes simultáneos por host
+                (default: SCRAPE_PER_HOST_LIMIT)
+            url_timeout: Segundos máximos por URL (default: SCRAPE_URL_TIMEOUT)
+            deadline: Segundos máximos para el lote; al vencer se detiene
+                sin entregar las URLs pendientes (None = sin límite)
+            **kwargs: Argumentos para scrape_page
         
-        finally:
-            await page.close()
+        Yields:
+            (url, ScrapedContent o excepción)
+        """
+        async def scrape(url: str) -> ScrapedContent:
+            return await self.scrape_page(url, **kwargs)
+        
+        async for url, result in iter_completed(
+            urls,
+            scrape,
+            max_concurrent=max_concurrent,
+            per_host=per_host or settings.SCRAPE_PER_HOST_LIMIT,
+            item_timeout=url_timeout or settings.SCRAPE_URL_TIMEOUT,
+            deadline=deadline,
+        ):
+            if isinstance(result, Exception):
+                self.logger.error(
+                    "scrape_failed",
+                    url=url,
+                    error=str(result) or type(result).__name__,
+                )
+            yield url, result
     
     async def scrape_multiple(
         self,
         urls: List[str],
         max_concurrent: int = 3,
+        per_host: Optional[int] = None,
+        url_timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
         **kwargs,
     ) -> List[ScrapedContent]:
         """
@@ -423,27 +525,28 @@ class PlaywrightAdapter(MCPAdapter[ScrapedContent]):
         Args:
             urls: Lista de URLs
             max_concurrent: Máximo número de scrapes simultáneos
+            per_host: Máximo de scrapes simultáneos por host
+            url_timeout: Segundos máximos por URL
+            deadline: Segundos máximos para el lote (retorna resultados parciales)
             **kwargs: Argumentos para scrape_page
         
         Returns:
-            Lista de ScrapedContent
+            Lista de ScrapedContent (en el orden de urls, sin los fallidos ni
+            los que no terminaron antes del deadline)
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
-        
-        async def scrape_with_semaphore(url: str) -> ScrapedContent:
-            async with semaphore:
-                return await self.scrape_page(url, **kwargs)
-        
-        tasks = [scrape_with_semaphore(url) for url in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter out exceptions
-        successful = []
-        for result in results:
-            if isinstance(result, Exception):
-                self.logger.error("scrape_failed", error=str(result))
-            else:
-                successful.append(result)
+        results = {}
+        async for url, result in self.iter_scrape(
+            urls,
+            max_concurrent=max_concurrent,
+            per_host=per_host,
+            url_timeout=url_timeout,
+            deadline=deadline,
+            **kwargs,
+        ):
+            if not isinstance(result, Exception):
+                results[url] = result
+        
+        successful = [results[url] for url in dict.fromkeys(urls) if url in results]
         
         self.logger.info(
             "multiple_scrape_completed",
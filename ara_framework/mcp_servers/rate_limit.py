@@ -0,0 +1,188 @@
+"""
+Rate limiters para MCP adapters.
+
+Backends intercambiables con la misma interfaz (`acquire`):
+- TokenBucketLimiter: token bucket en proceso, actualización O(1)
+- RedisTokenBucketLimiter: mismo algoritmo en un script Lua atómico,
+  compartido entre procesos/workers (ej: 1 req/seg de Semantic Scholar
+  se respeta aunque la API corra con varios workers)
+
+Ambos reservan el turno dentro del lock/script y duermen fuera de él: un
+request en espera no bloquea el cálculo de los siguientes, y el orden de
+llegada se respeta.
+
+Usage:
+    ```python
+    from mcp_servers.rate_limit import RateLimit, create_rate_limiter
+
+    limiter = create_rate_limiter("semantic_scholar", RateLimit.per_second(1), redis)
+    await limiter.acquire()
+    ```
+"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+import structlog
+from redis.asyncio import Redis
+
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Límite declarado por un adapter: tasa sostenida + ráfaga máxima."""
+
+    rate: float  # tokens (requests) por segundo
+    burst: int = 1  # requests permitidos de golpe con el bucket lleno
+
+    @classmethod
+    def per_second(cls, rps: float, burst: Optional[int] = None) -> "RateLimit":
+        """Límite en requests por segundo (burst default: 1)."""
+        return cls(rate=float(rps), burst=burst or 1)
+
+    @classmethod
+    def per_minute(cls, rpm: float, burst: Optional[int] = None) -> "RateLimit":
+        """Límite en requests por minuto (burst default: rpm, como una ventana de 60s)."""
+        return cls(rate=rpm / 60.0, burst=burst or max(1, int(rpm)))
+
+
+class RateLimiter(ABC):
+    """Interfaz común de los backends."""
+
+    backend = "base"
+
+    def __init__(self, limit: RateLimit, name: str = ""):
+        self.limit = limit
+        self.name = name
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """
+        Espera hasta poder hacer el request.
+
+        Returns:
+            Segundos esperados
+        """
+        wait_time = await self._reserve(tokens)
+        if wait_time > 0:
+            logger.debug(
+                "rate_limit_waiting",
+                adapter=self.name,
+                backend=self.backend,
+                wait_seconds=round(wait_time, 3),
+            )
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+    @abstractmethod
+    async def _reserve(self, tokens: int) -> float:
+        """Consume tokens y retorna cuánto esperar antes de usarlos."""
+
+
+class TokenBucketLimiter(RateLimiter):
+    """Token bucket en proceso (O(1) por request)."""
+
+    backend = "memory"
+
+    def __init__(self, limit: RateLimit, name: str = ""):
+        super().__init__(limit, name)
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+
+    async def _reserve(self, tokens: int) -> float:
+        # Sin await: la actualización es atómica dentro del event loop
+        now = time.monotonic()
+        self._tokens = min(
+            self.limit.burst,
+            self._tokens + (now - self._updated) * self.limit.rate,
+        )
+        self._updated = now
+        # Saldo negativo = turnos ya reservados por requests en espera
+        self._tokens -= tokens
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.limit.rate
+
+
+# Mismo algoritmo que TokenBucketLimiter, atómico en Redis.
+# Usa TIME del servidor para que todos los workers compartan reloj.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - requested
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+class RedisTokenBucketLimiter(RateLimiter):
+    """
+    Token bucket compartido entre procesos (script Lua, 1 round-trip).
+
+    Si Redis falla, degrada a un bucket local para no bloquear el adapter.
+    """
+
+    backend = "redis"
+
+    def __init__(self, redis_client: Redis, limit: RateLimit, name: str = ""):
+        super().__init__(limit, name)
+        self.redis = redis_client
+        self.key = f"ratelimit:mcp:{name}"
+        self._script = redis_client.register_script(_TOKEN_BUCKET_LUA)
+        self._fallback = TokenBucketLimiter(limit, name)
+
+    async def _reserve(self, tokens: int) -> float:
+        try:
+            wait_time = await self._script(
+                keys=[self.key],
+                args=[self.limit.rate, self.limit.burst, tokens],
+            )
+            return float(wait_time)
+        except Exception as e:
+            logger.warning(
+                "rate_limit_redis_error",
+                key=self.key,
+                error=str(e),
+                fallback="memory",
+            )
+            return await self._fallback._reserve(tokens)
+
+
+def create_rate_limiter(
+    name: str,
+    limit: RateLimit,
+    redis_client: Optional[Redis] = None,
+    backend: Optional[str] = None,
+) -> RateLimiter:
+    """
+    Crea el limiter configurado para un adapter.
+
+    Args:
+        name: Nombre del adapter (parte de la key en Redis)
+        limit: Límite declarado
+        redis_client: Cliente Redis (requerido para backend "redis")
+        backend: "memory" o "redis" (default: settings.MCP_RATE_LIMIT_BACKEND)
+    """
+    backend = backend or settings.MCP_RATE_LIMIT_BACKEND
+
+    if backend == "redis" and redis_client is not None:
+        return RedisTokenBucketLimiter(redis_client, limit, name)
+
+    if backend == "redis":
+        logger.warning("rate_limit_redis_unavailable", adapter=name, fallback="memory")
+
+    return TokenBucketLimiter(limit, name)
@@ -0,0 +1,275 @@
+"""
+Revalidación condicional de páginas cacheadas.
+
+Antes una página scrapeada vivía REDIS_TTL_CONTENT (3 días) y después se
+volvía a descargar y renderizar completa, aunque no hubiera cambiado (al
+re-correr un nicho cada semana, casi ninguna cambia). Ahora cada página se
+guarda como un PageRecord con:
+- ETag / Last-Modified de la respuesta del servidor
+- SHA-256 del body (para servidores sin validadores)
+- fresh_until: hasta cuándo se sirve sin consultar al servidor
+
+El record se retiene SCRAPE_PAGE_RETENTION (más que el TTL de frescura).
+Un record vencido se revalida con un GET condicional (If-None-Match /
+If-Modified-Since): 304, o un 200 con el mismo hash, solo extiende
+fresh_until. Solo un cambio real dispara el fetch / render completo.
+
+Modos (SCRAPE_REVALIDATION_MODE):
+- "off": un record vencido se vuelve a obtener completo
+- "revalidate": revalidación antes de responder
+- "stale_while_revalidate": se responde con el record vencido y se
+  revalida en background. Si el refresh usa un recurso con ciclo de vida
+  (el browser de PlaywrightAdapter), background_session lo mantiene
+  abierto durante el refresh (BrowserManager.session) y cancel() descarta
+  los pendientes al desconectar
+
+Stale-if-error: si la revalidación falla (error de red, 5xx) y hay un
+record vencido, se responde con él en vez de escalar al fetch completo.
+
+Usage:
+    ```python
+    revalidator = Revalidator(adapter, fresh_ttl=259200)
+
+    async def refresh(stale: Optional[PageRecord]):
+        if stale is not None and await is_unchanged(client, url, stale):
+            return NOT_MODIFIED
+        return PageRecord(value=await render(url), **validators)
+
+    value = await revalidator.get(cache_key, refresh, tags=[f"url:{url}"])
+    ```
+"""
+import asyncio
+import hashlib
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Iterable, Optional, Set, Union
+
+import httpx
+import structlog
+
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+
+def content_hash(body: bytes) -> str:
+    """SHA-256 hex del body de la respuesta."""
+    return hashlib.sha256(body).hexdigest()
+
+
+@dataclass
+class PageRecord:
+    """Valor cacheado + validadores HTTP."""
+
+    value: Dict[str, Any]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    fresh_until: float = 0.0  # Epoch (time.time())
+
+    @classmethod
+    def from_response(cls, value: Dict[str, Any], headers: Any, body: Optional[bytes]) -> "PageRecord":
+        """Record con los validadores de los headers (dict-like, keys en minúsculas)."""
+        return cls(
+            value=value,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            content_hash=content_hash(body) if body is not None else None,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PageRecord":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) < self.fresh_until
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers para un GET condicional (vacío si no hay validadores)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def matches(self, response: httpx.Response) -> bool:
+        """True si la respuesta confirma que el contenido no cambió."""
+        if response.status_code == 304:
+            return True
+        return (
+            response.status_code == 200
+            and self.content_hash is not None
+            and content_hash(response.content) == self.content_hash
+        )
+
+
+async def is_unchanged(client: httpx.AsyncClient, url: str, record: PageRecord) -> bool:
+    """
+    GET condicional contra el servidor.
+
+    Returns:
+        True si respondió 304 o el body tiene el mismo hash; False si cambió
+        o la revalidación falló (el caller hace el fetch completo)
+    """
+    headers = record.conditional_headers()
+    if not headers and record.content_hash is None:
+        return False  # Nada con qué comparar: el GET sería un desperdicio
+
+    try:
+        response = await client.get(url, headers=headers)
+    except httpx.HTTPError as e:
+        logger.info("revalidation_failed", url=url, error=str(e) or type(e).__name__)
+        return False
+    return record.matches(response)
+
+
+# Resultado de refresh(): el record vencido sigue siendo válido
+NOT_MODIFIED = object()
+
+RefreshResult = Union[PageRecord, object, None]
+
+
+class Revalidator:
+    """
+    Lectura de PageRecords sobre el cache (L1 + Redis) de un MCPAdapter.
+
+    Los refreshes de una misma key se de-duplican con el single-flight del
+    adapter; los de background se mantienen referenciados hasta terminar y
+    corren dentro de background_session() si está definido.
+    """
+
+    def __init__(
+        self,
+        adapter: Any,
+        fresh_ttl: int,
+        retention: Optional[int] = None,
+        mode: Optional[str] = None,
+    ):
+        """
+        Args:
+            adapter: MCPAdapter cuyo cache y single-flight se usan
+            fresh_ttl: Segundos que un record se sirve sin revalidar
+            retention: Segundos que el record se guarda (default: SCRAPE_PAGE_RETENTION)
+            mode: "off" | "revalidate" | "stale_while_revalidate"
+                (default: SCRAPE_REVALIDATION_MODE)
+        """
+        self.adapter = adapter
+        self.fresh_ttl = fresh_ttl
+        self.retention = max(retention or settings.SCRAPE_PAGE_RETENTION, fresh_ttl)
+        self.mode = mode or settings.SCRAPE_REVALIDATION_MODE
+        self.stats: Counter = Counter()
+        self._background: Set[asyncio.Task] = set()
+        self._refreshing: Set[str] = set()
+        # Sesión que mantiene vivo el recurso del refresh (ej: BrowserManager.session)
+        self.background_session: Optional[Callable[[], AsyncContextManager[Any]]] = None
+
+    async def get(
+        self,
+        cache_key: str,
+        refresh: Callable[[Optional[PageRecord]], Awaitable[RefreshResult]],
+        tags: Iterable[str] = (),
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Valor cacheado, revalidado u obtenido de nuevo según el modo.
+
+        Args:
+            cache_key: Key del record
+            refresh: Recibe el record vencido (o None) y retorna NOT_MODIFIED,
+                un PageRecord nuevo, o None (no cachear)
+            tags: Tags de la entrada
+
+        Returns:
+            record.value, o None si refresh no obtuvo nada. Si refresh lanza
+            y hay un record vencido, el record vencido (stale-if-error)
+        """
+        tags = list(tags)
+        cached = await self.adapter._get_cached(cache_key)
+        record = PageRecord.from_dict(cached) if cached is not None else None
+
+        if record is not None and record.is_fresh():
+            self.stats["fresh"] += 1
+            return record.value
+
+        if record is not None and self.mode == "off":
+            record = None
+
+        if record is not None and self.mode == "stale_while_revalidate":
+            self.stats["stale_served"] += 1
+            if cache_key not in self._refreshing:
+                self._refreshing.add(cache_key)
+                task = asyncio.create_task(self._background_refresh(cache_key, record, refresh, tags))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            return record.value
+
+        if record is None:
+            return await self._refresh(cache_key, record, refresh, tags)
+
+        try:
+            return await self._refresh(cache_key, record, refresh, tags)
+        except Exception as e:
+            self.stats["stale_if_error"] += 1
+            logger.info("stale_served_on_error", key=cache_key, error=str(e) or type(e).__name__)
+            return record.value
+
+    async def _background_refresh(
+        self,
+        cache_key: str,
+        record: PageRecord,
+        refresh: Callable[[Optional[PageRecord]], Awaitable[RefreshResult]],
+        tags: list,
+    ) -> None:
+        try:
+            if self.background_session is not None:
+                async with self.background_session():
+                    await self._refresh(cache_key, record, refresh, tags)
+            else:
+                await self._refresh(cache_key, record, refresh, tags)
+        except Exception as e:
+            logger.warning("background_revalidation_failed", key=cache_key, error=str(e))
+        finally:
+            self._refreshing.discard(cache_key)
+
+    async def _refresh(
+        self,
+        cache_key: str,
+        record: Optional[PageRecord],
+        refresh: Callable[[Optional[PageRecord]], Awaitable[RefreshResult]],
+        tags: list,
+    ) -> Optional[Dict[str, Any]]:
+        async def run() -> Optional[Dict[str, Any]]:
+            result = await refresh(record)
+
+            if result is NOT_MODIFIED and record is not None:
+                self.stats["not_modified"] += 1
+                fresh = record
+            elif isinstance(result, PageRecord):
+                self.stats["refetched" if record is not None else "fetched"] += 1
+                fresh = result
+            else:
+                return None
+
+            fresh.fresh_until = time.time() + self.fresh_ttl
+            await self.adapter._set_cached(cache_key, fresh.to_dict(), ttl=self.retention, tags=tags)
+            return fresh.value
+
+        value, _ = await self.adapter._single_flight.do(f"refresh:{cache_key}", run)
+        return value
+
+    async def drain(self) -> None:
+        """Espera los refreshes de background en curso."""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    async def cancel(self) -> None:
+        """Cancela los refreshes de background (el record vencido se revalida en el próximo get)."""
+        tasks = list(self._background)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -8,7 +8,7 @@ Fuente: investigación perplexity/15_semantic_scholar_api.md
 Referencia: docs/07_TASKS.md (LiteratureResearcher +67% tiempo por bottleneck)
 
 Estrategias de mitigación implementadas:
-1. Rate limiting estricto con asyncio.sleep(1.0)
+1. Rate limiting estricto: token bucket 1 req/seg (compartido entre workers con MCP_RATE_LIMIT_BACKEND="redis")
 2. Cache agresivo (7 días TTL para papers)
 3. Paralelización con offsets (múltiples queries simultáneas)
 4. Circuit breaker para errores 429
@@ -21,10 +21,30 @@ from pybreaker import CircuitBreaker
 import structlog
 
 from mcp_servers.base import MCPAdapter
+from mcp_servers.rate_limit import RateLimit
 from config.settings import settings
 
 logger = structlog.get_logger()
 
+# Campos que pedimos al API (search, detalle y batch comparten cache)
+PAPER_FIELDS = [
+    "paperId",
+    "title",
+    "abstract",
+    "year",
+    "authors",
+    "citationCount",
+    "url",
+    "venue",
+    "fieldsOfStudy",
+]
+
+# POST /paper/batch acepta hasta 500 IDs por request
+BATCH_MAX_IDS = 500
+
+# Páginas del planner de search_papers_window (máximo limit del API)
+SEARCH_PAGE_SIZE = 100
+
 
 @dataclass
 class Paper:
@@ -97,7 +117,8 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
         super().__init__(
             name="semantic_scholar",
             redis_client=redis_client,
-            rate_limit_rpm=60,  # Teórico, pero enforceamos 1 req/seg manualmente
+            # 1 req/seg estricto, sin ráfagas (429 abre el circuit breaker)
+            rate_limit=RateLimit.per_second(1.0 / settings.SEMANTIC_SCHOLAR_DELAY, burst=1),
             cache_ttl=settings.REDIS_TTL_PAPERS,  # 7 días
         )
         
@@ -112,10 +133,6 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
             fail_max=settings.CIRCUIT_BREAKER_FAIL_MAX,
             reset_timeout=settings.CIRCUIT_BREAKER_TIMEOUT,
         )
-        
-        # Timestamp del último request (para 1 req/seg enforcement)
-        self._last_request_time: float = 0
-        self._request_lock = asyncio.Lock()
     
     async def connect(self) -> None:
         """Inicializa el cliente HTTP."""
@@ -167,7 +184,6 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
         Returns:
             Lista de Papers
         """
-        # Check cache
         cache_key = self._make_cache_key(
             "search",
             query,
@@ -177,55 +193,34 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
             str(year_to or ""),
         )
         
-        cached = await self._get_cached(cache_key)
-        if cached:
-            return [Paper(**paper_data) for paper_data in cached]
-        
-        # Enforce rate limit (1 req/seg)
-        await self._enforce_rate_limit()
-        
-        # Build params
-        params = {
-            "query": query,
-            "limit": min(limit, 100),  # API max
-            "offset": offset,
-            "fields": ",".join(fields or [
-                "paperId",
-                "title",
-                "abstract",
-                "year",
-                "authors",
-                "citationCount",
-                "url",
-                "venue",
-                "fieldsOfStudy",
-            ]),
-        }
-        
-        if year_from:
-            params["year"] = f"{year_from}-"
-        if year_to:
-            if "year" in params:
-                params["year"] = f"{year_from}-{year_to}"
-            else:
-                params["year"] = f"-{year_to}"
-        
-        # Request con circuit breaker
-        try:
-            response_data = await self._make_request("/paper/search", params)
+        async def fetch() -> List[dict]:
+            # Enforce rate limit (1 req/seg)
+            await self._wait_for_rate_limit()
+            
+            # Build params
+            params = {
+                "query": query,
+                "limit": min(limit, 100),  # API max
+                "offset": offset,
+                "fields": ",".join(fields or PAPER_FIELDS),
+            }
+            
+            year = self._year_param(year_from, year_to)
+            if year:
+                params["year"] = year
+            
+            # Request con circuit breaker
+            try:
+                response_data = await self._make_request("/paper/search", params)
+            except Exception as e:
+                self.logger.error("search_error", query=query, error=str(e))
+                raise
             
             papers = [
                 Paper.from_api_response(paper_data)
                 for paper_data in response_data.get("data", [])
             ]
             
-            # Cache results
-            await self._set_cached(
-                cache_key,
-                [paper.to_dict() for paper in papers],
-                ttl=settings.REDIS_TTL_PAPERS,
-            )
-            
             self.logger.info(
                 "papers_found",
                 query=query,
@@ -233,11 +228,15 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
                 offset=offset,
             )
             
-            return papers
+            return [paper.to_dict() for paper in papers]
         
-        except Exception as e:
-            self.logger.error("search_error", query=query, error=str(e))
-            raise
+        # Cache (L1 + Redis) con single-flight para búsquedas idénticas concurrentes
+        cached = await self._get_or_fetch(
+            cache_key,
+            fetch,
+            ttl=settings.REDIS_TTL_PAPERS,
+        )
+        return [Paper(**paper_data) for paper_data in cached]
     
     async def search_papers_parallel(
         self,
@@ -313,6 +312,69 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
         
         return all_papers[:total]
     
+    async def search_papers_window(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+    ) -> List[Paper]:
+        """
+        Busca papers sirviendo cualquier ventana (limit, offset) desde páginas cacheadas.
+        
+        Planner de paginación: los resultados se piden siempre en páginas
+        alineadas de SEARCH_PAGE_SIZE (el máximo del API) y cada página se
+        cachea como lista de paper IDs; los papers se cachean por ID (mismo
+        cache que get_paper_details / get_papers_details). Así un request
+        limit=20 sirve después a limit=10, offset=5, etc. sin tocar el API.
+        
+        Búsquedas idénticas concurrentes comparten el fetch de cada página
+        (single-flight en _get_or_fetch).
+        
+        Args:
+            query: Query de búsqueda
+            limit: Número de resultados
+            offset: Posición del primer resultado
+            year_from: Año mínimo (opcional)
+            year_to: Año máximo (opcional)
+        
+        Returns:
+            Lista de Papers en el orden de relevancia del API
+        """
+        if limit <= 0:
+            return []
+        
+        first_page = offset // SEARCH_PAGE_SIZE
+        last_page = (offset + limit - 1) // SEARCH_PAGE_SIZE
+        
+        ranked_ids: List[str] = []
+        for page in range(first_page, last_page + 1):
+            page_ids = await self._get_search_page(query, page, year_from, year_to)
+            ranked_ids.extend(page_ids)
+            
+            # Página incompleta = no hay más resultados
+            if len(page_ids) < SEARCH_PAGE_SIZE:
+                break
+        
+        start = offset - first_page * SEARCH_PAGE_SIZE
+        window = ranked_ids[start:start + limit]
+        
+        # Normalmente todo viene del cache por ID (llenado por la página);
+        # si alguno expiró, get_papers_details lo pide en un solo batch
+        papers = await self.get_papers_details(window)
+        
+        self.logger.info(
+            "search_window_served",
+            query=query,
+            limit=limit,
+            offset=offset,
+            pages=last_page - first_page + 1,
+            count=len(window),
+        )
+        
+        return [papers[paper_id] for paper_id in window if paper_id in papers]
+    
     async def get_paper_details(self, paper_id: str) -> Optional[Paper]:
         """
         Obtiene detalles de un paper específico.
@@ -323,34 +385,107 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
         Returns:
             Paper o None si no existe
         """
-        # Check cache
         cache_key = self._make_cache_key("paper", paper_id)
-        cached = await self._get_cached(cache_key)
-        if cached:
-            return Paper(**cached)
         
-        # Enforce rate limit
-        await self._enforce_rate_limit()
+        async def fetch() -> Optional[dict]:
+            # Enforce rate limit
+            await self._wait_for_rate_limit()
+            
+            try:
+                response_data = await self._make_request(
+                    f"/paper/{paper_id}",
+                    params={"fields": ",".join(PAPER_FIELDS)},
+                )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    self.logger.warning("paper_not_found", paper_id=paper_id)
+                    return None
+                raise
+            
+            return Paper.from_api_response(response_data).to_dict()
         
-        try:
-            response_data = await self._make_request(f"/paper/{paper_id}")
+        cached = await self._get_or_fetch(
+            cache_key,
+            fetch,
+            ttl=settings.REDIS_TTL_PAPERS,
+            tags=[f"paper:{paper_id}"],
+        )
+        return Paper(**cached) if cached else None
+    
+    async def get_papers_details(
+        self,
+        paper_ids: List[str],
+        chunk_size: int = BATCH_MAX_IDS,
+    ) -> Dict[str, Paper]:
+        """
+        Obtiene detalles de varios papers con POST /paper/batch.
+        
+        Revisa el cache por ID (L1 + un MGET a Redis), pide solo los IDs
+        faltantes en chunks (1 request por chunk bajo el rate limit) y
+        cachea cada paper individualmente (compartido con get_paper_details).
+        
+        Args:
+            paper_ids: IDs en Semantic Scholar (acepta también "DOI:...", "ARXIV:...")
+            chunk_size: IDs por request (max 500)
+        
+        Returns:
+            Dict {paper_id: Paper}; los IDs inexistentes no aparecen
+        """
+        unique_ids = list(dict.fromkeys(paper_ids))
+        keys = {paper_id: self._make_cache_key("paper", paper_id) for paper_id in unique_ids}
+        
+        cached = await self._get_cached_many(list(keys.values()))
+        papers = {
+            paper_id: Paper(**cached[key])
+            for paper_id, key in keys.items()
+            if key in cached
+        }
+        missing = [paper_id for paper_id in unique_ids if paper_id not in papers]
+        
+        chunk_size = max(1, min(chunk_size, BATCH_MAX_IDS))
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start:start + chunk_size]
             
-            paper = Paper.from_api_response(response_data)
+            # Un request por chunk (vs uno por paper)
+            await self._wait_for_rate_limit()
             
-            # Cache
-            await self._set_cached(
-                cache_key,
-                paper.to_dict(),
-                ttl=settings.REDIS_TTL_PAPERS,
-            )
+            try:
+                response_data = await self._make_request(
+                    "/paper/batch",
+                    params={"fields": ",".join(PAPER_FIELDS)},
+                    json_body={"ids": chunk},
+                )
+            except Exception as e:
+                self.logger.error("batch_details_error", ids=len(chunk), error=str(e))
+                raise
             
-            return paper
+            # La respuesta viene alineada con los IDs pedidos (null = no existe)
+            to_cache = []
+            for paper_id, paper_data in zip(chunk, response_data):
+                if not paper_data:
+                    self.logger.warning("paper_not_found", paper_id=paper_id)
+                    continue
+                paper = Paper.from_api_response(paper_data)
+                papers[paper_id] = paper
+                to_cache.append(
+                    self._set_cached(
+                        keys[paper_id],
+                        paper.to_dict(),
+                        ttl=settings.REDIS_TTL_PAPERS,
+                        tags=[f"paper:{paper_id}"],
+                    )
+                )
+            await asyncio.gather(*to_cache)
         
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                self.logger.warning("paper_not_found", paper_id=paper_id)
-                return None
-            raise
+        self.logger.info(
+            "batch_details_completed",
+            requested=len(unique_ids),
+            cache_hits=len(unique_ids) - len(missing),
+            fetched=len(missing),
+            requests=(len(missing) + chunk_size - 1) // chunk_size,
+        )
+        
+        return papers
     
     async def get_recommendations(
         self,
@@ -367,75 +502,128 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
         Returns:
             Lista de Papers relacionados
         """
-        # Check cache
         cache_key = self._make_cache_key("recommendations", paper_id, str(limit))
-        cached = await self._get_cached(cache_key)
-        if cached:
-            return [Paper(**paper_data) for paper_data in cached]
         
-        # Enforce rate limit
-        await self._enforce_rate_limit()
-        
-        try:
-            response_data = await self._make_request(
-                f"/paper/{paper_id}/recommendations",
-                params={"limit": limit},
-            )
+        async def fetch() -> List[dict]:
+            # Enforce rate limit
+            await self._wait_for_rate_limit()
             
-            papers = [
-                Paper.from_api_response(rec["paper"])
+            try:
+                response_data = await self._make_request(
+                    f"/paper/{paper_id}/recommendations",
+                    params={"limit": limit},
+                )
+            except Exception as e:
+                self.logger.error("recommendations_error", paper_id=paper_id, error=str(e))
+                raise
+            
+            return [
+                Paper.from_api_response(rec["paper"]).to_dict()
                 for rec in response_data.get("data", [])
             ]
-            
-            # Cache
-            await self._set_cached(
-                cache_key,
-                [paper.to_dict() for paper in papers],
-                ttl=settings.REDIS_TTL_PAPERS,
-            )
-            
-            return papers
         
-        except Exception as e:
-            self.logger.error("recommendations_error", paper_id=paper_id, error=str(e))
-            raise
+        cached = await self._get_or_fetch(
+            cache_key,
+            fetch,
+            ttl=settings.REDIS_TTL_PAPERS,
+            tags=[f"paper:{paper_id}"],
+        )
+        return [Paper(**paper_data) for paper_data in cached]
     
     # ============================================================
     # MÉTODOS PRIVADOS
     # ============================================================
     
-    async def _enforce_rate_limit(self) -> None:
+    async def _get_search_page(
+        self,
+        query: str,
+        page: int,
+        year_from: Optional[int],
+        year_to: Optional[int],
+    ) -> List[str]:
         """
-        Enforce estricto de 1 request por segundo.
+        Retorna los paper IDs de una página de búsqueda (cacheada).
         
-        Usa lock para garantizar que solo 1 request se ejecute por segundo,
-        incluso con múltiples tasks concurrentes.
+        Al pedir la página, cada paper se cachea también por ID.
         """
-        async with self._request_lock:
-            now = asyncio.get_event_loop().time()
-            elapsed = now - self._last_request_time
+        cache_key = self._make_cache_key(
+            "search_page",
+            query,
+            str(page),
+            str(year_from or ""),
+            str(year_to or ""),
+        )
+        
+        async def fetch() -> List[str]:
+            await self._wait_for_rate_limit()
             
-            if elapsed < self.delay:
-                wait_time = self.delay - elapsed
-                self.logger.debug(
-                    "rate_limit_enforced",
-                    wait_seconds=round(wait_time, 2),
+            params = {
+                "query": query,
+                "limit": SEARCH_PAGE_SIZE,
+                "offset": page * SEARCH_PAGE_SIZE,
+                "fields": ",".join(PAPER_FIELDS),
+            }
+            year = self._year_param(year_from, year_to)
+            if year:
+                params["year"] = year
+            
+            try:
+                response_data = await self._make_request("/paper/search", params)
+            except Exception as e:
+                self.logger.error("search_page_error", query=query, page=page, error=str(e))
+                raise
+            
+            papers = [
+                Paper.from_api_response(paper_data)
+                for paper_data in response_data.get("data", [])
+            ]
+            papers = [paper for paper in papers if paper.paper_id]
+            
+            await asyncio.gather(*[
+                self._set_cached(
+                    self._make_cache_key("paper", paper.paper_id),
+                    paper.to_dict(),
+                    ttl=settings.REDIS_TTL_PAPERS,
+                    tags=[f"paper:{paper.paper_id}"],
                 )
-                await asyncio.sleep(wait_time)
+                for paper in papers
+            ])
+            
+            self.logger.info(
+                "search_page_fetched",
+                query=query,
+                page=page,
+                count=len(papers),
+            )
             
-            self._last_request_time = asyncio.get_event_loop().time()
+            return [paper.paper_id for paper in papers]
+        
+        return await self._get_or_fetch(
+            cache_key,
+            fetch,
+            ttl=settings.REDIS_TTL_PAPERS,
+        )
+    
+    @staticmethod
+    def _year_param(year_from: Optional[int], year_to: Optional[int]) -> Optional[str]:
+        """Formato del filtro "year" del API ("2020-", "-2023", "2020-2023")."""
+        if not year_from and not year_to:
+            return None
+        return f"{year_from or ''}-{year_to or ''}"
     
     async def _make_request(
         self,
         endpoint: str,
         params: Optional[dict] = None,
-    ) -> dict:
+        json_body: Optional[dict] = None,
+    ) -> Any:
         """
         Hace request al API con circuit breaker.
         
         Args:
             endpoint: Endpoint (ej: "/paper/search")
             params: Query parameters
+            json_body: Body JSON (si se pasa, el request es POST)
         
         Returns:
             Response JSON
@@ -443,7 +631,10 @@ class SemanticScholarAdapter(MCPAdapter[List[Paper]]):
         Raises:
             httpx.HTTPStatusError: Si error HTTP
         """
-        response = await self.client.get(endpoint, params=params)
+        if json_body is not None:
+            response = await self.client.post(endpoint, params=params, json=json_body)
+        else:
+            response = await self.client.get(endpoint, params=params)
         
         # Handle 429 (rate limit exceeded)
         if response.status_code == 429:
@@ -24,6 +24,7 @@ import structlog
 from supabase import create_client, Client
 
 from mcp_servers.base import MCPAdapter
+from mcp_servers.rate_limit import RateLimit
 from config.settings import settings
 
 logger = structlog.get_logger()
@@ -96,7 +97,7 @@ class SupabaseAdapter(MCPAdapter[Dict[str, Any]]):
         super().__init__(
             name="supabase",
             redis_client=redis_client,
-            rate_limit_rpm=100,  # Free tier limit
+            rate_limit=RateLimit.per_minute(100, burst=20),  # Free tier limit
             cache_ttl=0,  # No cache (Supabase ES persistencia)
         )
         
@@ -0,0 +1,133 @@
+"""
+Cola de trabajo acotada con límite por host y deadlines.
+
+Scrapear en grupos fijos (gather de max_concurrent URLs y recién entonces
+el grupo siguiente) deja los slots libres esperando a la página más lenta
+del grupo. Aquí N workers toman URLs de una cola compartida:
+- Un worker libre toma la siguiente URL cuyo host tenga capacidad (una
+  URL de un host saturado no bloquea a las de otros hosts)
+- Deadline por item: el que lo excede se cancela y se entrega como
+  TimeoutError
+- Deadline global: al vencer, se cancelan los items en curso y el
+  generador termina con los resultados entregados hasta ese momento
+- Cada resultado se entrega en cuanto termina (orden de finalización)
+
+Usage:
+    ```python
+    from mcp_servers.work_queue import iter_completed
+
+    async for url, result in iter_completed(urls, scrape, max_concurrent=4,
+                                            per_host=2, item_timeout=30):
+        if isinstance(result, Exception):
+            ...
+    ```
+"""
+import asyncio
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+def host_key(url: str) -> str:
+    """Host de la URL en minúsculas ("" si no tiene)."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+async def iter_completed(
+    items: Iterable[str],
+    fn: Callable[[str], Awaitable[Any]],
+    max_concurrent: int,
+    per_host: Optional[int] = None,
+    item_timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+    key: Callable[[str], str] = host_key,
+) -> AsyncIterator[Tuple[str, Union[Any, Exception]]]:
+    """
+    Ejecuta fn sobre cada item con concurrencia acotada.
+
+    Args:
+        items: URLs (u otros items) a procesar, en orden de prioridad
+        fn: Corutina a ejecutar por item
+        max_concurrent: Máximo de items en curso
+        per_host: Máximo de items en curso por key (None = sin límite)
+        item_timeout: Segundos máximos por item (None = sin límite)
+        deadline: Segundos máximos para todo el lote (None = sin límite)
+        key: Función item -> key para per_host (default: host de la URL)
+
+    Yields:
+        (item, resultado o excepción) en orden de finalización. Si vence el
+        deadline, los items no terminados no se entregan.
+    """
+    pending = deque(items)
+    total = len(pending)
+    if total == 0:
+        return
+
+    active: Dict[str, int] = defaultdict(int)
+    changed = asyncio.Condition()
+    done: asyncio.Queue = asyncio.Queue()
+
+    def take() -> Optional[Tuple[str, str]]:
+        for index, item in enumerate(pending):
+            item_key = key(item)
+            if per_host is None or active[item_key] < per_host:
+                del pending[index]
+                active[item_key] += 1
+                return item, item_key
+        return None
+
+    async def worker() -> None:
+        while True:
+            async with changed:
+                while True:
+                    if not pending:
+                        return
+                    picked = take()
+                    if picked is not None:
+                        break
+                    await changed.wait()
+
+            item, item_key = picked
+            try:
+                if item_timeout is None:
+                    result = await fn(item)
+                else:
+                    result = await asyncio.wait_for(fn(item), item_timeout)
+            except Exception as e:
+                result = e
+            finally:
+                async with changed:
+                    active[item_key] -= 1
+                    changed.notify_all()
+
+            done.put_nowait((item, result))
+
+    loop = asyncio.get_running_loop()
+    expires_at = None if deadline is None else loop.time() + deadline
+    workers = [asyncio.create_task(worker()) for _ in range(min(max(1, max_concurrent), total))]
+
+    try:
+        for delivered in range(total):
+            if expires_at is None:
+                yield await done.get()
+                continue
+
+            try:
+                completed = await asyncio.wait_for(done.get(), max(0.0, expires_at - loop.time()))
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "work_queue_deadline_reached",
+                    deadline=deadline,
+                    completed=delivered,
+                    unfinished=total - delivered,
+                )
+                return
+            yield completed
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,146 @@
+"""
+Micro-benchmark del post-procesamiento de PDFs convertidos.
+
+Compara la implementación anterior (_clean_repetitive_headers +
+_extract_sections, dos recorridos con lower() y 10 búsquedas de substring
+por línea) con el scanner de una pasada de mcp_servers/pdf_sections.py.
+
+Uso:
+    python scripts/benchmark_pdf_sections.py                 # corpus sintético
+    python scripts/benchmark_pdf_sections.py papers/ -n 20   # PDFs reales (PyMuPDF)
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mcp_servers.pdf_sections import scan_markdown  # noqa: E402
+
+LEGACY_KEYWORDS = [
+    "abstract",
+    "introduction",
+    "related work",
+    "methodology",
+    "methods",
+    "results",
+    "discussion",
+    "conclusion",
+    "references",
+    "acknowledgments",
+]
+
+
+def legacy_clean(text: str) -> str:
+    """Implementación anterior de _clean_repetitive_headers."""
+    lines = text.split("\n")
+    line_counts = {}
+    for line in lines:
+        stripped = line.strip()
+        if stripped:
+            line_counts[stripped] = line_counts.get(stripped, 0) + 1
+
+    cleaned_lines = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            cleaned_lines.append(line)
+            continue
+        if line_counts[stripped] > 3:
+            continue
+        if stripped.isdigit():
+            continue
+        cleaned_lines.append(line)
+    return "\n".join(cleaned_lines)
+
+
+def legacy_sections(markdown: str) -> Dict[str, str]:
+    """Implementación anterior de _extract_sections."""
+    sections = {}
+    current_section = "header"
+    current_text = []
+    for line in markdown.split("\n"):
+        line_lower = line.lower().strip()
+        is_section = False
+        for keyword in LEGACY_KEYWORDS:
+            if keyword in line_lower and len(line_lower) < 50:
+                if current_text:
+                    sections[current_section] = "\n".join(current_text).strip()
+                current_section = keyword.replace(" ", "_")
+                current_text = []
+                is_section = True
+                break
+        if not is_section:
+            current_text.append(line)
+    if current_text:
+        sections[current_section] = "\n".join(current_text).strip()
+    return sections
+
+
+def synthetic_corpus(count: int, pages: int = 30, seed: int = 7) -> List[str]:
+    """Papers sintéticos: headers por página, números de página y secciones."""
+    rng = random.Random(seed)
+    words = "model data results method learning network analysis we show that the of".split()
+    headers = ["Abstract", "1. Introduction", "2 Related Work", "3. Methods",
+               "4. Results", "5. Discussion", "6. Conclusion", "References"]
+    corpus = []
+    for _ in range(count):
+        lines = []
+        for page in range(1, pages + 1):
+            lines.append("Proceedings of the Conference on Things 2025")
+            if page % 4 == 1 and headers:
+                lines.append(headers[(page // 4) % len(headers)])
+            for _ in range(45):
+                lines.append(" ".join(rng.choice(words) for _ in range(rng.randint(4, 14))))
+            lines.append(str(page))
+        corpus.append("\n".join(lines))
+    return corpus
+
+
+def pdf_corpus(directory: Path) -> List[str]:
+    """Texto de los PDFs de un directorio (PyMuPDF)."""
+    from mcp_servers.pdf_workers import convert_with_pymupdf_sync
+
+    return [
+        convert_with_pymupdf_sync(str(path))["markdown"]
+        for path in sorted(directory.glob("*.pdf"))
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("pdf_dir", nargs="?", help="Directorio con PDFs (default: sintético)")
+    parser.add_argument("-n", "--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = pdf_corpus(Path(args.pdf_dir)) if args.pdf_dir else synthetic_corpus(20)
+    if not corpus:
+        print("Corpus vacío")
+        return 1
+
+    chars = sum(len(doc) for doc in corpus)
+    print(f"Corpus: {len(corpus)} documentos, {chars / 1e6:.1f}M caracteres, {args.repeat} repeticiones")
+
+    def run_legacy():
+        for doc in corpus:
+            legacy_sections(legacy_clean(doc))
+
+    def run_scanner():
+        for doc in corpus:
+            scan_markdown(doc).sections
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.repeat))
+    scanner = min(timeit.repeat(run_scanner, number=1, repeat=args.repeat))
+
+    print(f"  legacy (2 pasadas):   {legacy * 1000:8.1f} ms")
+    print(f"  scanner (1 pasada):   {scanner * 1000:8.1f} ms")
+    print(f"  speedup:              {legacy / scanner:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Tests para core/agent_utils.safe_agent_invoke (ejecución de tool calls).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+
+from core.agent_utils import safe_agent_invoke
+
+
+def make_llm(tool_calls):
+    """LLM falso: primera respuesta pide tool_calls, segunda responde final."""
+    bound = Mock()
+    bound.ainvoke = AsyncMock(side_effect=[
+        AIMessage(content="", tool_calls=tool_calls),
+        AIMessage(content="final answer"),
+    ])
+    llm = Mock()
+    llm.bind_tools.return_value = bound
+    return llm, bound
+
+
+def make_tool(name, delay=0.0, tracker=None):
+    async def run(value: str) -> str:
+        if tracker is not None:
+            tracker["running"] += 1
+            tracker["max"] = max(tracker["max"], tracker["running"])
+        try:
+            await asyncio.sleep(delay)
+            return f"{name}:{value}"
+        finally:
+            if tracker is not None:
+                tracker["running"] -= 1
+
+    return StructuredTool.from_function(coroutine=run, name=name, description=name)
+
+
+def call(name, value, call_id):
+    return {"name": name, "args": {"value": value}, "id": call_id}
+
+
+def tool_messages(bound):
+    """ToolMessages enviados al LLM en la segunda invocación."""
+    sent = bound.ainvoke.call_args_list[1].args[0]
+    return [m for m in sent if isinstance(m, ToolMessage)]
+
+
+class TestConcurrentToolCalls:
+    """Tool calls de una misma respuesta se ejecutan en paralelo."""
+
+    @pytest.mark.asyncio
+    async def test_results_keep_original_order(self):
+        llm, bound = make_llm([
+            call("slow", "a", "1"),
+            call("fast", "b", "2"),
+            call("slow", "c", "3"),
+        ])
+        tools = [make_tool("slow", delay=0.05), make_tool("fast")]
+
+        result = await safe_agent_invoke(llm, tools, [HumanMessage(content="go")])
+
+        assert result["output"] == "final answer"
+        assert len(result["tool_calls"]) == 3
+        messages = tool_messages(bound)
+        assert [m.tool_call_id for m in messages] == ["1", "2", "3"]
+        assert [m.content for m in messages] == ["slow:a", "fast:b", "slow:c"]
+
+    @pytest.mark.asyncio
+    async def test_calls_run_concurrently(self):
+        tracker = {"running": 0, "max": 0}
+        llm, _ = make_llm([call("scrape", str(i), str(i)) for i in range(3)])
+        tools = [make_tool("scrape", delay=0.05, tracker=tracker)]
+
+        await safe_agent_invoke(llm, tools, [HumanMessage(content="go")])
+
+        assert tracker["max"] == 3
+
+    @pytest.mark.asyncio
+    async def test_per_tool_concurrency_limit(self):
+        tracker = {"running": 0, "max": 0}
+        llm, _ = make_llm([call("scrape", str(i), str(i)) for i in range(4)])
+        tools = [make_tool("scrape", delay=0.01, tracker=tracker)]
+
+        await safe_agent_invoke(
+            llm, tools, [HumanMessage(content="go")],
+            tool_concurrency={"scrape": 1},
+        )
+
+        assert tracker["max"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_error_message(self):
+        llm, bound = make_llm([call("hang", "x", "1"), call("fast", "y", "2")])
+        tools = [make_tool("hang", delay=5), make_tool("fast")]
+
+        result = await safe_agent_invoke(
+            llm, tools, [HumanMessage(content="go")], tool_timeout=0.05,
+        )
+
+        assert result["output"] == "final answer"
+        messages = tool_messages(bound)
+        assert "timed out" in messages[0].content
+        assert messages[1].content == "fast:y"
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool_returns_error_message(self):
+        llm, bound = make_llm([call("missing", "x", "1")])
+
+        await safe_agent_invoke(llm, [make_tool("fast")], [HumanMessage(content="go")])
+
+        assert "not found" in tool_messages(bound)[0].content
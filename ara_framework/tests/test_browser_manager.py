@@ -0,0 +1,255 @@
+"""
+Tests para el ciclo de vida del browser (BrowserManager).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import pytest
+
+from mcp_servers.browser_manager import BrowserManager, browser_rss_bytes
+from mcp_servers.http_fetcher import HTTPFetcher
+from mcp_servers.revalidation import PageRecord, Revalidator
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def is_connected(self):
+        return self.connected
+
+    def crash(self):
+        self.connected = False
+        self.handlers["disconnected"](self)
+
+
+class FakeAdapter:
+    """Sustituto de PlaywrightAdapter: cuenta connects / disconnects."""
+
+    def __init__(self):
+        self.browser = None
+        self.connects = 0
+        self.disconnects = 0
+
+    async def connect(self):
+        self.connects += 1
+        self.browser = FakeBrowser()
+
+    async def disconnect(self):
+        self.disconnects += 1
+        self.browser = None
+
+    async def health_check(self):
+        return True
+
+    def pool_stats(self):
+        return {"text": {"total_uses": 0}}
+
+
+class TestBrowserManager:
+    """Arranque lazy, reinicios y apagado por inactividad."""
+
+    @pytest.mark.asyncio
+    async def test_starts_on_first_session(self):
+        adapter = FakeAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0, max_pages=0)
+
+        assert adapter.connects == 0
+        async with manager.session() as session_adapter:
+            assert session_adapter is adapter
+        async with manager.session():
+            pass
+
+        assert adapter.connects == 1
+        assert manager.metrics()["total_pages"] == 2
+        await manager.close()
+        assert adapter.disconnects == 1
+
+    @pytest.mark.asyncio
+    async def test_prewarm(self):
+        adapter = FakeAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0, max_pages=0)
+
+        await manager.start()
+        await manager.start()
+
+        assert adapter.connects == 1
+        assert manager.running
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_restarts_after_max_pages(self):
+        adapter = FakeAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0, max_pages=3)
+
+        for _ in range(7):
+            async with manager.session():
+                pass
+
+        assert adapter.connects == 3
+        assert manager.restarts == {"max_pages": 2}
+        assert manager.pages_since_start == 1
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_restart_waits_for_in_flight_sessions(self):
+        adapter = FakeAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0, max_pages=2)
+        events = []
+
+        async def use(name, delay):
+            async with manager.session():
+                events.append(f"{name}_start_{adapter.connects}")
+                await asyncio.sleep(delay)
+                events.append(f"{name}_end")
+
+        first = asyncio.create_task(use("a", 0.05))
+        second = asyncio.create_task(use("b", 0.1))
+        await asyncio.sleep(0.01)
+        # a y b ocupan las 2 páginas: c debe esperar a que terminen ambas
+        await use("c", 0)
+        await asyncio.gather(first, second)
+
+        assert events.index("c_start_2") > events.index("b_end")
+        assert adapter.disconnects == 1
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_restarts_after_crash(self):
+        adapter = FakeAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0, max_pages=0)
+
+        async with manager.session():
+            pass
+        adapter.browser.crash()
+
+        assert manager.metrics()["crashed"] is True
+        assert await manager.health_check() is False
+
+        async with manager.session():
+            pass
+
+        assert adapter.connects == 2
+        assert manager.restarts == {"crashed": 1}
+        assert manager.metrics()["crashed"] is False
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_shutdown_and_restart_on_demand(self):
+        adapter = FakeAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0.1, max_pages=0)
+
+        async with manager.session():
+            pass
+        await asyncio.sleep(0.3)
+
+        assert not manager.running
+        assert adapter.disconnects == 1
+        assert manager.idle_shutdowns == 1
+
+        async with manager.session():
+            pass
+
+        assert manager.running
+        assert adapter.connects == 2
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_no_idle_shutdown_while_in_use(self):
+        adapter = FakeAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0.05, max_pages=0)
+
+        async with manager.session():
+            await asyncio.sleep(0.2)
+            assert manager.running
+
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_metrics(self):
+        adapter = FakeAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0, max_pages=0)
+        async with manager.session():
+            pass
+
+        metrics = manager.metrics()
+
+        assert metrics["running"] is True
+        assert metrics["starts"] == 1
+        assert metrics["pools"] == {"text": {"total_uses": 0}}
+        assert metrics["browser_rss_mb"] is None or metrics["browser_rss_mb"] >= 0
+        await manager.close()
+
+    def test_browser_rss_without_browsers(self):
+        rss = browser_rss_bytes()
+        assert rss is None or rss == 0
+
+
+class RevalidatingAdapter(FakeAdapter):
+    """FakeAdapter con un Revalidator en stale_while_revalidate."""
+
+    def __init__(self):
+        super().__init__()
+        self.revalidator = Revalidator(HTTPFetcher(), fresh_ttl=0, mode="stale_while_revalidate")
+        self.browser_open_during_refresh = []
+
+    async def seed(self):
+        async def fetch(stale):
+            return PageRecord(value={"v": 1})
+        await self.revalidator.get("k", fetch)
+
+
+class TestBackgroundRevalidation:
+    """Los refreshes de background cuentan como sesión del browser."""
+
+    @pytest.mark.asyncio
+    async def test_idle_shutdown_waits_for_background_refresh(self):
+        adapter = RevalidatingAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0.05, max_pages=0)
+        await adapter.seed()
+        release = asyncio.Event()
+
+        async def slow_render(stale):
+            await release.wait()
+            adapter.browser_open_during_refresh.append(adapter.browser is not None)
+            return PageRecord(value={"v": 2})
+
+        assert await adapter.revalidator.get("k", slow_render) == {"v": 1}
+        await asyncio.sleep(0.2)  # Más que idle_timeout
+
+        assert manager.metrics()["in_flight"] == 1
+        assert adapter.disconnects == 0
+
+        release.set()
+        await adapter.revalidator.drain()
+        await asyncio.sleep(0.2)
+
+        assert adapter.browser_open_during_refresh == [True]
+        assert manager.idle_shutdowns == 1
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_background_refresh(self):
+        adapter = RevalidatingAdapter()
+        manager = BrowserManager(adapter, idle_timeout=0, max_pages=0)
+        await adapter.seed()
+        started = asyncio.Event()
+
+        async def hanging_render(stale):
+            started.set()
+            await asyncio.Event().wait()
+
+        await adapter.revalidator.get("k", hanging_render)
+        await started.wait()
+
+        await asyncio.wait_for(manager.close(), timeout=1)
+
+        assert adapter.disconnects == 1
+        assert not adapter.revalidator._background
+        assert manager.metrics()["in_flight"] == 0
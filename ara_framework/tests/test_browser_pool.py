@@ -0,0 +1,224 @@
+"""
+Tests para el pool de contextos/páginas de Playwright.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from mcp_servers.browser_pool import (
+    BrowserPagePool,
+    FULL_RENDER_PROFILE,
+    TEXT_PROFILE,
+)
+from mcp_servers.playwright_mcp import PlaywrightAdapter
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+        self.gotos = []
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url, **kwargs):
+        self.gotos.append(url)
+
+    async def title(self):
+        return "Title"
+
+    async def inner_text(self, selector):
+        return f"text of {self.gotos[-1]}"
+
+    async def content(self):
+        return "<html></html>"
+
+    @property
+    def url(self):
+        return self.gotos[-1]
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.closed = False
+        self.routes = []
+        self.init_scripts = []
+        self.pages = []
+
+    async def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+        for page in self.pages:
+            page.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **options):
+        context = FakeContext(options)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+def make_route(resource_type):
+    route = MagicMock()
+    route.request.resource_type = resource_type
+
+    async def abort():
+        route.outcome = "abort"
+
+    async def continue_():
+        route.outcome = "continue"
+
+    route.abort = abort
+    route.continue_ = continue_
+    return route
+
+
+class TestBrowserPagePool:
+    """Reutilización, reciclaje e intercepción de requests."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_page_until_max_uses(self):
+        browser = FakeBrowser()
+        pool = BrowserPagePool(browser, TEXT_PROFILE, size=1, max_uses=3)
+
+        pages = []
+        for _ in range(4):
+            async with pool.page() as page:
+                pages.append(page)
+
+        assert pages[0] is pages[1] is pages[2]
+        assert pages[3] is not pages[0]
+        assert len(browser.contexts) == 2
+        assert browser.contexts[0].closed
+        assert pool.stats()["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_size_bounds_open_pages(self):
+        pool = BrowserPagePool(FakeBrowser(), TEXT_PROFILE, size=2)
+        active = 0
+        peak = 0
+
+        async def use():
+            nonlocal active, peak
+            async with pool.page():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*[use() for _ in range(6)])
+
+        assert peak == 2
+        assert pool.stats()["contexts_created"] == 2
+
+    @pytest.mark.asyncio
+    async def test_closed_page_is_replaced(self):
+        browser = FakeBrowser()
+        pool = BrowserPagePool(browser, TEXT_PROFILE, size=1)
+
+        with pytest.raises(RuntimeError):
+            async with pool.page() as page:
+                page.closed = True  # Crash del renderer
+                raise RuntimeError("Target closed")
+
+        async with pool.page() as page:
+            assert not page.is_closed()
+
+        assert len(browser.contexts) == 2
+        assert browser.contexts[0].closed
+
+    @pytest.mark.asyncio
+    async def test_text_profile_blocks_heavy_resources(self):
+        browser = FakeBrowser()
+        pool = BrowserPagePool(browser, TEXT_PROFILE, size=1)
+        async with pool.page():
+            pass
+
+        context = browser.contexts[0]
+        assert context.options["service_workers"] == "block"
+        (pattern, handler), = context.routes
+
+        outcomes = {}
+        for resource_type in ("document", "script", "xhr", "image", "font", "stylesheet", "media"):
+            route = make_route(resource_type)
+            await handler(route)
+            outcomes[resource_type] = route.outcome
+
+        assert outcomes == {
+            "document": "continue",
+            "script": "continue",
+            "xhr": "continue",
+            "image": "abort",
+            "font": "abort",
+            "stylesheet": "abort",
+            "media": "abort",
+        }
+        assert pool.stats()["blocked_requests"] == 4
+
+    @pytest.mark.asyncio
+    async def test_full_render_profile_does_not_intercept(self):
+        browser = FakeBrowser()
+        pool = BrowserPagePool(browser, FULL_RENDER_PROFILE, size=1, init_script="stealth")
+        async with pool.page():
+            pass
+
+        context = browser.contexts[0]
+        assert context.routes == []
+        assert "service_workers" not in context.options
+        assert context.init_scripts == ["stealth"]
+
+
+class TestPlaywrightAdapterPools:
+    """PlaywrightAdapter usa el pool de texto para scrapear."""
+
+    @pytest.fixture
+    def adapter(self):
+        adapter = PlaywrightAdapter(pool_size=2, page_max_uses=2)
+        adapter.browser = FakeBrowser()
+        adapter.text_pool = BrowserPagePool(adapter.browser, TEXT_PROFILE, size=2, max_uses=2)
+        adapter.render_pool = BrowserPagePool(adapter.browser, FULL_RENDER_PROFILE, size=1)
+        adapter._wait_for_rate_limit = MagicMock(side_effect=lambda: asyncio.sleep(0))
+        return adapter
+
+    @pytest.mark.asyncio
+    async def test_scrape_page_uses_text_pool(self, adapter):
+        content = await adapter.scrape_page("https://example.com/a")
+
+        assert content.text == "text of https://example.com/a"
+        stats = adapter.pool_stats()
+        assert stats["text"]["total_uses"] == 1
+        assert stats["full"]["total_uses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_scrape_multiple_recycles_contexts(self, adapter):
+        urls = [f"https://example.com/{i}" for i in range(6)]
+
+        results = await adapter.scrape_multiple(urls, max_concurrent=3)
+
+        assert sorted(r.text for r in results) == sorted(f"text of {u}" for u in urls)
+        stats = adapter.pool_stats()["text"]
+        assert stats["total_uses"] == 6
+        assert stats["open_pages"] <= 2
+        assert stats["recycled"] >= 2
@@ -8,11 +8,12 @@ Tests cubiertos:
 2. Lógica de BudgetStatus (computed fields, alerts, affordability)
 3. Validación de fallbacks configurados
 4. Inicialización básica de BudgetManager
+5. record_usage atómico contra fakeredis (script Lua) y usage_log en background
+6. Snapshot del BudgetStatus (TTL + campo version en Redis)
 
 LIMITACIONES DOCUMENTADAS:
-- No se testean métodos async con Redis (can_use_model, record_usage, get_status)
-  Razón: Mocking async state es complejo y frágil
-  Solución: Integration tests con Redis real (ver test_pipeline_manual.py)
+- can_use_model / get_status con Redis real se cubren en integration tests
+  (ver test_pipeline_manual.py)
   
 - No se mockea BudgetManager.initialize()
   Razón: initialize() carga de Redis y resetea estado mockeado
@@ -21,15 +22,20 @@ LIMITACIONES DOCUMENTADAS:
 COBERTURA: 53% de tests unitarios + integration tests = cobertura completa funcional
 """
 
+import asyncio
+import time
 import pytest
+from collections import Counter
+import fakeredis.aioredis
 from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
 
 # Imports de ARA Framework
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.budget_manager import BudgetManager, ModelCost, BudgetStatus, MODEL_COSTS
+from core.budget_manager import BudgetManager, ModelCost, BudgetStatus, MODEL_COSTS, BUDGET_KEY
 
 
 class TestModelCost:
@@ -205,6 +211,196 @@ class TestBudgetManagerBasic:
         assert status.can_afford("gpt-4o") is True
 
 
+
+class FakeSupabaseTable:
+    """table("usage_log").insert(rows).execute() sync y lento."""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self._pending = None
+    
+    def insert(self, data):
+        self._pending = data
+        return self
+    
+    def execute(self):
+        time.sleep(0.05)
+        self.rows.extend(self._pending)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.rows = []
+    
+    def table(self, name):
+        return FakeSupabaseTable(self.rows)
+
+
+class TestRecordUsageAtomic:
+    """record_usage: un round-trip atómico a Redis + persistencia en background."""
+    
+    @pytest.fixture
+    def redis(self):
+        return fakeredis.aioredis.FakeRedis(decode_responses=True)
+    
+    @pytest.mark.asyncio
+    async def test_returns_new_totals(self, redis):
+        budget = BudgetManager(redis_client=redis)
+        redis.hgetall = AsyncMock(side_effect=AssertionError("lectura extra"))
+        
+        await budget.record_usage("gpt-5")
+        status = await budget.record_usage("claude-haiku-4.5")
+        
+        assert status.credits_used == pytest.approx(1.33)
+        assert status.requests_by_model == {"gpt-5": 1, "claude-haiku-4.5": 1}
+        assert status.credits_limit == 300
+        assert status.period_start.day == 1
+        assert await redis.ttl(BUDGET_KEY) > 0
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_workers_do_not_lose_updates(self, redis):
+        worker_a = BudgetManager(redis_client=redis)
+        worker_b = BudgetManager(redis_client=redis)
+        
+        await asyncio.gather(*[
+            (worker_a if i % 2 else worker_b).record_usage("gpt-5") for i in range(40)
+        ])
+        
+        status = await BudgetManager(redis_client=redis).get_status()
+        assert status.credits_used == pytest.approx(40.0)
+        assert status.requests_by_model == {"gpt-5": 40}
+    
+    @pytest.mark.asyncio
+    async def test_supabase_insert_runs_in_background(self, redis):
+        budget = BudgetManager(redis_client=redis)
+        budget.supabase = FakeSupabase()
+        
+        start = time.perf_counter()
+        await budget.record_usage("gpt-5", metadata={"agent": "niche_analyst"})
+        assert time.perf_counter() - start < 0.05
+        assert budget.supabase.rows == []
+        
+        await budget.close()
+        
+        assert len(budget.supabase.rows) == 1
+        assert budget.supabase.rows[0]["model"] == "gpt-5"
+        assert budget.supabase.rows[0]["metadata"] == {"agent": "niche_analyst"}
+    
+    @pytest.mark.asyncio
+    async def test_records_tokens(self, redis):
+        budget = BudgetManager(redis_client=redis)
+        budget.supabase = FakeSupabase()
+        
+        await budget.record_usage("deepseek-v3", input_tokens=1000, output_tokens=500)
+        status = await budget.record_usage("gpt-5", input_tokens=200, output_tokens=50)
+        await budget.close()
+        
+        assert (status.input_tokens, status.output_tokens) == (1200, 550)
+        assert budget.supabase.rows[0]["metadata"]["cost_usd"] == pytest.approx(0.00082)
+        assert budget.supabase.rows[1]["metadata"]["input_tokens"] == 200
+    
+    @pytest.mark.asyncio
+    async def test_alert_only_when_crossing_threshold(self, redis):
+        budget = BudgetManager(redis_client=redis)
+        budget._send_alert = AsyncMock()
+        await redis.hset(BUDGET_KEY, "credits_used", 239.5)
+        
+        await budget.record_usage("gpt-5")  # 240.5: cruza el 80%
+        await budget.record_usage("gpt-5")
+        
+        budget._send_alert.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_redis_error_falls_back_to_status_load(self, redis):
+        budget = BudgetManager(redis_client=redis)
+        budget._record_script = AsyncMock(side_effect=ConnectionError("down"))
+        budget.redis = None
+        
+        status = await budget.record_usage("gpt-5")
+        
+        assert status.credits_used == 0.0
+
+
+
+def spy_redis(redis):
+    """Cuenta las lecturas hget / hgetall sobre el cliente fakeredis."""
+    calls = Counter()
+    for name in ("hget", "hgetall"):
+        original = getattr(redis, name)
+        
+        async def wrapper(*args, _name=name, _original=original, **kwargs):
+            calls[_name] += 1
+            return await _original(*args, **kwargs)
+        
+        setattr(redis, name, wrapper)
+    return calls
+
+
+class TestBudgetStatusSnapshot:
+    """Snapshot en memoria del BudgetStatus con validación por versión."""
+    
+    @pytest.fixture
+    def redis(self):
+        return fakeredis.aioredis.FakeRedis(decode_responses=True)
+    
+    @pytest.mark.asyncio
+    async def test_preflight_checks_use_snapshot(self, redis):
+        budget = BudgetManager(redis_client=redis)
+        await budget.record_usage("gpt-5")
+        calls = spy_redis(redis)
+        
+        for _ in range(10):
+            assert await budget.can_use_model("gpt-5")
+            await budget.get_fallback_model("claude-sonnet-4.5")
+            assert await budget.get_remaining_credits() == pytest.approx(299.0)
+        
+        assert calls == {}
+        assert budget.snapshot_stats["reloads"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_own_usage_updates_snapshot(self, redis):
+        budget = BudgetManager(redis_client=redis)
+        assert await budget.get_remaining_credits() == 300.0
+        calls = spy_redis(redis)
+        
+        await budget.record_usage("gpt-5")
+        
+        assert await budget.get_remaining_credits() == pytest.approx(299.0)
+        assert calls == {}
+    
+    @pytest.mark.asyncio
+    async def test_other_worker_update_is_picked_up_by_version(self, redis):
+        worker_a = BudgetManager(redis_client=redis)
+        worker_b = BudgetManager(redis_client=redis)
+        worker_a.status_cache_ttl = 0  # Validar la versión en cada lectura
+        await worker_a.record_usage("gpt-5")
+        calls = spy_redis(redis)
+        
+        # Sin cambios: solo HGET de la versión, sin recargar el hash
+        assert await worker_a.get_remaining_credits() == pytest.approx(299.0)
+        assert calls == {"hget": 1}
+        assert worker_a.snapshot_stats["revalidated"] == 1
+        
+        await worker_b.record_usage("gpt-5")
+        
+        assert await worker_a.get_remaining_credits() == pytest.approx(298.0)
+        assert calls == {"hget": 2, "hgetall": 1}
+        assert worker_a.snapshot_stats["reloads"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_is_stale_only_within_ttl(self, redis):
+        worker_a = BudgetManager(redis_client=redis)
+        worker_b = BudgetManager(redis_client=redis)
+        worker_a.status_cache_ttl = 0.05
+        assert await worker_a.get_remaining_credits() == 300.0
+        
+        await worker_b.record_usage("gpt-5")
+        assert await worker_a.get_remaining_credits() == 300.0
+        
+        await asyncio.sleep(0.06)
+        assert await worker_a.get_remaining_credits() == pytest.approx(299.0)
+
+
 # Documentación de limitaciones
 """
 === TESTS NO IMPLEMENTADOS (Requieren Integration Testing) ===
@@ -218,7 +414,7 @@ Están cubiertos por integration tests en test_pipeline_manual.py:
    
 2. test_record_usage_updates_redis()
    - Verifica que record_usage() incrementa counters en Redis
-   - Valida atomicidad con locks
+   - Atomicidad: ver TestRecordUsageAtomic (fakeredis)
    
 3. test_get_status_from_redis()
    - Verifica que get_status() carga estado actual de Redis
@@ -0,0 +1,203 @@
+"""
+Tests para el scraping en niveles (HTTP plano → Playwright).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import threading
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+
+from mcp_servers import http_fetcher
+from mcp_servers.http_fetcher import HTTPFetcher, html_to_text, is_spa_domain, render_required_reason
+from mcp_servers.playwright_mcp import ScrapedContent
+from tools.scraping_tool import ScrapingTool
+
+ARTICLE = "<p>" + "Transformers for protein folding. " * 20 + "</p>"
+
+PAGES = {
+    "https://arxiv.org/abs/1": (
+        200,
+        "text/html; charset=utf-8",
+        f"<html><head><title>Paper</title><style>p {{}}</style></head>"
+        f"<body><script>var x = 1;</script>{ARTICLE}<div id='main'>ok</div></body></html>",
+    ),
+    "https://app.example.com/": (
+        200,
+        "text/html",
+        "<html><head><title>App</title></head><body><div id='root'></div>"
+        "<script src='/bundle.js'></script></body></html>",
+    ),
+    "https://dash.example.com/": (
+        200,
+        "text/html",
+        "<html><body><noscript>You need to enable JavaScript to run this app.</noscript>"
+        "<p>" + "Loading dashboard shell. " * 12 + "</p></body></html>",
+    ),
+    "https://blog.example.com/post": (
+        200,
+        "text/html",
+        "<html><body><noscript>Please enable JavaScript to view the comments.</noscript>"
+        + ARTICLE * 3 + "</body></html>",
+    ),
+    "https://example.com/forbidden": (403, "text/html", "denied"),
+    "https://example.com/paper.pdf": (200, "application/pdf", "%PDF-1.7"),
+    "https://notes.example.com/readme.txt": (200, "text/plain", "plain text " * 30),
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    status, content_type, body = PAGES[str(request.url)]
+    return httpx.Response(status, headers={"content-type": content_type}, text=body)
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = HTTPFetcher()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+class TestRenderHeuristics:
+    """Detección de páginas que necesitan browser."""
+
+    def test_html_to_text_drops_scripts_and_styles(self):
+        title, text, noscript = html_to_text(PAGES["https://arxiv.org/abs/1"][2])
+
+        assert title == "Paper"
+        assert "protein folding" in text
+        assert "var x" not in text and "p {}" not in text
+        assert noscript is False
+
+    def test_spa_domains_match_subdomains(self):
+        assert is_spa_domain("https://www.linkedin.com/in/someone")
+        assert is_spa_domain("https://x.com/user")
+        assert not is_spa_domain("https://arxiv.org/abs/1")
+        assert not is_spa_domain("https://notlinkedin.com/")
+
+    def test_reasons(self):
+        long_text = "word " * 100
+        assert render_required_reason("https://a.com", long_text, False) is None
+        assert render_required_reason("https://a.com", "", False) == "empty_body"
+        assert render_required_reason("https://a.com", long_text, True) == "noscript"
+        assert render_required_reason("https://a.com", long_text * 5, True) is None
+        assert render_required_reason("https://twitter.com/a", long_text, False) == "spa_domain"
+
+
+class TestHTTPFetcher:
+    """Primer nivel: GET + HTML → texto."""
+
+    @pytest.mark.asyncio
+    async def test_static_page(self, fetcher):
+        content = await fetcher.fetch("https://arxiv.org/abs/1")
+
+        assert content.title == "Paper"
+        assert content.metadata["fetcher"] == "http"
+        assert content.metadata["render_required"] is None
+        assert content.html is None
+
+    @pytest.mark.asyncio
+    async def test_js_pages_are_flagged(self, fetcher):
+        spa = await fetcher.fetch("https://app.example.com/")
+        dash = await fetcher.fetch("https://dash.example.com/")
+        blog = await fetcher.fetch("https://blog.example.com/post")
+
+        assert spa.metadata["render_required"] == "empty_body"
+        assert dash.metadata["render_required"] == "noscript"
+        assert blog.metadata["render_required"] is None
+
+    @pytest.mark.asyncio
+    async def test_missing_selector_requires_render(self, fetcher):
+        found = await fetcher.fetch("https://arxiv.org/abs/1", wait_for_selector="#main")
+        missing = await fetcher.fetch("https://arxiv.org/abs/1", wait_for_selector=".comments")
+
+        assert found.metadata["render_required"] is None
+        assert missing.metadata["render_required"] == "selector_missing"
+
+    @pytest.mark.asyncio
+    async def test_html_is_parsed_once_off_the_event_loop(self, fetcher, monkeypatch):
+        parse_page = http_fetcher.parse_page
+        threads = []
+
+        def spy(html, selector=None):
+            threads.append(threading.current_thread())
+            return parse_page(html, selector)
+
+        monkeypatch.setattr(http_fetcher, "parse_page", spy)
+        content = await fetcher.fetch("https://arxiv.org/abs/1", wait_for_selector="#main")
+
+        assert content.metadata["render_required"] is None
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_unusable_responses_return_none(self, fetcher):
+        assert await fetcher.fetch("https://example.com/forbidden") is None
+        assert await fetcher.fetch("https://example.com/paper.pdf") is None
+
+    @pytest.mark.asyncio
+    async def test_plain_text(self, fetcher):
+        content = await fetcher.fetch("https://notes.example.com/readme.txt")
+
+        assert content.text.startswith("plain text")
+        assert content.metadata["render_required"] is None
+
+
+class TestTieredScraping:
+    """ScrapingTool.fetch_page escala a Playwright solo cuando hace falta."""
+
+    @pytest.fixture
+    def scraping_tool(self, fetcher):
+        tool = ScrapingTool()
+        tool.http = fetcher
+        tool.adapter.connect = AsyncMock()  # Sin Chromium real
+
+        async def scrape_page(url, **kwargs):
+            return ScrapedContent(url=url, title="Rendered", text="rendered text", metadata={"final_url": url})
+
+        tool.adapter.scrape_page = AsyncMock(side_effect=scrape_page)
+        return tool
+
+    @pytest.mark.asyncio
+    async def test_static_page_skips_browser(self, scraping_tool):
+        content = await scraping_tool.fetch_page("https://arxiv.org/abs/1")
+
+        assert content.metadata["fetcher"] == "http"
+        scraping_tool.adapter.scrape_page.assert_not_awaited()
+        assert scraping_tool.fetch_counts == {"http": 1}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("url, reason", [
+        ("https://app.example.com/", "empty_body"),
+        ("https://dash.example.com/", "noscript"),
+        ("https://example.com/forbidden", "http_unusable"),
+    ])
+    async def test_escalates_to_browser(self, scraping_tool, url, reason):
+        content = await scraping_tool.fetch_page(url)
+
+        assert content.title == "Rendered"
+        assert content.metadata["fetcher"] == "browser"
+        assert content.metadata["render_reason"] == reason
+        scraping_tool.adapter.scrape_page.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_network_error_escalates(self, scraping_tool):
+        def failing(request):
+            raise httpx.ConnectError("connection refused")
+
+        scraping_tool.http.client = httpx.AsyncClient(transport=httpx.MockTransport(failing))
+
+        content = await scraping_tool.fetch_page("https://arxiv.org/abs/1")
+
+        assert content.metadata["render_reason"] == "http_error"
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_mixes_tiers(self, scraping_tool):
+        urls = ["https://arxiv.org/abs/1", "https://app.example.com/", "https://example.com/paper.pdf"]
+
+        results = await scraping_tool.fetch_many(urls)
+
+        assert [r.metadata["fetcher"] for r in results] == ["http", "browser", "browser"]
+        assert scraping_tool.fetch_counts == {"http": 1, "browser": 2}
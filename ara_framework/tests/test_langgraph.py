@@ -131,6 +131,22 @@ class TestResearchGraph:
         assert "niche_analyst" in result["agent_history"]
         assert result["current_agent"] == "literature_researcher"
     
+    @pytest.mark.asyncio
+    @patch("graphs.research_graph.safe_agent_invoke")
+    @patch("graphs.research_graph.create_model")
+    async def test_literature_researcher_gets_batch_details_tool(self, mock_create_model, mock_safe_invoke):
+        """The literature researcher can fetch paper details in one batch call."""
+        from graphs.research_graph import literature_researcher_node
+        
+        mock_create_model.return_value = Mock()
+        mock_safe_invoke.return_value = {"output": "# Literature Review", "tool_calls": []}
+        
+        result = await literature_researcher_node({"niche": "Test", "niche_analysis": None})
+        
+        tool_names = [t.name for t in mock_safe_invoke.call_args.kwargs["tools"]]
+        assert "get_papers_details" in tool_names
+        assert result["literature_review"] == "# Literature Review"
+    
     @pytest.mark.asyncio
     @patch("graphs.research_graph.safe_agent_invoke")
     @patch("graphs.research_graph.create_model")
@@ -185,6 +201,80 @@ class TestResearchGraph:
         assert graph is not None
 
 
+class TestParallelGraph:
+    """Test suite for the fan-out/fan-in graph mode."""
+
+    def test_parallel_graph_creation(self):
+        """Parallel mode compiles with the same five agent nodes."""
+        graph = create_research_graph(enable_checkpointing=False, mode="parallel")
+
+        nodes = set(graph.get_graph().nodes)
+        for node in [
+            "niche_analyst",
+            "literature_researcher",
+            "technical_architect",
+            "implementation_specialist",
+            "content_synthesizer",
+        ]:
+            assert node in nodes
+
+    def test_unknown_mode_falls_back_to_sequential(self):
+        """Unknown modes fall back to the sequential chain."""
+        graph = create_research_graph(enable_checkpointing=False, mode="bogus")
+
+        assert graph is not None
+
+    @pytest.mark.asyncio
+    @patch("graphs.research_graph.safe_agent_invoke")
+    @patch("graphs.research_graph.create_model")
+    async def test_parallel_branches_run_concurrently(self, mock_create_model, mock_safe_invoke):
+        """Independent branches overlap and reducers merge their outputs."""
+        mock_create_model.return_value = Mock()
+
+        running = 0
+        max_running = 0
+
+        async def fake_invoke(llm, tools, messages, max_iterations=5):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"output": "output", "tool_calls": []}
+
+        mock_safe_invoke.side_effect = fake_invoke
+
+        graph = create_research_graph(enable_checkpointing=False, mode="parallel")
+        result = await graph.ainvoke({"niche": "Test Technology"})
+
+        assert max_running == 2
+        assert sorted(result["agent_history"]) == sorted([
+            "niche_analyst",
+            "literature_researcher",
+            "technical_architect",
+            "implementation_specialist",
+            "content_synthesizer",
+        ])
+        assert result["agent_history"][-1] == "content_synthesizer"
+        assert result["final_report"] == "output"
+        assert result["errors"] == []
+
+    @pytest.mark.asyncio
+    @patch("graphs.research_graph.safe_agent_invoke")
+    @patch("graphs.research_graph.create_model")
+    async def test_parallel_branch_errors_are_merged(self, mock_create_model, mock_safe_invoke):
+        """Errors from concurrent branches are accumulated, not overwritten."""
+        mock_create_model.return_value = Mock()
+        mock_safe_invoke.side_effect = Exception("Test error")
+
+        graph = create_research_graph(enable_checkpointing=False, mode="parallel")
+        result = await graph.ainvoke({"niche": "Test Technology"})
+
+        assert len(result["errors"]) == 5
+        assert result["retry_count"]["niche_analyst"] == 1
+        assert result["retry_count"]["literature_researcher"] == 1
+
+
 class TestConvenienceFunctions:
     """Test convenience functions for running the pipeline."""
     
@@ -0,0 +1,160 @@
+"""
+Tests para core/llm_cache.py (cache de respuestas LLM).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import fakeredis.aioredis
+from unittest.mock import Mock, AsyncMock
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.tools import StructuredTool
+
+from core.agent_utils import safe_agent_invoke
+from core.llm_cache import (
+    LLMCacheMiss,
+    LLMResponseCache,
+    RedisLLMCache,
+    SQLiteLLMCache,
+    make_cache_key,
+)
+
+
+def make_llm(model="gpt-4o", temperature=0.7):
+    llm = Mock()
+    llm.model_name = model
+    llm.temperature = temperature
+    llm.ainvoke = AsyncMock(return_value=AIMessage(content="answer"))
+    return llm
+
+
+def search_tool():
+    async def search(query: str) -> str:
+        return query
+
+    return StructuredTool.from_function(coroutine=search, name="search", description="search")
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    cache = SQLiteLLMCache(path=str(tmp_path / "llm.sqlite"), ttl=60, max_entries=3)
+    yield cache
+    cache._conn.close()
+
+
+class TestCacheKey:
+    """Key canónica de una llamada."""
+
+    def test_ignores_message_ids(self):
+        llm = make_llm()
+        first = make_cache_key([HumanMessage(content="hi", id="a")], [], llm)
+        second = make_cache_key([HumanMessage(content="hi", id="b")], [], llm)
+
+        assert first == second
+
+    def test_depends_on_model_temperature_and_tools(self):
+        messages = [SystemMessage(content="sys"), HumanMessage(content="hi")]
+        base = make_cache_key(messages, [], make_llm())
+
+        assert make_cache_key(messages, [], make_llm(model="gpt-4o-mini")) != base
+        assert make_cache_key(messages, [], make_llm(temperature=0.2)) != base
+        assert make_cache_key(messages, [search_tool()], make_llm()) != base
+
+
+class TestBackends:
+    """Backends Redis y SQLite."""
+
+    def test_base_class_is_abstract(self):
+        with pytest.raises(TypeError):
+            LLMResponseCache()
+
+    @pytest.mark.asyncio
+    async def test_redis_close_closes_client(self):
+        redis = AsyncMock()
+        cache = RedisLLMCache(redis)
+
+        await cache.close()
+
+        redis.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_roundtrip_keeps_tool_calls(self, sqlite_cache):
+        response = AIMessage(
+            content="",
+            tool_calls=[{"name": "search", "args": {"query": "x"}, "id": "1"}],
+        )
+        await sqlite_cache.set("k", response)
+
+        cached = await sqlite_cache.get("k")
+
+        assert cached.tool_calls[0]["name"] == "search"
+        assert cached.tool_calls[0]["args"] == {"query": "x"}
+
+    @pytest.mark.asyncio
+    async def test_sqlite_evicts_oldest(self, sqlite_cache):
+        for i in range(5):
+            await sqlite_cache.set(f"k{i}", AIMessage(content=str(i)))
+
+        assert await sqlite_cache.get("k0") is None
+        assert await sqlite_cache.get("k1") is None
+        assert (await sqlite_cache.get("k4")).content == "4"
+
+    @pytest.mark.asyncio
+    async def test_sqlite_expired_entries_are_misses(self, sqlite_cache):
+        sqlite_cache.ttl = 0
+        await sqlite_cache.set("k", AIMessage(content="old"))
+
+        assert await sqlite_cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_roundtrip_and_eviction(self):
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        cache = RedisLLMCache(redis, ttl=60, max_entries=2)
+
+        for i in range(3):
+            await cache.set(f"k{i}", AIMessage(content=str(i)))
+
+        assert await cache.get("k0") is None
+        assert (await cache.get("k2")).content == "2"
+        assert await redis.zcard(cache.index_key) == 2
+
+
+class TestSafeAgentInvokeCache:
+    """Integración con safe_agent_invoke."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_cache(self, sqlite_cache):
+        llm = make_llm()
+        messages = [HumanMessage(content="Analyze: Test")]
+
+        first = await safe_agent_invoke(llm, [], messages, cache=sqlite_cache)
+        second = await safe_agent_invoke(llm, [], messages, cache=sqlite_cache)
+
+        assert first["output"] == second["output"] == "answer"
+        assert llm.ainvoke.await_count == 1
+        assert sqlite_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_replay_mode_raises_on_miss(self, sqlite_cache):
+        sqlite_cache.mode = "replay"
+        llm = make_llm()
+
+        with pytest.raises(LLMCacheMiss):
+            await safe_agent_invoke(llm, [], [HumanMessage(content="new")], cache=sqlite_cache)
+
+        llm.ainvoke.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_replay_miss_in_no_tools_retry_raises(self):
+        cache = AsyncMock()
+        cache.replay = True
+        # La llamada con tools falla con un error de tool calling; el reintento sin tools no está grabado
+        cache.get.side_effect = [Exception("invalid tool call format"), None]
+        llm = make_llm()
+
+        with pytest.raises(LLMCacheMiss):
+            await safe_agent_invoke(llm, [search_tool()], [HumanMessage(content="go")], cache=cache)
+
+        assert cache.get.await_count == 2
+        llm.ainvoke.assert_not_awaited()
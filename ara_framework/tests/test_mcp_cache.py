@@ -0,0 +1,189 @@
+"""
+Tests para el cache de dos niveles de MCPAdapter (mcp_servers/cache.py).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import json
+import time
+import pytest
+import fakeredis.aioredis
+
+from mcp_servers.base import MCPAdapter
+from mcp_servers.cache import LocalTTLCache, SingleFlight
+
+
+class DummyAdapter(MCPAdapter[dict]):
+    """Adapter mínimo para probar la lógica común."""
+
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def health_check(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+class TestLocalTTLCache:
+    """L1 en proceso."""
+
+    def test_lru_eviction(self):
+        cache = LocalTTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" pasa a ser el menos usado
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_expired_entries_are_misses(self):
+        cache = LocalTTLCache()
+        cache.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate_tags(self):
+        cache = LocalTTLCache()
+        cache.set("a", 1, tags=["paper:1"])
+        cache.set("b", 2, tags=["paper:1", "search"])
+        cache.set("c", 3, tags=["search"])
+
+        assert cache.invalidate_tags("paper:1") == 2
+        assert cache.get("c") == 3
+
+    def test_tag_index_is_pruned(self):
+        cache = LocalTTLCache(max_entries=10)
+        for i in range(1000):
+            cache.set(f"k{i}", i, tags=["search", f"paper:{i}"])
+
+        assert len(cache._tags["search"]) == 10
+        assert len(cache._tags) == 11
+
+        cache.delete("k999")
+        cache.set("k998", 0, ttl=0.01)  # sin tags: se desvincula de los anteriores
+        time.sleep(0.02)
+        assert cache.get("k998") is None
+
+        assert "paper:999" not in cache._tags
+        assert "paper:998" not in cache._tags
+        assert cache._tags["search"] == {f"k{i}" for i in range(990, 998)}
+
+
+class TestSingleFlight:
+    """De-duplicación de llamadas concurrentes."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*[flight.do("k", fetch) for _ in range(5)])
+
+        assert calls == 1
+        assert [value for value, _ in results] == ["value"] * 5
+        assert sum(shared for _, shared in results) == 4
+        assert flight.inflight == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_waiters(self):
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        results = await asyncio.gather(
+            flight.do("k", fetch), flight.do("k", fetch), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+
+class TestMCPAdapterCache:
+    """Integración L1 + Redis en MCPAdapter."""
+
+    @pytest.mark.asyncio
+    async def test_l1_hit_skips_redis(self, redis):
+        adapter = DummyAdapter("dummy", redis_client=redis)
+        await adapter._set_cached("mcp:dummy:k", {"v": 1}, ttl=60)
+        await redis.delete("mcp:dummy:k")
+
+        assert await adapter._get_cached("mcp:dummy:k") == {"v": 1}
+
+    @pytest.mark.asyncio
+    async def test_l1_ttl_follows_redis_ttl(self, redis):
+        adapter = DummyAdapter("dummy", redis_client=redis, cache_ttl=3600)
+        await redis.setex("mcp:dummy:k", 5, json.dumps({"v": 1}))
+
+        assert await adapter._get_cached("mcp:dummy:k") == {"v": 1}
+        expires_at, _ = adapter._local_cache._data["mcp:dummy:k"]
+        assert expires_at - time.monotonic() <= 5
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_fetch_once(self, redis):
+        adapter = DummyAdapter("dummy", redis_client=redis)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"papers": [1, 2]}
+
+        results = await asyncio.gather(*[
+            adapter._get_or_fetch("mcp:dummy:search", fetch) for _ in range(3)
+        ])
+
+        assert calls == 1
+        assert results == [{"papers": [1, 2]}] * 3
+        assert json.loads(await redis.get("mcp:dummy:search")) == {"papers": [1, 2]}
+
+    @pytest.mark.asyncio
+    async def test_none_is_not_cached(self):
+        adapter = DummyAdapter("dummy")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return None
+
+        await adapter._get_or_fetch("mcp:dummy:missing", fetch)
+        await adapter._get_or_fetch("mcp:dummy:missing", fetch)
+
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation_without_scan(self, redis):
+        adapter = DummyAdapter("dummy", redis_client=redis)
+        other_process = DummyAdapter("dummy", redis_client=redis)
+        await adapter._set_cached("mcp:dummy:a", {"v": 1}, tags=["url:x"])
+        await adapter._set_cached("mcp:dummy:b", {"v": 2}, tags=["url:y"])
+        await other_process._get_cached("mcp:dummy:a")  # poblar su L1
+
+        deleted = await other_process._invalidate_tags("url:x")
+
+        assert deleted == 1
+        assert await redis.get("mcp:dummy:a") is None
+        assert await redis.get("mcp:dummy:b") is not None
+        assert await other_process._get_cached("mcp:dummy:a") is None
+        assert not await redis.exists("mcp:dummy:tag:url:x")
@@ -0,0 +1,85 @@
+"""
+Tests for core/model_factory.py client registry.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from core import model_factory
+from core.model_factory import create_model, close_models, get_http_clients
+
+
+@pytest.fixture(autouse=True)
+async def clean_registry():
+    await close_models()
+    with patch.object(model_factory.settings, "GITHUB_TOKEN", "test-token"):
+        yield
+    await close_models()
+
+
+class TestClientRegistry:
+    """Pooled, reusable LLM clients."""
+
+    def test_same_key_returns_same_instance(self):
+        first = create_model(provider="github", model="gpt-4o", temperature=0.7)
+        second = create_model(provider="github", model="gpt-4o", temperature=0.7)
+
+        assert first is second
+
+    def test_different_params_return_different_instances(self):
+        first = create_model(provider="github", model="gpt-4o", temperature=0.7)
+        second = create_model(provider="github", model="gpt-4o", temperature=0.2)
+        third = create_model(provider="github", model="gpt-4o-mini", temperature=0.7)
+
+        assert first is not second
+        assert first is not third
+
+    def test_reuse_false_builds_new_instance(self):
+        first = create_model(provider="github", model="gpt-4o")
+        second = create_model(provider="github", model="gpt-4o", reuse=False)
+
+        assert first is not second
+
+    def test_github_models_share_http_pool(self):
+        create_model(provider="github", model="gpt-4o")
+        create_model(provider="github", model="gpt-4o-mini")
+
+        assert len(model_factory._http_clients) == 1
+
+    def test_unsupported_provider(self):
+        with pytest.raises(ValueError):
+            create_model(provider="unknown")
+
+    @pytest.mark.asyncio
+    async def test_close_models_clears_registry(self):
+        create_model(provider="github", model="gpt-4o")
+        sync_client, async_client = get_http_clients(model_factory.settings.GITHUB_MODELS_BASE_URL)
+
+        await close_models()
+
+        assert model_factory._model_registry == {}
+        assert model_factory._http_clients == {}
+        assert sync_client.is_closed
+        assert async_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_warmup_reports_failures(self):
+        with patch("httpx.AsyncClient.head", new=AsyncMock(side_effect=Exception("offline"))):
+            results = await model_factory.warmup_models([{"provider": "github", "model": "gpt-4o"}])
+
+        assert results == {"github:gpt-4o": False}
+        # The client is registered even if the network is down
+        assert len(model_factory._model_registry) == 1
+
+    @pytest.mark.asyncio
+    async def test_default_warmup_matches_graph_agents(self, monkeypatch):
+        monkeypatch.delenv("USE_OLLAMA", raising=False)
+        with patch("httpx.AsyncClient.head", new=AsyncMock()):
+            await model_factory.warmup_models()
+
+        warmed = list(model_factory._model_registry.values())
+        assert create_model(**model_factory.agent_model_spec()) is warmed[0]
+        assert len(model_factory._model_registry) == 1
@@ -0,0 +1,223 @@
+"""
+Tests para el scheduler de RPM por modelo (core/model_scheduler.py).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from langchain_core.messages import AIMessage, HumanMessage
+
+from core import model_scheduler
+from core.agent_utils import safe_agent_invoke
+from core.llm_cache import cached_ainvoke
+from core.model_scheduler import ModelRateLimited, ModelRateScheduler
+
+
+@pytest.fixture
+def short_window(monkeypatch):
+    monkeypatch.setattr(model_scheduler, "WINDOW_SECONDS", 0.1)
+
+
+class TestModelRateScheduler:
+    """Ventana deslizante, turnos reservados y fallback por espera."""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_limit_then_waits(self, short_window):
+        scheduler = ModelRateScheduler(limits={"gpt-5": 2})
+
+        assert await scheduler.acquire("gpt-5") == 0.0
+        assert await scheduler.acquire("gpt-5") == 0.0
+        assert scheduler.expected_wait("gpt-5") == pytest.approx(0.1, abs=0.02)
+
+        assert await scheduler.acquire("gpt-5") == pytest.approx(0.1, abs=0.02)
+        assert scheduler.metrics()["waited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queued_calls_get_successive_turns(self, short_window):
+        scheduler = ModelRateScheduler(limits={"gpt-5": 1})
+
+        waits = await asyncio.gather(*[scheduler.acquire("gpt-5") for _ in range(3)])
+
+        assert [round(w, 1) for w in waits] == [0.0, 0.1, 0.2]
+
+    @pytest.mark.asyncio
+    async def test_unlimited_model(self):
+        scheduler = ModelRateScheduler(limits={"gpt-5": 1})
+
+        assert await scheduler.select("mistral:7b") == "mistral:7b"
+        assert await scheduler.acquire("mistral:7b") == 0.0
+        assert await scheduler.acquire("mistral:7b") == 0.0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_wait_too_long(self):
+        scheduler = ModelRateScheduler(max_wait=1.0, limits={"gpt-5": 1, "gpt-4o": 100})
+
+        assert await scheduler.select("gpt-5") == "gpt-5"
+        await scheduler.acquire("gpt-5")
+
+        assert await scheduler.select("gpt-5") == "gpt-4o"  # fallback_model en MODEL_COSTS
+        reservation = await scheduler.reserve("gpt-5")
+        assert reservation.model == "gpt-4o"
+        assert reservation.wait == 0.0
+        assert scheduler.stats["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uses_budget_manager_fallback(self):
+        budget = AsyncMock()
+        budget.get_fallback_model.return_value = "claude-haiku-4.5"
+        scheduler = ModelRateScheduler(
+            budget_manager=budget,
+            max_wait=1.0,
+            limits={"claude-sonnet-4.5": 1, "claude-haiku-4.5": 100},
+        )
+        await scheduler.acquire("claude-sonnet-4.5")
+
+        assert await scheduler.select("claude-sonnet-4.5") == "claude-haiku-4.5"
+        budget.get_fallback_model.assert_awaited_once_with("claude-sonnet-4.5")
+
+    @pytest.mark.asyncio
+    async def test_raises_when_no_fallback_fits(self):
+        scheduler = ModelRateScheduler(max_wait=1.0, limits={"gpt-4o": 1})
+        await scheduler.acquire("gpt-4o")
+
+        with pytest.raises(ModelRateLimited, match="gpt-4o"):
+            await scheduler.reserve("gpt-4o")
+        assert scheduler.metrics()["rate_limited"] == 1
+        assert scheduler.metrics()["admitted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ignores_fallbacks_from_another_provider(self):
+        budget = AsyncMock()
+        budget.get_fallback_model.return_value = "gemini-2.5-pro"
+        scheduler = ModelRateScheduler(
+            budget_manager=budget,
+            max_wait=1.0,
+            limits={"gpt-4o": 1, "gemini-2.5-pro": 100},
+        )
+        await scheduler.acquire("gpt-4o")
+
+        assert await scheduler.select("gpt-4o") == "gpt-4o"
+        with pytest.raises(ModelRateLimited):
+            await scheduler.reserve("gpt-4o")
+
+    @pytest.mark.asyncio
+    async def test_singleton_uses_shared_budget_manager(self, monkeypatch):
+        budget = AsyncMock()
+        monkeypatch.setattr(model_scheduler, "_model_scheduler", None)
+        monkeypatch.setattr(model_scheduler, "get_budget_manager", AsyncMock(return_value=budget))
+
+        scheduler = await model_scheduler.get_model_scheduler()
+
+        assert scheduler.budget_manager is budget
+        assert await model_scheduler.get_model_scheduler() is scheduler
+
+    @pytest.mark.asyncio
+    async def test_keeps_shortest_wait_when_all_saturated(self):
+        scheduler = ModelRateScheduler(max_wait=1.0, limits={"gpt-5": 1, "gpt-4o": 1})
+        await scheduler.acquire("gpt-4o")
+        await asyncio.sleep(0.05)
+        await scheduler.acquire("gpt-5")
+
+        # gpt-4o se libera antes (su admisión es más antigua)
+        assert await scheduler.select("gpt-5") == "gpt-4o"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_burst_reserves_within_max_wait(self):
+        scheduler = ModelRateScheduler(max_wait=10.0, limits={"gpt-5": 50, "gpt-4o": 100})
+
+        reservations = await asyncio.gather(*[scheduler.reserve("gpt-5") for _ in range(60)])
+
+        models = [r.model for r in reservations]
+        assert models.count("gpt-5") == 50
+        assert models.count("gpt-4o") == 10
+        assert max(r.wait for r in reservations) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_release_returns_the_turn(self):
+        scheduler = ModelRateScheduler(limits={"gpt-5": 1})
+
+        reservation = await scheduler.reserve("gpt-5")
+        assert scheduler.expected_wait("gpt-5") > 0
+
+        scheduler.release(reservation)
+        assert scheduler.expected_wait("gpt-5") == 0.0
+        assert scheduler.metrics()["released"] == 1
+
+
+class FakeLLM:
+    """LLM con model_name / model_copy que registra el modelo de cada llamada."""
+
+    def __init__(self, model_name, calls):
+        self.model_name = model_name
+        self.calls = calls
+
+    def model_copy(self, update):
+        return FakeLLM(update["model_name"], self.calls)
+
+    def bind_tools(self, tools):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls.append(self.model_name)
+        return AIMessage(content=f"from {self.model_name}")
+
+
+class TestSafeAgentInvokeScheduling:
+    """safe_agent_invoke pasa por el scheduler en cada llamada al proveedor."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_model_is_saturated(self):
+        calls = []
+        llm = FakeLLM("gpt-5", calls)
+        scheduler = ModelRateScheduler(max_wait=1.0, limits={"gpt-5": 1, "gpt-4o": 10})
+        messages = [HumanMessage(content="go")]
+
+        first = await safe_agent_invoke(llm, [], messages, scheduler=scheduler)
+        second = await safe_agent_invoke(llm, [], messages, scheduler=scheduler)
+
+        assert first["output"] == "from gpt-5"
+        assert second["output"] == "from gpt-4o"
+        assert calls == ["gpt-5", "gpt-4o"]
+        assert scheduler.metrics()["admitted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_fails_without_waiting(self):
+        calls = []
+        scheduler = ModelRateScheduler(max_wait=1.0, limits={"gpt-4o": 1})
+        await scheduler.acquire("gpt-4o")
+
+        result = await safe_agent_invoke(
+            FakeLLM("gpt-4o", calls), [], [HumanMessage(content="go")], scheduler=scheduler
+        )
+
+        assert "Rate limited" in result["error"]
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_does_not_take_a_turn(self):
+        cache = AsyncMock()
+        cache.get.return_value = AIMessage(content="cached")
+        before_invoke = AsyncMock()
+        llm = FakeLLM("gpt-5", [])
+
+        response = await cached_ainvoke(llm, [HumanMessage(content="go")], [], llm, cache, before_invoke)
+
+        assert response.content == "cached"
+        before_invoke.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_releases_reserved_turn(self):
+        cache = AsyncMock()
+        cache.get.return_value = AIMessage(content="cached")
+        scheduler = ModelRateScheduler(limits={"gpt-5": 1})
+
+        result = await safe_agent_invoke(
+            FakeLLM("gpt-5", []), [], [HumanMessage(content="go")], cache=cache, scheduler=scheduler
+        )
+
+        assert result["output"] == "cached"
+        assert scheduler.expected_wait("gpt-5") == 0.0
+        assert scheduler.metrics()["released"] == 1
@@ -0,0 +1,186 @@
+"""
+Tests para el cache de conversiones PDF por hash de contenido.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import os
+import pytest
+from unittest.mock import AsyncMock
+
+from mcp_servers.markitdown_mcp import MarkItDownAdapter, ProcessedPDF
+from mcp_servers.pdf_cache import PDFConversionCache, hash_file
+
+
+def write_pdf(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+
+def make_adapter(cache_dir):
+    """Adapter sin Redis, con conversión falsa (el markdown incluye el path)."""
+    adapter = MarkItDownAdapter(pdf_cache=PDFConversionCache(cache_dir))
+    adapter._wait_for_rate_limit = AsyncMock()
+
+    async def fake_convert(file_path):
+        await asyncio.sleep(0.01)
+        return ProcessedPDF(
+            file_path=file_path,
+            markdown=f"Abstract\nconverted {Path(file_path).read_bytes().decode()}\n1\n",
+            metadata={"title": "t", "page_count": 1},
+            page_count=1,
+            method_used="pymupdf",
+        )
+
+    adapter._convert = AsyncMock(side_effect=fake_convert)
+    return adapter
+
+
+class TestPDFConversionCache:
+    """Store en disco + índice path → hash."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_file_is_not_rehashed(self, tmp_path):
+        cache = PDFConversionCache(tmp_path / "cache")
+        pdf = write_pdf(tmp_path / "a.pdf", b"paper-a")
+
+        first = await cache.content_hash(pdf)
+        second = await cache.content_hash(pdf)
+
+        assert first == second == hash_file(pdf)
+        assert cache.hashes_computed == 1
+
+    @pytest.mark.asyncio
+    async def test_modified_file_is_rehashed(self, tmp_path):
+        cache = PDFConversionCache(tmp_path / "cache")
+        pdf = write_pdf(tmp_path / "a.pdf", b"paper-a")
+        first = await cache.content_hash(pdf)
+
+        write_pdf(tmp_path / "a.pdf", b"paper-b")
+        os.utime(pdf, ns=(1, 1))
+
+        assert await cache.content_hash(pdf) != first
+        assert cache.hashes_computed == 2
+
+    @pytest.mark.asyncio
+    async def test_roundtrip_is_compressed(self, tmp_path):
+        cache = PDFConversionCache(tmp_path / "cache")
+        value = {"markdown": "x" * 10000, "metadata": {}}
+
+        await cache.put("ab" * 32, value)
+
+        assert await cache.get("ab" * 32) == value
+        assert await cache.get("cd" * 32) is None
+        assert cache._entry_path("ab" * 32).stat().st_size < 1000
+
+    @pytest.mark.asyncio
+    async def test_store_prunes_least_recently_used(self, tmp_path):
+        cache = PDFConversionCache(tmp_path / "cache", max_bytes=3000)
+        first, second, third = "aa" * 32, "bb" * 32, "cc" * 32
+        for digest in (first, second):
+            await cache.put(digest, {"markdown": os.urandom(1000).hex()})
+        os.utime(cache._entry_path(first), (100, 100))
+        os.utime(cache._entry_path(second), (200, 200))
+
+        assert await cache.get(first) is not None  # Hit: pasa a ser el más reciente
+        await cache.put(third, {"markdown": os.urandom(1000).hex()})
+
+        assert await cache.get(second) is None
+        assert await cache.get(first) is not None
+        assert await cache.get(third) is not None
+        assert cache.evictions == 1
+        assert cache._store_bytes <= 3000
+
+    @pytest.mark.asyncio
+    async def test_index_drops_orphaned_and_oldest_rows(self, tmp_path):
+        cache = PDFConversionCache(tmp_path / "cache", max_index_entries=2)
+        paths = [write_pdf(tmp_path / f"{name}.pdf", name.encode()) for name in "abcd"]
+        await cache.content_hash(paths[0])
+        await cache.content_hash(paths[1])
+        os.remove(paths[0])
+
+        await cache.content_hash(paths[2])
+        await cache.content_hash(paths[3])
+
+        rows = {row[0] for row in cache._conn.execute("SELECT path FROM path_index")}
+        assert rows == {str(Path(p).resolve()) for p in paths[2:]}
+
+    @pytest.mark.asyncio
+    async def test_prune_entry_point(self, tmp_path):
+        cache = PDFConversionCache(tmp_path / "cache")
+        pdf = write_pdf(tmp_path / "a.pdf", b"paper-a")
+        digest = await cache.content_hash(pdf)
+        await cache.put(digest, {"markdown": "x"})
+        os.remove(pdf)
+        cache.max_bytes = 0
+
+        result = await cache.prune()
+
+        assert result["entries_removed"] == 1
+        assert result["bytes_removed"] > 0
+        assert result["index_rows_removed"] == 1
+        assert await cache.get(digest) is None
+
+
+class TestContentKeyedConversion:
+    """MarkItDownAdapter.convert_pdf usa el hash, no el path."""
+
+    @pytest.mark.asyncio
+    async def test_renamed_file_is_not_reconverted(self, tmp_path):
+        adapter = make_adapter(tmp_path / "cache")
+        original = write_pdf(tmp_path / "a.pdf", b"paper-a")
+        copy = write_pdf(tmp_path / "b.pdf", b"paper-a")
+
+        await adapter.convert_pdf(original)
+        result = await adapter.convert_pdf(copy)
+
+        assert adapter._convert.await_count == 1
+        assert result.file_path == copy
+
+    @pytest.mark.asyncio
+    async def test_disk_store_shared_between_adapters(self, tmp_path):
+        pdf = write_pdf(tmp_path / "a.pdf", b"paper-a")
+        await make_adapter(tmp_path / "cache").convert_pdf(pdf)
+
+        adapter = make_adapter(tmp_path / "cache")
+        result = await adapter.convert_pdf(pdf)
+
+        adapter._convert.assert_not_awaited()
+        assert "converted paper-a" in result.markdown
+
+    @pytest.mark.asyncio
+    async def test_overwritten_file_is_reconverted(self, tmp_path):
+        adapter = make_adapter(tmp_path / "cache")
+        pdf = write_pdf(tmp_path / "a.pdf", b"paper-a")
+        await adapter.convert_pdf(pdf)
+
+        write_pdf(tmp_path / "a.pdf", b"paper-b-v2")
+        result = await adapter.convert_pdf(pdf)
+
+        assert adapter._convert.await_count == 2
+        assert "converted paper-b-v2" in result.markdown
+
+    @pytest.mark.asyncio
+    async def test_flag_variants_share_one_conversion(self, tmp_path):
+        adapter = make_adapter(tmp_path / "cache")
+        pdf = write_pdf(tmp_path / "a.pdf", b"paper-a")
+
+        cleaned, raw = await asyncio.gather(
+            adapter.convert_pdf(pdf),
+            adapter.convert_pdf(pdf, clean_headers=False, extract_sections=False),
+        )
+
+        assert adapter._convert.await_count == 1
+        assert "sections" in cleaned.metadata
+        assert "sections" not in raw.metadata
+        assert "\n1\n" in raw.markdown
+        assert "\n1\n" not in cleaned.markdown
+
+    @pytest.mark.asyncio
+    async def test_missing_file_raises(self, tmp_path):
+        adapter = make_adapter(tmp_path / "cache")
+
+        with pytest.raises(FileNotFoundError):
+            await adapter.convert_pdf(str(tmp_path / "missing.pdf"))
@@ -0,0 +1,122 @@
+"""
+Tests para la extracción por páginas / secciones de MarkItDownAdapter.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from unittest.mock import patch
+
+from mcp_servers import markitdown_mcp
+from mcp_servers.markitdown_mcp import MarkItDownAdapter, strip_markdown
+
+fitz = pytest.importorskip("pymupdf")
+
+PAGES = [
+    "A Study of Things\nAbstract\nWe study things.",
+    "Introduction\nThings matter a lot.",
+    "Methods\nWe counted things.",
+    "Discussion\nThings were counted.",
+    "Conclusion\nMore things later.",
+]
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    for text in PAGES:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    path = tmp_path / "paper.pdf"
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def adapter():
+    return MarkItDownAdapter(workers=0)
+
+
+@pytest.fixture
+def page_reads():
+    """Cuenta las páginas que PyMuPDF realmente carga."""
+    with patch.object(markitdown_mcp, "_page_text", wraps=markitdown_mcp._page_text) as spy:
+        yield spy
+
+
+class TestStripMarkdown:
+    """strip_markdown equivale a las pasadas de str.replace anteriores."""
+
+    def test_matches_replace_chain(self):
+        text = "# Title\n**bold** and *italic* with snake_case and ## h2"
+        expected = text
+        for token in ("#", "**", "*", "_"):
+            expected = expected.replace(token, "")
+
+        assert strip_markdown(text) == expected
+
+
+class TestStreamingExtraction:
+    """iter_pages / iter_sections leen solo lo necesario."""
+
+    @pytest.mark.asyncio
+    async def test_page_range(self, adapter, pdf_path, page_reads):
+        pages = [page async for page in adapter.iter_pages(pdf_path, first_page=2, last_page=3)]
+
+        assert [number for number, _ in pages] == [2, 3]
+        assert "Introduction" in pages[0][1]
+        assert page_reads.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sections_stream_in_order(self, adapter, pdf_path):
+        sections = [name async for name, _ in adapter.iter_sections(pdf_path)]
+
+        assert sections == ["header", "abstract", "introduction", "methods", "discussion", "conclusion"]
+
+    @pytest.mark.asyncio
+    async def test_stop_after_introduction(self, adapter, pdf_path, page_reads):
+        text = await adapter.extract_text_only(pdf_path, stop_after="introduction")
+
+        assert "We study things." in text
+        assert "Things matter a lot." in text
+        assert "counted" not in text
+        # La página 3 se lee para detectar el fin de la introducción; el resto no
+        assert page_reads.call_count == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("alias", ["method", "Materials and Methods", "METHODS"])
+    async def test_stop_after_accepts_aliases(self, adapter, pdf_path, page_reads, alias):
+        text = await adapter.extract_text_only(pdf_path, stop_after=alias)
+
+        assert "We counted things." in text
+        assert "Things were counted." not in text
+        assert page_reads.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_stop_after_plural_alias(self, adapter, pdf_path):
+        sections = [
+            name async for name, _ in adapter.iter_sections(pdf_path, stop_after="conclusions")
+        ]
+
+        assert sections[-1] == "conclusion"
+
+    @pytest.mark.asyncio
+    async def test_stop_after_unknown_section_raises(self, adapter, pdf_path, page_reads):
+        with pytest.raises(ValueError, match="summary"):
+            await adapter.extract_text_only(pdf_path, stop_after="summary")
+        assert page_reads.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_max_pages(self, adapter, pdf_path, page_reads):
+        text = await adapter.extract_text_only(pdf_path, max_pages=1)
+
+        assert "We study things." in text
+        assert "Introduction" not in text
+        assert page_reads.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_file_raises(self, adapter, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            await adapter.extract_text_only(str(tmp_path / "missing.pdf"), max_pages=1)
@@ -0,0 +1,97 @@
+"""
+Tests para el scanner de secciones / headers (mcp_servers/pdf_sections.py).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from mcp_servers.pdf_sections import match_section_header, scan_markdown, section_name
+
+PAPER = "\n".join([
+    "Journal of Things, Vol 3",
+    "A Study of Things",
+    "Abstract",
+    "We study things.",
+    "Journal of Things, Vol 3",
+    "1",
+    "## 1. Introduction",
+    "Our results show that things matter.",
+    "Journal of Things, Vol 3",
+    "Page 2 of 9",
+    "**Related Work**",
+    "Others studied things.",
+    "IV. RESULTS:",
+    "Many things.",
+    "Journal of Things, Vol 3",
+    "Conclusions",
+    "Things are good.",
+])
+
+
+class TestSectionHeaders:
+    """Regex anclado a la línea completa."""
+
+    @pytest.mark.parametrize("line,expected", [
+        ("Abstract", "abstract"),
+        ("## 2.1 Related   Work", "related_work"),
+        ("**Methods**", "methods"),
+        ("IV. RESULTS:", "results"),
+        ("Acknowledgements", "acknowledgments"),
+        ("Our results show that things matter.", None),
+        ("Discussion of the introduction", None),
+        ("results", "results"),
+    ])
+    def test_match(self, line, expected):
+        assert match_section_header(line) == expected
+
+    @pytest.mark.parametrize("name,expected", [
+        ("conclusions", "conclusion"),
+        ("method", "methods"),
+        ("Acknowledgements", "acknowledgments"),
+        ("results and discussion", "results"),
+        ("related_work", "related_work"),
+        (" Related  Work ", "related_work"),
+        ("summary", None),
+    ])
+    def test_section_name(self, name, expected):
+        assert section_name(name) == expected
+
+
+class TestScanMarkdown:
+    """Limpieza + secciones en una pasada."""
+
+    def test_cleans_repeated_lines_and_page_numbers(self):
+        scan = scan_markdown(PAPER)
+
+        assert "Journal of Things" not in scan.text
+        assert "Page 2 of 9" not in scan.text
+        assert "\n1\n" not in scan.text
+        assert scan.removed_repeated == 4
+        assert scan.removed_page_numbers == 2
+
+    def test_sections_and_offsets(self):
+        scan = scan_markdown(PAPER)
+
+        assert list(scan.section_offsets) == [
+            "header", "abstract", "introduction", "related_work", "results", "conclusion",
+        ]
+        assert scan.section("abstract") == "We study things."
+        # Una frase con "results" no abre sección
+        assert scan.section("introduction") == "Our results show that things matter."
+        start, end = scan.section_offsets["conclusion"]
+        assert scan.text[start:end] == "Things are good."
+        assert scan.sections["header"] == "A Study of Things"
+
+    def test_flags_disable_work(self):
+        scan = scan_markdown(PAPER, clean_headers=False, extract_sections=False)
+
+        assert scan.text == PAPER
+        assert scan.section_offsets == {}
+
+    def test_sections_without_cleaning(self):
+        scan = scan_markdown(PAPER, clean_headers=False)
+
+        assert scan.section("abstract").startswith("We study things.")
+        assert "Journal of Things" in scan.section("abstract")
@@ -0,0 +1,96 @@
+"""
+Tests para el pool de procesos de conversión de PDFs.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import os
+import pytest
+
+from mcp_servers.pdf_workers import PDFConversionError, PDFWorkerPool
+
+fitz = pytest.importorskip("pymupdf")
+
+
+def make_pdf(path, text):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+async def pool():
+    pool = PDFWorkerPool(workers=2, timeout=5)
+    yield pool
+    await pool.close()
+
+
+class TestPDFWorkerPool:
+    """Conversión en procesos con timeout por documento."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_conversions(self, pool, tmp_path):
+        paths = [make_pdf(tmp_path / f"p{i}.pdf", f"Abstract paper {i}") for i in range(4)]
+
+        results = await asyncio.gather(*[pool.convert(path) for path in paths])
+
+        for i, result in enumerate(results):
+            assert f"paper {i}" in result["markdown"]
+            assert result["page_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_conversion_error_is_reported(self, pool, tmp_path):
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+
+        with pytest.raises(PDFConversionError):
+            await pool.convert(str(broken))
+
+    @pytest.mark.asyncio
+    async def test_timeout_replaces_worker(self, tmp_path):
+        pool = PDFWorkerPool(workers=1, timeout=0.5)
+        try:
+            # Leer un FIFO sin escritor bloquea al worker indefinidamente
+            fifo = tmp_path / "hang.pdf"
+            os.mkfifo(fifo)
+
+            with pytest.raises(TimeoutError):
+                await pool.convert(str(fifo))
+
+            pool.timeout = 30
+            result = await pool.convert(make_pdf(tmp_path / "ok.pdf", "still alive"))
+
+            assert "still alive" in result["markdown"]
+            assert pool.stats()["restarts"] == 1
+        finally:
+            await pool.close()
+
+
+class TestAdapterWithPool:
+    """MarkItDownAdapter convierte en el pool cuando PDF_WORKERS > 0."""
+
+    @pytest.mark.asyncio
+    async def test_convert_multiple_keeps_order_and_skips_failures(self, tmp_path):
+        from mcp_servers.markitdown_mcp import MarkItDownAdapter
+        from mcp_servers.pdf_cache import PDFConversionCache
+
+        adapter = MarkItDownAdapter(pdf_cache=PDFConversionCache(tmp_path / "cache"), workers=2)
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+        paths = [
+            make_pdf(tmp_path / "a.pdf", "Abstract first"),
+            str(broken),
+            make_pdf(tmp_path / "b.pdf", "Abstract second"),
+        ]
+        try:
+            results = await adapter.convert_multiple(paths)
+        finally:
+            await adapter.disconnect()
+
+        assert [r.file_path for r in results] == [paths[0], paths[2]]
+        assert adapter.worker_pool.stats()["workers"] == 2
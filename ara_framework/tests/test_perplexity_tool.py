@@ -0,0 +1,151 @@
+"""
+Tests para el cliente async compartido de Perplexity (cache y límite de concurrencia).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+from config.settings import settings
+from core.model_factory import close_models
+from tools import perplexity_tool
+from tools.perplexity_tool import get_perplexity_client, perplexity_search, perplexity_search_fast
+
+
+class FakeCompletions:
+    """chat.completions async: cuenta llamadas y la concurrencia máxima."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            query = kwargs["messages"][-1]["content"]
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=f"answer: {query}"))],
+                citations=["https://example.com/a"],
+                related_questions=["What next?"],
+            )
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    fake = FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+    monkeypatch.setattr(settings, "PERPLEXITY_API_KEY", "test-key")
+    monkeypatch.setattr(perplexity_tool, "get_perplexity_client", lambda: client)
+    monkeypatch.setattr(perplexity_tool, "_search_semaphore", None)
+    perplexity_tool._search_cache.clear()
+    yield fake
+    perplexity_tool._search_cache.clear()
+
+
+class TestPerplexitySearch:
+    """Cache por query + recency filter, single-flight y semáforo."""
+
+    @pytest.mark.asyncio
+    async def test_formats_response(self, completions):
+        result = await perplexity_search.ainvoke({"query": "rust wasm"})
+
+        assert "answer: rust wasm" in result
+        assert "1. https://example.com/a" in result
+        assert "- What next?" in result
+
+        call = completions.calls[0]
+        assert call["model"] == settings.PERPLEXITY_MODEL
+        assert call["extra_body"]["search_recency_filter"] == "month"
+        assert call["extra_body"]["return_related_questions"] is True
+
+    @pytest.mark.asyncio
+    async def test_cache_by_query_and_recency(self, completions):
+        await perplexity_search.ainvoke({"query": "rust wasm"})
+        await perplexity_search.ainvoke({"query": "  Rust   WASM "})
+        assert len(completions.calls) == 1
+
+        await perplexity_search.ainvoke({"query": "rust wasm", "search_recency_filter": "week"})
+        assert len(completions.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_fast_search_uses_separate_entries(self, completions):
+        await perplexity_search.ainvoke({"query": "rust wasm"})
+        result = await perplexity_search_fast.ainvoke({"query": "rust wasm"})
+
+        assert result == "**Search Results**: rust wasm\n\nanswer: rust wasm"
+        assert completions.calls[1]["model"] == perplexity_tool.PERPLEXITY_FAST_MODEL
+        assert "top_p" not in completions.calls[1]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_searches_share_request(self, completions):
+        completions.delay = 0.05
+
+        results = await asyncio.gather(*[
+            perplexity_search.ainvoke({"query": "rust wasm"}) for _ in range(5)
+        ])
+
+        assert len(completions.calls) == 1
+        assert len(set(results)) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, completions, monkeypatch):
+        monkeypatch.setattr(settings, "PERPLEXITY_MAX_CONCURRENT", 2)
+        completions.delay = 0.02
+
+        await asyncio.gather(*[
+            perplexity_search.ainvoke({"query": f"query {i}"}) for i in range(6)
+        ])
+
+        assert len(completions.calls) == 6
+        assert completions.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, completions):
+        completions.error = RuntimeError("rate limited")
+        result = await perplexity_search.ainvoke({"query": "rust wasm"})
+        assert result == "❌ Perplexity search failed: rate limited"
+
+        completions.error = None
+        result = await perplexity_search.ainvoke({"query": "rust wasm"})
+        assert "answer: rust wasm" in result
+        assert len(completions.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_api_key(self, monkeypatch):
+        monkeypatch.setattr(settings, "PERPLEXITY_API_KEY", None)
+
+        result = await perplexity_search.ainvoke({"query": "rust wasm"})
+
+        assert "not configured" in result
+        assert get_perplexity_client() is None
+
+
+class TestPerplexityClient:
+    """Cliente AsyncOpenAI sobre el pool HTTP compartido."""
+
+    @pytest.mark.asyncio
+    async def test_shared_client_rebuilt_after_close(self, monkeypatch):
+        monkeypatch.setattr(settings, "PERPLEXITY_API_KEY", "test-key")
+
+        client = get_perplexity_client()
+        assert get_perplexity_client() is client
+
+        await close_models()
+        rebuilt = get_perplexity_client()
+
+        assert rebuilt is not client
+        assert not perplexity_tool._perplexity_http.is_closed
+        await close_models()
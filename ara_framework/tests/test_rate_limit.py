@@ -0,0 +1,105 @@
+"""
+Tests para mcp_servers/rate_limit.py (token bucket en proceso y Redis).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import pytest
+import fakeredis.aioredis
+from unittest.mock import AsyncMock
+
+from mcp_servers.rate_limit import (
+    RateLimit,
+    RedisTokenBucketLimiter,
+    TokenBucketLimiter,
+    create_rate_limiter,
+)
+from mcp_servers.semantic_scholar import SemanticScholarAdapter
+
+
+class TestRateLimit:
+    """Declaración de límites RPS/RPM."""
+
+    def test_per_second(self):
+        limit = RateLimit.per_second(2, burst=4)
+
+        assert limit.rate == 2.0
+        assert limit.burst == 4
+
+    def test_per_minute_defaults_burst_to_rpm(self):
+        limit = RateLimit.per_minute(30)
+
+        assert limit.rate == 0.5
+        assert limit.burst == 30
+
+
+class TestTokenBucketLimiter:
+    """Backend en proceso."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_waits(self):
+        limiter = TokenBucketLimiter(RateLimit.per_second(10, burst=2))
+
+        assert await limiter._reserve(1) == 0.0
+        assert await limiter._reserve(1) == 0.0
+        assert await limiter._reserve(1) == pytest.approx(0.1, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_are_spaced(self):
+        limiter = TokenBucketLimiter(RateLimit.per_second(20, burst=1))
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        waits = await asyncio.gather(*[limiter.acquire() for _ in range(3)])
+
+        # Los turnos se reservan sin esperar al anterior: 0, 50ms, 100ms
+        assert sorted(round(w, 2) for w in waits) == [0.0, 0.05, 0.1]
+        assert loop.time() - start < 0.2
+
+
+class TestRedisTokenBucketLimiter:
+    """Backend compartido entre procesos."""
+
+    @pytest.mark.asyncio
+    async def test_limit_is_shared_between_workers(self):
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        limit = RateLimit.per_second(1, burst=1)
+        worker_a = RedisTokenBucketLimiter(redis, limit, "semantic_scholar")
+        worker_b = RedisTokenBucketLimiter(redis, limit, "semantic_scholar")
+
+        assert await worker_a._reserve(1) == 0.0
+        assert await worker_b._reserve(1) == pytest.approx(1.0, abs=0.05)
+        assert await redis.ttl("ratelimit:mcp:semantic_scholar") > 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_memory_on_redis_error(self):
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        limiter = RedisTokenBucketLimiter(redis, RateLimit.per_second(1), "test")
+        limiter._script = AsyncMock(side_effect=ConnectionError("down"))
+
+        assert await limiter._reserve(1) == 0.0
+        assert await limiter._reserve(1) > 0
+
+
+class TestAdapterLimiter:
+    """Selección de backend en MCPAdapter."""
+
+    def test_redis_backend_with_client(self):
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+        limiter = create_rate_limiter("x", RateLimit.per_second(1), redis, backend="redis")
+
+        assert isinstance(limiter, RedisTokenBucketLimiter)
+
+    def test_redis_backend_without_client_falls_back(self):
+        limiter = create_rate_limiter("x", RateLimit.per_second(1), None, backend="redis")
+
+        assert isinstance(limiter, TokenBucketLimiter)
+
+    def test_semantic_scholar_declares_one_rps(self):
+        adapter = SemanticScholarAdapter()
+
+        assert adapter.rate_limit.rate == pytest.approx(1.0)
+        assert adapter.rate_limit.burst == 1
@@ -0,0 +1,159 @@
+"""
+Tests para core/redis_checkpointer.py y el resume de run_research_pipeline.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import operator
+from typing import Annotated, TypedDict
+
+import pytest
+import fakeredis.aioredis
+from unittest.mock import Mock, patch
+from langgraph.graph import StateGraph, START, END
+
+from core.redis_checkpointer import RedisCheckpointSaver, close_checkpointer
+from graphs.research_graph import create_research_graph, run_research_pipeline
+
+
+class CounterState(TypedDict):
+    static: str
+    log: Annotated[list, operator.add]
+
+
+def make_counter_graph(saver):
+    workflow = StateGraph(CounterState)
+    workflow.add_node("first", lambda state: {"log": ["first"]})
+    workflow.add_node("second", lambda state: {"log": ["second"]})
+    workflow.add_edge(START, "first")
+    workflow.add_edge("first", "second")
+    workflow.add_edge("second", END)
+    return workflow.compile(checkpointer=saver)
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.aioredis.FakeRedis()
+
+
+@pytest.fixture
+def saver(redis_client):
+    return RedisCheckpointSaver(redis_client, ttl=120)
+
+
+CONFIG = {"configurable": {"thread_id": "t1"}}
+
+
+class TestRedisCheckpointSaver:
+    """Persistencia de checkpoints en Redis."""
+
+    @pytest.mark.asyncio
+    async def test_state_roundtrip(self, saver):
+        graph = make_counter_graph(saver)
+        await graph.ainvoke({"static": "x" * 1000, "log": []}, CONFIG)
+
+        # Un grafo nuevo sobre el mismo Redis ve el estado persistido
+        snapshot = await make_counter_graph(saver).aget_state(CONFIG)
+
+        assert snapshot.values["static"] == "x" * 1000
+        assert snapshot.values["log"] == ["first", "second"]
+        assert snapshot.next == ()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_channels_are_not_rewritten(self, saver, redis_client):
+        graph = make_counter_graph(saver)
+        await graph.ainvoke({"static": "x" * 1000, "log": []}, CONFIG)
+
+        static_blobs = await redis_client.keys("checkpoint:t1::blob:static:*")
+        history = [s async for s in graph.aget_state_history(CONFIG)]
+
+        assert len(history) >= 3
+        assert len(static_blobs) == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_have_ttl(self, saver, redis_client):
+        await make_counter_graph(saver).ainvoke({"static": "x", "log": []}, CONFIG)
+
+        keys = await redis_client.smembers("checkpoint:t1:keys")
+
+        assert keys
+        for key in keys:
+            assert 0 < await redis_client.ttl(key) <= 120
+
+    @pytest.mark.asyncio
+    async def test_delete_thread(self, saver, redis_client):
+        graph = make_counter_graph(saver)
+        await graph.ainvoke({"static": "x", "log": []}, CONFIG)
+
+        await saver.adelete_thread("t1")
+
+        assert await redis_client.keys("checkpoint:t1*") == []
+        assert (await graph.aget_state(CONFIG)).values == {}
+
+    @pytest.mark.asyncio
+    async def test_graphs_share_one_redis_client(self):
+        first = create_research_graph(checkpoint_backend="redis")
+        second = create_research_graph(checkpoint_backend="redis")
+
+        client = first.checkpointer.redis
+        assert second.checkpointer.redis is client
+
+        await close_checkpointer()
+
+        assert RedisCheckpointSaver.from_settings().redis is not client
+        await close_checkpointer()
+
+
+class TestPipelineResume:
+    """run_research_pipeline(resume=True) reanuda desde el último nodo completado."""
+
+    @pytest.mark.asyncio
+    @patch("graphs.research_graph.safe_agent_invoke")
+    @patch("graphs.research_graph.create_model")
+    async def test_resume_reruns_only_failed_node(
+        self, mock_create_model, mock_safe_invoke, redis_client
+    ):
+        mock_create_model.return_value = Mock()
+        calls = []
+
+        async def fake_invoke(llm, tools, messages, max_iterations=5):
+            calls.append(messages[0].content[:40])
+            # content_synthesizer (5º nodo) falla en la primera ejecución
+            if len(calls) == 5:
+                raise Exception("synthesizer down")
+            return {"output": "output", "tool_calls": []}
+
+        mock_safe_invoke.side_effect = fake_invoke
+
+        with patch(
+            "graphs.research_graph.RedisCheckpointSaver.from_settings",
+            side_effect=lambda: RedisCheckpointSaver(redis_client),
+        ):
+            first = await run_research_pipeline(
+                niche="Test", checkpoint_backend="redis", mode="sequential",
+                thread_id="run-1",
+            )
+            assert first["final_report"] is None
+            assert len(calls) == 5
+
+            resumed = await run_research_pipeline(
+                niche="Test", checkpoint_backend="redis", mode="sequential",
+                thread_id="run-1", resume=True,
+            )
+            # Un thread completo no vuelve a ejecutar nodos
+            again = await run_research_pipeline(
+                niche="Test", checkpoint_backend="redis", mode="sequential",
+                thread_id="run-1", resume=True,
+            )
+
+        assert len(calls) == 6
+        assert again["final_report"] == "output"
+        assert resumed["final_report"] == "output"
+        assert resumed["niche_analysis"] == "output"
+        assert resumed["errors"] == []
+
+    @pytest.mark.asyncio
+    async def test_resume_requires_thread_id(self):
+        with pytest.raises(ValueError):
+            await run_research_pipeline(niche="Test", resume=True)
@@ -0,0 +1,286 @@
+"""
+Tests para la revalidación condicional de páginas cacheadas.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import httpx
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+from mcp_servers.http_fetcher import HTTPFetcher
+from mcp_servers.playwright_mcp import PlaywrightAdapter
+from mcp_servers.revalidation import NOT_MODIFIED, PageRecord, Revalidator, content_hash
+
+ARTICLE = "<html><head><title>Post</title></head><body><p>" + "Static research content. " * 20 + "</p></body></html>"
+
+
+class FakeServer:
+    """Servidor HTTP con ETag (o sin validadores si etag=None)."""
+
+    def __init__(self, body=ARTICLE, etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"content-type": "text/html"}
+        if self.etag:
+            headers["etag"] = self.etag
+            if request.headers.get("if-none-match") == self.etag:
+                return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, text=self.body)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+class TestPageRecord:
+    """Validadores y comparación de respuestas."""
+
+    def test_conditional_headers(self):
+        record = PageRecord(value={}, etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        assert record.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+        assert PageRecord(value={}).conditional_headers() == {}
+
+    def test_matches(self):
+        record = PageRecord(value={}, content_hash=content_hash(b"same"))
+
+        assert record.matches(httpx.Response(304))
+        assert record.matches(httpx.Response(200, content=b"same"))
+        assert not record.matches(httpx.Response(200, content=b"changed"))
+        assert not PageRecord(value={}).matches(httpx.Response(200, content=b"same"))
+
+    def test_roundtrip(self):
+        record = PageRecord(value={"a": 1}, etag="x", content_hash="h", fresh_until=5.0)
+        assert PageRecord.from_dict(record.to_dict()) == record
+
+
+class TestRevalidator:
+    """Frescura, revalidación y stale-while-revalidate."""
+
+    @pytest.fixture
+    def adapter(self):
+        return HTTPFetcher()  # Solo se usan su cache L1 y su single-flight
+
+    @pytest.mark.asyncio
+    async def test_fresh_record_skips_refresh(self, adapter):
+        revalidator = Revalidator(adapter, fresh_ttl=60, mode="revalidate")
+        refresh = AsyncMock(return_value=PageRecord(value={"v": 1}))
+
+        assert await revalidator.get("k", refresh) == {"v": 1}
+        assert await revalidator.get("k", refresh) == {"v": 1}
+
+        assert refresh.await_count == 1
+        assert revalidator.stats == {"fetched": 1, "fresh": 1}
+
+    @pytest.mark.asyncio
+    async def test_not_modified_extends_freshness(self, adapter):
+        revalidator = Revalidator(adapter, fresh_ttl=60, mode="revalidate")
+        await revalidator.get("k", AsyncMock(return_value=PageRecord(value={"v": 1})))
+        await self._expire(adapter, "k")
+
+        refresh = AsyncMock(return_value=NOT_MODIFIED)
+        assert await revalidator.get("k", refresh) == {"v": 1}
+        refresh.assert_awaited_once()
+        assert refresh.await_args.args[0].value == {"v": 1}
+
+        # Vuelve a estar fresco: no se consulta de nuevo
+        assert await revalidator.get("k", refresh) == {"v": 1}
+        assert refresh.await_count == 1
+        assert revalidator.stats["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_page_is_refetched(self, adapter):
+        revalidator = Revalidator(adapter, fresh_ttl=60, mode="revalidate")
+        await revalidator.get("k", AsyncMock(return_value=PageRecord(value={"v": 1})))
+        await self._expire(adapter, "k")
+
+        assert await revalidator.get("k", AsyncMock(return_value=PageRecord(value={"v": 2}))) == {"v": 2}
+        assert revalidator.stats["refetched"] == 1
+
+    @pytest.mark.asyncio
+    async def test_off_mode_ignores_stale_record(self, adapter):
+        revalidator = Revalidator(adapter, fresh_ttl=60, mode="off")
+        await revalidator.get("k", AsyncMock(return_value=PageRecord(value={"v": 1})))
+        await self._expire(adapter, "k")
+
+        refresh = AsyncMock(return_value=PageRecord(value={"v": 2}))
+        assert await revalidator.get("k", refresh) == {"v": 2}
+        assert refresh.await_args.args[0] is None
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, adapter):
+        revalidator = Revalidator(adapter, fresh_ttl=60, mode="stale_while_revalidate")
+        await revalidator.get("k", AsyncMock(return_value=PageRecord(value={"v": 1})))
+        await self._expire(adapter, "k")
+
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_refresh(stale):
+            started.set()
+            await release.wait()
+            return PageRecord(value={"v": 2})
+
+        # Se responde con la copia vencida; un solo refresh en background
+        assert await revalidator.get("k", slow_refresh) == {"v": 1}
+        assert await revalidator.get("k", slow_refresh) == {"v": 1}
+        await started.wait()
+        assert len(revalidator._background) == 1
+
+        release.set()
+        await revalidator.drain()
+
+        assert await revalidator.get("k", slow_refresh) == {"v": 2}
+        assert revalidator.stats["stale_served"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_if_error(self, adapter):
+        revalidator = Revalidator(adapter, fresh_ttl=60, mode="revalidate")
+        await revalidator.get("k", AsyncMock(return_value=PageRecord(value={"v": 1})))
+        await self._expire(adapter, "k")
+
+        failing = AsyncMock(side_effect=httpx.ConnectError("down"))
+        assert await revalidator.get("k", failing) == {"v": 1}
+        assert revalidator.stats["stale_if_error"] == 1
+
+        # Sin record vencido el error se propaga
+        with pytest.raises(httpx.ConnectError):
+            await revalidator.get("other", failing)
+
+    async def _expire(self, adapter, key):
+        record = PageRecord.from_dict(await adapter._get_cached(key))
+        record.fresh_until = 0.0
+        await adapter._set_cached(key, record.to_dict())
+
+
+class TestHTTPFetcherRevalidation:
+    """HTTPFetcher revalida con If-None-Match o con el hash del body."""
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation(self):
+        server = FakeServer()
+        fetcher = HTTPFetcher()
+        fetcher.client = server.client()
+        fetcher.revalidator.fresh_ttl = 0  # Cada lectura revalida
+
+        first = await fetcher.fetch("https://blog.example.com/post")
+        second = await fetcher.fetch("https://blog.example.com/post")
+
+        assert second.text == first.text
+        assert server.requests[1].headers["if-none-match"] == '"v1"'
+        assert fetcher.revalidator.stats["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hash_revalidation_without_validators(self):
+        server = FakeServer(etag=None)
+        fetcher = HTTPFetcher()
+        fetcher.client = server.client()
+        fetcher.revalidator.fresh_ttl = 0
+
+        await fetcher.fetch("https://blog.example.com/post")
+        await fetcher.fetch("https://blog.example.com/post")
+        assert fetcher.revalidator.stats["not_modified"] == 1
+
+        server.body = ARTICLE.replace("Static", "Updated")
+        content = await fetcher.fetch("https://blog.example.com/post")
+
+        assert "Updated research content" in content.text
+        assert fetcher.revalidator.stats["refetched"] == 1
+
+    @pytest.mark.asyncio
+    async def test_server_error_serves_stale_copy(self):
+        server = FakeServer()
+        fetcher = HTTPFetcher()
+        fetcher.client = server.client()
+        fetcher.revalidator.fresh_ttl = 0
+
+        first = await fetcher.fetch("https://blog.example.com/post")
+        server.handler = lambda request: httpx.Response(503, headers={"content-type": "text/html"})
+        fetcher.client = server.client()
+
+        content = await fetcher.fetch("https://blog.example.com/post")
+
+        assert content is not None
+        assert content.text == first.text
+        assert not content.metadata["render_required"]
+        assert fetcher.revalidator.stats["stale_if_error"] == 1
+
+
+class FakeResponse:
+    def __init__(self, headers, body):
+        self.headers = headers
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class FakePage:
+    def __init__(self, server):
+        self.server = server
+        self.renders = 0
+        self.url = None
+
+    async def goto(self, url, **kwargs):
+        self.renders += 1
+        self.url = url
+        return FakeResponse({"etag": self.server.etag} if self.server.etag else {}, self.server.body.encode())
+
+    async def title(self):
+        return "Post"
+
+    async def inner_text(self, selector):
+        return f"render {self.renders}"
+
+
+class TestPlaywrightRevalidation:
+    """scrape_page solo re-renderiza si la página cambió."""
+
+    @pytest.fixture
+    def setup(self):
+        server = FakeServer()
+        page = FakePage(server)
+        adapter = PlaywrightAdapter()
+        adapter.http_client = server.client()
+        adapter.revalidator.fresh_ttl = 0
+        adapter._wait_for_rate_limit = AsyncMock()
+
+        class Pool:
+            @asynccontextmanager
+            async def page(self):
+                yield page
+
+        adapter.text_pool = Pool()
+        return adapter, server, page
+
+    @pytest.mark.asyncio
+    async def test_unchanged_page_is_not_rendered_again(self, setup):
+        adapter, server, page = setup
+
+        first = await adapter.scrape_page("https://spa.example.com/")
+        second = await adapter.scrape_page("https://spa.example.com/")
+
+        assert page.renders == 1
+        assert second.text == first.text == "render 1"
+        assert server.requests[0].headers["if-none-match"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_changed_page_is_rendered_again(self, setup):
+        adapter, server, page = setup
+
+        await adapter.scrape_page("https://spa.example.com/")
+        server.etag = '"v2"'
+        server.body = ARTICLE.replace("Static", "Updated")
+        content = await adapter.scrape_page("https://spa.example.com/")
+
+        assert page.renders == 2
+        assert content.text == "render 2"
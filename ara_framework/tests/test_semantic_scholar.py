@@ -0,0 +1,170 @@
+"""
+Tests para SemanticScholarAdapter (detalles en batch y planner de paginación).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import json
+import pytest
+import fakeredis.aioredis
+from unittest.mock import AsyncMock, patch
+
+from mcp_servers.semantic_scholar import SEARCH_PAGE_SIZE, SemanticScholarAdapter, Paper
+
+
+def api_paper(paper_id):
+    return {
+        "paperId": paper_id,
+        "title": f"Paper {paper_id}",
+        "abstract": None,
+        "year": 2024,
+        "authors": [{"name": "Ada"}],
+        "citationCount": 3,
+        "url": f"https://example.org/{paper_id}",
+    }
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def adapter(redis):
+    adapter = SemanticScholarAdapter(redis_client=redis)
+    adapter._wait_for_rate_limit = AsyncMock()
+    return adapter
+
+
+class TestBatchDetails:
+    """get_papers_details con POST /paper/batch."""
+
+    @pytest.mark.asyncio
+    async def test_only_missing_ids_are_requested(self, adapter, redis):
+        cached = Paper.from_api_response(api_paper("a")).to_dict()
+        await redis.set(adapter._make_cache_key("paper", "a"), json.dumps(cached))
+
+        async def fake_request(endpoint, params=None, json_body=None):
+            return [api_paper(pid) if pid != "missing" else None for pid in json_body["ids"]]
+
+        with patch.object(adapter, "_make_request", side_effect=fake_request) as request:
+            papers = await adapter.get_papers_details(["a", "b", "c", "missing", "b"])
+
+        request.assert_awaited_once()
+        assert request.await_args.args[0] == "/paper/batch"
+        assert request.await_args.kwargs["json_body"] == {"ids": ["b", "c", "missing"]}
+        assert set(papers) == {"a", "b", "c"}
+        assert papers["b"].authors == ["Ada"]
+
+    @pytest.mark.asyncio
+    async def test_chunks_and_fills_cache_per_paper(self, adapter, redis):
+        ids = [f"p{i}" for i in range(5)]
+
+        async def fake_request(endpoint, params=None, json_body=None):
+            return [api_paper(pid) for pid in json_body["ids"]]
+
+        with patch.object(adapter, "_make_request", side_effect=fake_request) as request:
+            await adapter.get_papers_details(ids, chunk_size=2)
+
+        assert request.await_count == 3
+        assert adapter._wait_for_rate_limit.await_count == 3
+        for pid in ids:
+            assert await redis.get(adapter._make_cache_key("paper", pid))
+
+        # get_paper_details comparte el cache: no hace request
+        with patch.object(adapter, "_make_request", new=AsyncMock()) as request:
+            paper = await adapter.get_paper_details("p3")
+
+        request.assert_not_awaited()
+        assert paper.title == "Paper p3"
+
+    @pytest.mark.asyncio
+    async def test_all_cached_makes_no_request(self, adapter):
+        async def fake_request(endpoint, params=None, json_body=None):
+            return [api_paper(pid) for pid in json_body["ids"]]
+
+        with patch.object(adapter, "_make_request", side_effect=fake_request):
+            await adapter.get_papers_details(["a", "b"])
+
+        with patch.object(adapter, "_make_request", new=AsyncMock()) as request:
+            papers = await adapter.get_papers_details(["a", "b"])
+
+        request.assert_not_awaited()
+        assert set(papers) == {"a", "b"}
+
+
+def search_api(total):
+    """_make_request falso para /paper/search con `total` resultados."""
+    async def fake_request(endpoint, params=None, json_body=None):
+        assert endpoint == "/paper/search"
+        await asyncio.sleep(0)
+        start = params["offset"]
+        end = min(total, start + params["limit"])
+        return {"data": [api_paper(f"p{i}") for i in range(start, end)]}
+    return fake_request
+
+
+class TestSearchWindow:
+    """search_papers_window sirve (limit, offset) desde páginas cacheadas."""
+
+    @pytest.mark.asyncio
+    async def test_smaller_window_served_from_cached_page(self, adapter):
+        with patch.object(adapter, "_make_request", side_effect=search_api(250)) as request:
+            first = await adapter.search_papers_window("llm", limit=20)
+            second = await adapter.search_papers_window("llm", limit=10, offset=5)
+
+        request.assert_awaited_once()
+        params = request.await_args.args[1]
+        assert params["limit"] == SEARCH_PAGE_SIZE
+        assert params["offset"] == 0
+        assert [p.paper_id for p in first] == [f"p{i}" for i in range(20)]
+        assert [p.paper_id for p in second] == [f"p{i}" for i in range(5, 15)]
+
+    @pytest.mark.asyncio
+    async def test_window_across_pages(self, adapter):
+        with patch.object(adapter, "_make_request", side_effect=search_api(250)) as request:
+            papers = await adapter.search_papers_window("llm", limit=20, offset=190)
+
+        assert [call.args[1]["offset"] for call in request.await_args_list] == [100, 200]
+        assert [p.paper_id for p in papers] == [f"p{i}" for i in range(190, 210)]
+
+    @pytest.mark.asyncio
+    async def test_stops_on_incomplete_page(self, adapter):
+        with patch.object(adapter, "_make_request", side_effect=search_api(30)) as request:
+            papers = await adapter.search_papers_window("llm", limit=150)
+
+        request.assert_awaited_once()
+        assert len(papers) == 30
+
+    @pytest.mark.asyncio
+    async def test_year_range_is_part_of_page_key(self, adapter):
+        with patch.object(adapter, "_make_request", side_effect=search_api(50)) as request:
+            await adapter.search_papers_window("llm", limit=10, year_from=2023)
+            await adapter.search_papers_window("llm", limit=10, year_from=2020, year_to=2022)
+
+        years = [call.args[1]["year"] for call in request.await_args_list]
+        assert years == ["2023-", "2020-2022"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_queries_share_request(self, adapter):
+        with patch.object(adapter, "_make_request", side_effect=search_api(50)) as request:
+            results = await asyncio.gather(*[
+                adapter.search_papers_window("llm", limit=limit)
+                for limit in (10, 20, 10)
+            ])
+
+        request.assert_awaited_once()
+        assert [len(r) for r in results] == [10, 20, 10]
+
+    @pytest.mark.asyncio
+    async def test_page_fills_per_paper_cache(self, adapter):
+        with patch.object(adapter, "_make_request", side_effect=search_api(50)):
+            await adapter.search_papers_window("llm", limit=5)
+
+        with patch.object(adapter, "_make_request", new=AsyncMock()) as request:
+            paper = await adapter.get_paper_details("p42")
+
+        request.assert_not_awaited()
+        assert paper.title == "Paper p42"
@@ -0,0 +1,87 @@
+"""
+Tests para core/state_compaction.py (historial de mensajes acotado).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from unittest.mock import patch
+from langchain_core.messages import SystemMessage, HumanMessage
+
+from core.state_compaction import (
+    HistoryPolicy,
+    SUMMARY_MESSAGE_ID,
+    bounded_add_messages,
+    compact_node_messages,
+)
+
+
+class TestCompactNodeMessages:
+    """Política de historial por nodo."""
+
+    def test_long_system_prompt_is_truncated(self):
+        system_msg = SystemMessage(content="x" * 5000)
+        human_msg = HumanMessage(content="Analyze the niche: Test")
+
+        compacted = compact_node_messages("niche_analyst", [system_msg, human_msg])
+
+        assert len(compacted) == 2
+        assert len(compacted[0].content) < 400
+        assert "4700 chars compacted" in compacted[0].content
+        assert compacted[1].content == "Analyze the niche: Test"
+        # Los originales no se modifican
+        assert len(system_msg.content) == 5000
+
+    def test_synthesizer_drops_system_prompt(self):
+        compacted = compact_node_messages(
+            "content_synthesizer",
+            [SystemMessage(content="context " * 1000), HumanMessage(content="Synthesize")],
+        )
+
+        assert [m.type for m in compacted] == ["human"]
+
+    def test_explicit_policy(self):
+        compacted = compact_node_messages(
+            "unknown_node",
+            [HumanMessage(content="abcdef")],
+            policy=HistoryPolicy(other_chars=3),
+        )
+
+        assert compacted[0].content.startswith("abc\n")
+
+    def test_ids_depend_on_full_content(self):
+        """Prompts con el mismo prefijo no colisionan tras el recorte."""
+        first = compact_node_messages("niche_analyst", [SystemMessage(content="a" * 1000 + "1")])
+        second = compact_node_messages("niche_analyst", [SystemMessage(content="a" * 1000 + "2")])
+
+        assert first[0].content == second[0].content
+        assert first[0].id != second[0].id
+
+
+class TestBoundedAddMessages:
+    """Reducer de ResearchState.messages."""
+
+    def test_repeated_messages_stored_once(self):
+        batch = compact_node_messages("niche_analyst", [HumanMessage(content="Analyze: Test")])
+
+        state = bounded_add_messages([], batch)
+        state = bounded_add_messages(state, compact_node_messages(
+            "niche_analyst", [HumanMessage(content="Analyze: Test")]
+        ))
+
+        assert len(state) == 1
+
+    def test_history_is_bounded_with_summary(self):
+        with patch("core.state_compaction.settings") as mock_settings:
+            mock_settings.STATE_MAX_MESSAGES = 4
+
+            state = []
+            for i in range(10):
+                state = bounded_add_messages(
+                    state, compact_node_messages("node", [HumanMessage(content=f"msg {i}")])
+                )
+
+        assert len(state) == 4
+        assert state[0].id == SUMMARY_MESSAGE_ID
+        assert state[0].additional_kwargs["compacted"] == 7
+        assert [m.content for m in state[1:]] == ["msg 7", "msg 8", "msg 9"]
@@ -0,0 +1,228 @@
+"""
+Tests para el conteo de tokens por llamada, nodo y run (core/token_usage.py).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+
+from core.agent_utils import safe_agent_invoke
+from core.langgraph_monitoring import GraphExecutionTracer, LangGraphMonitor
+from core.token_usage import RunUsage, TokenUsage, merge_usage_dicts, track_run, tracked_node
+
+
+@tool
+async def lookup(query: str) -> str:
+    """Busca algo."""
+    return f"found {query}"
+
+
+def reply(content="", tool_calls=None, input_tokens=100, output_tokens=20):
+    return AIMessage(
+        content=content,
+        tool_calls=tool_calls or [],
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+    )
+
+
+class ScriptedLLM:
+    """LLM que devuelve las respuestas dadas, en orden."""
+
+    def __init__(self, model_name, responses):
+        self.model_name = model_name
+        self.responses = list(responses)
+
+    def bind_tools(self, tools):
+        return self
+
+    async def ainvoke(self, messages):
+        return self.responses.pop(0)
+
+
+def tool_round(input_tokens=100, output_tokens=20):
+    return reply(
+        tool_calls=[{"name": "lookup", "args": {"query": "wasm"}, "id": "call_1"}],
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+    )
+
+
+class TestTokenUsage:
+    """Lectura de usage_metadata y costo por modelo."""
+
+    def test_from_usage_metadata_with_token_prices(self):
+        usage = TokenUsage.from_response(reply(input_tokens=1_000_000, output_tokens=500_000), "deepseek-v3")
+
+        assert usage.total_tokens == 1_500_000
+        assert usage.llm_calls == 1
+        assert usage.cost_usd == pytest.approx(0.27 + 0.55)
+        assert usage.credits == 0.0
+
+    def test_falls_back_to_openai_token_usage(self):
+        response = AIMessage(
+            content="ok",
+            response_metadata={"token_usage": {"prompt_tokens": 30, "completion_tokens": 5}},
+        )
+
+        usage = TokenUsage.from_response(response, "gpt-5")
+
+        assert (usage.input_tokens, usage.output_tokens) == (30, 5)
+        assert usage.credits == 1.0
+        assert usage.cost_usd == 0.0
+
+    def test_unknown_model_and_missing_metadata(self):
+        usage = TokenUsage.from_response(AIMessage(content="ok"), "mistral:7b")
+
+        assert usage.to_dict() == {
+            "input_tokens": 0, "output_tokens": 0, "total_tokens": 0,
+            "llm_calls": 1, "cost_usd": 0.0, "credits": 0.0,
+        }
+
+    def test_merge_usage_dicts(self):
+        left = {"niche_analyst": TokenUsage(10, 5, 1).to_dict()}
+        right = {"niche_analyst": TokenUsage(20, 5, 1).to_dict(), "content_synthesizer": TokenUsage(1, 1, 1).to_dict()}
+
+        merged = merge_usage_dicts(left, right)
+
+        assert merged["niche_analyst"]["total_tokens"] == 40
+        assert merged["niche_analyst"]["llm_calls"] == 2
+        assert merged["content_synthesizer"]["input_tokens"] == 1
+
+
+class TestSafeAgentInvokeUsage:
+    """safe_agent_invoke suma los tokens de cada iteración."""
+
+    @pytest.mark.asyncio
+    async def test_usage_per_iteration(self):
+        llm = ScriptedLLM("gpt-5", [tool_round(100, 20), reply("done", input_tokens=150, output_tokens=40)])
+
+        result = await safe_agent_invoke(llm, [lookup], [HumanMessage(content="go")], scheduler=None)
+
+        usage = result["usage"]
+        assert result["output"] == "done"
+        assert (usage["input_tokens"], usage["output_tokens"], usage["llm_calls"]) == (250, 60, 2)
+        assert usage["credits"] == 2.0
+        assert [(it["iteration"], it["model"], it["total_tokens"]) for it in usage["iterations"]] == [
+            (0, "gpt-5", 120),
+            (1, "gpt-5", 190),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_final_call_after_max_iterations_is_counted(self):
+        llm = ScriptedLLM("gpt-4o", [tool_round(), reply("summary", input_tokens=300, output_tokens=50)])
+
+        result = await safe_agent_invoke(llm, [lookup], [HumanMessage(content="go")], max_iterations=1, scheduler=None)
+
+        assert "warning" in result
+        assert [it["iteration"] for it in result["usage"]["iterations"]] == [0, 1]
+        assert result["usage"]["total_tokens"] == 470
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_are_not_counted(self):
+        cache = AsyncMock()
+        cache.replay = False
+        cache.get.return_value = reply("cached", input_tokens=999, output_tokens=999)
+        llm = ScriptedLLM("gpt-5", [])
+
+        result = await safe_agent_invoke(llm, [], [HumanMessage(content="go")], cache=cache, scheduler=None)
+
+        assert result["output"] == "cached"
+        assert result["usage"]["llm_calls"] == 0
+        assert result["usage"]["iterations"] == []
+
+
+class FakeBudget:
+    """Registra las llamadas a record_usage."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def record_usage(self, model, credits_used=None, metadata=None, input_tokens=0, output_tokens=0):
+        self.calls.append((model, metadata["node"], input_tokens, output_tokens))
+
+
+def agent_node(llm):
+    async def node(state):
+        result = await safe_agent_invoke(llm, [lookup], [HumanMessage(content="go")], scheduler=None)
+        return {"output": result["output"]}
+    return node
+
+
+class TestRunUsage:
+    """Agregado por nodo / run y envío a BudgetManager y LangGraphMonitor."""
+
+    @pytest.mark.asyncio
+    async def test_tracked_node_feeds_budget_and_monitor(self):
+        monitor = LangGraphMonitor()
+        budget = FakeBudget()
+        tracer = GraphExecutionTracer(monitor, "exec-1", "thread-1")
+        tracer.log_start({"niche": "wasm"})
+        run = RunUsage(budget_manager=budget, tracer=tracer)
+
+        analyst = tracked_node("niche_analyst", agent_node(
+            ScriptedLLM("gpt-5", [tool_round(100, 20), reply("a", input_tokens=150, output_tokens=30)])
+        ))
+        writer = tracked_node("content_synthesizer", agent_node(
+            ScriptedLLM("deepseek-v3", [reply("b", input_tokens=1000, output_tokens=500)])
+        ))
+
+        with track_run(run):
+            # Las tasks heredan el run activo (como los nodos de LangGraph)
+            first, second = await asyncio.gather(
+                asyncio.create_task(analyst({"niche": "wasm"})),
+                asyncio.create_task(writer({"niche": "wasm"})),
+            )
+
+        assert first["token_usage"]["niche_analyst"]["total_tokens"] == 300
+        assert first["total_credits_used"] == 2.0
+        assert second["token_usage"]["content_synthesizer"]["cost_usd"] == pytest.approx(0.00082)
+
+        assert run.total.total_tokens == 1800
+        assert run.by_node["niche_analyst"].llm_calls == 2
+        assert run.by_model["deepseek-v3"].input_tokens == 1000
+        assert sorted(budget.calls) == [
+            ("deepseek-v3", "content_synthesizer", 1000, 500),
+            ("gpt-5", "niche_analyst", 100, 20),
+            ("gpt-5", "niche_analyst", 150, 30),
+        ]
+
+        summary = monitor.get_execution_summary("exec-1")
+        assert summary["total_tokens"] == 1800
+        assert summary["total_cost_usd"] == pytest.approx(0.00082)
+        assert {node["node_name"]: node["tokens_used"] for node in summary["node_details"]} == {
+            "niche_analyst": 300,
+            "content_synthesizer": 1500,
+        }
+
+    @pytest.mark.asyncio
+    async def test_node_errors_are_reported_as_failures(self):
+        tracer = MagicMock()
+        run = RunUsage(tracer=tracer)
+
+        async def failing(state):
+            return {"errors": ["NicheAnalyst: boom"]}
+
+        with track_run(run):
+            update = await tracked_node("niche_analyst", failing)({})
+
+        tracer.log_node_failure.assert_called_once_with("niche_analyst", "NicheAnalyst: boom")
+        tracer.log_node_completion.assert_not_called()
+        assert update["token_usage"]["niche_analyst"]["llm_calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_without_active_run(self):
+        node = tracked_node("niche_analyst", agent_node(ScriptedLLM("gpt-4o", [reply("a")])))
+
+        update = await node({})
+
+        assert update["output"] == "a"
+        assert update["token_usage"]["niche_analyst"]["total_tokens"] == 120
@@ -0,0 +1,138 @@
+"""
+Tests para el write-behind del usage_log (core/usage_log.py).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import json
+import pytest
+
+from core import usage_log
+from core.usage_log import UsageLogWriter
+
+
+class FakeSupabase:
+    """Registra cada insert (lote); puede fallar las primeras N veces."""
+
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.batches = []
+        self.attempts = 0
+
+    def table(self, name):
+        self.name = name
+        return self
+
+    def insert(self, rows):
+        self._rows = rows
+        return self
+
+    def execute(self):
+        self.attempts += 1
+        if self.attempts <= self.fail_times:
+            raise ConnectionError("supabase unreachable")
+        self.batches.append(list(self._rows))
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+
+def event(i):
+    return {"model": "gpt-5", "credits_used": 1.0, "metadata": {"i": i}}
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(usage_log, "INITIAL_BACKOFF", 0.01)
+    monkeypatch.setattr(usage_log, "MAX_BACKOFF", 0.02)
+
+
+class TestUsageLogWriter:
+    """Flush por tamaño / tiempo, reintentos, spool y drenado al cerrar."""
+
+    @pytest.mark.asyncio
+    async def test_flush_by_size(self):
+        supabase = FakeSupabase()
+        writer = UsageLogWriter(supabase, batch_size=3, flush_interval=60, spool_path="")
+
+        for i in range(3):
+            writer.add(event(i))
+        await asyncio.sleep(0.05)
+
+        assert supabase.batches == [[event(0), event(1), event(2)]]
+        assert supabase.name == "usage_log"
+        assert len(writer) == 0
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_flush_by_interval(self):
+        supabase = FakeSupabase()
+        writer = UsageLogWriter(supabase, batch_size=100, flush_interval=0.05, spool_path="")
+
+        writer.add(event(0))
+        assert supabase.batches == []
+        await asyncio.sleep(0.15)
+
+        assert supabase.rows == [event(0)]
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff_keeping_order(self, fast_backoff):
+        supabase = FakeSupabase(fail_times=2)
+        writer = UsageLogWriter(supabase, batch_size=2, flush_interval=0.01, spool_path="")
+
+        for i in range(4):
+            writer.add(event(i))
+        await asyncio.sleep(0.2)
+
+        assert supabase.rows == [event(i) for i in range(4)]
+        assert writer.metrics()["failed_flushes"] == 2
+        assert writer.metrics()["backoff_seconds"] == 0.0
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_close_drains_buffer(self):
+        supabase = FakeSupabase()
+        writer = UsageLogWriter(supabase, batch_size=2, flush_interval=60, spool_path="")
+
+        writer.add(event(0))
+        await writer.close()
+
+        assert supabase.rows == [event(0)]
+        assert writer.metrics()["flushed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bounded_buffer_drops_oldest(self, fast_backoff):
+        supabase = FakeSupabase(fail_times=1000)
+        writer = UsageLogWriter(supabase, batch_size=100, flush_interval=60, max_buffer=3, spool_path="")
+
+        for i in range(5):
+            writer.add(event(i))
+
+        assert [row["metadata"]["i"] for row in writer._buffer] == [2, 3, 4]
+        assert writer.metrics()["dropped"] == 2
+        await writer.close(timeout=0)
+
+    @pytest.mark.asyncio
+    async def test_spool_on_close_and_reload(self, tmp_path, fast_backoff):
+        spool = tmp_path / "spool.jsonl"
+        down = UsageLogWriter(FakeSupabase(fail_times=1000), flush_interval=60, spool_path=str(spool))
+
+        down.add(event(0))
+        down.add(event(1))
+        await down.close(timeout=0.05)
+
+        assert [json.loads(line) for line in spool.read_text().splitlines()] == [event(0), event(1)]
+        assert down.metrics()["spooled"] == 2
+
+        # Próximo arranque: los pendientes se envían antes que los nuevos
+        supabase = FakeSupabase()
+        writer = UsageLogWriter(supabase, flush_interval=60, spool_path=str(spool))
+        writer.add(event(2))
+        await writer.close()
+
+        assert supabase.rows == [event(0), event(1), event(2)]
+        assert not spool.exists()
@@ -0,0 +1,154 @@
+"""
+Tests para la cola de trabajo acotada (scrape_multiple_urls).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import pytest
+from collections import defaultdict
+from unittest.mock import AsyncMock
+
+from mcp_servers.playwright_mcp import PlaywrightAdapter, ScrapedContent
+from mcp_servers.work_queue import host_key, iter_completed
+
+
+def make_fetch(delays, tracker=None):
+    """fn que duerme delays[url] segundos y registra concurrencia por host."""
+    async def fetch(url):
+        host = host_key(url)
+        if tracker is not None:
+            tracker["active"][host] += 1
+            tracker["peak"][host] = max(tracker["peak"][host], tracker["active"][host])
+        try:
+            await asyncio.sleep(delays.get(url, 0.01))
+            if url.endswith("/boom"):
+                raise ValueError("boom")
+            return f"content of {url}"
+        finally:
+            if tracker is not None:
+                tracker["active"][host] -= 1
+    return fetch
+
+
+class TestIterCompleted:
+    """Streaming, límites por host y deadlines."""
+
+    def test_host_key(self):
+        assert host_key("https://ArXiv.org/abs/1") == "arxiv.org"
+        assert host_key("not a url") == ""
+
+    @pytest.mark.asyncio
+    async def test_streams_in_completion_order(self):
+        urls = ["https://a.com/slow", "https://b.com/fast", "https://c.com/fast"]
+        fetch = make_fetch({urls[0]: 0.2, urls[1]: 0.01, urls[2]: 0.02})
+
+        order = [url async for url, _ in iter_completed(urls, fetch, max_concurrent=3)]
+
+        assert order == [urls[1], urls[2], urls[0]]
+
+    @pytest.mark.asyncio
+    async def test_slow_url_does_not_block_free_slots(self):
+        # Con grupos fijos de 2, las 4 rápidas esperarían a la lenta
+        urls = ["https://a.com/slow"] + [f"https://b{i}.com/" for i in range(4)]
+        fetch = make_fetch({urls[0]: 0.3})
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        finished = {}
+        async for url, _ in iter_completed(urls, fetch, max_concurrent=2):
+            finished[url] = loop.time() - start
+
+        assert max(finished[u] for u in urls[1:]) < 0.2
+        assert finished[urls[0]] >= 0.3
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        tracker = {"active": defaultdict(int), "peak": defaultdict(int)}
+        urls = [f"https://same.com/{i}" for i in range(6)] + [f"https://other.com/{i}" for i in range(2)]
+        fetch = make_fetch({}, tracker)
+
+        results = [r async for r in iter_completed(urls, fetch, max_concurrent=4, per_host=2)]
+
+        assert len(results) == 8
+        assert tracker["peak"]["same.com"] == 2
+        assert tracker["peak"]["other.com"] == 2
+
+    @pytest.mark.asyncio
+    async def test_saturated_host_does_not_block_other_hosts(self):
+        urls = [f"https://same.com/{i}" for i in range(3)] + ["https://other.com/"]
+        fetch = make_fetch({u: 0.2 for u in urls[:3]})
+
+        order = [url async for url, _ in iter_completed(urls, fetch, max_concurrent=2, per_host=1)]
+
+        assert order[0] == "https://other.com/"
+
+    @pytest.mark.asyncio
+    async def test_item_timeout_and_errors_are_yielded(self):
+        urls = ["https://a.com/hang", "https://b.com/boom", "https://c.com/ok"]
+        fetch = make_fetch({urls[0]: 10})
+
+        results = dict([r async for r in iter_completed(urls, fetch, max_concurrent=3, item_timeout=0.1)])
+
+        assert isinstance(results[urls[0]], asyncio.TimeoutError)
+        assert isinstance(results[urls[1]], ValueError)
+        assert results[urls[2]] == "content of https://c.com/ok"
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results(self):
+        urls = ["https://a.com/1", "https://b.com/hang", "https://c.com/hang"]
+        started = []
+
+        async def fetch(url):
+            started.append(url)
+            await asyncio.sleep(10 if "hang" in url else 0.01)
+            return url
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = [r async for r in iter_completed(urls, fetch, max_concurrent=3, deadline=0.2)]
+
+        assert results == [("https://a.com/1", "https://a.com/1")]
+        assert loop.time() - start < 1
+        assert len(started) == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self):
+        assert [r async for r in iter_completed([], make_fetch({}), max_concurrent=3)] == []
+
+
+class TestScrapeMultiple:
+    """PlaywrightAdapter.scrape_multiple sobre la cola de trabajo."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_input_order_and_drops_failures(self):
+        adapter = PlaywrightAdapter()
+
+        async def scrape_page(url, **kwargs):
+            await asyncio.sleep(0.05 if url.endswith("1") else 0.01)
+            if url.endswith("boom"):
+                raise RuntimeError("navigation failed")
+            return ScrapedContent(url=url, title="", text=url)
+
+        adapter.scrape_page = AsyncMock(side_effect=scrape_page)
+        urls = ["https://a.com/1", "https://a.com/boom", "https://b.com/2"]
+
+        results = await adapter.scrape_multiple(urls, max_concurrent=3)
+
+        assert [r.url for r in results] == ["https://a.com/1", "https://b.com/2"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_completed_pages(self):
+        adapter = PlaywrightAdapter()
+
+        async def scrape_page(url, **kwargs):
+            await asyncio.sleep(10 if "slow" in url else 0.01)
+            return ScrapedContent(url=url, title="", text=url)
+
+        adapter.scrape_page = AsyncMock(side_effect=scrape_page)
+        urls = ["https://a.com/slow", "https://b.com/fast"]
+
+        results = await adapter.scrape_multiple(urls, deadline=0.2)
+
+        assert [r.url for r in results] == ["https://b.com/fast"]
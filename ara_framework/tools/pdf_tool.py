@@ -13,7 +13,7 @@ Features:
 - Conversión PDF → Markdown (MarkItDown + PyMuPDF hybrid)
 - Extracción de metadatos (autor, título, año)
 - Detección de secciones académicas (Abstract, Introduction, etc.)
-- Rate limiting (5 conversiones/min - CPU intensive)
+- Pool de procesos para conversiones batch (PDF_WORKERS, timeout por documento)
 - Cache agresivo (7 días)
 """
 import asyncio
@@ -183,14 +183,23 @@ class PDFTool:
             return {}
     
     @tool("extract_pdf_text_only")
-    async def extract_pdf_text_only(file_path: str) -> str:
+    async def extract_pdf_text_only(
+        file_path: str,
+        max_pages: Optional[int] = None,
+        stop_after: Optional[str] = None,
+    ) -> str:
         """
         Extrae solo texto plano de un PDF (sin markdown formatting).
         
         Útil para búsquedas o análisis de texto donde el formato no importa.
+        Para papers largos, usar max_pages o stop_after: el PDF se lee
+        página a página y se deja de leer al llegar al límite.
         
         Args:
             file_path (str): Path al archivo PDF
+            max_pages (int, optional): Leer solo las primeras N páginas
+            stop_after (str, optional): Parar tras esta sección
+                (ej: "abstract", "introduction")
         
         Returns:
             str: Texto plano extraído
@@ -198,6 +207,9 @@ class PDFTool:
         Example:
             text = extract_pdf_text_only("paper.pdf")
             
+            # Solo abstract + introducción
+            intro = extract_pdf_text_only("thesis.pdf", stop_after="introduction")
+            
             # Buscar keyword
             if "deep learning" in text.lower():
                 print("Paper mentions deep learning")
@@ -206,7 +218,11 @@ class PDFTool:
         await tool_instance._ensure_connected()
         
         try:
-            text = await tool_instance.adapter.extract_text_only(file_path)
+            text = await tool_instance.adapter.extract_text_only(
+                file_path,
+                max_pages=max_pages,
+                stop_after=stop_after,
+            )
             
             logger.info(
                 "pdf_text_extracted",
@@ -227,17 +243,19 @@ class PDFTool:
     @tool("convert_multiple_pdfs")
     async def convert_multiple_pdfs(
         file_paths: List[str],
-        max_concurrent: int = 2,
+        max_concurrent: Optional[int] = None,
         clean_headers: bool = True,
     ) -> List[Dict[str, Any]]:
         """
         Convierte múltiples PDFs en paralelo.
         
-        Usa concurrencia limitada para no sobrecargar CPU.
+        Usa el pool de procesos del adapter (PDF_WORKERS): escala con los
+        cores sin sobrecargar CPU.
         
         Args:
             file_paths (list): Lista de paths a PDFs
-            max_concurrent (int): Máximo conversiones simultáneas (default 2)
+            max_concurrent (int, optional): Máximo conversiones simultáneas
+                (default: PDF_WORKERS)
             clean_headers (bool): Si limpiar headers/footers
         
         Returns:
@@ -377,14 +395,23 @@ def get_pdf_tool(redis_client=None) -> PDFTool:
 # ============================================================
 
 @tool("extract_pdf_text_only")
-async def extract_pdf_text_only(file_path: str) -> str:
+async def extract_pdf_text_only(
+    file_path: str,
+    max_pages: Optional[int] = None,
+    stop_after: Optional[str] = None,
+) -> str:
     """
     Extrae solo texto plano de un PDF (sin markdown formatting).
     
     Útil para búsquedas o análisis de texto donde el formato no importa.
+    Para papers largos, usar max_pages o stop_after: el PDF se lee
+    página a página y se deja de leer al llegar al límite.
     
     Args:
         file_path (str): Path al archivo PDF
+        max_pages (int, optional): Leer solo las primeras N páginas
+        stop_after (str, optional): Parar tras esta sección
+            (ej: "abstract", "introduction")
     
     Returns:
         str: Texto plano extraído
@@ -392,6 +419,9 @@ async def extract_pdf_text_only(file_path: str) -> str:
     Example:
         text = extract_pdf_text_only("paper.pdf")
         
+        # Solo abstract + introducción
+        intro = extract_pdf_text_only("thesis.pdf", stop_after="introduction")
+        
         # Buscar keyword
         if "deep learning" in text.lower():
             print("Paper mentions deep learning")
@@ -400,7 +430,11 @@ async def extract_pdf_text_only(file_path: str) -> str:
     await tool_instance._ensure_connected()
     
     try:
-        text = await tool_instance.adapter.extract_text_only(file_path)
+        text = await tool_instance.adapter.extract_text_only(
+            file_path,
+            max_pages=max_pages,
+            stop_after=stop_after,
+        )
         
         logger.info(
             "pdf_text_extracted",
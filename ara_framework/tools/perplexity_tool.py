@@ -13,6 +13,14 @@ Best for:
 - Community discussions
 - Market analysis
 
+Client pooling:
+    Both tools share one AsyncOpenAI client on the keep-alive httpx pool from
+    core.model_factory (closed by `close_models()`), so a search never blocks
+    the event loop. Results are cached in-process for PERPLEXITY_CACHE_TTL
+    seconds, keyed by (model, query, recency filter, max_tokens); identical
+    concurrent searches share one request, and at most
+    PERPLEXITY_MAX_CONCURRENT searches are in flight per process.
+
 Usage:
     from tools.perplexity_tool import perplexity_search
     
@@ -22,15 +30,145 @@ Usage:
     )
 """
 
+import asyncio
+import hashlib
+import json
+import httpx
 import structlog
-from typing import Optional, Literal
+from typing import Any, Dict, Optional, Literal
 from langchain_core.tools import tool
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from config.settings import settings
+from core.model_factory import get_http_clients
+from mcp_servers.cache import LocalTTLCache, SingleFlight
 
 logger = structlog.get_logger(__name__)
 
+# Model used by perplexity_search_fast
+PERPLEXITY_FAST_MODEL = "llama-3.1-sonar-small-128k-online"
+
+SEARCH_SYSTEM_PROMPT = (
+    "You are a helpful research assistant. "
+    "Provide comprehensive, well-structured information with citations. "
+    "Focus on recent developments, trends, and actionable insights."
+)
+
+FAST_SYSTEM_PROMPT = "You are a helpful assistant. Provide concise, accurate information."
+
+
+# =============================================================================
+# Shared client, response cache and concurrency limit (process-wide)
+# =============================================================================
+
+_perplexity_client: Optional[AsyncOpenAI] = None
+_perplexity_http: Optional[httpx.AsyncClient] = None
+_search_cache = LocalTTLCache(max_entries=512, default_ttl=settings.PERPLEXITY_CACHE_TTL)
+_search_flight = SingleFlight()
+_search_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_perplexity_client() -> Optional[AsyncOpenAI]:
+    """
+    Get the shared async Perplexity client (None without an API key).
+    
+    The client uses the pooled httpx.AsyncClient for PERPLEXITY_BASE_URL and
+    is rebuilt if close_models() has closed that pool.
+    """
+    global _perplexity_client, _perplexity_http
+    
+    if not settings.PERPLEXITY_API_KEY:
+        return None
+        
+    _, http_client = get_http_clients(settings.PERPLEXITY_BASE_URL)
+    if _perplexity_client is None or _perplexity_http is not http_client:
+        _perplexity_client = AsyncOpenAI(
+            api_key=settings.PERPLEXITY_API_KEY,
+            base_url=settings.PERPLEXITY_BASE_URL,
+            http_client=http_client,
+        )
+        _perplexity_http = http_client
+        logger.info("perplexity_client_initialized")
+        
+    return _perplexity_client
+
+
+def _get_search_semaphore() -> asyncio.Semaphore:
+    global _search_semaphore
+    if _search_semaphore is None:
+        _search_semaphore = asyncio.Semaphore(settings.PERPLEXITY_MAX_CONCURRENT)
+    return _search_semaphore
+
+
+def _search_cache_key(model: str, query: str, search_recency_filter: Optional[str], max_tokens: int) -> str:
+    """Cache key; queries differing only in case or whitespace share it."""
+    normalized = " ".join(query.split()).casefold()
+    raw = json.dumps([model, normalized, search_recency_filter, max_tokens])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def _search(
+    query: str,
+    model: str,
+    system_prompt: str,
+    max_tokens: int,
+    search_recency_filter: Optional[str],
+    top_p: Optional[float] = None,
+    return_related_questions: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run a Perplexity completion, or reuse a cached / in-flight one.
+    
+    Returns:
+        Dict with content, citations, related_questions and cached
+        (True if no new request was sent)
+        
+    Raises:
+        openai.OpenAIError: API errors (not cached)
+    """
+    cache_key = _search_cache_key(model, query, search_recency_filter, max_tokens)
+    
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        logger.info("perplexity_cache_hit", query=query, recency_filter=search_recency_filter)
+        return {**cached, "cached": True}
+        
+    async def fetch() -> Dict[str, Any]:
+        client = get_perplexity_client()
+        params: Dict[str, Any] = {}
+        if top_p is not None:
+            params["top_p"] = top_p
+            
+        async with _get_search_semaphore():
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": query},
+                ],
+                max_tokens=max_tokens,
+                temperature=0.2,  # Lower for factual accuracy
+                # Perplexity-specific parameters (not in the OpenAI schema)
+                extra_body={
+                    "search_recency_filter": search_recency_filter,
+                    "return_citations": True,
+                    "return_images": False,
+                    "return_related_questions": return_related_questions,
+                },
+                **params,
+            )
+            
+        result = {
+            "content": response.choices[0].message.content or "",
+            "citations": list(getattr(response, "citations", None) or []),
+            "related_questions": list(getattr(response, "related_questions", None) or []),
+        }
+        _search_cache.set(cache_key, result)
+        return result
+        
+    result, shared = await _search_flight.do(cache_key, fetch)
+    return {**result, "cached": shared}
+
 
 @tool("perplexity_search")
 async def perplexity_search(
@@ -79,57 +217,24 @@ async def perplexity_search(
             recency_filter=search_recency_filter,
         )
         
-        # Initialize Perplexity client (OpenAI-compatible)
-        client = OpenAI(
-            api_key=settings.PERPLEXITY_API_KEY,
-            base_url="https://api.perplexity.ai",
-        )
-        
         # Perplexity models:
         # - llama-3.1-sonar-small-128k-online: Fast, cheaper
         # - llama-3.1-sonar-large-128k-online: Better quality (recommended)
         # - llama-3.1-sonar-huge-128k-online: Best quality, slower
         
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You are a helpful research assistant. "
-                    "Provide comprehensive, well-structured information with citations. "
-                    "Focus on recent developments, trends, and actionable insights."
-                ),
-            },
-            {
-                "role": "user",
-                "content": query,
-            },
-        ]
-        
-        # Call Perplexity API
-        response = client.chat.completions.create(
+        result = await _search(
+            query,
             model=settings.PERPLEXITY_MODEL,
-            messages=messages,
+            system_prompt=SEARCH_SYSTEM_PROMPT,
             max_tokens=max_tokens,
-            temperature=0.2,  # Lower for factual accuracy
-            top_p=0.9,
             search_recency_filter=search_recency_filter,
-            return_citations=True,
-            return_images=False,
+            top_p=0.9,
             return_related_questions=True,
         )
         
-        # Extract response
-        content = response.choices[0].message.content
-        
-        # Extract citations if available
-        citations = []
-        if hasattr(response, "citations") and response.citations:
-            citations = response.citations
-        
-        # Extract related questions if available
-        related_questions = []
-        if hasattr(response, "related_questions") and response.related_questions:
-            related_questions = response.related_questions
+        content = result["content"]
+        citations = result["citations"]
+        related_questions = result["related_questions"]
         
         # Format response
         formatted_response = f"""# Perplexity Search Results
@@ -160,6 +265,7 @@ async def perplexity_search(
             response_length=len(content),
             citations_count=len(citations),
             related_questions_count=len(related_questions),
+            cached=result["cached"],
         )
         
         return formatted_response
@@ -202,37 +308,21 @@ async def perplexity_search_fast(
     try:
         logger.info("executing_perplexity_search_fast", query=query)
         
-        client = OpenAI(
-            api_key=settings.PERPLEXITY_API_KEY,
-            base_url="https://api.perplexity.ai",
-        )
-        
-        messages = [
-            {
-                "role": "system",
-                "content": "You are a helpful assistant. Provide concise, accurate information.",
-            },
-            {
-                "role": "user",
-                "content": query,
-            },
-        ]
-        
-        response = client.chat.completions.create(
-            model="llama-3.1-sonar-small-128k-online",  # Fast model
-            messages=messages,
+        result = await _search(
+            query,
+            model=PERPLEXITY_FAST_MODEL,
+            system_prompt=FAST_SYSTEM_PROMPT,
             max_tokens=max_tokens,
-            temperature=0.2,
             search_recency_filter="month",
-            return_citations=True,
         )
         
-        content = response.choices[0].message.content
+        content = result["content"]
         
         logger.info(
             "perplexity_search_fast_completed",
             query=query,
             response_length=len(content),
+            cached=result["cached"],
         )
         
         return f"**Search Results**: {query}\n\n{content}"
@@ -244,24 +334,3 @@ async def perplexity_search_fast(
             error=str(e),
         )
         return f"❌ Fast search failed: {str(e)}"
-
-
-# Singleton pattern - reuse client across calls
-_perplexity_client: Optional[OpenAI] = None
-
-
-def get_perplexity_client() -> Optional[OpenAI]:
-    """Get or create Perplexity client (singleton pattern)."""
-    global _perplexity_client
-    
-    if not settings.PERPLEXITY_API_KEY:
-        return None
-    
-    if _perplexity_client is None:
-        _perplexity_client = OpenAI(
-            api_key=settings.PERPLEXITY_API_KEY,
-            base_url="https://api.perplexity.ai",
-        )
-        logger.info("perplexity_client_initialized")
-    
-    return _perplexity_client
@@ -10,18 +10,25 @@ Este tool es usado por:
 - TechnicalArchitect: Análisis de documentación técnica
 
 Features:
+- Scraping en niveles: GET HTTP + HTML → texto primero; Playwright solo si
+  la página necesita render (body vacío, <noscript>, dominio SPA)
 - Browser automation con anti-detection
+- Ciclo de vida del browser gestionado (mcp_servers/browser_manager.py):
+  apagado por inactividad y reinicio tras un crash o N páginas
 - Rate limiting automático (10 req/min vía adapter)
 - Cache de contenido (3 días)
 - Extracción estructurada con selectores CSS
 - Screenshots para debugging
 """
-import asyncio
+from collections import Counter
 from typing import Optional, Dict, Any, List
 from langchain_core.tools import tool
 import structlog
 
+from mcp_servers.browser_manager import BrowserManager
+from mcp_servers.http_fetcher import HTTPFetcher
 from mcp_servers.playwright_mcp import PlaywrightAdapter, ScrapedContent
+from mcp_servers.work_queue import iter_completed
 from config.settings import settings
 
 logger = structlog.get_logger()
@@ -43,13 +50,88 @@ class ScrapingTool:
     
     def __init__(self, redis_client=None):
         self.adapter = PlaywrightAdapter(redis_client=redis_client)
-        self._connected = False
+        self.http = HTTPFetcher(redis_client=redis_client)
+        # Arranque lazy / apagado por inactividad / reinicio del browser
+        self.browser_manager = BrowserManager(self.adapter)
+        
+        # Páginas servidas por cada nivel ("http" / "browser")
+        self.fetch_counts: Counter = Counter()
     
-    async def _ensure_connected(self):
-        """Conecta adapter si no está conectado."""
-        if not self._connected:
-            await self.adapter.connect()
-            self._connected = True
+    async def fetch_page(
+        self,
+        url: str,
+        wait_for_selector: Optional[str] = None,
+        include_html: bool = False,
+    ) -> ScrapedContent:
+        """
+        Scraping en niveles: HTTP plano primero, Playwright si hace falta.
+        
+        Chromium solo se inicia cuando una página lo necesita
+        (ver mcp_servers/http_fetcher.py para los criterios).
+        
+        Returns:
+            ScrapedContent; metadata["fetcher"] indica el nivel usado y, si
+            se escaló, metadata["render_reason"] el motivo
+        """
+        reason = "tiered_disabled"
+        if settings.SCRAPE_TIERED:
+            try:
+                content = await self.http.fetch(
+                    url,
+                    include_html=include_html,
+                    wait_for_selector=wait_for_selector,
+                )
+            except Exception as e:
+                logger.info("http_fetch_failed", url=url, error=str(e) or type(e).__name__)
+                content = None
+                reason = "http_error"
+            else:
+                if content is not None and not content.metadata.get("render_required"):
+                    self.fetch_counts["http"] += 1
+                    return content
+                reason = content.metadata["render_required"] if content is not None else "http_unusable"
+        
+        async with self.browser_manager.session() as adapter:
+            result = await adapter.scrape_page(
+                url=url,
+                wait_for_selector=wait_for_selector,
+                include_html=include_html,
+            )
+        result.metadata = {**(result.metadata or {}), "fetcher": "browser", "render_reason": reason}
+        self.fetch_counts["browser"] += 1
+        
+        logger.info("page_render_escalated", url=url, reason=reason)
+        
+        return result
+    
+    async def fetch_many(
+        self,
+        urls: List[str],
+        max_concurrent: int = 3,
+        deadline: Optional[float] = None,
+    ) -> List[ScrapedContent]:
+        """
+        fetch_page sobre varias URLs (cola acotada por host, timeout por URL).
+        
+        Returns:
+            Lista de ScrapedContent en el orden de urls, sin las fallidas ni
+            las que no terminaron antes del deadline
+        """
+        results = {}
+        async for url, result in iter_completed(
+            urls,
+            self.fetch_page,
+            max_concurrent=max_concurrent,
+            per_host=settings.SCRAPE_PER_HOST_LIMIT,
+            item_timeout=settings.SCRAPE_URL_TIMEOUT,
+            deadline=deadline or settings.SCRAPE_BATCH_DEADLINE,
+        ):
+            if isinstance(result, Exception):
+                logger.error("parallel_scrape_failed", url=url, error=str(result) or type(result).__name__)
+            else:
+                results[url] = result
+        
+        return [results[url] for url in dict.fromkeys(urls) if url in results]
     
     @tool("scrape_website")
     async def scrape_website(
@@ -60,8 +142,10 @@ class ScrapingTool:
         """
         Extrae contenido completo de una página web.
         
-        Este tool usa Playwright para navegar y extraer contenido de páginas web,
-        con soporte para JavaScript rendering y anti-detection.
+        Las páginas estáticas se descargan con un GET HTTP; si la página necesita
+        JavaScript (body vacío, <noscript>, dominio SPA o wait_for_selector ausente
+        en el HTML), usa Playwright con soporte para JavaScript rendering y
+        anti-detection.
         
         Args:
             url (str): URL de la página a scrapear
@@ -88,10 +172,9 @@ class ScrapingTool:
         """
         # Instance method workaround for @tool decorator
         tool_instance = _get_scraping_tool_instance()
-        await tool_instance._ensure_connected()
         
         try:
-            result = await tool_instance.adapter.scrape_page(
+            result = await tool_instance.fetch_page(
                 url=url,
                 wait_for_selector=wait_for_selector,
                 include_html=include_html,
@@ -153,13 +236,13 @@ class ScrapingTool:
             )
         """
         tool_instance = _get_scraping_tool_instance()
-        await tool_instance._ensure_connected()
         
         try:
-            data = await tool_instance.adapter.extract_structured_data(
-                url=url,
-                selectors=selectors,
-            )
+            async with tool_instance.browser_manager.session() as adapter:
+                data = await adapter.extract_structured_data(
+                    url=url,
+                    selectors=selectors,
+                )
             
             logger.info(
                 "structured_extraction_completed",
@@ -181,13 +264,19 @@ class ScrapingTool:
     async def scrape_multiple_urls(
         urls: List[str],
         max_concurrent: int = 3,
+        deadline: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         Extrae contenido de múltiples URLs en paralelo.
         
+        Cada URL tiene su propio timeout y un host lento no bloquea a los
+        demás; si vence el deadline se retornan las URLs ya completadas.
+        
         Args:
             urls (list): Lista de URLs a scrapear
             max_concurrent (int): Máximo número de scrapes simultáneos (default 3)
+            deadline (float, optional): Segundos máximos para todo el lote
+                (default SCRAPE_BATCH_DEADLINE)
         
         Returns:
             List[Dict]: Lista de contenidos scrapeados
@@ -200,12 +289,12 @@ class ScrapingTool:
             ])
         """
         tool_instance = _get_scraping_tool_instance()
-        await tool_instance._ensure_connected()
         
         try:
-            results = await tool_instance.adapter.scrape_multiple(
+            results = await tool_instance.fetch_many(
                 urls=urls,
                 max_concurrent=max_concurrent,
+                deadline=deadline,
             )
             
             logger.info(
@@ -250,14 +339,14 @@ class ScrapingTool:
             )
         """
         tool_instance = _get_scraping_tool_instance()
-        await tool_instance._ensure_connected()
         
         try:
-            screenshot_path = await tool_instance.adapter.take_screenshot(
-                url=url,
-                path=path,
-                full_page=full_page,
-            )
+            async with tool_instance.browser_manager.session() as adapter:
+                screenshot_path = await adapter.take_screenshot(
+                    url=url,
+                    path=path,
+                    full_page=full_page,
+                )
             
             logger.info(
                 "screenshot_captured",
@@ -306,13 +395,13 @@ class ScrapingTool:
             )
         """
         tool_instance = _get_scraping_tool_instance()
-        await tool_instance._ensure_connected()
         
         try:
-            result = await tool_instance.adapter.evaluate_js(
-                url=url,
-                script=script,
-            )
+            async with tool_instance.browser_manager.session() as adapter:
+                result = await adapter.evaluate_js(
+                    url=url,
+                    script=script,
+                )
             
             logger.info(
                 "javascript_executed",
@@ -331,10 +420,16 @@ class ScrapingTool:
             return None
     
     async def close(self):
-        """Cierra conexión del adapter."""
-        if self._connected:
-            await self.adapter.disconnect()
-            self._connected = False
+        """Cierra el browser y el cliente HTTP."""
+        await self.http.disconnect()
+        await self.browser_manager.close()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Páginas por nivel + estado y memoria del browser."""
+        return {
+            "fetch_counts": dict(self.fetch_counts),
+            "browser": self.browser_manager.metrics(),
+        }
 
 
 # Global instance for singleton pattern
@@ -359,6 +454,27 @@ def _get_scraping_tool_instance(redis_client=None) -> ScrapingTool:
     return _scraping_tool_instance
 
 
+async def prewarm_scraping_tool() -> None:
+    """Inicia el browser del singleton por adelantado (arranque de la API)."""
+    await _get_scraping_tool_instance().browser_manager.start()
+
+
+async def close_scraping_tool() -> None:
+    """Libera browser y cliente HTTP del singleton (si se creó)."""
+    global _scraping_tool_instance
+    
+    if _scraping_tool_instance is not None:
+        await _scraping_tool_instance.close()
+        _scraping_tool_instance = None
+
+
+def get_scraping_metrics() -> Optional[Dict[str, Any]]:
+    """Métricas del singleton sin crearlo (None si nunca se usó)."""
+    if _scraping_tool_instance is None:
+        return None
+    return _scraping_tool_instance.metrics()
+
+
 def get_scraping_tool(redis_client=None) -> ScrapingTool:
     """
     Alias público para obtener instancia.
@@ -389,8 +505,10 @@ async def scrape_website(
     """
     Extrae contenido completo de una página web.
     
-    Este tool usa Playwright para navegar y extraer contenido de páginas web,
-    con soporte para JavaScript rendering y anti-detection.
+    Las páginas estáticas se descargan con un GET HTTP; si la página necesita
+    JavaScript (body vacío, <noscript>, dominio SPA o wait_for_selector ausente
+    en el HTML), usa Playwright con soporte para JavaScript rendering y
+    anti-detection.
     
     Args:
         url (str): URL de la página a scrapear
@@ -416,10 +534,9 @@ async def scrape_website(
         )
     """
     tool_instance = _get_scraping_tool_instance()
-    await tool_instance._ensure_connected()
     
     try:
-        result = await tool_instance.adapter.scrape_page(
+        result = await tool_instance.fetch_page(
             url=url,
             wait_for_selector=wait_for_selector,
             include_html=include_html,
@@ -452,32 +569,37 @@ async def scrape_website(
 async def scrape_multiple_urls(
     urls: List[str],
     max_concurrent: int = 3,
+    deadline: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
     """
     Extrae contenido de múltiples URLs en paralelo.
     
+    Cola de trabajo acotada: cada slot libre toma la siguiente URL (sin
+    esperar al resto de un grupo), con límite de scrapes simultáneos por
+    host y timeout por URL. Si vence el deadline se retornan las URLs ya
+    completadas.
+    
     Args:
         urls: Lista de URLs a scrapear
         max_concurrent: Máximo número de scrapes simultáneos
+        deadline: Segundos máximos para todo el lote (default SCRAPE_BATCH_DEADLINE)
     
     Returns:
-        List[Dict]: Lista de resultados (mismo formato que scrape_website)
+        List[Dict]: Lista de resultados (mismo formato que scrape_website),
+        en el orden de urls y sin las URLs fallidas
     """
     tool_instance = _get_scraping_tool_instance()
-    await tool_instance._ensure_connected()
     
-    async def scrape_one(url: str):
-        try:
-            return await tool_instance.adapter.scrape_page(url=url)
-        except Exception as e:
-            logger.error("parallel_scrape_failed", url=url, error=str(e))
-            return None
+    results = await tool_instance.fetch_many(
+        urls=urls,
+        max_concurrent=max_concurrent,
+        deadline=deadline,
+    )
     
-    # Process in batches
-    results = []
-    for i in range(0, len(urls), max_concurrent):
-        batch = urls[i:i + max_concurrent]
-        batch_results = await asyncio.gather(*[scrape_one(url) for url in batch])
-        results.extend([r.to_dict() if r else None for r in batch_results])
+    logger.info(
+        "multiple_scrape_completed",
+        total_urls=len(urls),
+        successful=len(results),
+    )
     
-    return [r for r in results if r is not None]
+    return [r.to_dict() for r in results]
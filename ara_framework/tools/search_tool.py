@@ -25,6 +25,9 @@ from config.settings import settings
 
 logger = structlog.get_logger()
 
+# Máximo de papers que retorna search_recent_papers (token limits del LLM)
+MAX_RECENT_PAPERS = 100
+
 
 class SearchTool:
     """
@@ -374,8 +377,10 @@ async def search_recent_papers(
     """
     Busca papers recientes (últimos N años) con paginación inteligente.
     
-    OPTIMIZACIÓN: Si limit > 50, divide en múltiples requests pequeños
-    para evitar token limits en modelos como GPT-4o (8K max).
+    OPTIMIZACIÓN: Los resultados se piden en páginas de 100 cacheadas por
+    paper ID, así un request posterior con otro limit/offset de la misma
+    query no consume rate limit. El resultado se limita a 100 papers para
+    evitar token limits en modelos como GPT-4o (8K max).
     
     Args:
         query (str): Query de búsqueda
@@ -390,7 +395,7 @@ async def search_recent_papers(
         recent = search_recent_papers(
             "generative AI",
             years_back=2,
-            limit=100  # Se divide en 5 requests de 20
+            limit=100  # 1 request de 100 (luego limit=20 sale del cache)
         )
     """
     from datetime import datetime
@@ -404,49 +409,14 @@ async def search_recent_papers(
         tool_instance._connected = True
     
     try:
-        # PAGINACIÓN: Si limit > 50, dividir en chunks de 20
-        # Para evitar token limits (GPT-4o max 8K tokens en request body)
-        if limit > 50:
-            page_size = 20
-            num_pages = min(5, (limit + page_size - 1) // page_size)  # Max 5 páginas (100 total)
-            all_papers = []
-            
-            logger.info(
-                "paginated_search_started",
-                query=query,
-                total_limit=limit,
-                page_size=page_size,
-                num_pages=num_pages,
-            )
-            
-            for page in range(num_pages):
-                papers = await tool_instance.adapter.search_papers(
-                    query=query,
-                    limit=page_size,
-                    offset=page * page_size,
-                    year_from=year_from,
-                )
-                all_papers.extend(papers)
-                
-                logger.info(
-                    "page_fetched",
-                    page=page + 1,
-                    fetched=len(papers),
-                    total_so_far=len(all_papers),
-                )
-                
-                # Si una página devuelve menos resultados, no hay más
-                if len(papers) < page_size:
-                    break
-            
-            papers = all_papers[:limit]  # Limitar al número solicitado
-        else:
-            # Request normal (limit <= 50)
-            papers = await tool_instance.adapter.search_papers(
-                query=query,
-                limit=limit,
-                year_from=year_from,
-            )
+        # Planner de paginación del adapter: páginas alineadas cacheadas por
+        # paper ID, cualquier (limit, offset) posterior sale del cache y
+        # búsquedas idénticas concurrentes comparten el request
+        papers = await tool_instance.adapter.search_papers_window(
+            query=query,
+            limit=min(limit, MAX_RECENT_PAPERS),
+            year_from=year_from,
+        )
         
         # Sort by citation count (más citados primero)
         papers_sorted = sorted(
@@ -460,7 +430,6 @@ async def search_recent_papers(
             query=query,
             count=len(papers_sorted),
             years_back=years_back,
-            paginated=limit > 50,
         )
         
         return [p.to_dict() for p in papers_sorted]
@@ -526,9 +495,9 @@ async def _search_with_backoff(
             await asyncio.sleep(wait_time)
             
             # Intentar búsqueda nuevamente
-            papers = await tool_instance.adapter.search_papers(
+            papers = await tool_instance.adapter.search_papers_window(
                 query=query,
-                limit=limit,
+                limit=min(limit, MAX_RECENT_PAPERS),
                 year_from=year_from,
             )
             
@@ -569,3 +538,46 @@ async def _search_with_backoff(
             continue
     
     return []
+
+
+@tool("get_papers_details")
+async def get_papers_details(paper_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Obtiene detalles de varios papers en una sola llamada (batch).
+    
+    Usar en lugar de llamar get_paper_details por cada paper: 40 papers
+    cuestan 1 request en vez de 40 segundos de rate limit.
+    
+    Args:
+        paper_ids (List[str]): IDs de Semantic Scholar (max recomendado: 100)
+    
+    Returns:
+        List[Dict]: Papers encontrados, en el orden de paper_ids
+    
+    Example:
+        papers = get_papers_details(["abc123", "def456"])
+    """
+    tool_instance = get_search_tool()
+    
+    if not tool_instance._connected:
+        await tool_instance.adapter.connect()
+        tool_instance._connected = True
+    
+    try:
+        papers = await tool_instance.adapter.get_papers_details(paper_ids)
+        
+        logger.info(
+            "papers_details_retrieved",
+            requested=len(paper_ids),
+            found=len(papers),
+        )
+        
+        return [papers[pid].to_dict() for pid in dict.fromkeys(paper_ids) if pid in papers]
+    
+    except Exception as e:
+        logger.error(
+            "get_papers_details_failed",
+            requested=len(paper_ids),
+            error=str(e),
+        )
+        return []